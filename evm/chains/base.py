@@ -81,9 +81,6 @@ from evm.utils.db import (
 from evm.utils.datatypes import (
     Configurable,
 )
-from evm.utils.headers import (
-    compute_gas_limit_bounds,
-)
 from evm.utils.hexadecimal import (
     encode_hex,
 )
@@ -250,10 +247,6 @@ class BaseChain(Configurable, metaclass=ABCMeta):
     def validate_block(self, block: BaseBlock) -> None:
         raise NotImplementedError("Chain classes must implement this method")
 
-    @abstractmethod
-    def validate_gaslimit(self, header: BlockHeader) -> None:
-        raise NotImplementedError("Chain classes must implement this method")
-
     @abstractmethod
     def validate_uncles(self, block: BaseBlock) -> None:
         raise NotImplementedError("Chain classes must implement this method")
@@ -536,7 +529,15 @@ class Chain(BaseChain):
         transactions = base_block.transactions + (transaction, )
         receipts = base_block.get_receipts(self.chaindb) + (receipt, )
 
-        new_block = vm.set_block_transactions(base_block, new_header, transactions, receipts)
+        # The block isn't final yet, so its receipts are read back from the tries until
+        # it's mined.
+        new_block = vm.set_block_transactions(
+            base_block,
+            new_header,
+            transactions,
+            receipts,
+            persist_item_lists=False,
+        )
 
         self.header = new_block.header
 
@@ -566,14 +567,14 @@ class Chain(BaseChain):
             )
 
         parent_chain = self.get_chain_at_block_parent(block)
-        imported_block = parent_chain.get_vm().import_block(block)
+        imported_block, receipts = parent_chain.get_vm().import_block_with_receipts(block)
 
         # Validate the imported block.
         if perform_validation:
             ensure_imported_block_unchanged(imported_block, block)
             self.validate_block(imported_block)
 
-        self.chaindb.persist_block(imported_block)
+        self.chaindb.persist_block(imported_block, receipts)
         self.header = self.create_header_from_parent(self.get_canonical_head())
         self.logger.debug(
             'IMPORTED_BLOCK: number %s | hash %s',
@@ -591,6 +592,14 @@ class Chain(BaseChain):
 
         self.validate_block(mined_block)
 
+        self.chaindb.persist_block_transactions(
+            mined_block.header.transaction_root,
+            mined_block.transactions,
+        )
+        self.chaindb.persist_block_receipts(
+            mined_block.header.receipt_root,
+            mined_block.get_receipts(self.chaindb),
+        )
         self.chaindb.persist_block(mined_block)
         self.header = self.create_header_from_parent(self.get_canonical_head())
         return mined_block
@@ -605,27 +614,14 @@ class Chain(BaseChain):
         Since block validation (specifically the uncle validation must have
         access to the ancestor blocks, this validation must occur at the Chain
         level.
+
+        The header of the block is validated against its parent by the VM, which
+        both mines and imports it.
         """
         vm = self.get_vm()
         vm.validate_seal(block.header)
 
         self.validate_uncles(block)
-        self.validate_gaslimit(block.header)
-
-    def validate_gaslimit(self, header: BlockHeader) -> None:
-        """
-        Validate the gas limit on the given header.
-        """
-        parent_header = self.get_block_header_by_hash(header.parent_hash)
-        low_bound, high_bound = compute_gas_limit_bounds(parent_header)
-        if header.gas_limit < low_bound:
-            raise ValidationError(
-                "The gas limit on block {0} is too low: {1}. It must be at least {2}".format(
-                    encode_hex(header.hash), header.gas_limit, low_bound))
-        elif header.gas_limit > high_bound:
-            raise ValidationError(
-                "The gas limit on block {0} is too high: {1}. It must be at most {2}".format(
-                    encode_hex(header.hash), header.gas_limit, high_bound))
 
     def validate_uncles(self, block: BaseBlock) -> None:
         """
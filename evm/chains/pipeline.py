@@ -0,0 +1,176 @@
+from collections import deque
+from concurrent.futures import (  # noqa: F401
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+)
+import functools
+import logging
+from typing import (  # noqa: F401
+    Callable,
+    Deque,
+    Iterable,
+    Iterator,
+    Type,
+    TypeVar,
+)
+
+import rlp
+
+from evm.db.backends.base import BaseDB
+from evm.db.write_behind import WriteBehindDB
+from evm.exceptions import HeaderNotFound
+from evm.rlp.blocks import BaseBlock
+from evm.rlp.headers import BlockHeader
+
+from .base import BaseChain
+
+
+TItem = TypeVar('TItem')
+
+
+def recover_senders(block: BaseBlock) -> BaseBlock:
+    """
+    Recovers the senders of all transactions of the given block, which are then
+    cached on the transactions.  Returns the block.
+    """
+    for transaction in block.transactions:
+        transaction.sender
+    return block
+
+
+def deserialize_block(chain_class: Type[BaseChain], encoded_block: bytes) -> BaseBlock:
+    """
+    Decodes an RLP encoded block using the block class of the VM for its number.
+    """
+    serialized_block = rlp.decode(encoded_block)
+    header = BlockHeader.deserialize(serialized_block[0])
+    vm_class = chain_class.get_vm_class_for_block_number(header.block_number)
+    return vm_class.get_block_class().deserialize(serialized_block)
+
+
+def decode_block(chain_class: Type[BaseChain], encoded_block: bytes) -> BaseBlock:
+    """
+    Decodes an RLP encoded block like :func:`deserialize_block`, and recovers
+    the senders of its transactions.
+    """
+    return recover_senders(deserialize_block(chain_class, encoded_block))
+
+
+def _is_canonical(chain: BaseChain, block: BaseBlock) -> bool:
+    try:
+        return chain.chaindb.get_canonical_block_hash(block.number) == block.hash
+    except HeaderNotFound:
+        return False
+
+
+class BlockImportPipeline:
+    """
+    Imports a sequence of blocks, overlapping the work around block execution
+    with the execution itself:
+
+    - Blocks are decoded and their transaction senders recovered ahead of time,
+      using the given ``executor``.  Use a ``ProcessPoolExecutor`` for the work
+      to happen in parallel; the chain class must then be importable by name.
+    - Blocks are executed, validated and imported one after another, as with
+      :meth:`~evm.chains.base.Chain.import_block`.
+    - The database writes of imported blocks are made from a background thread,
+      using a :class:`~evm.db.write_behind.WriteBehindDB`.
+
+    Both ends are bounded: at most ``max_prepared_blocks`` blocks are prepared
+    ahead of execution, and execution waits once the writes of
+    ``max_unpersisted_blocks`` blocks are outstanding.
+
+    Without an ``executor``, the pipeline creates one, which :meth:`close` shuts down.
+    """
+    logger = logging.getLogger('evm.chains.pipeline.BlockImportPipeline')
+
+    def __init__(self,
+                 chain_class: Type[BaseChain],
+                 base_db: BaseDB,
+                 executor: Executor = None,
+                 max_prepared_blocks: int = 16,
+                 max_unpersisted_blocks: int = 4,
+                 perform_validation: bool = True) -> None:
+        self.chain_class = chain_class
+        self.base_db = base_db
+        self._owns_executor = executor is None
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=1)
+        self.executor = executor
+        self.max_prepared_blocks = max_prepared_blocks
+        self.max_unpersisted_blocks = max_unpersisted_blocks
+        self.perform_validation = perform_validation
+
+    def __enter__(self) -> 'BlockImportPipeline':
+        return self
+
+    def __exit__(self, exc_type: None, exc_value: None, traceback: None) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Shuts down the executor created by the pipeline.  A given executor is left
+        to its owner.
+        """
+        if self._owns_executor:
+            self.executor.shutdown()
+
+    def import_blocks(self, blocks: Iterable[BaseBlock]) -> Iterator[BaseBlock]:
+        """
+        Imports the given blocks in order, yielding each block once it has been
+        imported.  All writes have been made to the database once the iteration
+        is over.
+
+        Blocks which are already part of the canonical chain are skipped, so that
+        an interrupted import can simply be restarted.
+        """
+        return self._import(blocks, recover_senders)
+
+    def import_encoded_blocks(self, encoded_blocks: Iterable[bytes]) -> Iterator[BaseBlock]:
+        """
+        Like :meth:`import_blocks`, for RLP encoded blocks.
+        """
+        return self._import(encoded_blocks, functools.partial(decode_block, self.chain_class))
+
+    def _import(self,
+                items: Iterable[TItem],
+                prepare: Callable[[TItem], BaseBlock]) -> Iterator[BaseBlock]:
+        db = WriteBehindDB(self.base_db, max_pending=self.max_unpersisted_blocks)
+        try:
+            chain = self.chain_class(db)
+            for block in self._prepare(items, prepare):
+                if _is_canonical(chain, block):
+                    continue
+                try:
+                    imported_block = chain.import_block(
+                        block,
+                        perform_validation=self.perform_validation,
+                    )
+                except Exception:
+                    db.clear()
+                    raise
+                db.commit()
+                yield imported_block
+            db.flush()
+        finally:
+            db.close()
+
+    def _prepare(self,
+                 items: Iterable[TItem],
+                 prepare: Callable[[TItem], BaseBlock]) -> Iterator[BaseBlock]:
+        """
+        Yields the prepared blocks in order, keeping up to ``max_prepared_blocks``
+        of them in preparation.
+        """
+        preparing = deque()  # type: Deque[Future]
+        try:
+            for item in items:
+                preparing.append(self.executor.submit(prepare, item))
+                if len(preparing) >= self.max_prepared_blocks:
+                    yield preparing.popleft().result()
+            while preparing:
+                yield preparing.popleft().result()
+        finally:
+            for future in preparing:
+                future.cancel()
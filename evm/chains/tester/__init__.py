@@ -46,8 +46,19 @@ class MaintainGasLimitMixin(object):
         )
 
 
+class NoProofOfWorkMixin(object):
+    def validate_seal(self, header: BlockHeader) -> None:
+        """
+        We don't validate the proof of work seal on the tester chain.
+        """
+        pass
+
+
 MAINNET_VMS = collections.OrderedDict(
-    (vm_class.fork, type(vm_class.__name__, (MaintainGasLimitMixin, vm_class), {}))
+    (
+        vm_class.fork,
+        type(vm_class.__name__, (MaintainGasLimitMixin, NoProofOfWorkMixin, vm_class), {}),
+    )
     for _, vm_class
     in MainnetChain.vm_configuration
 )
@@ -143,12 +154,6 @@ class MainnetTesterChain(BaseMainnetTesterChain):   # type: ignore
     It exposes one additional API `configure_forks` to allow for in-flight
     configuration of fork rules.
     """
-    def validate_seal(self, block):
-        """
-        We don't validate the proof of work seal on the tester chain.
-        """
-        pass
-
     def configure_forks(self,
                         *fork_start_blocks: ForkStartBlocks,
                         dao_start_block: Union[int, bool]=None) -> None:
@@ -0,0 +1,154 @@
+"""
+The parts of ethash which pyethash doesn't provide: the generation of the full
+dataset of an epoch from its cache, and hashimoto over the full dataset.
+
+See https://github.com/ethereum/wiki/wiki/Ethash for the specification.
+"""
+import mmap  # noqa: F401
+import struct
+from typing import (  # noqa: F401
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from pyethash import (
+    ACCESSES,
+    DATASET_BYTES_GROWTH,
+    DATASET_BYTES_INIT,
+    DATASET_PARENTS,
+    EPOCH_LENGTH,
+    HASH_BYTES,
+    MIX_BYTES,
+)
+
+from eth_hash.auto import keccak
+
+try:
+    # eth-hash only provides keccak-256.
+    from sha3 import keccak_512 as _keccak_512
+except ImportError:
+    keccak_512_available = False
+else:
+    keccak_512_available = True
+
+
+WORD_BYTES = 4
+HASH_WORDS = HASH_BYTES // WORD_BYTES
+MIX_WORDS = MIX_BYTES // WORD_BYTES
+# Number of dataset items read at once by each access of hashimoto.
+MIX_HASHES = MIX_BYTES // HASH_BYTES
+
+FNV_PRIME = 0x01000193
+WORD_MASK = 2**32 - 1
+
+
+def fnv(v1: int, v2: int) -> int:
+    return ((v1 * FNV_PRIME) ^ v2) & WORD_MASK
+
+
+def keccak_512(data: bytes) -> bytes:
+    return _keccak_512(data).digest()
+
+
+def _is_prime(number: int) -> bool:
+    for divisor in range(2, int(number ** 0.5) + 1):
+        if number % divisor == 0:
+            return False
+    return True
+
+
+def get_full_size(block_number: int) -> int:
+    """
+    Return the size in bytes of the full dataset of the epoch of the given block.
+    """
+    full_size = DATASET_BYTES_INIT + DATASET_BYTES_GROWTH * (block_number // EPOCH_LENGTH)
+    full_size -= MIX_BYTES
+    while not _is_prime(full_size // MIX_BYTES):
+        full_size -= 2 * MIX_BYTES
+    return full_size
+
+
+def _to_words(data: bytes) -> Tuple[int, ...]:
+    return struct.unpack('<{0}I'.format(len(data) // WORD_BYTES), data)
+
+
+def _from_words(words: Sequence[int]) -> bytes:
+    return struct.pack('<{0}I'.format(len(words)), *words)
+
+
+def calc_dataset_item(cache_items: Sequence[Sequence[int]], index: int) -> bytes:
+    """
+    Compute the dataset item with the given index from the items of the cache, as
+    returned by :func:`get_cache_items`.
+    """
+    num_cache_items = len(cache_items)
+    mix = list(cache_items[index % num_cache_items])
+    mix[0] ^= index
+    mix = list(_to_words(keccak_512(_from_words(mix))))
+    for parent in range(DATASET_PARENTS):
+        parent_item = cache_items[fnv(index ^ parent, mix[parent % HASH_WORDS]) % num_cache_items]
+        mix = [fnv(word, parent_word) for word, parent_word in zip(mix, parent_item)]
+    return keccak_512(_from_words(mix))
+
+
+def get_cache_items(cache: Union[bytes, 'mmap.mmap']) -> List[Tuple[int, ...]]:
+    return list(struct.iter_unpack('<{0}I'.format(HASH_WORDS), cache))
+
+
+def iter_dataset_items(cache: Union[bytes, 'mmap.mmap'], full_size: int) -> Iterable[bytes]:
+    """
+    Compute the items of the full dataset of ``full_size`` bytes from the given cache,
+    in order.  This takes hours for the datasets of the main network: about 8 for the
+    one of the first epoch, see ``scripts/benchmark/ethash_modes.py``.
+    """
+    cache_items = get_cache_items(cache)
+    for index in range(full_size // HASH_BYTES):
+        yield calc_dataset_item(cache_items, index)
+
+
+def hashimoto(mining_hash: bytes,
+              nonce: int,
+              full_size: int,
+              get_dataset_page: Callable[[int], bytes]) -> Dict[bytes, bytes]:
+    """
+    Compute the ethash of the given mining hash and nonce, reading the dataset of
+    ``full_size`` bytes with ``get_dataset_page``, which returns the ``MIX_BYTES`` of
+    the dataset page with the given index.
+
+    The result is a dictionary like the one of ``pyethash.hashimoto_light``.
+    """
+    num_pages = full_size // MIX_BYTES
+    seed = keccak_512(mining_hash + nonce.to_bytes(8, 'little'))
+    seed_words = _to_words(seed)
+    mix = list(seed_words * MIX_HASHES)
+    for access in range(ACCESSES):
+        page = fnv(access ^ seed_words[0], mix[access % MIX_WORDS]) % num_pages
+        page_words = _to_words(get_dataset_page(page))
+        mix = [fnv(word, page_word) for word, page_word in zip(mix, page_words)]
+    mix_digest = _from_words([
+        fnv(fnv(fnv(mix[i], mix[i + 1]), mix[i + 2]), mix[i + 3])
+        for i in range(0, MIX_WORDS, 4)
+    ])
+    return {
+        b'mix digest': mix_digest,
+        b'result': keccak(seed + mix_digest),
+    }
+
+
+def hashimoto_full(dataset: Union[bytes, 'mmap.mmap'],
+                   mining_hash: bytes,
+                   nonce: int) -> Dict[bytes, bytes]:
+    """
+    Compute the ethash of the given mining hash and nonce with the full dataset of its epoch.
+    """
+    return hashimoto(
+        mining_hash,
+        nonce,
+        len(dataset),
+        lambda page: dataset[page * MIX_BYTES:(page + 1) * MIX_BYTES],
+    )
@@ -1,11 +1,36 @@
+import asyncio
+import collections
 from collections import OrderedDict
+from concurrent.futures import Executor
+import logging
+import math
+import mmap
+import multiprocessing
+import os
+import random
+import tempfile
+import time
 from typing import (  # noqa: F401
+    Any,
+    Callable,
+    Dict,
+    Iterable,
     List,
-    Tuple
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from cytoolz import (
+    partition_all,
 )
 
 from pyethash import (
     EPOCH_LENGTH,
+    HASH_BYTES,
+    REVISION,
     hashimoto_light,
     mkcache_bytes,
 )
@@ -16,12 +41,14 @@ from eth_typing import (
 
 from eth_hash.auto import keccak
 
+from evm.consensus import ethash
 from evm.utils.hexadecimal import (
     encode_hex,
 )
 from evm.exceptions import (
     ValidationError,
 )
+from evm.rlp.headers import BlockHeader
 from evm.utils.numeric import (
     big_endian_to_int,
 )
@@ -31,27 +58,327 @@ from evm.validation import (
 )
 
 
+logger = logging.getLogger('evm.consensus.pow')
+
 # Type annotation here is to ensure we don't accidentally use strings instead of bytes.
 cache_seeds = [b'\x00' * 32]  # type: List[bytes]
-cache_by_seed = OrderedDict()  # type: OrderedDict[bytes, bytearray]
+cache_by_seed = OrderedDict()  # type: OrderedDict[bytes, Union[bytes, mmap.mmap]]
 CACHE_MAX_ITEMS = 10
 
+# The directory of the cache files, which are generated once and then memory mapped
+# by every process which needs them.  Set with set_cache_dir(), the caches are only
+# kept in memory otherwise.
+CACHE_DIR_ENV_VAR = 'PYEVM_ETHASH_CACHE_DIR'
+cache_dir = os.environ.get(CACHE_DIR_ENV_VAR)  # type: str
+
+# The process which generates the cache files in the background: the one of the next
+# epoch when the one of an epoch is first used, and the ones of the epochs of the
+# headers whose seals it gives to an executor to check.  Kept as a process id so that
+# forked worker processes don't all do it too.
+_pregenerating_pid = None  # type: int
+_cache_generation_context = multiprocessing.get_context('spawn')
+_cache_generations = {}  # type: Dict[bytes, multiprocessing.Process]
+# Number of seconds between two checks of a file which another process is generating.
+FILE_GENERATION_POLL_INTERVAL = 0.1
+
+# The directory of the full dataset files, in the full dataset mode set with
+# set_dataset_dir().  The hashes of an epoch are computed with its full dataset once
+# its file exists, which is faster than recomputing the dataset items from the cache.
+DATASET_DIR_ENV_VAR = 'PYEVM_ETHASH_DATASET_DIR'
+dataset_dir = os.environ.get(DATASET_DIR_ENV_VAR)  # type: str
+dataset_by_seed = OrderedDict()  # type: OrderedDict[bytes, mmap.mmap]
+DATASET_MAX_ITEMS = 2
+# The datasets whose hashes didn't match the ones computed from the cache.
+_invalid_dataset_seeds = set()  # type: Set[bytes]
+
+# The process which generates the missing dataset files in background processes, when
+# they are first used or the headers of their epochs are given to an executor to check
+# their seals, with the number of items written so far by each of them.
+_generating_dataset_pid = None  # type: int
+_dataset_generations = {}  # type: Dict[bytes, Tuple[multiprocessing.Process, Any]]
+# Number of items written between two updates of the progress of a dataset generation.
+DATASET_PROGRESS_INTERVAL = 4096
+# Minimum number of seconds between two logs of the progress of the dataset generations.
+DATASET_PROGRESS_LOG_INTERVAL = 60
+_last_dataset_progress_log = 0.0
+
+
+def set_cache_dir(path: str, pregenerate: bool = False) -> None:
+    """
+    Store the caches as files in the given directory.  The processes started
+    afterwards use it too.  With ``pregenerate``, this process also generates the
+    cache of the next epoch ahead of time.
+    """
+    global cache_dir, _pregenerating_pid
+    os.makedirs(path, exist_ok=True)
+    cache_dir = path
+    _pregenerating_pid = os.getpid() if pregenerate else None
+    os.environ[CACHE_DIR_ENV_VAR] = path
 
-def get_cache(block_number: int) -> bytes:
+
+def get_cache_seed(block_number: int) -> bytes:
     while len(cache_seeds) <= block_number // EPOCH_LENGTH:
         cache_seeds.append(keccak(cache_seeds[-1]))
-    seed = cache_seeds[block_number // EPOCH_LENGTH]
+    return cache_seeds[block_number // EPOCH_LENGTH]
+
+
+def get_cache_path(seed: bytes) -> str:
+    return os.path.join(cache_dir, 'cache-R{0}-{1}'.format(REVISION, encode_hex(seed)[2:18]))
+
+
+def _write_file(path: str, chunks: Iterable[bytes]) -> None:
+    # Write to a temporary file first, so that other processes never load a partial file.
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'wb') as output_file:
+            for chunk in chunks:
+                output_file.write(chunk)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def _is_lock_stale(lock_path: str) -> bool:
+    if os.name != 'posix':
+        # Signal 0 only checks whether the process exists on POSIX systems.
+        return False
+    try:
+        with open(lock_path) as lock_file:
+            pid = int(lock_file.read())
+    except (FileNotFoundError, ValueError):
+        # Released, or its process id isn't written yet.
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        pass
+    return False
+
+
+def _generate_file(path: str, make_chunks: Callable[[], Iterable[bytes]]) -> None:
+    """
+    Write the chunks returned by ``make_chunks`` to the given path, unless it exists.
+    The process generating it holds a lock file, created exclusively with its process
+    id, so that the other processes which need the file wait for it instead of
+    generating it too.
+    """
+    lock_path = path + '.lock'
+    while not os.path.exists(path):
+        try:
+            lock_fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if _is_lock_stale(lock_path):
+                # Left by a process which died while generating the file.
+                try:
+                    os.unlink(lock_path)
+                except FileNotFoundError:
+                    pass
+            else:
+                time.sleep(FILE_GENERATION_POLL_INTERVAL)
+            continue
+        try:
+            with os.fdopen(lock_fd, 'w') as lock_file:
+                lock_file.write(str(os.getpid()))
+            if not os.path.exists(path):
+                _write_file(path, make_chunks())
+        finally:
+            os.unlink(lock_path)
+
+
+def make_cache_file(block_number: int, path: str) -> None:
+    """
+    Generate the cache of the epoch of the given block, and write it to the given path,
+    or wait for the process which is generating it already.
+    """
+    _generate_file(path, lambda: (mkcache_bytes(block_number),))
+
+
+def _load_cache_file(block_number: int, seed: bytes) -> mmap.mmap:
+    path = get_cache_path(seed)
+    generation = _cache_generations.pop(seed, None)
+    if generation is not None:
+        generation.join()
+    if not os.path.exists(path):
+        make_cache_file(block_number, path)
+    with open(path, 'rb') as cache_file:
+        return mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def pregenerate_cache(block_number: int) -> None:
+    """
+    Generate the cache file of the epoch of the given block in a background
+    process, unless it exists already.
+    """
+    seed = get_cache_seed(block_number)
+    if seed in _cache_generations or os.path.exists(get_cache_path(seed)):
+        return
+    generation = _cache_generation_context.Process(
+        target=make_cache_file,
+        args=(block_number, get_cache_path(seed)),
+        daemon=True,
+    )
+    generation.start()
+    _cache_generations[seed] = generation
+
+
+def get_cache(block_number: int) -> Union[bytes, mmap.mmap]:
+    seed = get_cache_seed(block_number)
     if seed in cache_by_seed:
         c = cache_by_seed.pop(seed)  # pop and append at end
         cache_by_seed[seed] = c
         return c
-    c = mkcache_bytes(block_number)
+    if cache_dir is None:
+        c = mkcache_bytes(block_number)
+    else:
+        c = _load_cache_file(block_number, seed)
+        if _pregenerating_pid == os.getpid():
+            pregenerate_cache(block_number + EPOCH_LENGTH)
     cache_by_seed[seed] = c
     if len(cache_by_seed) > CACHE_MAX_ITEMS:
         cache_by_seed.popitem(last=False)  # remove last recently accessed
     return c
 
 
+def set_dataset_dir(path: str, generate: bool = False) -> None:
+    """
+    Compute the hashes with the full datasets stored as files in the given directory,
+    once they exist.  The processes started afterwards use it too.  With ``generate``,
+    this process generates the missing datasets in background processes.
+    """
+    global dataset_dir, _generating_dataset_pid
+    if not ethash.keccak_512_available:
+        raise ImportError("The full dataset mode requires the pysha3 library")
+    os.makedirs(path, exist_ok=True)
+    dataset_dir = path
+    _generating_dataset_pid = os.getpid() if generate else None
+    os.environ[DATASET_DIR_ENV_VAR] = path
+
+
+def get_dataset_path(seed: bytes) -> str:
+    return os.path.join(dataset_dir, 'full-R{0}-{1}'.format(REVISION, encode_hex(seed)[2:18]))
+
+
+def make_dataset_file(block_number: int, path: str, progress: Any = None) -> None:
+    """
+    Generate the full dataset of the epoch of the given block, and write it to the
+    given path, or wait for the process which is generating it already.  The number
+    of items written so far is stored in the ``progress`` shared value, if given.
+    """
+    def iter_items() -> Iterable[bytes]:
+        cache = get_cache(block_number)
+        items = ethash.iter_dataset_items(cache, ethash.get_full_size(block_number))
+        for index, item in enumerate(items):
+            if progress is not None and index % DATASET_PROGRESS_INTERVAL == 0:
+                progress.value = index
+            yield item
+
+    _generate_file(path, iter_items)
+
+
+def generate_dataset(block_number: int) -> None:
+    """
+    Generate the dataset file of the epoch of the given block in a background process,
+    unless it exists already.
+    """
+    seed = get_cache_seed(block_number)
+    if seed in _dataset_generations or os.path.exists(get_dataset_path(seed)):
+        return
+    progress = _cache_generation_context.Value('Q', 0)
+    generation = _cache_generation_context.Process(
+        target=make_dataset_file,
+        args=(block_number, get_dataset_path(seed), progress),
+        daemon=True,
+    )
+    generation.start()
+    _dataset_generations[seed] = (generation, progress)
+
+
+def get_dataset_progress(block_number: int) -> float:
+    """
+    Return the fraction of the dataset of the epoch of the given block which is
+    generated, in the full dataset mode.
+    """
+    seed = get_cache_seed(block_number)
+    if dataset_dir is not None and os.path.exists(get_dataset_path(seed)):
+        return 1.0
+    elif seed in _dataset_generations:
+        _, progress = _dataset_generations[seed]
+        return progress.value * HASH_BYTES / ethash.get_full_size(block_number)
+    else:
+        return 0.0
+
+
+def _log_dataset_progress(block_number: int) -> None:
+    global _last_dataset_progress_log
+    now = time.monotonic()
+    if now - _last_dataset_progress_log >= DATASET_PROGRESS_LOG_INTERVAL:
+        _last_dataset_progress_log = now
+        logger.info(
+            "Generating the ethash dataset of epoch %d: %.1f%%, hashing from the cache until done",
+            block_number // EPOCH_LENGTH,
+            get_dataset_progress(block_number) * 100,
+        )
+
+
+def _load_dataset_file(block_number: int, seed: bytes) -> Optional[mmap.mmap]:
+    generation = _dataset_generations.pop(seed, None)
+    if generation is not None:
+        generation[0].join()
+    with open(get_dataset_path(seed), 'rb') as dataset_file:
+        dataset = mmap.mmap(dataset_file.fileno(), 0, access=mmap.ACCESS_READ)
+    # Make sure that the dataset gives the same hashes as the cache before using it.
+    expected = hashimoto_light(block_number, get_cache(block_number), seed, 0)
+    if ethash.hashimoto_full(dataset, seed, 0) == expected:
+        return dataset
+    else:
+        logger.warning("Invalid ethash dataset %s, hashing from the cache", dataset_file.name)
+        dataset.close()
+        _invalid_dataset_seeds.add(seed)
+        return None
+
+
+def get_dataset(block_number: int) -> Optional[mmap.mmap]:
+    """
+    Return the full dataset of the epoch of the given block, or None if it isn't
+    available (yet).  With ``generate`` set in :func:`set_dataset_dir`, start
+    generating it when it's missing.
+    """
+    seed = get_cache_seed(block_number)
+    if seed in dataset_by_seed:
+        dataset = dataset_by_seed.pop(seed)  # pop and append at end
+        dataset_by_seed[seed] = dataset
+        return dataset
+    elif dataset_dir is None or seed in _invalid_dataset_seeds:
+        return None
+    elif not os.path.exists(get_dataset_path(seed)):
+        if _generating_dataset_pid == os.getpid():
+            generate_dataset(block_number)
+            _log_dataset_progress(block_number)
+        return None
+
+    dataset = _load_dataset_file(block_number, seed)
+    if dataset is not None:
+        dataset_by_seed[seed] = dataset
+        if len(dataset_by_seed) > DATASET_MAX_ITEMS:
+            dataset_by_seed.popitem(last=False)[1].close()  # remove last recently accessed
+    return dataset
+
+
+def hashimoto(block_number: int, mining_hash: Hash32, nonce: int) -> Dict[bytes, bytes]:
+    """
+    Compute the ethash of the given mining hash and nonce with the full dataset of the
+    block's epoch, in the full dataset mode once it is available, or from its cache.
+    """
+    dataset = get_dataset(block_number)
+    if dataset is None:
+        return hashimoto_light(block_number, get_cache(block_number), mining_hash, nonce)
+    else:
+        return ethash.hashimoto_full(dataset, mining_hash, nonce)
+
+
 def check_pow(block_number: int,
               mining_hash: Hash32,
               mix_hash: Hash32,
@@ -60,9 +387,7 @@ def check_pow(block_number: int,
     validate_length(mix_hash, 32, title="Mix Hash")
     validate_length(mining_hash, 32, title="Mining Hash")
     validate_length(nonce, 8, title="POW Nonce")
-    cache = get_cache(block_number)
-    mining_output = hashimoto_light(
-        block_number, cache, mining_hash, big_endian_to_int(nonce))
+    mining_output = hashimoto(block_number, mining_hash, big_endian_to_int(nonce))
     if mining_output[b'mix digest'] != mix_hash:
         raise ValidationError("mix hash mismatch; {0} != {1}".format(
             encode_hex(mining_output[b'mix digest']), encode_hex(mix_hash)))
@@ -70,13 +395,129 @@ def check_pow(block_number: int,
     validate_lte(result, 2**256 // difficulty, title="POW Difficulty")
 
 
+# Number of headers checked by each task given to the executor by check_pow_of_headers.
+POW_CHECK_BATCH_SIZE = 16
+
+
+def _start_generations(headers: Iterable[BlockHeader]) -> None:
+    """
+    Start generating the files needed to check the given headers, in the process which
+    owns the generations, before their checks are given to the worker processes of an
+    executor.  The workers then load the files, or wait for them, instead of each
+    generating them at the boundary of an epoch.
+    """
+    epochs = sorted(set(header.block_number // EPOCH_LENGTH for header in headers))
+    for epoch in epochs:
+        block_number = epoch * EPOCH_LENGTH
+        if cache_dir is not None and _pregenerating_pid == os.getpid():
+            pregenerate_cache(block_number)
+            pregenerate_cache(block_number + EPOCH_LENGTH)
+        if dataset_dir is not None and _generating_dataset_pid == os.getpid():
+            if not os.path.exists(get_dataset_path(get_cache_seed(block_number))):
+                generate_dataset(block_number)
+                _log_dataset_progress(block_number)
+
+
+def _check_pow_of_headers(headers: Iterable[BlockHeader]) -> None:
+    for header in headers:
+        try:
+            check_pow(
+                header.block_number,
+                header.mining_hash,
+                header.mix_hash,
+                header.nonce,
+                header.difficulty,
+            )
+        except ValidationError as err:
+            raise ValidationError("Invalid seal on header #{0} ({1}): {2}".format(
+                header.block_number, encode_hex(header.hash), err))
+
+
+def check_pow_of_headers(headers: Sequence[BlockHeader], executor: Executor = None) -> None:
+    """
+    Check the proof of work of the given headers, raising the ValidationError of
+    the first one, in the given order, whose seal is invalid.
+
+    If an executor is given, the headers are checked by batches of
+    ``POW_CHECK_BATCH_SIZE`` submitted to it, so a ``ProcessPoolExecutor`` checks
+    them on several cores.  Each worker process keeps its own epoch caches between
+    batches, and loads them from the files which this process starts generating.
+    """
+    if executor is None:
+        _check_pow_of_headers(headers)
+    else:
+        _start_generations(headers)
+        # The results are in the order of the batches, so the first error raised is
+        # the one of the first invalid header.
+        for _ in executor.map(_check_pow_of_headers, partition_all(POW_CHECK_BATCH_SIZE, headers)):
+            pass
+
+
+class SealCheckPolicy(collections.namedtuple('SealCheckPolicy', ['sample_ratio', 'checkpoint'])):
+    """
+    Which headers of a batch get their seal checked: none of the ones up to the
+    trusted ``checkpoint`` block number, and a random ``sample_ratio`` of the
+    others, always including the last one.
+    """
+    def __new__(cls, sample_ratio: float = 1.0, checkpoint: int = 0) -> 'SealCheckPolicy':
+        if not 0 <= sample_ratio <= 1:
+            raise ValueError("The sample ratio must be between 0 and 1, got {0}".format(
+                sample_ratio))
+        return super().__new__(cls, sample_ratio, checkpoint)
+
+    def __str__(self) -> str:
+        if self.sample_ratio == 1:
+            checks = 'full'
+        else:
+            checks = '{0:g}% sampled'.format(self.sample_ratio * 100)
+        if self.checkpoint:
+            return '{0}, none up to #{1}'.format(checks, self.checkpoint)
+        else:
+            return checks
+
+    def select_headers(self, headers: Sequence[BlockHeader]) -> Tuple[BlockHeader, ...]:
+        """
+        Return the headers whose seal must be checked, in their original order.
+        """
+        candidates = tuple(header for header in headers if header.block_number > self.checkpoint)
+        if self.sample_ratio == 1 or len(candidates) <= 1:
+            return candidates
+        sample_size = max(math.ceil(len(candidates) * self.sample_ratio), 1)
+        sampled_indices = random.sample(range(len(candidates) - 1), sample_size - 1)
+        return tuple(
+            candidates[index]
+            for index
+            in sorted(sampled_indices) + [len(candidates) - 1]
+        )
+
+
+FULL_SEAL_CHECKS = SealCheckPolicy()
+
+
+async def coro_check_pow_of_headers(headers: Sequence[BlockHeader], executor: Executor) -> None:
+    """
+    Like :func:`check_pow_of_headers` with an executor, without blocking the event loop.
+    """
+    _start_generations(headers)
+    loop = asyncio.get_event_loop()
+    results = await asyncio.gather(
+        *(
+            loop.run_in_executor(executor, _check_pow_of_headers, batch)
+            for batch in partition_all(POW_CHECK_BATCH_SIZE, headers)
+        ),
+        return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+
+
 MAX_TEST_MINE_ATTEMPTS = 1000
 
 
 def mine_pow_nonce(block_number: int, mining_hash: Hash32, difficulty: int) -> Tuple[bytes, bytes]:
-    cache = get_cache(block_number)
     for nonce in range(MAX_TEST_MINE_ATTEMPTS):
-        mining_output = hashimoto_light(block_number, cache, mining_hash, nonce)
+        mining_output = hashimoto(block_number, mining_hash, nonce)
         result = big_endian_to_int(mining_output[b'result'])
         result_cap = 2**256 // difficulty
         if result <= result_cap:
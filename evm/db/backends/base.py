@@ -5,6 +5,10 @@ from abc import (
 from collections.abc import (
     MutableMapping,
 )
+from typing import (
+    Iterator,
+    Tuple,
+)
 
 
 class BaseDB(MutableMapping, metaclass=ABCMeta):
@@ -21,6 +25,8 @@ class BaseDB(MutableMapping, metaclass=ABCMeta):
 
     Subclasses may optionally implement an _exists method
     that is type-checked for key and value.
+
+    Subclasses whose keys are stored in order may implement :meth:`iterate`.
     """
 
     @abstractmethod
@@ -52,3 +58,29 @@ class BaseDB(MutableMapping, metaclass=ABCMeta):
 
     def __len__(self):
         raise NotImplementedError("By default, DB classes cannot return the total number of keys.")
+
+    def iterate(self,
+                start: bytes = None,
+                stop: bytes = None,
+                prefix: bytes = None,
+                reverse: bool = False) -> Iterator[Tuple[bytes, bytes]]:
+        """
+        Iterates over the ``(key, value)`` pairs with ``start <= key < stop`` whose
+        keys begin with ``prefix``, in ascending byte order of the keys (descending
+        if ``reverse`` is set).  Any of the bounds may be omitted.
+
+        Implementations stream the pairs from the underlying storage, so that
+        iterating over a large database only needs a bounded amount of memory.
+        """
+        raise NotImplementedError("By default, DB classes cannot be iterated over a key range.")
+
+    def iterate_keys(self,
+                     start: bytes = None,
+                     stop: bytes = None,
+                     prefix: bytes = None,
+                     reverse: bool = False) -> Iterator[bytes]:
+        """
+        Like :meth:`iterate`, but only yields the keys.
+        """
+        for key, _ in self.iterate(start, stop, prefix, reverse):
+            yield key
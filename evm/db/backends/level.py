@@ -1,4 +1,12 @@
 from pathlib import Path
+from typing import (
+    Iterator,
+    Tuple,
+)
+
+from evm.db.iteration import (
+    get_key_range,
+)
 
 from .base import (
     BaseDB,
@@ -33,3 +41,29 @@ class LevelDB(BaseDB):
 
     def __delitem__(self, key: bytes) -> None:
         self.db.delete(key)
+
+    def iterate(self,
+                start: bytes = None,
+                stop: bytes = None,
+                prefix: bytes = None,
+                reverse: bool = False) -> Iterator[Tuple[bytes, bytes]]:
+        # plyvel does not allow combining a prefix with start/stop bounds, so
+        # the prefix is turned into bounds instead.
+        start, stop = get_key_range(start, stop, prefix)
+        # LevelDB iterators read from an implicit snapshot, so writes made while
+        # iterating are not visible.
+        with self.db.iterator(start=start, stop=stop, reverse=reverse) as iterator:
+            yield from iterator
+
+    def iterate_keys(self,
+                     start: bytes = None,
+                     stop: bytes = None,
+                     prefix: bytes = None,
+                     reverse: bool = False) -> Iterator[bytes]:
+        start, stop = get_key_range(start, stop, prefix)
+        with self.db.iterator(
+                start=start,
+                stop=stop,
+                reverse=reverse,
+                include_value=False) as iterator:
+            yield from iterator
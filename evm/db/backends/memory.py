@@ -1,5 +1,12 @@
 from typing import (
-    Dict
+    Dict,
+    Iterator,
+    Tuple,
+)
+
+from evm.db.iteration import (
+    get_key_range,
+    is_in_key_range,
 )
 
 from .base import (
@@ -27,3 +34,18 @@ class MemoryDB(BaseDB):
 
     def __delitem__(self, key: bytes) -> None:
         del self.kv_store[key]
+
+    def iterate(self,
+                start: bytes = None,
+                stop: bytes = None,
+                prefix: bytes = None,
+                reverse: bool = False) -> Iterator[Tuple[bytes, bytes]]:
+        start, stop = get_key_range(start, stop, prefix)
+        # Sort a snapshot of the keys, so the store can be modified while iterating.
+        keys = sorted(
+            (key for key in self.kv_store if is_in_key_range(key, start, stop)),
+            reverse=reverse,
+        )
+        for key in keys:
+            if key in self.kv_store:
+                yield key, self.kv_store[key]
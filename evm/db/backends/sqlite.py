@@ -0,0 +1,171 @@
+import contextlib
+from pathlib import Path
+import sqlite3
+import threading
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    Tuple,
+)
+
+from cytoolz import (
+    partition_all,
+)
+
+from evm.db.iteration import (
+    get_key_range,
+)
+
+from .base import (
+    BaseDB,
+)
+
+
+# Stays below the default SQLITE_MAX_VARIABLE_NUMBER of older SQLite releases.
+MULTI_GET_BATCH_SIZE = 500
+
+# The number of rows read at once by `SQLiteDB.iterate`.
+ITERATE_PAGE_SIZE = 1000
+
+CREATE_TABLE = 'CREATE TABLE IF NOT EXISTS kv (key BLOB PRIMARY KEY, value BLOB NOT NULL) WITHOUT ROWID'  # noqa: E501
+SELECT_VALUE = 'SELECT value FROM kv WHERE key = ?'
+SELECT_EXISTS = 'SELECT 1 FROM kv WHERE key = ?'
+UPSERT_VALUE = 'INSERT OR REPLACE INTO kv (key, value) VALUES (?, ?)'
+DELETE_KEY = 'DELETE FROM kv WHERE key = ?'
+
+
+class SQLiteDB(BaseDB):
+    """
+    A database stored in a single SQLite file, using only the standard library.
+
+    The database is opened in WAL mode, so any number of processes can read from
+    it while one process writes to it, which is not possible with the
+    single-process lock of :class:`~evm.db.backends.level.LevelDB`.
+
+    Every write outside of :meth:`write_batch` is committed on its own.  The SQL
+    statements are constant, so they are prepared once and then reused from the
+    statement cache of the connection.
+    """
+    def __init__(self, db_path: Path = None, timeout: float = 30.0) -> None:
+        if not db_path:
+            raise TypeError("Please specifiy a valid path for your database.")
+        self.db_path = db_path
+        self.timeout = timeout
+        # Transactions are managed explicitly, see `write_batch`.
+        self._connection = sqlite3.connect(
+            str(db_path),
+            timeout=timeout,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        # In WAL mode this is still safe against corruption, but only syncs on checkpoints.
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.execute(CREATE_TABLE)
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+
+    def __reduce__(self):
+        # Any number of processes can read the database, so it is reopened when unpickled.
+        return (self.__class__, (self.db_path, self.timeout))
+
+    def __getitem__(self, key: bytes) -> bytes:
+        with self._lock:
+            row = self._connection.execute(SELECT_VALUE, (key,)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return row[0]
+
+    def __setitem__(self, key: bytes, value: bytes) -> None:
+        with self._lock:
+            self._connection.execute(UPSERT_VALUE, (key, value))
+
+    def _exists(self, key: bytes) -> bool:
+        with self._lock:
+            return self._connection.execute(SELECT_EXISTS, (key,)).fetchone() is not None
+
+    def __delitem__(self, key: bytes) -> None:
+        with self._lock:
+            cursor = self._connection.execute(DELETE_KEY, (key,))
+        if cursor.rowcount == 0:
+            raise KeyError(key)
+
+    def multi_get(self, keys: Iterable[bytes]) -> Dict[bytes, bytes]:
+        """
+        Looks up many keys with a few queries, returning a mapping of the keys
+        which are present to their values.
+        """
+        values = {}  # type: Dict[bytes, bytes]
+        with self._lock:
+            for batch in partition_all(MULTI_GET_BATCH_SIZE, keys):
+                query = 'SELECT key, value FROM kv WHERE key IN ({0})'.format(
+                    ', '.join('?' * len(batch))
+                )
+                values.update(self._connection.execute(query, batch))
+        return values
+
+    @contextlib.contextmanager
+    def write_batch(self) -> Iterator['SQLiteDB']:
+        """
+        Groups all writes made inside the context into a single transaction,
+        which is rolled back if an exception is raised.  Batches may be nested,
+        in which case only the outermost one commits.
+        """
+        with self._lock:
+            if self._batch_depth == 0:
+                self._connection.execute('BEGIN IMMEDIATE')
+            self._batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._connection.execute('ROLLBACK')
+                raise
+            else:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._connection.execute('COMMIT')
+
+    def iterate(self,
+                start: bytes = None,
+                stop: bytes = None,
+                prefix: bytes = None,
+                reverse: bool = False) -> Iterator[Tuple[bytes, bytes]]:
+        start, stop = get_key_range(start, stop, prefix)
+
+        # The rows are read in pages, each with its own query made while holding the
+        # lock, so that no cursor is left open on the connection shared with other
+        # threads while the rows are consumed.
+        while True:
+            conditions = []
+            params = []
+            if start is not None:
+                conditions.append('key >= ?')
+                params.append(start)
+            if stop is not None:
+                conditions.append('key < ?')
+                params.append(stop)
+
+            query = 'SELECT key, value FROM kv{0} ORDER BY key {1} LIMIT {2}'.format(
+                ' WHERE ' + ' AND '.join(conditions) if conditions else '',
+                'DESC' if reverse else 'ASC',
+                ITERATE_PAGE_SIZE,
+            )
+            with self._lock:
+                rows = self._connection.execute(query, params).fetchall()
+
+            yield from rows
+            if len(rows) < ITERATE_PAGE_SIZE:
+                break
+
+            last_key = rows[-1][0]
+            if reverse:
+                stop = last_key
+            else:
+                # The smallest key greater than the last one.
+                start = last_key + b'\x00'
+
+    def close(self) -> None:
+        self._connection.close()
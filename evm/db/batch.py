@@ -1,5 +1,5 @@
 import logging
-from typing import Type, Dict  # noqa: F401
+from typing import Iterator, Type, Dict, Tuple  # noqa: F401
 
 from evm.db.diff import (
     DBDiff,
@@ -7,6 +7,10 @@ from evm.db.diff import (
     DiffMissingError,
 )
 from evm.db.backends.base import BaseDB
+from evm.db.iteration import (
+    get_key_range,
+    overlay_changes,
+)
 
 
 class BatchDB(BaseDB):
@@ -72,5 +76,25 @@ class BatchDB(BaseDB):
             raise KeyError(key)
         del self._track_diff[key]
 
+    def iterate(self,
+                start: bytes = None,
+                stop: bytes = None,
+                prefix: bytes = None,
+                reverse: bool = False) -> Iterator[Tuple[bytes, bytes]]:
+        """
+        Iterates over the wrapped database with the uncommitted changes applied on top.
+        """
+        start, stop = get_key_range(start, stop, prefix)
+        diff = self.diff()
+        changes = dict(diff.pending_items())
+        changes.update((key, None) for key in diff.deleted_keys())
+        return overlay_changes(
+            self.wrapped_db.iterate(start, stop, reverse=reverse),
+            changes,
+            start,
+            stop,
+            reverse,
+        )
+
     def diff(self) -> DBDiff:
         return self._track_diff.diff()
@@ -0,0 +1,54 @@
+"""
+Helpers for the bloom bits index of the canonical chain.
+
+The header blooms are transposed into one bit vector per bloom bit and section
+of :data:`BLOOM_BITS_SECTION_SIZE` blocks: bit ``n`` of the vector for bloom bit
+``b`` of section ``s`` is set if the bloom of block ``s * BLOOM_BITS_SECTION_SIZE + n``
+has bit ``b`` set.  The vectors are handled as python integers, so that whole
+sections can be matched against a filter with a few bitwise operations.
+"""
+from typing import (
+    Iterable,
+    Tuple,
+)
+
+from eth_hash.auto import keccak
+
+
+BLOOM_BITS_SECTION_SIZE = 4096
+
+BLOOM_BITS = 2048
+
+
+def get_bloom_bit_indices(value: bytes) -> Tuple[int, int, int]:
+    """
+    Returns the three bloom bits which are set when adding ``value`` to a bloom.
+    """
+    value_hash = keccak(value)
+    return tuple(  # type: ignore
+        ((value_hash[offset] << 8) | value_hash[offset + 1]) % BLOOM_BITS
+        for offset in (0, 2, 4)
+    )
+
+
+def get_set_bits(value: int) -> Iterable[int]:
+    """
+    Yields the positions of the bits set in ``value``, lowest first.
+    """
+    while value:
+        lowest_bit = value & -value
+        yield lowest_bit.bit_length() - 1
+        value ^= lowest_bit
+
+
+def get_section_range_mask(section: int, from_block: int, to_block: int) -> int:
+    """
+    Returns the bit vector selecting the blocks of ``section`` which are between
+    ``from_block`` and ``to_block``, inclusive.
+    """
+    section_start = section * BLOOM_BITS_SECTION_SIZE
+    first_position = max(from_block - section_start, 0)
+    last_position = min(to_block - section_start, BLOOM_BITS_SECTION_SIZE - 1)
+    if first_position > last_position:
+        return 0
+    return ((1 << (last_position + 1)) - 1) ^ ((1 << first_position) - 1)
@@ -10,6 +10,7 @@ from typing import (
     Dict,
     Iterable,
     List,
+    Sequence,
     Tuple,
     Type,
     TYPE_CHECKING,
@@ -17,6 +18,10 @@ from typing import (
 
 import rlp
 
+from cytoolz import (
+    first,
+)
+
 from trie import (
     HexaryTrie,
 )
@@ -27,6 +32,8 @@ from eth_typing import (
 )
 
 from eth_utils import (
+    big_endian_to_int,
+    int_to_big_endian,
     to_list,
     to_tuple,
 )
@@ -34,6 +41,7 @@ from eth_utils import (
 from eth_hash.auto import keccak
 
 from evm.constants import (
+    BLANK_ROOT_HASH,
     GENESIS_PARENT_HASH,
 )
 from evm.exceptions import (
@@ -41,11 +49,22 @@ from evm.exceptions import (
     HeaderNotFound,
     ParentNotFound,
     TransactionNotFound,
+    ValidationError,
 )
 from evm.db.backends.base import (
     BaseDB
 )
-from evm.db.schema import SchemaV1
+from evm.db.batch import BatchDB
+from evm.db.bloombits import (
+    BLOOM_BITS_SECTION_SIZE,
+    get_bloom_bit_indices,
+    get_section_range_mask,
+    get_set_bits,
+)
+from evm.db.schema import (  # noqa: F401
+    BaseSchema,
+    get_schema,
+)
 from evm.rlp.headers import (
     BlockHeader,
 )
@@ -69,6 +88,11 @@ if TYPE_CHECKING:
     )
 
 
+# Block transactions and receipts are stored as a list of their individual encodings, which
+# allows hashing a transaction without re-encoding it.
+ENCODED_ITEM_LIST = rlp.sedes.CountableList(rlp.sedes.binary)
+
+
 class TransactionKey(rlp.Serializable):
     fields = [
         ('block_number', rlp.sedes.big_endian_int),
@@ -121,11 +145,17 @@ class BaseChainDB(metaclass=ABCMeta):
     def persist_header(self, header: BlockHeader) -> Tuple[BlockHeader, ...]:
         raise NotImplementedError("ChainDB classes must implement this method")
 
+    @abstractmethod
+    def persist_header_chain(self, headers: Iterable[BlockHeader]) -> Tuple[BlockHeader, ...]:
+        raise NotImplementedError("ChainDB classes must implement this method")
+
     #
     # Block API
     #
     @abstractmethod
-    def persist_block(self, block: 'BaseBlock') -> None:
+    def persist_block(self,
+                      block: 'BaseBlock',
+                      receipts: Iterable[Receipt] = None) -> None:
         raise NotImplementedError("ChainDB classes must implement this method")
 
     @abstractmethod
@@ -176,6 +206,28 @@ class BaseChainDB(metaclass=ABCMeta):
     def get_transaction_index(self, transaction_hash: Hash32) -> Tuple[BlockNumber, int]:
         raise NotImplementedError("ChainDB classes must implement this method")
 
+    @abstractmethod
+    def persist_block_transactions(self,
+                                   transaction_root: Hash32,
+                                   transactions: Iterable['BaseTransaction']) -> None:
+        raise NotImplementedError("ChainDB classes must implement this method")
+
+    @abstractmethod
+    def persist_block_receipts(self,
+                               receipt_root: Hash32,
+                               receipts: Iterable[Receipt]) -> None:
+        raise NotImplementedError("ChainDB classes must implement this method")
+
+    #
+    # Log Index API
+    #
+    @abstractmethod
+    def get_log_candidate_block_numbers(self,
+                                        criteria: Sequence[Sequence[bytes]],
+                                        from_block: BlockNumber,
+                                        to_block: BlockNumber) -> Iterable[BlockNumber]:
+        raise NotImplementedError("ChainDB classes must implement this method")
+
     #
     # Raw Database API
     #
@@ -189,8 +241,11 @@ class BaseChainDB(metaclass=ABCMeta):
 
 
 class ChainDB(BaseChainDB):
+    schema = None  # type: Type[BaseSchema]
+
     def __init__(self, db: BaseDB) -> None:
         self.db = db
+        self.schema = get_schema(db)
 
     #
     # Canonical Chain API
@@ -199,11 +254,14 @@ class ChainDB(BaseChainDB):
         """
         Return the block hash for the given block number.
         """
+        return self._get_canonical_block_hash(self.db, block_number)
+
+    def _get_canonical_block_hash(self, db: BaseDB, block_number: BlockNumber) -> Hash32:
         validate_uint256(block_number, title="Block Number")
-        number_to_hash_key = SchemaV1.make_block_number_to_hash_lookup_key(block_number)
+        number_to_hash_key = self.schema.make_block_number_to_hash_lookup_key(block_number)
         try:
             return rlp.decode(
-                self.db[number_to_hash_key],
+                db[number_to_hash_key],
                 sedes=rlp.sedes.binary,
             )
         except KeyError:
@@ -218,8 +276,15 @@ class ChainDB(BaseChainDB):
         Raises HeaderNotFound if there's no block header with the given number in the
         canonical chain.
         """
+        return self._get_canonical_block_header_by_number(self.db, block_number)
+
+    def _get_canonical_block_header_by_number(
+            self,
+            db: BaseDB,
+            block_number: BlockNumber) -> BlockHeader:
         validate_uint256(block_number, title="Block Number")
-        return self.get_block_header_by_hash(self.get_canonical_block_hash(block_number))
+        canonical_block_hash = self._get_canonical_block_hash(db, block_number)
+        return self._get_block_header_by_hash(db, canonical_block_hash)
 
     def get_canonical_head(self) -> BlockHeader:
         """
@@ -227,11 +292,15 @@ class ChainDB(BaseChainDB):
 
         Raises CanonicalHeadNotFound if no canonical head has been set.
         """
+        return self._get_canonical_head(self.db)
+
+    def _get_canonical_head(self, db: BaseDB) -> BlockHeader:
         try:
-            canonical_head_hash = self.db[SchemaV1.make_canonical_head_hash_lookup_key()]
+            canonical_head_hash = db[self.schema.make_canonical_head_hash_lookup_key()]
         except KeyError:
             raise CanonicalHeadNotFound("No canonical head set for this chain")
-        return self.get_block_header_by_hash(
+        return self._get_block_header_by_hash(
+            db,
             cast(Hash32, canonical_head_hash),
         )
 
@@ -250,9 +319,13 @@ class ChainDB(BaseChainDB):
 
         Raises HeaderNotFound if it is not present in the db.
         """
+        return self._get_block_header_by_hash(self.db, block_hash)
+
+    @staticmethod
+    def _get_block_header_by_hash(db: BaseDB, block_hash: Hash32) -> BlockHeader:
         validate_word(block_hash, title="Block Hash")
         try:
-            header_rlp = self.db[block_hash]
+            header_rlp = db[block_hash]
         except KeyError:
             raise HeaderNotFound(
                 "No header with hash {0} found".format(encode_hex(block_hash))
@@ -279,8 +352,11 @@ class ChainDB(BaseChainDB):
 
         Raises HeaderNotFound if no header with the given has is found in the database.
         """
+        return self._get_score(self.db, block_hash)
+
+    def _get_score(self, db: BaseDB, block_hash: Hash32) -> int:
         try:
-            encoded_score = self.db[SchemaV1.make_block_hash_to_score_lookup_key(block_hash)]
+            encoded_score = db[self.schema.make_block_hash_to_score_lookup_key(block_hash)]
         except KeyError:
             raise HeaderNotFound(
                 "No header with hash {0} found".format(encode_hex(block_hash))
@@ -291,81 +367,130 @@ class ChainDB(BaseChainDB):
                 sedes=rlp.sedes.big_endian_int,
             )
 
-    # TODO: This method should take a chain of headers as that's the most common use case
-    # and it'd be much faster than inserting each header individually.
     def persist_header(self, header: BlockHeader) -> Tuple[BlockHeader, ...]:
         """
         Returns iterable of headers newly on the canonical chain
         """
-        is_genesis = header.parent_hash == GENESIS_PARENT_HASH
-        if not is_genesis and not self.header_exists(header.parent_hash):
+        return self.persist_header_chain((header,))
+
+    def persist_header_chain(self, headers: Iterable[BlockHeader]) -> Tuple[BlockHeader, ...]:
+        """
+        Persist a contiguous chain of headers, where each header is the parent
+        of the next one, in a single write batch.
+
+        The parent of the first header must already be present in the database
+        (unless it is a genesis header). Scores are computed incrementally and
+        the canonical head is updated at most once.
+
+        Returns iterable of headers newly on the canonical chain
+        """
+        with BatchDB(self.db) as db:
+            return self._persist_header_chain(db, headers)
+
+    def _persist_header_chain(
+            self,
+            db: BaseDB,
+            headers: Iterable[BlockHeader]) -> Tuple[BlockHeader, ...]:
+        headers_iterator = iter(headers)
+
+        try:
+            first_header = first(headers_iterator)
+        except StopIteration:
+            return tuple()
+
+        is_genesis = first_header.parent_hash == GENESIS_PARENT_HASH
+        if not is_genesis and not db.exists(first_header.parent_hash):
             raise ParentNotFound(
                 "Cannot persist block header ({}) with unknown parent ({})".format(
-                    encode_hex(header.hash), encode_hex(header.parent_hash)))
-
-        self.db.set(
-            header.hash,
-            rlp.encode(header),
-        )
+                    encode_hex(first_header.hash), encode_hex(first_header.parent_hash)))
 
         if is_genesis:
-            score = header.difficulty
+            score = 0
         else:
-            score = self.get_score(header.parent_hash) + header.difficulty
-
-        self.db.set(
-            SchemaV1.make_block_hash_to_score_lookup_key(header.hash),
-            rlp.encode(score, sedes=rlp.sedes.big_endian_int),
-        )
+            score = self._get_score(db, first_header.parent_hash)
+
+        curr_chain_head = first_header
+        score = self._persist_header_and_score(db, curr_chain_head, score)
+
+        for child in headers_iterator:
+            if child.parent_hash != curr_chain_head.hash:
+                raise ValidationError(
+                    "Non-contiguous chain. Expected {} to have {} as parent but was {}".format(
+                        encode_hex(child.hash),
+                        encode_hex(curr_chain_head.hash),
+                        encode_hex(child.parent_hash),
+                    )
+                )
+            curr_chain_head = child
+            score = self._persist_header_and_score(db, curr_chain_head, score)
 
         try:
-            head_score = self.get_score(self.get_canonical_head().hash)
+            head_score = self._get_score(db, self._get_canonical_head(db).hash)
         except CanonicalHeadNotFound:
-            new_headers = self._set_as_canonical_chain_head(header)
+            return self._set_as_canonical_chain_head(db, curr_chain_head)
+
+        if score > head_score:
+            return self._set_as_canonical_chain_head(db, curr_chain_head)
         else:
-            if score > head_score:
-                new_headers = self._set_as_canonical_chain_head(header)
-            else:
-                new_headers = tuple()
+            return tuple()
 
-        return new_headers
+    def _persist_header_and_score(self, db: BaseDB, header: BlockHeader, parent_score: int) -> int:
+        """
+        Writes the header and its score, returning the score.
+        """
+        score = parent_score + header.difficulty
+        db.set(
+            header.hash,
+            rlp.encode(header),
+        )
+        db.set(
+            self.schema.make_block_hash_to_score_lookup_key(header.hash),
+            rlp.encode(score, sedes=rlp.sedes.big_endian_int),
+        )
+        return score
 
     # TODO: update this to take a `hash` rather than a full header object.
-    def _set_as_canonical_chain_head(self, header: BlockHeader) -> Tuple[BlockHeader, ...]:
+    def _set_as_canonical_chain_head(self,
+                                     db: BaseDB,
+                                     header: BlockHeader) -> Tuple[BlockHeader, ...]:
         """
         Returns iterable of headers newly on the canonical head
         """
         try:
-            self.get_block_header_by_hash(header.hash)
+            self._get_block_header_by_hash(db, header.hash)
         except HeaderNotFound:
             raise ValueError("Cannot use unknown block hash as canonical head: {}".format(
                 header.hash))
 
-        new_canonical_headers = tuple(reversed(self._find_new_ancestors(header)))
+        new_canonical_headers = tuple(reversed(self._find_new_ancestors(db, header)))
+        old_canonical_headers = []
 
         # remove transaction lookups for blocks that are no longer canonical
         for h in new_canonical_headers:
             try:
-                old_hash = self.get_canonical_block_hash(h.block_number)
+                old_hash = self._get_canonical_block_hash(db, h.block_number)
             except HeaderNotFound:
                 # no old block, and no more possible
                 break
             else:
-                old_header = self.get_block_header_by_hash(old_hash)
-                for transaction_hash in self.get_block_transaction_hashes(old_header):
-                    self._remove_transaction_from_canonical_chain(transaction_hash)
+                old_header = self._get_block_header_by_hash(db, old_hash)
+                for transaction_hash in self._get_block_transaction_hashes(db, old_header):
+                    self._remove_transaction_from_canonical_chain(db, transaction_hash)
                     # TODO re-add txn to internal pending pool (only if local sender)
                     pass
+                old_canonical_headers.append(old_header)
 
         for h in new_canonical_headers:
-            self._add_block_number_to_hash_lookup(h)
+            self._add_block_number_to_hash_lookup(db, h)
+
+        self._update_bloom_bits(db, old_canonical_headers, new_canonical_headers)
 
-        self.db.set(SchemaV1.make_canonical_head_hash_lookup_key(), header.hash)
+        db.set(self.schema.make_canonical_head_hash_lookup_key(), header.hash)
 
         return new_canonical_headers
 
     @to_tuple
-    def _find_new_ancestors(self, header: BlockHeader) -> Iterable[BlockHeader]:
+    def _find_new_ancestors(self, db: BaseDB, header: BlockHeader) -> Iterable[BlockHeader]:
         """
         Returns the chain leading up from the given header until (but not including)
         the first ancestor it has in common with our canonical chain.
@@ -380,7 +505,7 @@ class ChainDB(BaseChainDB):
         h = header
         while True:
             try:
-                orig = self.get_canonical_block_header_by_number(h.block_number)
+                orig = self._get_canonical_block_header_by_number(db, h.block_number)
             except HeaderNotFound:
                 # This just means the block is not on the canonical chain.
                 pass
@@ -395,17 +520,17 @@ class ChainDB(BaseChainDB):
             if h.parent_hash == GENESIS_PARENT_HASH:
                 break
             else:
-                h = self.get_block_header_by_hash(h.parent_hash)
+                h = self._get_block_header_by_hash(db, h.parent_hash)
 
-    def _add_block_number_to_hash_lookup(self, header: BlockHeader) -> None:
+    def _add_block_number_to_hash_lookup(self, db: BaseDB, header: BlockHeader) -> None:
         """
         Sets a record in the database to allow looking up this header by its
         block number.
         """
-        block_number_to_hash_key = SchemaV1.make_block_number_to_hash_lookup_key(
+        block_number_to_hash_key = self.schema.make_block_number_to_hash_lookup_key(
             header.block_number
         )
-        self.db.set(
+        db.set(
             block_number_to_hash_key,
             rlp.encode(header.hash, sedes=rlp.sedes.binary),
         )
@@ -413,16 +538,26 @@ class ChainDB(BaseChainDB):
     #
     # Block API
     #
-    def persist_block(self, block: 'BaseBlock') -> None:
+    def persist_block(self,
+                      block: 'BaseBlock',
+                      receipts: Iterable[Receipt] = None) -> None:
         '''
         Persist the given block's header and uncles.
 
-        Assumes all block transactions have been persisted already.
+        Assumes all block transactions have been persisted already.  If the
+        receipts of the block are given, the block was just imported, and the
+        transaction lookups of the block are built from its transactions instead
+        of reading them back from the database.
         '''
         new_canonical_headers = self.persist_header(block.header)
 
         for header in new_canonical_headers:
-            for index, transaction_hash in enumerate(self.get_block_transaction_hashes(header)):
+            if receipts is not None and header == block.header:
+                transaction_hashes = [transaction.hash for transaction in block.transactions]
+            else:
+                transaction_hashes = self.get_block_transaction_hashes(header)
+
+            for index, transaction_hash in enumerate(transaction_hashes):
                 self._add_transaction_to_canonical_chain(transaction_hash, header, index)
 
         if hasattr(block, "uncles"):
@@ -477,13 +612,20 @@ class ChainDB(BaseChainDB):
         """
         return self._get_block_transactions(header.transaction_root, transaction_class)
 
-    @to_list
     def get_block_transaction_hashes(self, block_header: BlockHeader) -> Iterable[Hash32]:
         """
         Returns an iterable of the transaction hashes from th block specified
         by the given block header.
         """
+        return self._get_block_transaction_hashes(self.db, block_header)
+
+    @to_list
+    def _get_block_transaction_hashes(
+            self,
+            db: BaseDB,
+            block_header: BlockHeader) -> Iterable[Hash32]:
         all_encoded_transactions = self._get_block_transaction_data(
+            db,
             block_header.transaction_root,
         )
         for encoded_transaction in all_encoded_transactions:
@@ -497,14 +639,8 @@ class ChainDB(BaseChainDB):
         Returns an iterable of receipts for the block specified by the given
         block header.
         """
-        receipt_db = HexaryTrie(db=self.db, root_hash=header.receipt_root)
-        for receipt_idx in itertools.count():
-            receipt_key = rlp.encode(receipt_idx)
-            if receipt_key in receipt_db:
-                receipt_data = receipt_db[receipt_key]
-                yield rlp.decode(receipt_data, sedes=receipt_class)
-            else:
-                break
+        for receipt_data in self._get_block_receipt_data(self.db, header.receipt_root):
+            yield rlp.decode(receipt_data, sedes=receipt_class)
 
     def get_transaction_by_index(
             self,
@@ -521,14 +657,24 @@ class ChainDB(BaseChainDB):
             block_header = self.get_canonical_block_header_by_number(block_number)
         except HeaderNotFound:
             raise TransactionNotFound("Block {} is not in the canonical chain".format(block_number))
-        transaction_db = HexaryTrie(self.db, root_hash=block_header.transaction_root)
-        encoded_index = rlp.encode(transaction_index)
-        if encoded_index in transaction_db:
-            encoded_transaction = transaction_db[encoded_index]
-            return rlp.decode(encoded_transaction, sedes=transaction_class)
+        try:
+            encoded_transactions = self._get_encoded_item_list(
+                self.db,
+                self.schema.make_block_transactions_lookup_key(block_header.transaction_root),
+            )
+        except KeyError:
+            transaction_db = HexaryTrie(self.db, root_hash=block_header.transaction_root)
+            encoded_index = rlp.encode(transaction_index)
+            if encoded_index in transaction_db:
+                encoded_transaction = transaction_db[encoded_index]
+                return rlp.decode(encoded_transaction, sedes=transaction_class)
         else:
-            raise TransactionNotFound(
-                "No transaction is at index {} of block {}".format(transaction_index, block_number))
+            if 0 <= transaction_index < len(encoded_transactions):
+                encoded_transaction = encoded_transactions[transaction_index]
+                return rlp.decode(encoded_transaction, sedes=transaction_class)
+
+        raise TransactionNotFound(
+            "No transaction is at index {} of block {}".format(transaction_index, block_number))
 
     def get_transaction_index(self, transaction_hash: Hash32) -> Tuple[BlockNumber, int]:
         """
@@ -539,7 +685,7 @@ class ChainDB(BaseChainDB):
         Raises TransactionNotFound if the transaction_hash is not found in the
         canonical chain.
         """
-        key = SchemaV1.make_transaction_hash_to_block_lookup_key(transaction_hash)
+        key = self.schema.make_transaction_hash_to_block_lookup_key(transaction_hash)
         try:
             encoded_key = self.db[key]
         except KeyError:
@@ -549,15 +695,56 @@ class ChainDB(BaseChainDB):
         transaction_key = rlp.decode(encoded_key, sedes=TransactionKey)
         return (transaction_key.block_number, transaction_key.index)
 
-    def _get_block_transaction_data(self, transaction_root: Hash32) -> Iterable[Hash32]:
+    def _get_block_transaction_data(self,
+                                    db: BaseDB,
+                                    transaction_root: Hash32) -> Iterable[bytes]:
         '''
         Returns iterable of the encoded transactions for the given block header
         '''
-        transaction_db = HexaryTrie(self.db, root_hash=transaction_root)
-        for transaction_idx in itertools.count():
-            transaction_key = rlp.encode(transaction_idx)
-            if transaction_key in transaction_db:
-                yield transaction_db[transaction_key]
+        return self._get_block_item_data(
+            db,
+            transaction_root,
+            self.schema.make_block_transactions_lookup_key(transaction_root),
+        )
+
+    def _get_block_receipt_data(self, db: BaseDB, receipt_root: Hash32) -> Iterable[bytes]:
+        '''
+        Returns iterable of the encoded receipts for the given block header
+        '''
+        return self._get_block_item_data(
+            db,
+            receipt_root,
+            self.schema.make_block_receipts_lookup_key(receipt_root),
+        )
+
+    def _get_block_item_data(self,
+                             db: BaseDB,
+                             trie_root: Hash32,
+                             item_list_key: bytes) -> Iterable[bytes]:
+        """
+        Returns the encoded items of a transaction or receipt trie, reading
+        them from the single value stored under ``item_list_key`` if present
+        and falling back to walking the trie otherwise.
+        """
+        if trie_root == BLANK_ROOT_HASH:
+            return tuple()
+
+        try:
+            return self._get_encoded_item_list(db, item_list_key)
+        except KeyError:
+            return self._get_trie_item_data(db, trie_root)
+
+    @staticmethod
+    def _get_encoded_item_list(db: BaseDB, item_list_key: bytes) -> Tuple[bytes, ...]:
+        return tuple(rlp.decode(db[item_list_key], sedes=ENCODED_ITEM_LIST))
+
+    @staticmethod
+    def _get_trie_item_data(db: BaseDB, trie_root: Hash32) -> Iterable[bytes]:
+        trie = HexaryTrie(db, root_hash=trie_root)
+        for item_idx in itertools.count():
+            item_key = rlp.encode(item_idx)
+            if item_key in trie:
+                yield trie[item_key]
             else:
                 break
 
@@ -570,15 +757,17 @@ class ChainDB(BaseChainDB):
         """
         Memoizable version of `get_block_transactions`
         """
-        for encoded_transaction in self._get_block_transaction_data(transaction_root):
+        for encoded_transaction in self._get_block_transaction_data(self.db, transaction_root):
             yield rlp.decode(encoded_transaction, sedes=transaction_class)
 
-    def _remove_transaction_from_canonical_chain(self, transaction_hash: Hash32) -> None:
+    def _remove_transaction_from_canonical_chain(self,
+                                                 db: BaseDB,
+                                                 transaction_hash: Hash32) -> None:
         """
         Removes the transaction specified by the given hash from the canonical
         chain.
         """
-        self.db.delete(SchemaV1.make_transaction_hash_to_block_lookup_key(transaction_hash))
+        db.delete(self.schema.make_transaction_hash_to_block_lookup_key(transaction_hash))
 
     def _add_transaction_to_canonical_chain(self,
                                             transaction_hash: Hash32,
@@ -593,10 +782,154 @@ class ChainDB(BaseChainDB):
         """
         transaction_key = TransactionKey(block_header.block_number, index)
         self.db.set(
-            SchemaV1.make_transaction_hash_to_block_lookup_key(transaction_hash),
+            self.schema.make_transaction_hash_to_block_lookup_key(transaction_hash),
             rlp.encode(transaction_key),
         )
 
+    def persist_block_transactions(self,
+                                   transaction_root: Hash32,
+                                   transactions: Iterable['BaseTransaction']) -> None:
+        """
+        Stores the given transactions, which must be the full list of transactions
+        of a block with the given ``transaction_root``, as a single database value
+        so they can be retrieved without walking the transaction trie.
+
+        This does not store the trie nodes; see :meth:`persist_trie_data_dict`.
+        """
+        self._persist_encoded_item_list(
+            self.schema.make_block_transactions_lookup_key(transaction_root),
+            transactions,
+        )
+
+    def persist_block_receipts(self,
+                               receipt_root: Hash32,
+                               receipts: Iterable[Receipt]) -> None:
+        """
+        Stores the given receipts, which must be the full list of receipts of a
+        block with the given ``receipt_root``, as a single database value so
+        they can be retrieved without walking the receipt trie.
+
+        This does not store the trie nodes; see :meth:`persist_trie_data_dict`.
+        """
+        self._persist_encoded_item_list(
+            self.schema.make_block_receipts_lookup_key(receipt_root),
+            receipts,
+        )
+
+    def _persist_encoded_item_list(self,
+                                   item_list_key: bytes,
+                                   items: Iterable[rlp.Serializable]) -> None:
+        self.db.set(
+            item_list_key,
+            rlp.encode([rlp.encode(item) for item in items], sedes=ENCODED_ITEM_LIST),
+        )
+
+    #
+    # Log Index API
+    #
+    def get_log_candidate_block_numbers(self,
+                                        criteria: Sequence[Sequence[bytes]],
+                                        from_block: BlockNumber,
+                                        to_block: BlockNumber) -> Iterable[BlockNumber]:
+        """
+        Returns the numbers of the canonical blocks between ``from_block`` and
+        ``to_block`` (inclusive) which may contain logs matching ``criteria``.
+
+        ``criteria`` is a sequence of groups of addresses or topics; a block is a
+        candidate if its bloom may contain at least one value of every group.
+        Empty groups match everything.  As with any bloom filter, some candidates
+        may turn out not to contain a matching log.
+
+        The candidates are found by combining the bloom bits of whole sections of
+        blocks at once, so blocks which can't match are never loaded.
+        """
+        bit_groups = tuple(
+            tuple(get_bloom_bit_indices(value) for value in group)
+            for group in criteria
+            if group
+        )
+        first_section = from_block // BLOOM_BITS_SECTION_SIZE
+        last_section = to_block // BLOOM_BITS_SECTION_SIZE
+
+        for section in range(first_section, last_section + 1):
+            candidates = self._match_bloom_bits_section(
+                bit_groups,
+                section,
+                get_section_range_mask(section, from_block, to_block),
+            )
+            section_start = section * BLOOM_BITS_SECTION_SIZE
+            for position in get_set_bits(candidates):
+                yield BlockNumber(section_start + position)
+
+    def _match_bloom_bits_section(self,
+                                  bit_groups: Sequence[Sequence[Sequence[int]]],
+                                  section: int,
+                                  candidates: int) -> int:
+        # Each vector is only loaded once, and only while there are candidates left.
+        vectors = {}  # type: Dict[int, int]
+
+        def get_vector(bit: int) -> int:
+            if bit not in vectors:
+                vectors[bit] = self._get_bloom_bits(self.db, bit, section)
+            return vectors[bit]
+
+        for bit_group in bit_groups:
+            group_matches = 0
+            for value_bits in bit_group:
+                value_matches = candidates
+                for bit in value_bits:
+                    if not value_matches:
+                        break
+                    value_matches &= get_vector(bit)
+                group_matches |= value_matches
+
+            candidates &= group_matches
+            if not candidates:
+                break
+
+        return candidates
+
+    def _get_bloom_bits(self, db: BaseDB, bit: int, section: int) -> int:
+        try:
+            return big_endian_to_int(db[self.schema.make_bloom_bits_lookup_key(bit, section)])
+        except KeyError:
+            return 0
+
+    def _update_bloom_bits(self,
+                           db: BaseDB,
+                           old_canonical_headers: Iterable[BlockHeader],
+                           new_canonical_headers: Iterable[BlockHeader]) -> None:
+        """
+        Clears the positions of the headers which are no longer canonical, and sets
+        the ones of the new canonical headers, in the bloom bits of every bit set
+        in their blooms.
+
+        The changes are combined first, so that each vector is only read and written
+        once however many of the headers are in its section.
+        """
+        # The positions to clear and to set, by the section and the bit of the vector.
+        changes = {}  # type: Dict[int, Tuple[Dict[int, int], Dict[int, int]]]
+        for change_index, headers in enumerate((old_canonical_headers, new_canonical_headers)):
+            for header in headers:
+                section, position = divmod(header.block_number, BLOOM_BITS_SECTION_SIZE)
+                if section not in changes:
+                    changes[section] = ({}, {})
+                masks = changes[section][change_index]
+                position_mask = 1 << position
+                for bit in get_set_bits(header.bloom):
+                    masks[bit] = masks.get(bit, 0) | position_mask
+
+        for section, (cleared, added) in changes.items():
+            for bit in cleared.keys() | added.keys():
+                vector = self._get_bloom_bits(db, bit, section)
+                vector = vector & ~cleared.get(bit, 0) | added.get(bit, 0)
+
+                key = self.schema.make_bloom_bits_lookup_key(bit, section)
+                if vector:
+                    db.set(key, int_to_big_endian(vector))
+                elif db.exists(key):
+                    db.delete(key)
+
     #
     # Raw Database API
     #
@@ -642,8 +975,23 @@ class AsyncChainDB(ChainDB):
     async def coro_persist_header(self, header: BlockHeader) -> Tuple[BlockHeader, ...]:
         raise NotImplementedError()
 
+    async def coro_persist_header_chain(self,
+                                        headers: Iterable[BlockHeader]) -> Tuple[BlockHeader, ...]:
+        raise NotImplementedError()
+
     async def coro_persist_uncles(self, uncles: Tuple[BlockHeader]) -> Hash32:
         raise NotImplementedError()
 
     async def coro_persist_trie_data_dict(self, trie_data_dict: Dict[bytes, bytes]) -> None:
         raise NotImplementedError()
+
+    async def coro_persist_block_transactions(
+            self,
+            transaction_root: Hash32,
+            transactions: Iterable['BaseTransaction']) -> None:
+        raise NotImplementedError()
+
+    async def coro_persist_block_receipts(self,
+                                          receipt_root: Hash32,
+                                          receipts: Iterable[Receipt]) -> None:
+        raise NotImplementedError()
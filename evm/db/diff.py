@@ -5,6 +5,7 @@ from collections.abc import (
 from typing import (  # noqa: F401
     Dict,
     Iterable,
+    Tuple,
     Union,
 )
 
@@ -118,6 +119,22 @@ class DBDiff(Mapping):
     def __len__(self):
         return len(self._changes)
 
+    def pending_items(self) -> Iterable[Tuple[bytes, bytes]]:
+        """
+        The keys and values which were inserted or updated.
+        """
+        for key, value in self._changes.items():
+            if value is not DELETED:
+                yield key, value
+
+    def deleted_keys(self) -> Iterable[bytes]:
+        """
+        The keys which were deleted.
+        """
+        for key, value in self._changes.items():
+            if value is DELETED:
+                yield key
+
     def apply_to(self, db: MutableMapping, apply_deletes: bool = True) -> None:
         """
         Apply the changes in this diff to the given database.
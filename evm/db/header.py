@@ -1,8 +1,12 @@
 from abc import ABCMeta, abstractmethod
-from typing import Tuple, Iterable
+from typing import Tuple, Iterable, Type  # noqa: F401
 
 import rlp
 
+from cytoolz import (
+    first,
+)
+
 from eth_utils import (
     encode_hex,
     to_tuple,
@@ -20,9 +24,14 @@ from evm.exceptions import (
     CanonicalHeadNotFound,
     HeaderNotFound,
     ParentNotFound,
+    ValidationError,
 )
 from evm.db import BaseDB
-from evm.db.schema import SchemaV1
+from evm.db.batch import BatchDB
+from evm.db.schema import (  # noqa: F401
+    BaseSchema,
+    get_schema,
+)
 from evm.rlp.headers import BlockHeader
 from evm.validation import (
     validate_block_number,
@@ -70,8 +79,18 @@ class BaseHeaderDB(metaclass=ABCMeta):
     def persist_header(self, header: BlockHeader) -> Tuple[BlockHeader, ...]:
         raise NotImplementedError("ChainDB classes must implement this method")
 
+    @abstractmethod
+    def persist_header_chain(self, headers: Iterable[BlockHeader]) -> Tuple[BlockHeader, ...]:
+        raise NotImplementedError("ChainDB classes must implement this method")
+
 
 class HeaderDB(BaseHeaderDB):
+    schema = None  # type: Type[BaseSchema]
+
+    def __init__(self, db: BaseDB) -> None:
+        super().__init__(db)
+        self.schema = get_schema(db)
+
     #
     # Canonical Chain API
     #
@@ -82,11 +101,14 @@ class HeaderDB(BaseHeaderDB):
         Raises BlockNotFound if there's no block header with the given number in the
         canonical chain.
         """
+        return self._get_canonical_block_hash(self.db, block_number)
+
+    def _get_canonical_block_hash(self, db: BaseDB, block_number: BlockNumber) -> Hash32:
         validate_block_number(block_number, title="Block Number")
-        number_to_hash_key = SchemaV1.make_block_number_to_hash_lookup_key(block_number)
+        number_to_hash_key = self.schema.make_block_number_to_hash_lookup_key(block_number)
 
         try:
-            encoded_key = self.db[number_to_hash_key]
+            encoded_key = db[number_to_hash_key]
         except KeyError:
             raise HeaderNotFound(
                 "No canonical header for block number #{0}".format(block_number)
@@ -101,18 +123,28 @@ class HeaderDB(BaseHeaderDB):
         Raises BlockNotFound if there's no block header with the given number in the
         canonical chain.
         """
+        return self._get_canonical_block_header_by_number(self.db, block_number)
+
+    def _get_canonical_block_header_by_number(
+            self,
+            db: BaseDB,
+            block_number: BlockNumber) -> BlockHeader:
         validate_block_number(block_number, title="Block Number")
-        return self.get_block_header_by_hash(self.get_canonical_block_hash(block_number))
+        canonical_block_hash = self._get_canonical_block_hash(db, block_number)
+        return self._get_block_header_by_hash(db, canonical_block_hash)
 
     def get_canonical_head(self) -> BlockHeader:
         """
         Returns the current block header at the head of the chain.
         """
+        return self._get_canonical_head(self.db)
+
+    def _get_canonical_head(self, db: BaseDB) -> BlockHeader:
         try:
-            canonical_head_hash = self.db[SchemaV1.make_canonical_head_hash_lookup_key()]
+            canonical_head_hash = db[self.schema.make_canonical_head_hash_lookup_key()]
         except KeyError:
             raise CanonicalHeadNotFound("No canonical head set for this chain")
-        return self.get_block_header_by_hash(canonical_head_hash)
+        return self._get_block_header_by_hash(db, canonical_head_hash)
 
     #
     # Header API
@@ -123,66 +155,123 @@ class HeaderDB(BaseHeaderDB):
 
         Raises BlockNotFound if it is not present in the db.
         """
+        return self._get_block_header_by_hash(self.db, block_hash)
+
+    @staticmethod
+    def _get_block_header_by_hash(db: BaseDB, block_hash: Hash32) -> BlockHeader:
         validate_word(block_hash, title="Block Hash")
         try:
-            header_rlp = self.db[block_hash]
+            header_rlp = db[block_hash]
         except KeyError:
             raise HeaderNotFound("No header with hash {0} found".format(
                 encode_hex(block_hash)))
         return rlp.decode(header_rlp, BlockHeader)
 
     def get_score(self, block_hash: Hash32) -> int:
+        return self._get_score(self.db, block_hash)
+
+    def _get_score(self, db: BaseDB, block_hash: Hash32) -> int:
         try:
-            encoded_score = self.db[SchemaV1.make_block_hash_to_score_lookup_key(block_hash)]
+            encoded_score = db[self.schema.make_block_hash_to_score_lookup_key(block_hash)]
         except KeyError:
             raise HeaderNotFound("No header with hash {0} found".format(
                 encode_hex(block_hash)))
         return rlp.decode(encoded_score, sedes=rlp.sedes.big_endian_int)
 
     def header_exists(self, block_hash: Hash32) -> bool:
+        return self._header_exists(self.db, block_hash)
+
+    @staticmethod
+    def _header_exists(db: BaseDB, block_hash: Hash32) -> bool:
         validate_word(block_hash, title="Block Hash")
-        return block_hash in self.db
+        return block_hash in db
 
     def persist_header(self, header: BlockHeader) -> Tuple[BlockHeader, ...]:
         """
         :returns: iterable of headers newly on the canonical chain
         """
-        if header.parent_hash != GENESIS_PARENT_HASH:
-            try:
-                self.get_block_header_by_hash(header.parent_hash)
-            except HeaderNotFound:
-                raise ParentNotFound(
-                    "Cannot persist block header ({}) with unknown parent ({})".format(
-                        encode_hex(header.hash), encode_hex(header.parent_hash)))
+        return self.persist_header_chain((header,))
 
-        self.db.set(
-            header.hash,
-            rlp.encode(header),
-        )
+    def persist_header_chain(self, headers: Iterable[BlockHeader]) -> Tuple[BlockHeader, ...]:
+        """
+        Persist a contiguous chain of headers, where each header is the parent
+        of the next one, in a single write batch.
 
-        if header.parent_hash == GENESIS_PARENT_HASH:
-            score = header.difficulty
-        else:
-            score = self.get_score(header.parent_hash) + header.difficulty
+        The parent of the first header must already be present in the database
+        (unless it is a genesis header). Scores are computed incrementally and
+        the canonical head is updated at most once, so this is much cheaper than
+        calling :meth:`persist_header` for each header.
 
-        self.db.set(
-            SchemaV1.make_block_hash_to_score_lookup_key(header.hash),
-            rlp.encode(score, sedes=rlp.sedes.big_endian_int),
-        )
+        :returns: iterable of headers newly on the canonical chain
+        """
+        with BatchDB(self.db) as db:
+            return self._persist_header_chain(db, headers)
+
+    def _persist_header_chain(
+            self,
+            db: BaseDB,
+            headers: Iterable[BlockHeader]) -> Tuple[BlockHeader, ...]:
+        headers_iterator = iter(headers)
+
+        try:
+            first_header = first(headers_iterator)
+        except StopIteration:
+            return tuple()
+
+        is_genesis = first_header.parent_hash == GENESIS_PARENT_HASH
+        if not is_genesis and not self._header_exists(db, first_header.parent_hash):
+            raise ParentNotFound(
+                "Cannot persist block header ({}) with unknown parent ({})".format(
+                    encode_hex(first_header.hash), encode_hex(first_header.parent_hash)))
+
+        if is_genesis:
+            score = 0
+        else:
+            score = self._get_score(db, first_header.parent_hash)
+
+        curr_chain_head = first_header
+        score = self._persist_header_and_score(db, curr_chain_head, score)
+
+        for child in headers_iterator:
+            if child.parent_hash != curr_chain_head.hash:
+                raise ValidationError(
+                    "Non-contiguous chain. Expected {} to have {} as parent but was {}".format(
+                        encode_hex(child.hash),
+                        encode_hex(curr_chain_head.hash),
+                        encode_hex(child.parent_hash),
+                    )
+                )
+            curr_chain_head = child
+            score = self._persist_header_and_score(db, curr_chain_head, score)
 
         try:
-            head_score = self.get_score(self.get_canonical_head().hash)
+            head_score = self._get_score(db, self._get_canonical_head(db).hash)
         except CanonicalHeadNotFound:
-            new_canonical_headers = self._set_as_canonical_chain_head(header.hash)
+            return self._set_as_canonical_chain_head(db, curr_chain_head.hash)
+
+        if score > head_score:
+            return self._set_as_canonical_chain_head(db, curr_chain_head.hash)
         else:
-            if score > head_score:
-                new_canonical_headers = self._set_as_canonical_chain_head(header.hash)
-            else:
-                new_canonical_headers = tuple()
+            return tuple()
 
-        return new_canonical_headers
+    def _persist_header_and_score(self, db: BaseDB, header: BlockHeader, parent_score: int) -> int:
+        """
+        Writes the header and its score, returning the score.
+        """
+        score = parent_score + header.difficulty
+        db.set(
+            header.hash,
+            rlp.encode(header),
+        )
+        db.set(
+            self.schema.make_block_hash_to_score_lookup_key(header.hash),
+            rlp.encode(score, sedes=rlp.sedes.big_endian_int),
+        )
+        return score
 
-    def _set_as_canonical_chain_head(self, block_hash: Hash32) -> Tuple[BlockHeader, ...]:
+    def _set_as_canonical_chain_head(self,
+                                     db: BaseDB,
+                                     block_hash: Hash32) -> Tuple[BlockHeader, ...]:
         """
         Sets the canonical chain HEAD to the block header as specified by the
         given block hash.
@@ -190,23 +279,23 @@ class HeaderDB(BaseHeaderDB):
         Returns iterable of headers newly on the canonical head
         """
         try:
-            header = self.get_block_header_by_hash(block_hash)
+            header = self._get_block_header_by_hash(db, block_hash)
         except HeaderNotFound:
             raise ValueError(
                 "Cannot use unknown block hash as canonical head: {}".format(block_hash)
             )
 
-        new_canonical_headers = tuple(reversed(self._find_new_ancestors(header)))
+        new_canonical_headers = tuple(reversed(self._find_new_ancestors(db, header)))
 
         for h in new_canonical_headers:
-            self._add_block_number_to_hash_lookup(h)
+            self._add_block_number_to_hash_lookup(db, h)
 
-        self.db.set(SchemaV1.make_canonical_head_hash_lookup_key(), header.hash)
+        db.set(self.schema.make_canonical_head_hash_lookup_key(), header.hash)
 
         return new_canonical_headers
 
     @to_tuple
-    def _find_new_ancestors(self, header: BlockHeader) -> Iterable[BlockHeader]:
+    def _find_new_ancestors(self, db: BaseDB, header: BlockHeader) -> Iterable[BlockHeader]:
         """
         Returns the chain leading up from the given header until (but not including)
         the first ancestor it has in common with our canonical chain.
@@ -221,7 +310,7 @@ class HeaderDB(BaseHeaderDB):
         h = header
         while True:
             try:
-                orig = self.get_canonical_block_header_by_number(h.block_number)
+                orig = self._get_canonical_block_header_by_number(db, h.block_number)
             except HeaderNotFound:
                 # This just means the block is not on the canonical chain.
                 pass
@@ -236,17 +325,17 @@ class HeaderDB(BaseHeaderDB):
             if h.parent_hash == GENESIS_PARENT_HASH:
                 break
             else:
-                h = self.get_block_header_by_hash(h.parent_hash)
+                h = self._get_block_header_by_hash(db, h.parent_hash)
 
-    def _add_block_number_to_hash_lookup(self, header: BlockHeader) -> None:
+    def _add_block_number_to_hash_lookup(self, db: BaseDB, header: BlockHeader) -> None:
         """
         Sets a record in the database to allow looking up this header by its
         block number.
         """
-        block_number_to_hash_key = SchemaV1.make_block_number_to_hash_lookup_key(
+        block_number_to_hash_key = self.schema.make_block_number_to_hash_lookup_key(
             header.block_number
         )
-        self.db.set(
+        db.set(
             block_number_to_hash_key,
             rlp.encode(header.hash, sedes=rlp.sedes.binary),
         )
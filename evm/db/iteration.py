@@ -0,0 +1,76 @@
+import heapq
+from typing import (
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+
+def get_prefix_stop(prefix: bytes) -> Optional[bytes]:
+    """
+    Returns the first key which is greater than every key starting with ``prefix``,
+    or ``None`` if there is no such key (the prefix is empty or all ``0xff`` bytes).
+    """
+    stripped_prefix = prefix.rstrip(b'\xff')
+    if not stripped_prefix:
+        return None
+    return stripped_prefix[:-1] + bytes([stripped_prefix[-1] + 1])
+
+
+def get_key_range(start: bytes = None,
+                  stop: bytes = None,
+                  prefix: bytes = None) -> Tuple[Optional[bytes], Optional[bytes]]:
+    """
+    Combines a ``prefix`` with the ``start`` and ``stop`` bounds of an iteration,
+    returning the narrowest ``(start, stop)`` range covering all of them.
+    """
+    if prefix is None:
+        return start, stop
+
+    prefix_stop = get_prefix_stop(prefix)
+    if start is None or start < prefix:
+        start = prefix
+    if stop is None or (prefix_stop is not None and stop > prefix_stop):
+        stop = prefix_stop
+    return start, stop
+
+
+def is_in_key_range(key: bytes, start: Optional[bytes], stop: Optional[bytes]) -> bool:
+    if start is not None and key < start:
+        return False
+    elif stop is not None and key >= stop:
+        return False
+    else:
+        return True
+
+
+def overlay_changes(items: Iterable[Tuple[bytes, bytes]],
+                    changes: Mapping[bytes, Optional[bytes]],
+                    start: bytes = None,
+                    stop: bytes = None,
+                    reverse: bool = False) -> Iterator[Tuple[bytes, bytes]]:
+    """
+    Merges pending ``changes`` into the ordered ``(key, value)`` pairs of the
+    underlying database, which must cover the range ``[start, stop)``.  A change
+    with a value of ``None`` is a pending delete.
+
+    Only the changes inside the range are held in memory; ``items`` is streamed.
+    """
+    changed_keys = sorted(
+        (key for key in changes if is_in_key_range(key, start, stop)),
+        reverse=reverse,
+    )
+    changed_items = ((key, changes[key]) for key in changed_keys)
+    unchanged_items = ((key, value) for key, value in items if key not in changes)
+
+    merged = heapq.merge(
+        changed_items,
+        unchanged_items,
+        key=lambda item: item[0],
+        reverse=reverse,
+    )
+    for key, value in merged:
+        if value is not None:
+            yield key, value
@@ -1,5 +1,5 @@
 import collections
-from typing import Dict, Union  # noqa: F401
+from typing import Dict, Iterator, Tuple, Union  # noqa: F401
 import uuid
 
 from cytoolz import (
@@ -9,6 +9,10 @@ from cytoolz import (
 )
 
 from evm.db.backends.base import BaseDB
+from evm.db.iteration import (
+    get_key_range,
+    overlay_changes,
+)
 from evm.exceptions import ValidationError
 
 
@@ -116,6 +120,12 @@ class Journal(BaseDB):
             )
         return changeset_data
 
+    def flatten(self) -> Dict[bytes, Union[bytes, DeletedEntry]]:
+        """
+        Returns the changes of all changesets, giving precedence to later changesets.
+        """
+        return merge(*self.journal_data.values())
+
     #
     # Database API
     #
@@ -195,6 +205,27 @@ class JournalDB(BaseDB):
             raise KeyError(key)
         del self.journal[key]
 
+    def iterate(self,
+                start: bytes = None,
+                stop: bytes = None,
+                prefix: bytes = None,
+                reverse: bool = False) -> Iterator[Tuple[bytes, bytes]]:
+        """
+        Iterates over the wrapped database with all journaled changes applied on top.
+        """
+        start, stop = get_key_range(start, stop, prefix)
+        changes = {
+            key: None if value is DELETED_ENTRY else value
+            for key, value in self.journal.flatten().items()
+        }
+        return overlay_changes(
+            self.wrapped_db.iterate(start, stop, reverse=reverse),
+            changes,
+            start,
+            stop,
+            reverse,
+        )
+
     #
     # Snapshot API
     #
@@ -0,0 +1,260 @@
+import logging
+from typing import (  # noqa: F401
+    Callable,
+    Dict,
+    Tuple,
+    Type,
+)
+
+import rlp
+
+from eth_typing import (
+    BlockNumber,
+)
+
+from evm.constants import (
+    BLANK_ROOT_HASH,
+)
+from evm.db.backends.base import BaseDB
+from evm.db.batch import BatchDB
+from evm.db.bloombits import (
+    BLOOM_BITS_SECTION_SIZE,
+    get_set_bits,
+)
+from evm.db.chain import (
+    ChainDB,
+    ENCODED_ITEM_LIST,
+)
+from evm.db.schema import (
+    BaseSchema,
+    SchemaV2,
+    SchemaV3,
+    get_schema,
+    set_schema,
+)
+from evm.exceptions import CanonicalHeadNotFound
+from evm.rlp.headers import BlockHeader
+
+
+logger = logging.getLogger('evm.db.migrations')
+
+
+def migrate_block_bodies_to_v2(base_db: BaseDB,
+                               start_block: int = 0,
+                               batch_size: int = 1000) -> int:
+    """
+    Stores the transactions and receipts of every block in the canonical chain
+    using the single-value layout introduced by :class:`~evm.db.schema.SchemaV2`.
+
+    Blocks which have already been migrated, or whose transaction/receipt tries
+    are not present in the database, are skipped.  Writes are committed every
+    ``batch_size`` blocks, so an interrupted migration can be resumed by passing
+    the last reported block number as ``start_block``.
+
+    Returns the number of blocks which were migrated.
+    """
+    head_chaindb = ChainDB(base_db)
+    try:
+        head = head_chaindb.get_canonical_head()
+    except CanonicalHeadNotFound:
+        # A new database, without any block to migrate.
+        return 0
+    schema = head_chaindb.schema
+    migrated = 0
+
+    for batch_start in range(start_block, head.block_number + 1, batch_size):
+        batch_end = min(batch_start + batch_size, head.block_number + 1)
+        with BatchDB(base_db) as batch_db:
+            chaindb = ChainDB(batch_db)
+            for block_number in range(batch_start, batch_end):
+                header = chaindb.get_canonical_block_header_by_number(BlockNumber(block_number))
+                if _migrate_block_body(batch_db, schema, header):
+                    migrated += 1
+
+        logger.info(
+            "Migrated block bodies up to #%d (%d of %d)",
+            batch_end - 1,
+            batch_end,
+            head.block_number + 1,
+        )
+
+    return migrated
+
+
+def _migrate_block_body(db: BaseDB, schema: Type[BaseSchema], header: BlockHeader) -> bool:
+    item_lists = (
+        (header.transaction_root, schema.make_block_transactions_lookup_key),
+        (header.receipt_root, schema.make_block_receipts_lookup_key),
+    )
+
+    did_migrate = False
+    for trie_root, make_lookup_key in item_lists:
+        lookup_key = make_lookup_key(trie_root)
+        if trie_root == BLANK_ROOT_HASH or db.exists(lookup_key):
+            continue
+
+        try:
+            encoded_items = tuple(ChainDB._get_trie_item_data(db, trie_root))
+        except KeyError:
+            # The trie nodes for this block were never downloaded (e.g. a header-only
+            # sync), so there is nothing to migrate.
+            continue
+
+        db.set(lookup_key, rlp.encode(encoded_items, sedes=ENCODED_ITEM_LIST))
+        did_migrate = True
+
+    return did_migrate
+
+
+def backfill_bloom_bits(base_db: BaseDB, start_block: int = 0) -> int:
+    """
+    Sets the bloom bits of every block in the canonical chain.
+
+    The bloom bits are only updated when blocks become canonical, so databases
+    written before they were introduced have none, and logs of those blocks
+    can't be found with :meth:`~evm.db.chain.ChainDB.get_log_candidate_block_numbers`.
+    Blocks which are already indexed are skipped.  Writes are committed once per
+    section of bloom bits, so an interrupted backfill can be resumed by passing
+    the last reported block number as ``start_block``.
+
+    Returns the number of blocks which were indexed.
+    """
+    head_chaindb = ChainDB(base_db)
+    try:
+        head = head_chaindb.get_canonical_head()
+    except CanonicalHeadNotFound:
+        # A new database, without any block to index.
+        return 0
+    backfilled = 0
+
+    first_section = start_block // BLOOM_BITS_SECTION_SIZE
+    last_section = head.block_number // BLOOM_BITS_SECTION_SIZE
+    for section in range(first_section, last_section + 1):
+        section_start = section * BLOOM_BITS_SECTION_SIZE
+        section_end = min(section_start + BLOOM_BITS_SECTION_SIZE, head.block_number + 1)
+        with BatchDB(base_db) as batch_db:
+            chaindb = ChainDB(batch_db)
+            headers = tuple(
+                chaindb.get_canonical_block_header_by_number(BlockNumber(block_number))
+                for block_number in range(max(section_start, start_block), section_end)
+            )
+            missing_headers = _get_headers_missing_bloom_bits(chaindb, section, headers)
+            chaindb._update_bloom_bits(batch_db, (), missing_headers)
+            backfilled += len(missing_headers)
+
+        logger.info(
+            "Backfilled bloom bits up to #%d (%d of %d)",
+            section_end - 1,
+            section_end,
+            head.block_number + 1,
+        )
+
+    return backfilled
+
+
+def _get_headers_missing_bloom_bits(chaindb: ChainDB,
+                                    section: int,
+                                    headers: Tuple[BlockHeader, ...]) -> Tuple[BlockHeader, ...]:
+    vectors = {}  # type: Dict[int, int]
+
+    def is_indexed(header: BlockHeader) -> bool:
+        position_mask = 1 << (header.block_number - section * BLOOM_BITS_SECTION_SIZE)
+        for bit in get_set_bits(header.bloom):
+            if bit not in vectors:
+                vectors[bit] = chaindb._get_bloom_bits(chaindb.db, bit, section)
+            if not vectors[bit] & position_mask:
+                return False
+        return True
+
+    return tuple(header for header in headers if not is_indexed(header))
+
+
+def _make_v3_block_number_key(encoded_block_number: bytes) -> bytes:
+    if not encoded_block_number.isdigit():
+        raise ValueError("Invalid block number: {0!r}".format(encoded_block_number))
+    return SchemaV3.make_block_number_to_hash_lookup_key(BlockNumber(int(encoded_block_number)))
+
+
+def _make_v3_hash_key(make_lookup_key: Callable[[bytes], bytes]) -> Callable[[bytes], bytes]:
+    def make_v3_key(suffix: bytes) -> bytes:
+        if len(suffix) != 32:
+            raise ValueError("Invalid hash: {0!r}".format(suffix))
+        return make_lookup_key(suffix)
+    return make_v3_key
+
+
+def _make_v3_bloom_bits_key(suffix: bytes) -> bytes:
+    bit, _, section = suffix.partition(b':')
+    if not bit.isdigit() or not section.isdigit():
+        raise ValueError("Invalid bloom bits key: {0!r}".format(suffix))
+    return SchemaV3.make_bloom_bits_lookup_key(int(bit), int(section))
+
+
+# The key prefixes of SchemaV2, and how the remainder of each key maps to a SchemaV3 key.
+V2_TO_V3_KEY_PREFIXES = (
+    (b'block-number-to-hash:', _make_v3_block_number_key),
+    (b'block-hash-to-score:', _make_v3_hash_key(SchemaV3.make_block_hash_to_score_lookup_key)),
+    (
+        b'transaction-hash-to-block:',
+        _make_v3_hash_key(SchemaV3.make_transaction_hash_to_block_lookup_key),
+    ),
+    (b'block-transactions:', _make_v3_hash_key(SchemaV3.make_block_transactions_lookup_key)),
+    (b'block-receipts:', _make_v3_hash_key(SchemaV3.make_block_receipts_lookup_key)),
+    (b'bloom-bits:', _make_v3_bloom_bits_key),
+)  # type: Tuple[Tuple[bytes, Callable[[bytes], bytes]], ...]
+
+
+def migrate_keys_to_v3(base_db: BaseDB, batch_size: int = 10000) -> int:
+    """
+    Rewrites the lookup keys of a :class:`~evm.db.schema.SchemaV2` database to the
+    compact binary keys of :class:`~evm.db.schema.SchemaV3`.  Values are not modified.
+
+    The old keys are streamed in order using :meth:`~evm.db.backends.base.BaseDB.iterate`,
+    so the backend must support range iteration, and writes are committed every
+    ``batch_size`` keys.  The schema version is only recorded once every key has
+    been rewritten; if the migration is interrupted, run it again to finish it.
+
+    Returns the number of keys which were rewritten.
+    """
+    if get_schema(base_db) is SchemaV3:
+        return 0
+
+    migrated = 0
+    for prefix, make_v3_key in V2_TO_V3_KEY_PREFIXES:
+        migrated += _migrate_key_range(base_db, prefix, make_v3_key, batch_size)
+
+    with BatchDB(base_db) as batch_db:
+        old_head_key = SchemaV2.make_canonical_head_hash_lookup_key()
+        if batch_db.exists(old_head_key):
+            batch_db.set(SchemaV3.make_canonical_head_hash_lookup_key(), batch_db[old_head_key])
+            batch_db.delete(old_head_key)
+            migrated += 1
+        set_schema(batch_db, SchemaV3)
+
+    return migrated
+
+
+def _migrate_key_range(base_db: BaseDB,
+                       prefix: bytes,
+                       make_v3_key: Callable[[bytes], bytes],
+                       batch_size: int) -> int:
+    migrated = 0
+    batch_db = BatchDB(base_db)
+    for key, value in base_db.iterate(prefix=prefix):
+        try:
+            v3_key = make_v3_key(key[len(prefix):])
+        except ValueError:
+            # Some other key which happens to share the prefix, e.g. a trie node.
+            continue
+
+        batch_db.set(v3_key, value)
+        batch_db.delete(key)
+        migrated += 1
+
+        if migrated % batch_size == 0:
+            batch_db.commit()
+            logger.info("Rewrote %d keys with prefix %r", migrated, prefix)
+
+    batch_db.commit()
+    logger.info("Rewrote %d keys with prefix %r", migrated, prefix)
+    return migrated
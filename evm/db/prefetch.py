@@ -0,0 +1,73 @@
+from evm.db.backends.base import BaseDB
+from evm.db.cache import CacheDB
+
+
+class PrefetchCacheDB(CacheDB):
+    """
+    A :class:`~evm.db.cache.CacheDB` which other threads can fill ahead of time
+    through :meth:`get_warming_db`.
+
+    Only use it for content-addressed values like trie nodes and code, whose
+    value for a key never changes, so that values cached by other threads are
+    never stale.
+
+    ``hits`` and ``misses`` count the reads made through this database itself,
+    not the ones made to warm the cache.
+    """
+    def __init__(self, db: BaseDB, cache_size: int = 65536) -> None:
+        super().__init__(db, cache_size)
+        self.hits = 0
+        self.misses = 0
+
+    def get_warming_db(self) -> BaseDB:
+        """
+        Return a database which reads through the cache, filling it, without
+        being counted as hits or misses.  Writes to it are not allowed.
+        """
+        return _WarmingDB(self)
+
+    def _read(self, key: bytes) -> bytes:
+        # LRU operations are atomic, but another thread may evict the key between
+        # two of them, so each read only looks the key up once.
+        try:
+            return self._cached_values[key]
+        except KeyError:
+            value = self._db[key]
+            self._cached_values[key] = value
+            return value
+
+    def __getitem__(self, key: bytes) -> bytes:
+        if key in self._cached_values:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return self._read(key)
+
+    def _exists(self, key: bytes) -> bool:
+        return key in self._cached_values or key in self._db
+
+    def __delitem__(self, key: bytes) -> None:
+        self._cached_values.pop(key, None)
+        del self._db[key]
+
+
+class _WarmingDB(BaseDB):
+    def __init__(self, cache_db: PrefetchCacheDB) -> None:
+        self.cache_db = cache_db
+
+    def __getitem__(self, key: bytes) -> bytes:
+        return self.cache_db._read(key)
+
+    def _exists(self, key: bytes) -> bool:
+        try:
+            self.cache_db._read(key)
+        except KeyError:
+            return False
+        else:
+            return True
+
+    def __setitem__(self, key: bytes, value: bytes) -> None:
+        raise TypeError("The cache may only be warmed by reading")
+
+    def __delitem__(self, key: bytes) -> None:
+        raise TypeError("The cache may only be warmed by reading")
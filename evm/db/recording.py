@@ -0,0 +1,50 @@
+from typing import (  # noqa: F401
+    Dict,
+    Iterator,
+    Tuple,
+)
+
+from evm.db.backends.base import BaseDB
+
+
+class ReadRecordingDB(BaseDB):
+    """
+    A read-only wrapper of basic DB objects which records every key and value
+    read from the wrapped database, including the ones read by iterating.
+
+    Wrap it in a :class:`~evm.db.batch.BatchDB` to keep the writes in memory, so
+    that only values which were in the wrapped database are recorded.
+    """
+    wrapped_db = None  # type: BaseDB
+
+    def __init__(self, wrapped_db: BaseDB) -> None:
+        self.wrapped_db = wrapped_db
+        self.read_values = {}  # type: Dict[bytes, bytes]
+
+    def __getitem__(self, key: bytes) -> bytes:
+        value = self.wrapped_db[key]
+        self.read_values[key] = value
+        return value
+
+    def _exists(self, key: bytes) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+        else:
+            return True
+
+    def __setitem__(self, key: bytes, value: bytes) -> None:
+        raise TypeError("A ReadRecordingDB is read-only")
+
+    def __delitem__(self, key: bytes) -> None:
+        raise TypeError("A ReadRecordingDB is read-only")
+
+    def iterate(self,
+                start: bytes = None,
+                stop: bytes = None,
+                prefix: bytes = None,
+                reverse: bool = False) -> Iterator[Tuple[bytes, bytes]]:
+        for key, value in self.wrapped_db.iterate(start, stop, prefix, reverse):
+            self.read_values[key] = value
+            yield key, value
@@ -1,12 +1,26 @@
 from abc import ABCMeta, abstractmethod
+from typing import (  # noqa: F401
+    Dict,
+    Type,
+    Union,
+)
 
 from eth_typing import (
     BlockNumber,
     Hash32,
 )
 
+from evm.db.backends.base import BaseDB
+
+
+# Databases using a schema other than the implicit default record its version
+# under this key.  No key of any schema starts with a null byte.
+SCHEMA_VERSION_KEY = b'\x00schema-version'
+
 
 class BaseSchema(metaclass=ABCMeta):
+    version = None  # type: int
+
     @staticmethod
     @abstractmethod
     def make_canonical_head_hash_lookup_key() -> bytes:
@@ -27,8 +41,25 @@ class BaseSchema(metaclass=ABCMeta):
     def make_transaction_hash_to_block_lookup_key(transaction_hash: Hash32) -> bytes:
         raise NotImplementedError('Must be implemented by subclasses')
 
+    @staticmethod
+    @abstractmethod
+    def make_block_transactions_lookup_key(transaction_root: Hash32) -> bytes:
+        raise NotImplementedError('Must be implemented by subclasses')
+
+    @staticmethod
+    @abstractmethod
+    def make_block_receipts_lookup_key(receipt_root: Hash32) -> bytes:
+        raise NotImplementedError('Must be implemented by subclasses')
+
+    @staticmethod
+    @abstractmethod
+    def make_bloom_bits_lookup_key(bit: int, section: int) -> bytes:
+        raise NotImplementedError('Must be implemented by subclasses')
+
 
 class SchemaV1(BaseSchema):
+    version = 1
+
     @staticmethod
     def make_canonical_head_hash_lookup_key() -> bytes:
         return b'v1:canonical_head_hash'
@@ -45,3 +76,126 @@ class SchemaV1(BaseSchema):
     @staticmethod
     def make_transaction_hash_to_block_lookup_key(transaction_hash: Hash32) -> bytes:
         return b'transaction-hash-to-block:%s' % transaction_hash
+
+
+class SchemaV2(SchemaV1):
+    """
+    Extends :class:`SchemaV1` with keys which store the full list of a block's
+    transactions and receipts as a single value, so that they can be loaded
+    without walking the corresponding tries.
+
+    The lists are keyed by their trie root, which identifies their content.
+
+    It also adds the keys of the bloom bits of the canonical chain.
+    """
+    version = 2
+
+    @staticmethod
+    def make_block_transactions_lookup_key(transaction_root: Hash32) -> bytes:
+        return b'block-transactions:%s' % transaction_root
+
+    @staticmethod
+    def make_block_receipts_lookup_key(receipt_root: Hash32) -> bytes:
+        return b'block-receipts:%s' % receipt_root
+
+    @staticmethod
+    def make_bloom_bits_lookup_key(bit: int, section: int) -> bytes:
+        return b'bloom-bits:%d:%d' % (bit, section)
+
+
+class SchemaV3(BaseSchema):
+    """
+    Compact binary keys: a single prefix byte followed by either a 32 byte hash
+    or a block number encoded as a fixed-width, big-endian integer.
+
+    Unlike the decimal block numbers of :class:`SchemaV1`, the canonical
+    block number keys sort in numerical order, so that backends supporting
+    :meth:`~evm.db.backends.base.BaseDB.iterate` can scan ranges of the
+    canonical chain.
+    """
+    version = 3
+
+    CANONICAL_HEAD_HASH_KEY = b'\x01'
+    BLOCK_NUMBER_TO_HASH_PREFIX = b'\x02'
+    BLOCK_HASH_TO_SCORE_PREFIX = b'\x03'
+    TRANSACTION_HASH_TO_BLOCK_PREFIX = b'\x04'
+    BLOCK_TRANSACTIONS_PREFIX = b'\x05'
+    BLOCK_RECEIPTS_PREFIX = b'\x06'
+    BLOOM_BITS_PREFIX = b'\x07'
+
+    BLOCK_NUMBER_WIDTH = 8
+
+    @classmethod
+    def make_canonical_head_hash_lookup_key(cls) -> bytes:
+        return cls.CANONICAL_HEAD_HASH_KEY
+
+    @classmethod
+    def make_block_number_to_hash_lookup_key(cls, block_number: BlockNumber) -> bytes:
+        return cls.BLOCK_NUMBER_TO_HASH_PREFIX + block_number.to_bytes(
+            cls.BLOCK_NUMBER_WIDTH,
+            'big',
+        )
+
+    @classmethod
+    def get_block_number_from_lookup_key(cls, number_to_hash_key: bytes) -> BlockNumber:
+        if not number_to_hash_key.startswith(cls.BLOCK_NUMBER_TO_HASH_PREFIX):
+            raise ValueError(
+                "Not a block number to hash lookup key: {0!r}".format(number_to_hash_key)
+            )
+        return BlockNumber(int.from_bytes(
+            number_to_hash_key[len(cls.BLOCK_NUMBER_TO_HASH_PREFIX):],
+            'big',
+        ))
+
+    @classmethod
+    def make_block_hash_to_score_lookup_key(cls, block_hash: Hash32) -> bytes:
+        return cls.BLOCK_HASH_TO_SCORE_PREFIX + block_hash
+
+    @classmethod
+    def make_transaction_hash_to_block_lookup_key(cls, transaction_hash: Hash32) -> bytes:
+        return cls.TRANSACTION_HASH_TO_BLOCK_PREFIX + transaction_hash
+
+    @classmethod
+    def make_block_transactions_lookup_key(cls, transaction_root: Hash32) -> bytes:
+        return cls.BLOCK_TRANSACTIONS_PREFIX + transaction_root
+
+    @classmethod
+    def make_block_receipts_lookup_key(cls, receipt_root: Hash32) -> bytes:
+        return cls.BLOCK_RECEIPTS_PREFIX + receipt_root
+
+    @classmethod
+    def make_bloom_bits_lookup_key(cls, bit: int, section: int) -> bytes:
+        return cls.BLOOM_BITS_PREFIX + bit.to_bytes(2, 'big') + section.to_bytes(8, 'big')
+
+
+# Databases without a recorded version use this schema.
+DEFAULT_SCHEMA = SchemaV2
+
+SCHEMAS_BY_VERSION = {
+    SchemaV2.version: SchemaV2,
+    SchemaV3.version: SchemaV3,
+}  # type: Dict[int, Union[Type[SchemaV2], Type[SchemaV3]]]
+
+
+def get_schema(db: BaseDB) -> Type[BaseSchema]:
+    """
+    Returns the schema used by the given database.
+    """
+    try:
+        encoded_version = db[SCHEMA_VERSION_KEY]
+    except KeyError:
+        return DEFAULT_SCHEMA
+
+    version = int(encoded_version)
+    try:
+        return SCHEMAS_BY_VERSION[version]
+    except KeyError:
+        raise ValueError("Unknown database schema version: {0}".format(version))
+
+
+def set_schema(db: BaseDB, schema: Type[BaseSchema]) -> None:
+    """
+    Records the schema used by the given database.  This does not migrate any
+    existing keys, see :mod:`evm.db.migrations` for that.
+    """
+    db.set(SCHEMA_VERSION_KEY, b'%d' % schema.version)
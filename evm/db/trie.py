@@ -18,10 +18,10 @@ def make_trie_root_and_nodes(
     return _make_trie_root_and_nodes(tuple(rlp.encode(item) for item in items))
 
 
-# This cache is expected to be useful when importing blocks as we call this once when importing
-# and again when validating the imported block. But it should also help for post-Byzantium blocks
-# as it's common for them to have duplicate receipt_roots. Given that, it probably makes sense to
-# use a relatively small cache size here.
+# This cache is expected to be useful when mining blocks as we call this once when applying
+# the transactions and again when validating the mined block. But it should also help for
+# post-Byzantium blocks as it's common for them to have duplicate receipt_roots. Given that, it
+# probably makes sense to use a relatively small cache size here.
 @functools.lru_cache(128)
 def _make_trie_root_and_nodes(items: Tuple[bytes, ...]) -> Tuple[bytes, Dict[bytes, bytes]]:
     kv_store = {}  # type: Dict[bytes, bytes]
@@ -0,0 +1,182 @@
+from collections import deque
+import logging
+import queue
+import threading
+from typing import (  # noqa: F401
+    Deque,
+    Dict,
+    Iterator,
+    Optional,
+    Tuple,
+)
+
+from evm.db.backends.base import BaseDB
+from evm.db.diff import (
+    DBDiff,
+    DBDiffTracker,
+    DiffMissingError,
+)
+from evm.db.iteration import (
+    get_key_range,
+    overlay_changes,
+)
+
+
+class WriteBehindDB(BaseDB):
+    """
+    A wrapper of basic DB objects which writes changes to the wrapped database
+    from a background thread, so that the caller does not wait on disk I/O.
+
+    Changes are collected in memory until :meth:`commit` hands them over to the
+    writer thread, in order.  Until a commit has been written, reads are served
+    from memory, so changes are always visible immediately.  At most ``max_pending``
+    commits are held in memory; once that many are waiting to be written,
+    :meth:`commit` blocks until the oldest one has been written.
+
+    Call :meth:`flush` to wait for all commits to be written, and :meth:`close`
+    once done with the database.  An error raised while writing is re-raised by
+    the next call to :meth:`commit` or :meth:`flush`.
+    """
+    logger = logging.getLogger("evm.db.WriteBehindDB")
+
+    wrapped_db = None  # type: BaseDB
+    _track_diff = None  # type: DBDiffTracker
+
+    def __init__(self, wrapped_db: BaseDB, max_pending: int = 4) -> None:
+        self.wrapped_db = wrapped_db
+        self._track_diff = DBDiffTracker()
+        # The committed diffs which may not be written yet, oldest first.
+        self._pending = deque()  # type: Deque[DBDiff]
+        self._pending_lock = threading.Lock()
+        self._write_queue = queue.Queue(maxsize=max_pending)  # type: queue.Queue
+        self._write_error = None  # type: Optional[BaseException]
+        self._writer = threading.Thread(
+            target=self._write_pending,
+            name='WriteBehindDB writer',
+            daemon=True,
+        )
+        self._writer.start()
+
+    #
+    # Writing
+    #
+    def commit(self) -> None:
+        """
+        Hands the changes made since the last commit over to the writer thread.
+        """
+        self._raise_write_error()
+        diff = self._track_diff.diff()
+        self._track_diff = DBDiffTracker()
+        if not len(diff):
+            return
+
+        with self._pending_lock:
+            self._pending.append(diff)
+        self._write_queue.put(diff)
+
+    def clear(self) -> None:
+        """
+        Discards the changes made since the last commit.
+        """
+        self._track_diff = DBDiffTracker()
+
+    def flush(self) -> None:
+        """
+        Commits any outstanding changes and waits for all commits to be written.
+        """
+        self.commit()
+        self._write_queue.join()
+        self._raise_write_error()
+
+    def close(self) -> None:
+        """
+        Writes all committed changes and stops the writer thread.  Changes which
+        were not committed are discarded.
+        """
+        self.clear()
+        self._write_queue.put(None)
+        self._writer.join()
+
+    def _write_pending(self) -> None:
+        while True:
+            diff = self._write_queue.get()
+            try:
+                if diff is None:
+                    return
+                elif self._write_error is None:
+                    self._write_diff(diff)
+            except Exception as err:
+                self.logger.exception("Failed to write pending changes")
+                self._write_error = err
+            finally:
+                if diff is not None:
+                    with self._pending_lock:
+                        self._pending.popleft()
+                self._write_queue.task_done()
+
+    def _write_diff(self, diff: DBDiff) -> None:
+        # Backends which support it write each commit in a single transaction.
+        write_batch = getattr(self.wrapped_db, 'write_batch', None)
+        if write_batch is None:
+            diff.apply_to(self.wrapped_db)
+        else:
+            with write_batch():
+                diff.apply_to(self.wrapped_db)
+
+    def _raise_write_error(self) -> None:
+        if self._write_error is not None:
+            raise self._write_error
+
+    #
+    # Reading
+    #
+    def _get_pending(self) -> Tuple[DBDiff, ...]:
+        with self._pending_lock:
+            return tuple(self._pending)
+
+    def __getitem__(self, key: bytes) -> bytes:
+        for diff in (self._track_diff,) + tuple(reversed(self._get_pending())):
+            try:
+                return diff[key]
+            except DiffMissingError as missing:
+                if missing.is_deleted:
+                    raise KeyError(key)
+        return self.wrapped_db[key]
+
+    def _exists(self, key: bytes) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+        else:
+            return True
+
+    def __setitem__(self, key: bytes, value: bytes) -> None:
+        self._track_diff[key] = value
+
+    def __delitem__(self, key: bytes) -> None:
+        if key not in self:
+            raise KeyError(key)
+        del self._track_diff[key]
+
+    def iterate(self,
+                start: bytes = None,
+                stop: bytes = None,
+                prefix: bytes = None,
+                reverse: bool = False) -> Iterator[Tuple[bytes, bytes]]:
+        """
+        Iterates over the wrapped database with the changes which are not written
+        yet applied on top.
+        """
+        start, stop = get_key_range(start, stop, prefix)
+        changes = {}  # type: Dict[bytes, Optional[bytes]]
+        for diff in self._get_pending() + (self._track_diff.diff(),):
+            changes.update(diff.pending_items())
+            changes.update((key, None) for key in diff.deleted_keys())
+        return overlay_changes(
+            self.wrapped_db.iterate(start, stop, reverse=reverse),
+            changes,
+            start,
+            stop,
+            reverse,
+        )
@@ -3,9 +3,17 @@ from cytoolz import (
 )
 
 
+from evm import constants
 from evm.utils.spoof import (
     SpoofTransaction,
 )
+from evm.vm import opcode_values
+from evm.vm.gas_meter import (
+    GasMeter,
+)
+from evm.vm.logic.call import (
+    CallEIP150,
+)
 
 
 def _get_computation_error(state, transaction):
@@ -23,6 +31,24 @@ def _get_computation_error(state, transaction):
         state.revert(snapshot)
 
 
+def _validate_has_sender(transaction):
+    if not hasattr(transaction, 'sender'):
+        raise TypeError(
+            "Transaction is missing attribute sender.",
+            "If sending an unsigned transaction, use SpoofTransaction and provide the",
+            "sender using the 'from' parameter")
+
+
+def _bisect_gas(is_enough_gas, maximum_out_of_gas, minimum_viable, tolerance):
+    while minimum_viable - maximum_out_of_gas > tolerance:
+        midpoint = (minimum_viable + maximum_out_of_gas) // 2
+        if is_enough_gas(midpoint):
+            minimum_viable = midpoint
+        else:
+            maximum_out_of_gas = midpoint
+    return minimum_viable
+
+
 @curry
 def binary_gas_search(state, transaction, tolerance=1):
     """
@@ -40,11 +66,7 @@ def binary_gas_search(state, transaction, tolerance=1):
         subject to tolerance. If OutOfGas is thrown at block limit, return block limit.
     :raises VMError: if the computation fails even when given the block gas_limit to complete
     """
-    if not hasattr(transaction, 'sender'):
-        raise TypeError(
-            "Transaction is missing attribute sender.",
-            "If sending an unsigned transaction, use SpoofTransaction and provide the",
-            "sender using the 'from' parameter")
+    _validate_has_sender(transaction)
 
     minimum_transaction = SpoofTransaction(
         transaction,
@@ -64,17 +86,11 @@ def binary_gas_search(state, transaction, tolerance=1):
     if error is not None:
         raise error
 
-    minimum_viable = state.gas_limit
-    maximum_out_of_gas = transaction.intrinsic_gas
-    while minimum_viable - maximum_out_of_gas > tolerance:
-        midpoint = (minimum_viable + maximum_out_of_gas) // 2
-        test_transaction = SpoofTransaction(transaction, gas=midpoint)
-        if _get_computation_error(state, test_transaction) is None:
-            minimum_viable = midpoint
-        else:
-            maximum_out_of_gas = midpoint
+    def is_enough_gas(gas):
+        test_transaction = SpoofTransaction(transaction, gas=gas)
+        return _get_computation_error(state, test_transaction) is None
 
-    return minimum_viable
+    return _bisect_gas(is_enough_gas, transaction.intrinsic_gas, state.gas_limit, tolerance)
 
 
 # Estimate in increments of intrinsic gas usage
@@ -85,3 +101,166 @@ binary_gas_search_1000_tolerance = binary_gas_search(tolerance=1000)
 
 # Estimate to the exact gas, takes roughly 15 more executions than intrinsic to estimate
 binary_gas_search_exact = binary_gas_search(tolerance=1)
+
+
+class _TracingGasMeter(GasMeter):
+    """
+    Keep track of the most gas consumed at any point, which is the gas needed to
+    run the same way, and of the last consumption.
+    """
+    def __init__(self, start_gas):
+        super().__init__(start_gas)
+        self.required_gas = 0
+        self.required_gas_before_last_consumption = 0
+        self.gas_remaining_before_last_consumption = start_gas
+
+    def consume_gas(self, amount, reason):
+        self.required_gas_before_last_consumption = self.required_gas
+        self.gas_remaining_before_last_consumption = self.gas_remaining
+        super().consume_gas(amount, reason)
+        self.required_gas = max(self.required_gas, self.start_gas - self.gas_remaining)
+
+
+def _get_gas_to_forward(child_gas):
+    """
+    Return the least gas whose all but one 64th is the given child gas (EIP-150).
+    """
+    gas = max(child_gas * 64 // 63 - 2, 0)
+    while gas - gas // 64 < child_gas:
+        gas += 1
+    return gas
+
+
+class _GasTracingComputation:
+    """
+    Computation mixin which tracks the gas the computation needs to run the same way
+    as it did, in ``required_gas``.
+
+    The gas forwarded to a child computation is mostly given back, so what counts is
+    the gas that the child computation needed, and the gas the parent needs to forward
+    it under the 63/64 rule of EIP-150.  Refunds are only applied at the end of the
+    transaction, so they don't lower the gas needed.
+
+    When a child computation burns its gas, the gas the parent consumes depends on the
+    gas it forwarded, and ``is_trace_conclusive`` is False.
+    """
+    is_trace_conclusive = True
+
+    def __init__(self, state, message, transaction_context):
+        super().__init__(state, message, transaction_context)
+        self._gas_meter = _TracingGasMeter(message.gas)
+
+    @property
+    def required_gas(self):
+        return self._gas_meter.required_gas
+
+    def apply_child_computation(self, child_msg):
+        # The gas for the child computation was just consumed, by the CALL or CREATE opcode.
+        gas_meter = self._gas_meter
+        gas_remaining = gas_meter.gas_remaining_before_last_consumption
+        fee = gas_remaining - gas_meter.gas_remaining
+        gas_meter.required_gas = gas_meter.required_gas_before_last_consumption
+
+        child_computation = super().apply_child_computation(child_msg)
+        if child_computation.should_burn_gas or not child_computation.is_trace_conclusive:
+            self.is_trace_conclusive = False
+
+        if child_msg.should_transfer_value and child_msg.value and not child_msg.is_create:
+            stipend = constants.GAS_CALLSTIPEND
+        else:
+            stipend = 0
+        extra_gas = fee - (child_msg.gas - stipend)
+        child_gas = max(child_computation.required_gas - stipend, 0)
+        if isinstance(self.opcodes[opcode_values.CALL], CallEIP150):
+            gas_needed = extra_gas + _get_gas_to_forward(child_gas)
+        elif child_msg.is_create:
+            gas_needed = extra_gas + child_gas
+        else:
+            # Before EIP-150, calls pay for all the requested gas up front.
+            gas_needed = fee
+
+        gas_meter.required_gas = max(
+            gas_meter.required_gas,
+            gas_meter.start_gas - gas_remaining + gas_needed,
+        )
+        return child_computation
+
+
+def _get_traced_computation(state, transaction):
+    state_computation_class = state.computation_class
+    snapshot = state.snapshot()
+    # Shadow the computation class of the state for this execution only.
+    state.computation_class = type(
+        'GasTracing{0}'.format(state_computation_class.__name__),
+        (_GasTracingComputation, state_computation_class),
+        {},
+    )
+    try:
+        return state.execute_transaction(transaction)
+    finally:
+        del state.computation_class
+        state.revert(snapshot)
+
+
+def trace_gas_search(state, transaction):
+    """
+    Find the same gas as ``binary_gas_search_exact`` with a few executions of the
+    transaction.
+
+    The transaction is executed once with the block gas limit, tracking the gas it
+    needs to run the same way.  That gas is confirmed by executing the transaction
+    with it and with one gas less.  If this fails, or if the first execution can't
+    tell, the gas is found by bisection, reusing the executions done so far.
+
+    :returns int: The smallest gas to not throw an OutOfGas exception. If OutOfGas
+        is thrown at block limit, return block limit.
+    :raises VMError: if the computation fails even when given the block gas_limit to complete
+    """
+    _validate_has_sender(transaction)
+
+    errors_by_gas = {}
+
+    def is_enough_gas(gas):
+        if gas not in errors_by_gas:
+            errors_by_gas[gas] = _get_computation_error(
+                state,
+                SpoofTransaction(transaction, gas=gas),
+            )
+        return errors_by_gas[gas] is None
+
+    def is_intrinsic_gas_enough():
+        minimum_transaction = SpoofTransaction(
+            transaction,
+            gas=transaction.intrinsic_gas,
+            gas_price=0,
+        )
+        return _get_computation_error(state, minimum_transaction) is None
+
+    maximum_transaction = SpoofTransaction(
+        transaction,
+        gas=state.gas_limit,
+        gas_price=0,
+    )
+    computation = _get_traced_computation(state, maximum_transaction)
+    if computation.is_error:
+        if is_intrinsic_gas_enough():
+            return transaction.intrinsic_gas
+        else:
+            computation.raise_if_error()
+
+    candidate = min(transaction.intrinsic_gas + computation.required_gas, state.gas_limit)
+    if computation.is_trace_conclusive and candidate > transaction.intrinsic_gas:
+        if not is_enough_gas(candidate):
+            return _bisect_gas(is_enough_gas, candidate, state.gas_limit, tolerance=1)
+        elif not is_enough_gas(candidate - 1):
+            return candidate
+        else:
+            # The transaction runs differently with less gas, and needs even less.
+            minimum_viable = candidate - 1
+    else:
+        minimum_viable = state.gas_limit
+
+    if is_intrinsic_gas_enough():
+        return transaction.intrinsic_gas
+    else:
+        return _bisect_gas(is_enough_gas, transaction.intrinsic_gas, minimum_viable, tolerance=1)
@@ -85,12 +85,17 @@ class BaseTransaction(rlp.Serializable, BaseTransactionCommonMethods):
     def hash(self) -> bytes:
         return keccak(rlp.encode(self))
 
+    _sender = None  # type: Address
+
     @property
     def sender(self) -> Address:
         """
-        Convenience property for the return value of `get_sender`
+        Convenience property for the return value of `get_sender`.  Recovering
+        the sender is expensive, so it is only done once per transaction.
         """
-        return self.get_sender()
+        if self._sender is None:
+            self._sender = self.get_sender()
+        return self._sender
 
     # +-------------------------------------------------------------+
     # | API that must be implemented by all Transaction subclasses. |
@@ -0,0 +1,107 @@
+"""
+Capture of the database reads made while importing blocks, so that the same
+blocks can be imported again later from the captured data alone, in memory.
+"""
+import gzip
+from pathlib import Path
+from typing import (  # noqa: F401
+    Dict,
+    Iterable,
+    Tuple,
+    Type,
+)
+
+import rlp
+
+from evm.chains.base import BaseChain
+from evm.chains.pipeline import deserialize_block
+from evm.db.backends.base import BaseDB
+from evm.db.backends.memory import MemoryDB
+from evm.db.batch import BatchDB
+from evm.db.recording import ReadRecordingDB
+from evm.exceptions import ValidationError
+from evm.rlp.blocks import BaseBlock
+
+
+BLOCK_CAPTURE_VERSION = 1
+
+
+class BlockCapture:
+    """
+    RLP encoded blocks, and the database values which importing them reads.
+    """
+    def __init__(self, encoded_blocks: Tuple[bytes, ...], data: Dict[bytes, bytes]) -> None:
+        self.encoded_blocks = encoded_blocks
+        self.data = data
+
+    def get_blocks(self, chain_class: Type[BaseChain]) -> Tuple[BaseBlock, ...]:
+        """
+        Decode the captured blocks, using the block classes of the given chain.
+        """
+        return tuple(
+            deserialize_block(chain_class, encoded_block)
+            for encoded_block
+            in self.encoded_blocks
+        )
+
+    def save(self, path: Path) -> None:
+        """
+        Write the capture to the given file, compressed.
+        """
+        serialized = [
+            BLOCK_CAPTURE_VERSION,
+            list(self.encoded_blocks),
+            [[key, value] for key, value in sorted(self.data.items())],
+        ]
+        with gzip.open(str(path), 'wb') as capture_file:
+            capture_file.write(rlp.encode(serialized))
+
+    @classmethod
+    def load(cls, path: Path) -> 'BlockCapture':
+        """
+        Read a capture written by :meth:`save`.
+        """
+        with gzip.open(str(path), 'rb') as capture_file:
+            version, encoded_blocks, items = rlp.decode(capture_file.read())
+        if rlp.sedes.big_endian_int.deserialize(version) != BLOCK_CAPTURE_VERSION:
+            raise ValidationError("Unsupported block capture version: {0}".format(version))
+        return cls(tuple(encoded_blocks), {key: value for key, value in items})
+
+
+def capture_blocks(chain_class: Type[BaseChain],
+                   db: BaseDB,
+                   blocks: Iterable[BaseBlock],
+                   perform_validation: bool = True) -> BlockCapture:
+    """
+    Import the given blocks on top of the chain in the given database, and
+    capture every value read from the database while doing so.
+
+    The blocks are imported in memory only, so the database isn't changed,
+    even if the blocks are already part of its chain.
+    """
+    recording_db = ReadRecordingDB(db)
+    chain = chain_class(BatchDB(recording_db))
+    encoded_blocks = []
+    for block in blocks:
+        chain.import_block(block, perform_validation=perform_validation)
+        encoded_blocks.append(rlp.encode(block))
+    return BlockCapture(tuple(encoded_blocks), dict(recording_db.read_values))
+
+
+def replay_blocks(chain_class: Type[BaseChain],
+                  capture: BlockCapture,
+                  blocks: Tuple[BaseBlock, ...] = None,
+                  perform_validation: bool = True) -> Tuple[BaseBlock, ...]:
+    """
+    Import the captured blocks again, into an in-memory database which only
+    contains the captured data.  Pass ``blocks`` decoded with
+    :meth:`BlockCapture.get_blocks` ahead of time to leave the decoding out.
+    """
+    if blocks is None:
+        blocks = capture.get_blocks(chain_class)
+    chain = chain_class(MemoryDB(dict(capture.data)))
+    return tuple(
+        chain.import_block(block, perform_validation=perform_validation)
+        for block
+        in blocks
+    )
@@ -4,6 +4,9 @@ import functools
 import hashlib
 import json
 import os
+import pickle
+import statistics
+import tempfile
 
 import rlp
 
@@ -141,6 +144,28 @@ def hash_log_entries(log_entries):
     return logs_hash
 
 
+def get_block_hash_for_testing(self, block_number):
+    """
+    The hash of an ancestor block as the state tests expect it: the hash of the
+    block number, for the last 256 blocks only.
+    """
+    if block_number >= self.block_number:
+        return b''
+    elif block_number < 0:
+        return b''
+    elif block_number < self.block_number - 256:
+        return b''
+    else:
+        return keccak(to_bytes(text="{0}".format(block_number)))
+
+
+def get_prev_hashes_for_testing(self, last_block_hash, db):
+    """
+    The state tests don't have any previous block.
+    """
+    return []
+
+
 # we use an LRU cache on this function so that we can sort the tests such that
 # all fixtures from the same file are executed sequentially allowing us to keep
 # a small rolling cache of the loaded fixture files.
@@ -164,6 +189,96 @@ def load_fixture(fixture_path, fixture_key, normalize_fn=identity):
     return fixture
 
 
+#
+# Normalized fixture cache
+#
+# Bump this when the normalization of the fixtures changes, to invalidate the
+# cached normalized fixtures.
+NORMALIZED_FIXTURE_CACHE_VERSION = 1
+
+
+def get_normalizer_key(normalize_fn):
+    """
+    Returns a key which identifies the normalization done by the given function,
+    including the arguments given to it if it is curried.
+    """
+    if isinstance(normalize_fn, curry):
+        return get_normalizer_key(normalize_fn.func) + (
+            normalize_fn.args,
+            tuple(sorted((normalize_fn.keywords or {}).items())),
+        )
+    else:
+        return (normalize_fn.__module__, normalize_fn.__qualname__)
+
+
+class NormalizedFixtureCache:
+    """
+    Caches normalized fixtures on disk, pickled, so that loading them again
+    doesn't need to parse and normalize the JSON fixture files.
+
+    The normalized fixtures of each fixture file are stored together, in a file
+    named after the `get_fixtures_file_hash` of the fixture file, so they are
+    invalidated when the fixture file changes.  Like `load_json_fixture`, this
+    works best if the fixtures are loaded one fixture file after the other.
+    """
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self._fixture_path = None
+        self._cache_path = None
+        self._entries = {}
+        self._new_entries = {}
+
+    def load_fixture(self, fixture_path, fixture_key, normalize_fn=identity):
+        """
+        Loads a specific fixture like `load_fixture`, from the cache if possible.
+        """
+        if fixture_path != self._fixture_path:
+            self._switch_fixture_file(fixture_path)
+
+        entry_key = (fixture_key, get_normalizer_key(normalize_fn))
+        try:
+            return self._entries[entry_key]
+        except KeyError:
+            fixture = load_fixture(fixture_path, fixture_key, normalize_fn)
+            self._entries[entry_key] = fixture
+            self._new_entries[entry_key] = fixture
+            return fixture
+
+    def flush(self):
+        """
+        Writes the fixtures normalized since the last flush to the cache.
+        """
+        if not self._new_entries:
+            return
+
+        # Other processes may have cached other fixtures of the same file meanwhile.
+        entries = merge(self._read_cache_file(self._cache_path), self._new_entries)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir)
+        with os.fdopen(fd, 'wb') as temp_file:
+            pickle.dump(entries, temp_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, self._cache_path)
+        self._new_entries = {}
+
+    def _switch_fixture_file(self, fixture_path):
+        self.flush()
+        file_hash = get_fixtures_file_hash((fixture_path,))
+        self._fixture_path = fixture_path
+        self._cache_path = os.path.join(
+            self.cache_dir,
+            '{0}-v{1}.pickle'.format(file_hash, NORMALIZED_FIXTURE_CACHE_VERSION),
+        )
+        self._entries = self._read_cache_file(self._cache_path)
+
+    @staticmethod
+    def _read_cache_file(cache_path):
+        try:
+            with open(cache_path, 'rb') as cache_file:
+                return pickle.load(cache_file)
+        except FileNotFoundError:
+            return {}
+
+
 #
 # RLP Diffing
 #
@@ -232,6 +347,94 @@ def get_fixtures_file_hash(all_fixture_paths):
     return hasher.hexdigest()
 
 
+#
+# Sharding
+#
+FIXTURE_DURATIONS_CACHE_KEY = 'pyevm/fixtures/durations'
+
+
+def get_fixture_params(fixture):
+    """
+    Returns the parameters of a fixture, which may have been wrapped in a
+    `pytest.param` by `filter_fixtures`.
+    """
+    if hasattr(fixture, 'values'):
+        return fixture.values[0]
+    else:
+        return fixture
+
+
+def get_fixture_durations(cache):
+    """
+    Returns the durations of the fixture tests recorded in the given pytest
+    cache by `update_fixture_durations`, by fixture id.
+    """
+    return cache.get(FIXTURE_DURATIONS_CACHE_KEY, {})
+
+
+def update_fixture_durations(cache, durations):
+    """
+    Records the durations of fixture tests, by fixture id, in the given pytest
+    cache, for `shard_fixtures` to balance the shards with.
+    """
+    cache.set(FIXTURE_DURATIONS_CACHE_KEY, merge(get_fixture_durations(cache), durations))
+
+
+def parse_fixture_shard(shard):
+    """
+    Parses a shard given as `<index>/<count>`, with `index` counted from 0.
+    """
+    try:
+        index, count = (int(part) for part in shard.split('/'))
+    except ValueError:
+        raise ValueError("Fixture shards must be given as <index>/<count>, got {0!r}".format(
+            shard,
+        ))
+    if not 0 <= index < count:
+        raise ValueError("Fixture shard index must be below the shard count, got {0!r}".format(
+            shard,
+        ))
+    return index, count
+
+
+def shard_fixtures(all_fixtures, num_shards, durations=None):
+    """
+    Splits the fixtures into `num_shards` shards which take about as long to run
+    as each other, going by the given durations by fixture id.  Fixtures without
+    a recorded duration are assumed to take the median duration.
+
+    The same fixtures and durations always give the same shards, so that separate
+    processes can each pick their own shard.
+    """
+    if durations is None:
+        durations = {}
+    fixture_ids = [idfn(get_fixture_params(fixture)) for fixture in all_fixtures]
+    known_durations = [
+        durations[fixture_id]
+        for fixture_id in fixture_ids
+        if fixture_id in durations
+    ]
+    default_duration = statistics.median(known_durations) if known_durations else 1.0
+
+    # Hand out the longest fixtures first, each to the shard with the least work so far.
+    order = sorted(
+        range(len(all_fixtures)),
+        key=lambda index: (-durations.get(fixture_ids[index], default_duration), index),
+    )
+    shard_durations = [0.0] * num_shards
+    shard_indices = [[] for _ in range(num_shards)]
+    for fixture_index in order:
+        shard = min(range(num_shards), key=lambda shard: (shard_durations[shard], shard))
+        shard_durations[shard] += durations.get(fixture_ids[fixture_index], default_duration)
+        shard_indices[shard].append(fixture_index)
+
+    # Keep the original order within each shard, so fixtures from the same file stay together.
+    return tuple(
+        tuple(all_fixtures[index] for index in sorted(indices))
+        for indices in shard_indices
+    )
+
+
 @curry
 def generate_fixture_tests(metafunc,
                            base_fixture_path,
@@ -247,6 +450,9 @@ def generate_fixture_tests(metafunc,
     - `preprocess_fn` handles any preprocessing that should be done on the raw
        fixtures (such as expanding the statetest fixtures to be multiple tests for
        each fork.
+
+    With the `--fixture-shard <index>/<count>` option, only the fixtures of the
+    given shard are used.  See `shard_fixtures`.
     """
     fixture_namespace = os.path.basename(base_fixture_path)
 
@@ -281,6 +487,15 @@ def generate_fixture_tests(metafunc,
 
         filtered_fixtures = filter_fn(preprocess_fn(all_fixtures))
 
+        fixture_shard = metafunc.config.getoption('fixture_shard', None)
+        if fixture_shard is not None:
+            shard_index, num_shards = parse_fixture_shard(fixture_shard)
+            filtered_fixtures = shard_fixtures(
+                tuple(filtered_fixtures),
+                num_shards,
+                get_fixture_durations(metafunc.config.cache),
+            )[shard_index]
+
         metafunc.parametrize('fixture_data', filtered_fixtures, ids=idfn)
 
 
@@ -0,0 +1,257 @@
+"""
+Timing of the JSON state test fixtures, to find the fixtures which are slow to
+execute and to catch changes which make some of them slower.
+
+The fixtures are executed like the state tests do, but the resulting state isn't
+checked, only the application of the transaction is timed.
+"""
+import collections
+import json
+import os
+import statistics
+import time
+from typing import (  # noqa: F401
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Sequence,
+    Tuple,
+    Type,
+)
+
+from cytoolz import (
+    groupby,
+)
+from eth_keys import keys
+from eth_utils import (
+    to_tuple,
+)
+
+from evm.db.backends.memory import MemoryDB
+from evm.db.chain import ChainDB
+from evm.exceptions import ValidationError
+from evm.rlp.headers import BlockHeader
+from evm.tools.fixture_tests import (
+    find_fixtures,
+    get_block_hash_for_testing,
+    get_prev_hashes_for_testing,
+    load_fixture,
+    normalize_statetest_fixture,
+)
+from evm.utils.db import apply_state_dict
+from evm.vm.base import BaseVM
+from evm.vm.forks import (
+    ByzantiumVM,
+    FrontierVM,
+    HomesteadVM,
+    SpuriousDragonVM,
+    TangerineWhistleVM,
+)
+
+
+def _configure_for_state_tests(vm_class: Type[BaseVM]) -> Type[BaseVM]:
+    """
+    Return a copy of the VM class which gets the block hashes the way the state
+    tests expect them.
+    """
+    state_class = vm_class.get_state_class()
+    return vm_class.configure(
+        __name__='{0}ForTiming'.format(vm_class.__name__),
+        _state_class=state_class.configure(
+            __name__='{0}ForTiming'.format(state_class.__name__),
+            get_ancestor_hash=get_block_hash_for_testing,
+        ),
+        get_prev_hashes=get_prev_hashes_for_testing,
+    )
+
+
+# The VM classes of the forks named in the state test fixtures, which are supported.
+STATE_TEST_VMS = {
+    'Frontier': _configure_for_state_tests(FrontierVM),
+    'Homestead': _configure_for_state_tests(HomesteadVM),
+    'EIP150': _configure_for_state_tests(TangerineWhistleVM),
+    'EIP158': _configure_for_state_tests(SpuriousDragonVM),
+    'Byzantium': _configure_for_state_tests(ByzantiumVM),
+}
+
+
+class FixtureTiming(collections.namedtuple(
+        'FixtureTiming',
+        ['fixture_id', 'fork', 'duration', 'gas_used', 'is_valid'])):
+
+    @property
+    def gas_per_second(self) -> float:
+        return self.gas_used / self.duration if self.duration else 0.0
+
+
+class TimingChange(collections.namedtuple(
+        'TimingChange',
+        ['fixture_id', 'baseline_duration', 'duration'])):
+
+    @property
+    def ratio(self) -> float:
+        return self.duration / self.baseline_duration
+
+
+@to_tuple
+def find_state_fixtures(fixtures_base_dir: str,
+                        forks: Iterable[str] = None) -> Iterable[Tuple[str, str, str, int]]:
+    """
+    Find the ``(fixture_path, fixture_key, fork, post_state_index)`` of every state test
+    under the given directory, for the given forks or every supported fork.
+    """
+    if forks is None:
+        forks = STATE_TEST_VMS.keys()
+    selected_forks = set(forks)
+
+    for fixture_path, fixture_key in find_fixtures(fixtures_base_dir):
+        fixture = load_fixture(fixture_path, fixture_key)
+        for fork, post_states in sorted(fixture['post'].items()):
+            if fork not in selected_forks:
+                continue
+            for post_state_index in range(len(post_states)):
+                yield fixture_path, fixture_key, fork, post_state_index
+
+
+def get_fixture_id(fixtures_base_dir: str,
+                   fixture_path: str,
+                   fixture_key: str,
+                   fork: str,
+                   post_state_index: int) -> str:
+    return ':'.join((
+        os.path.relpath(fixture_path, fixtures_base_dir),
+        fixture_key,
+        fork,
+        str(post_state_index),
+    ))
+
+
+def time_state_fixture(fixture: Dict[str, Any], fork: str) -> Tuple[float, int, bool]:
+    """
+    Apply the transaction of a normalized state test fixture to its pre state, and
+    return the time it took, the gas it used and whether it was valid.
+    """
+    header = BlockHeader(
+        coinbase=fixture['env']['currentCoinbase'],
+        difficulty=fixture['env']['currentDifficulty'],
+        block_number=fixture['env']['currentNumber'],
+        gas_limit=fixture['env']['currentGasLimit'],
+        timestamp=fixture['env']['currentTimestamp'],
+        parent_hash=fixture['env']['previousHash'],
+    )
+    vm = STATE_TEST_VMS[fork](header=header, chaindb=ChainDB(MemoryDB()))
+    apply_state_dict(vm.state.account_db, fixture['pre'])
+    vm.state.account_db.persist()
+    vm.block = vm.block.copy(header=vm.block.header.copy(state_root=vm.state.state_root))
+
+    transaction = vm.create_unsigned_transaction(
+        nonce=fixture['transaction']['nonce'],
+        gas_price=fixture['transaction']['gasPrice'],
+        gas=fixture['transaction']['gasLimit'],
+        to=fixture['transaction']['to'],
+        value=fixture['transaction']['value'],
+        data=fixture['transaction']['data'],
+    ).as_signed_transaction(keys.PrivateKey(fixture['transaction']['secretKey']))
+    # Recover the sender ahead of time, it isn't part of the execution.
+    transaction.sender
+
+    start = time.perf_counter()
+    try:
+        result_header, _, _ = vm.apply_transaction(vm.block.header, transaction)
+    except ValidationError:
+        return time.perf_counter() - start, 0, False
+    else:
+        return time.perf_counter() - start, result_header.gas_used, True
+
+
+def time_state_fixtures(fixtures_base_dir: str,
+                        fixtures: Iterable[Tuple[str, str, str, int]],
+                        rounds: int = 1) -> Iterable[FixtureTiming]:
+    """
+    Time the execution of each of the given state test fixtures, keeping the
+    fastest of ``rounds`` executions.
+    """
+    for fixture_path, fixture_key, fork, post_state_index in fixtures:
+        fixture = load_fixture(
+            fixture_path,
+            fixture_key,
+            normalize_statetest_fixture(fork=fork, post_state_index=post_state_index),
+        )
+        duration, gas_used, is_valid = min(
+            time_state_fixture(fixture, fork)
+            for _ in range(rounds)
+        )
+        yield FixtureTiming(
+            get_fixture_id(fixtures_base_dir, fixture_path, fixture_key, fork, post_state_index),
+            fork,
+            duration,
+            gas_used,
+            is_valid,
+        )
+
+
+@to_tuple
+def find_outliers(timings: Sequence[FixtureTiming],
+                  factor: float = 10.0,
+                  min_duration: float = 0.01) -> Iterable[FixtureTiming]:
+    """
+    Find the fixtures which execute at least ``factor`` times slower per unit of
+    gas than the median fixture of their fork, leaving out the ones faster than
+    ``min_duration`` seconds, whose timing is mostly noise.
+    """
+    timings_by_fork = groupby(lambda timing: timing.fork, timings)
+    for fork, fork_timings in sorted(timings_by_fork.items()):
+        measured = [timing for timing in fork_timings if timing.gas_used]
+        if not measured:
+            continue
+        median_gas_per_second = statistics.median(timing.gas_per_second for timing in measured)
+        for timing in measured:
+            if timing.duration < min_duration:
+                continue
+            elif timing.gas_per_second * factor < median_gas_per_second:
+                yield timing
+
+
+@to_tuple
+def compare_timings(timings: Iterable[FixtureTiming],
+                    baseline: Iterable[FixtureTiming],
+                    tolerance: float = 0.25,
+                    min_duration: float = 0.01) -> Iterable[TimingChange]:
+    """
+    Find the fixtures which became more than ``tolerance`` slower than in the baseline,
+    slowest first.  Fixtures faster than ``min_duration`` seconds in both are left out.
+    """
+    baseline_durations = {timing.fixture_id: timing.duration for timing in baseline}
+    changes = (
+        TimingChange(timing.fixture_id, baseline_durations[timing.fixture_id], timing.duration)
+        for timing in timings
+        if timing.fixture_id in baseline_durations
+    )
+    regressions = (
+        change
+        for change in changes
+        if max(change.duration, change.baseline_duration) >= min_duration and
+        change.duration > change.baseline_duration * (1 + tolerance)
+    )
+    yield from sorted(regressions, key=lambda change: change.ratio, reverse=True)
+
+
+def save_timings(path: str, timings: Iterable[FixtureTiming], **metadata: Any) -> None:
+    """
+    Write the timings to the given file as JSON, along with the given metadata.
+    """
+    report = dict(metadata, fixtures=[timing._asdict() for timing in timings])
+    with open(path, 'w') as report_file:
+        json.dump(report, report_file, indent=2, sort_keys=True)
+
+
+@to_tuple
+def load_timings(path: str) -> Iterable[FixtureTiming]:
+    """
+    Read the timings from a file written by :func:`save_timings`.
+    """
+    with open(path) as report_file:
+        report = json.load(report_file)
+    for timing in report['fixtures']:
+        yield FixtureTiming(**timing)
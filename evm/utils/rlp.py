@@ -1,5 +1,10 @@
 from __future__ import absolute_import
 
+from typing import (
+    BinaryIO,
+    Iterator,
+)
+
 import rlp
 
 from cytoolz import (
@@ -75,3 +80,42 @@ ensure_imported_block_unchanged = ensure_rlp_objects_are_equal(
     obj_a_name="block",
     obj_b_name="imported block",
 )
+
+
+# The longest possible prefix of an RLP item: one byte plus an eight byte length.
+MAX_RLP_PREFIX_LENGTH = 9
+
+
+def iterate_rlp_items(stream: BinaryIO, chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+    """
+    Yields the encoded RLP items stored one after another in ``stream``, as in the
+    block exports of most clients, reading the stream in chunks.
+    """
+    buffer = b''
+    position = 0
+    while True:
+        if len(buffer) - position < MAX_RLP_PREFIX_LENGTH:
+            buffer = buffer[position:]
+            position = 0
+            while len(buffer) < MAX_RLP_PREFIX_LENGTH:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                buffer += chunk
+            if not buffer:
+                return
+
+        _, _, length, payload_start = rlp.codec.consume_length_prefix(buffer, position)
+        item_end = payload_start + length
+        if item_end > len(buffer):
+            buffer = buffer[position:]
+            item_end -= position
+            position = 0
+            while item_end > len(buffer):
+                chunk = stream.read(max(chunk_size, item_end - len(buffer)))
+                if not chunk:
+                    raise rlp.DecodingError("RLP item is truncated", buffer)
+                buffer += chunk
+
+        yield buffer[position:item_end]
+        position = item_end
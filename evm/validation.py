@@ -16,6 +16,7 @@ from evm.constants import (
     GAS_LIMIT_ADJUSTMENT_FACTOR,
     GAS_LIMIT_MAXIMUM,
     GAS_LIMIT_MINIMUM,
+    MAX_UNCLES,
     SECPK1_N,
     UINT_256_MAX,
 )
@@ -225,12 +226,20 @@ def validate_gas_limit(gas_limit, parent_gas_limit):
         raise ValidationError("Gas limit {0} is above maximum {1}".format(
             gas_limit, GAS_LIMIT_MAXIMUM))
     diff = gas_limit - parent_gas_limit
-    if diff > (parent_gas_limit // GAS_LIMIT_ADJUSTMENT_FACTOR):
+    if abs(diff) > (parent_gas_limit // GAS_LIMIT_ADJUSTMENT_FACTOR):
         raise ValidationError(
             "Gas limit {0} difference to parent {1} is too big {2}".format(
                 gas_limit, parent_gas_limit, diff))
 
 
+def validate_uncles_count(uncles):
+    if len(uncles) > MAX_UNCLES:
+        raise ValidationError(
+            "Blocks may have a maximum of {0} uncles.  Found "
+            "{1}.".format(MAX_UNCLES, len(uncles))
+        )
+
+
 ALLOWED_HEADER_FIELDS = {
     'coinbase',
     'gas_limit',
@@ -9,6 +9,7 @@ import logging
 from typing import (  # noqa: F401
     List,
     Type,
+    TYPE_CHECKING,
 )
 
 import rlp
@@ -28,7 +29,6 @@ from evm.consensus.pow import (
 from evm.constants import (
     GENESIS_PARENT_HASH,
     MAX_PREV_HEADER_DEPTH,
-    MAX_UNCLES,
 )
 from evm.db.trie import make_trie_root_and_nodes
 from evm.db.chain import BaseChainDB  # noqa: F401
@@ -56,12 +56,17 @@ from evm.utils.headers import (
 from evm.validation import (
     validate_length_lte,
     validate_gas_limit,
+    validate_uncles_count,
 )
 from evm.vm.message import (
     Message,
 )
 from evm.vm.state import BaseState  # noqa: F401
 
+if TYPE_CHECKING:
+    from evm.vm.prefetch import StatePrefetcher  # noqa: F401
+    from evm.vm.speculative import SpeculativeExecutor  # noqa: F401
+
 
 class BaseVM(Configurable, metaclass=ABCMeta):
     block = None  # type: BaseBlock
@@ -123,12 +128,21 @@ class BaseVM(Configurable, metaclass=ABCMeta):
     def import_block(self, block):
         raise NotImplementedError("VM classes must implement this method")
 
+    @abstractmethod
+    def import_block_with_receipts(self, block):
+        raise NotImplementedError("VM classes must implement this method")
+
     @abstractmethod
     def mine_block(self, *args, **kwargs):
         raise NotImplementedError("VM classes must implement this method")
 
     @abstractmethod
-    def set_block_transactions(self, base_block, new_header, transactions, receipts):
+    def set_block_transactions(self,
+                               base_block,
+                               new_header,
+                               transactions,
+                               receipts,
+                               persist_item_lists=True):
         raise NotImplementedError("VM classes must implement this method")
 
     #
@@ -249,6 +263,11 @@ class BaseVM(Configurable, metaclass=ABCMeta):
     def validate_block(self, block):
         raise NotImplementedError("VM classes must implement this method")
 
+    @classmethod
+    @abstractmethod
+    def validate_header(cls, header, parent_header):
+        raise NotImplementedError("VM classes must implement this method")
+
     @abstractmethod
     def validate_transaction_against_header(self, base_header, transaction):
         """
@@ -285,6 +304,8 @@ class BaseVM(Configurable, metaclass=ABCMeta):
 
 class VM(BaseVM):
     _state = None
+    speculative_executor = None  # type: SpeculativeExecutor
+    state_prefetcher = None  # type: StatePrefetcher
 
     """
     The :class:`~evm.vm.base.BaseVM` class represents the Chain rules for a
@@ -296,6 +317,11 @@ class VM(BaseVM):
 
         - ``block_class``: The :class:`~evm.rlp.blocks.Block` class for blocks in this VM ruleset.
         - ``_state_class``: The :class:`~evm.vm.state.State` class used by this VM for execution.
+
+        It may be configured with a ``speculative_executor``, a
+        :class:`~evm.vm.speculative.SpeculativeExecutor` which executes the transactions
+        of imported blocks concurrently, and a ``state_prefetcher``, a
+        :class:`~evm.vm.prefetch.StatePrefetcher` which loads the state they need ahead of time.
     """
     def __init__(self, header, chaindb):
         self.chaindb = chaindb
@@ -384,6 +410,13 @@ class VM(BaseVM):
         )
 
     def _apply_all_transactions(self, transactions, base_header):
+        if self.speculative_executor is not None and len(transactions) > 1:
+            return self.speculative_executor.apply_all_transactions(
+                self,
+                transactions,
+                base_header,
+            )
+
         receipts = []
         previous_header = base_header
         result_header = base_header
@@ -403,6 +436,14 @@ class VM(BaseVM):
         """
         Import the given block to the chain.
         """
+        imported_block, _ = self.import_block_with_receipts(block)
+        return imported_block
+
+    def import_block_with_receipts(self, block):
+        """
+        Import the given block to the chain, and return the imported block along
+        with the receipts of its transactions.
+        """
         self.block = self.block.copy(
             header=self.configure_header(
                 coinbase=block.header.coinbase,
@@ -415,15 +456,36 @@ class VM(BaseVM):
             ),
             uncles=block.uncles,
         )
-        # we need to re-initialize the `state` to update the execution context.
-        self._state = self.get_state_class()(
-            db=self.chaindb.db,
-            execution_context=self.block.header.create_execution_context(self.previous_hashes),
-            state_root=self.block.header.state_root,
-        )
+        execution_context = self.block.header.create_execution_context(self.previous_hashes)
+        with self._prefetch_state(execution_context, block.transactions) as state_db:
+            # we need to re-initialize the `state` to update the execution context.
+            self._state = self.get_state_class()(
+                db=state_db,
+                execution_context=execution_context,
+                state_root=self.block.header.state_root,
+            )
 
-        # run all of the transactions.
-        last_header, receipts = self._apply_all_transactions(block.transactions, self.block.header)
+            # run all of the transactions.
+            try:
+                last_header, receipts = self._apply_all_transactions(
+                    block.transactions,
+                    self.block.header,
+                )
+            except BaseException:
+                if state_db is not self.chaindb.db:
+                    # Don't leave the state on the prefetch cache, which is stopped below.
+                    self._state = None
+                raise
+
+            if state_db is not self.chaindb.db:
+                # The prefetching stops when the context is left, so the rest of the
+                # block is applied on the state of the database itself.
+                self._state.account_db.persist()
+                self._state = self.get_state_class()(
+                    db=self.chaindb.db,
+                    execution_context=execution_context,
+                    state_root=self._state.state_root,
+                )
 
         self.block = self.set_block_transactions(
             self.block,
@@ -432,7 +494,30 @@ class VM(BaseVM):
             receipts,
         )
 
-        return self.mine_block()
+        final_block = self.finalize_block(self.pack_block(self.block))
+
+        # The transaction and receipt roots, the uncles hash and the state root of the
+        # imported block were all just computed from its body, so only its header is
+        # left to validate against the parent.
+        parent_header = get_parent_header(final_block.header, self.chaindb)
+        self.validate_header(final_block.header, parent_header)
+        validate_uncles_count(final_block.uncles)
+
+        return final_block, receipts
+
+    @contextlib.contextmanager
+    def _prefetch_state(self, execution_context, transactions):
+        if self.state_prefetcher is None:
+            yield self.chaindb.db
+        else:
+            with self.state_prefetcher.prefetch(
+                self.chaindb.db,
+                self.get_state_class(),
+                execution_context,
+                self.block.header.state_root,
+                transactions,
+            ) as state_db:
+                yield state_db
 
     def mine_block(self, *args, **kwargs):
         """
@@ -450,14 +535,29 @@ class VM(BaseVM):
 
         return final_block
 
-    def set_block_transactions(self, base_block, new_header, transactions, receipts):
+    def set_block_transactions(self,
+                               base_block,
+                               new_header,
+                               transactions,
+                               receipts,
+                               persist_item_lists=True):
+        """
+        Returns the block with the given transactions, whose tries are persisted.
 
+        Unless ``persist_item_lists`` is False, the transactions and receipts are also
+        stored as single values; a block which is still being built should only store
+        them once it's final, so that each of its intermediate lists isn't kept.
+        """
         tx_root_hash, tx_kv_nodes = make_trie_root_and_nodes(transactions)
         self.chaindb.persist_trie_data_dict(tx_kv_nodes)
 
         receipt_root_hash, receipt_kv_nodes = make_trie_root_and_nodes(receipts)
         self.chaindb.persist_trie_data_dict(receipt_kv_nodes)
 
+        if persist_item_lists:
+            self.chaindb.persist_block_transactions(tx_root_hash, transactions)
+            self.chaindb.persist_block_receipts(receipt_root_hash, receipts)
+
         return base_block.copy(
             transactions=transactions,
             header=new_header.copy(
@@ -630,29 +730,7 @@ class VM(BaseVM):
             )
         if not block.is_genesis:
             parent_header = get_parent_header(block.header, self.chaindb)
-
-            validate_gas_limit(block.header.gas_limit, parent_header.gas_limit)
-            validate_length_lte(block.header.extra_data, 32, title="BlockHeader.extra_data")
-
-            # timestamp
-            if block.header.timestamp < parent_header.timestamp:
-                raise ValidationError(
-                    "`timestamp` is before the parent block's timestamp.\n"
-                    "- block  : {0}\n"
-                    "- parent : {1}. ".format(
-                        block.header.timestamp,
-                        parent_header.timestamp,
-                    )
-                )
-            elif block.header.timestamp == parent_header.timestamp:
-                raise ValidationError(
-                    "`timestamp` is equal to the parent block's timestamp\n"
-                    "- block : {0}\n"
-                    "- parent: {1}. ".format(
-                        block.header.timestamp,
-                        parent_header.timestamp,
-                    )
-                )
+            self.validate_header(block.header, parent_header)
 
         tx_root_hash, _ = make_trie_root_and_nodes(block.transactions)
         if tx_root_hash != block.header.transaction_root:
@@ -660,11 +738,7 @@ class VM(BaseVM):
                 "Block's transaction_root ({0}) does not match expected value: {1}".format(
                     block.header.transaction_root, tx_root_hash))
 
-        if len(block.uncles) > MAX_UNCLES:
-            raise ValidationError(
-                "Blocks may have a maximum of {0} uncles.  Found "
-                "{1}.".format(MAX_UNCLES, len(block.uncles))
-            )
+        validate_uncles_count(block.uncles)
 
         if not self.chaindb.exists(block.header.state_root):
             raise ValidationError(
@@ -686,6 +760,34 @@ class VM(BaseVM):
                 )
             )
 
+    @classmethod
+    def validate_header(cls, header, parent_header):
+        """
+        Validate the given header against its parent.
+        """
+        validate_gas_limit(header.gas_limit, parent_header.gas_limit)
+        validate_length_lte(header.extra_data, 32, title="BlockHeader.extra_data")
+
+        # timestamp
+        if header.timestamp < parent_header.timestamp:
+            raise ValidationError(
+                "`timestamp` is before the parent block's timestamp.\n"
+                "- block  : {0}\n"
+                "- parent : {1}. ".format(
+                    header.timestamp,
+                    parent_header.timestamp,
+                )
+            )
+        elif header.timestamp == parent_header.timestamp:
+            raise ValidationError(
+                "`timestamp` is equal to the parent block's timestamp\n"
+                "- block : {0}\n"
+                "- parent: {1}. ".format(
+                    header.timestamp,
+                    parent_header.timestamp,
+                )
+            )
+
     def validate_seal(self, header: BlockHeader) -> None:
         """
         Validate the seal on the given header.
@@ -163,6 +163,13 @@ class BaseComputation(Configurable, metaclass=ABCMeta):
         """
         return not self.is_success
 
+    def raise_if_error(self) -> None:
+        """
+        Raise the error of the computation, if it resulted in one.
+        """
+        if self._error is not None:
+            raise self._error
+
     @property
     def should_burn_gas(self) -> bool:
         """
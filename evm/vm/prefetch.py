@@ -0,0 +1,130 @@
+from concurrent.futures import (  # noqa: F401
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+import contextlib
+import logging
+import threading
+from typing import (  # noqa: F401
+    Iterable,
+    Iterator,
+    List,
+    Type,
+    TYPE_CHECKING,
+)
+
+from eth_typing import Hash32  # noqa: F401
+
+from evm.constants import (
+    CREATE_CONTRACT_ADDRESS,
+)
+from evm.db.backends.base import BaseDB
+from evm.db.prefetch import PrefetchCacheDB
+from evm.rlp.transactions import BaseTransaction  # noqa: F401
+from evm.vm.execution_context import ExecutionContext  # noqa: F401
+
+if TYPE_CHECKING:
+    from evm.vm.state import BaseState  # noqa: F401
+
+
+class StatePrefetcher:
+    """
+    Loads the parts of the state which the transactions of a block will need
+    into a cache on background threads, while the transactions are executed.
+
+    For each transaction, the accounts of its sender and recipient and the code
+    of the recipient are loaded.  With ``pre_execute``, the transaction is instead
+    executed against the state at the start of the block, loading all the accounts,
+    storage slots and code it touches there.
+
+    The cached trie nodes and code never change, so the cache can be filled from
+    other threads.  :attr:`hits` and :attr:`misses` count how many reads during
+    the execution of the transactions were served from the cache.
+    """
+    logger = logging.getLogger('evm.vm.prefetch.StatePrefetcher')
+
+    def __init__(self,
+                 executor: Executor = None,
+                 pre_execute: bool = False,
+                 cache_size: int = 65536) -> None:
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=4)
+        self.executor = executor
+        self.pre_execute = pre_execute
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Return the share of reads which were served from the cache.
+        """
+        reads = self.hits + self.misses
+        if reads:
+            return self.hits / reads
+        else:
+            return 0.0
+
+    @contextlib.contextmanager
+    def prefetch(self,
+                 db: BaseDB,
+                 state_class: Type['BaseState'],
+                 execution_context: ExecutionContext,
+                 state_root: Hash32,
+                 transactions: Iterable[BaseTransaction]) -> Iterator[BaseDB]:
+        """
+        Start loading the state needed by the given transactions from the given
+        database, and return the database to execute them with.  Loading stops
+        when the context is left.
+        """
+        cache_db = PrefetchCacheDB(db, self.cache_size)
+        warming_db = cache_db.get_warming_db()
+        is_stopped = threading.Event()
+
+        def load_state(transaction=None):
+            if is_stopped.is_set():
+                return
+            state = state_class(warming_db, execution_context, state_root)
+            if transaction is None:
+                state.account_db.get_balance(execution_context.coinbase)
+            elif self.pre_execute:
+                # Earlier transactions of the block aren't applied, so the transaction
+                # isn't validated, which would fail for a second one of the same sender.
+                executor = state.get_transaction_executor()
+                message = executor.build_evm_message(transaction)
+                executor.build_computation(message, transaction)
+            else:
+                state.account_db.get_balance(transaction.sender)
+                if transaction.to != CREATE_CONTRACT_ADDRESS:
+                    state.account_db.get_code(transaction.to)
+
+        futures = [self.executor.submit(load_state)]  # type: List[Future]
+        futures.extend(
+            self.executor.submit(load_state, transaction)
+            for transaction
+            in transactions
+        )
+        try:
+            yield cache_db
+        finally:
+            is_stopped.set()
+            for future in futures:
+                future.cancel()
+            # The cache must not be filled any more once the state is persisted.
+            wait(futures)
+            self._log_prefetch_errors(futures)
+            self.hits += cache_db.hits
+            self.misses += cache_db.misses
+            self.logger.debug(
+                "Served %d of %d state reads from prefetched cache",
+                cache_db.hits,
+                cache_db.hits + cache_db.misses,
+            )
+
+    def _log_prefetch_errors(self, futures):
+        for future in futures:
+            if not future.cancelled() and future.exception() is not None:
+                self.logger.debug("Failed to prefetch state: %r", future.exception())
@@ -0,0 +1,483 @@
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+)
+import logging
+from typing import (  # noqa: F401
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TYPE_CHECKING,
+)
+
+from cytoolz import (
+    partition_all,
+)
+from eth_bloom import (
+    BloomFilter,
+)
+from eth_typing import (  # noqa: F401
+    Address,
+    Hash32,
+)
+
+from evm.db.account import (  # noqa: F401
+    AccountDB,
+    BaseAccountDB,
+)
+from evm.db.backends.base import BaseDB  # noqa: F401
+from evm.rlp.transactions import BaseTransaction  # noqa: F401
+from evm.vm.execution_context import ExecutionContext  # noqa: F401
+
+if TYPE_CHECKING:
+    from evm.vm.computation import BaseComputation  # noqa: F401
+    from evm.vm.state import BaseState  # noqa: F401
+
+
+# The parts of an account which are tracked as separate entries of the read and
+# write sets.  Storage slots are tracked as ``(address, STORAGE, slot)``.
+BALANCE = 'balance'
+NONCE = 'nonce'
+CODE = 'code'
+STORAGE = 'storage'
+# Whether the account exists, which is changed by any write to the account.
+EXISTS = 'exists'
+# Touching an account writes it back unchanged, which creates it if it doesn't exist.
+TOUCH = 'touch'
+
+# The ways in which an account may be wiped: deleting it, or deleting its storage.
+DELETE_ACCOUNT = 'account'
+DELETE_STORAGE = 'storage'
+
+
+class RecordingAccountDB(BaseAccountDB):
+    """
+    Wraps an account database, recording which parts of which accounts are read,
+    and the final value of the parts which are written.
+
+    Changes to the balances of the ``commutative_addresses`` are recorded as deltas,
+    as long as the balance is not also read.  This is meant for the coinbase,
+    which receives the fee of every transaction of a block.
+
+    Reads are recorded even if they happen in a call frame which is reverted,
+    since they may still have influenced the outcome of the execution.
+    """
+    def __init__(self,
+                 account_db: AccountDB,
+                 commutative_addresses: Iterable[Address] = ()) -> None:
+        self.wrapped_db = account_db
+        self.commutative_addresses = frozenset(commutative_addresses)
+        self.reads = set()  # type: Set[Tuple]
+        self.writes = {}  # type: Dict[Tuple, Any]
+        self.wiped = {}  # type: Dict[Address, str]
+        self.deltas = {}  # type: Dict[Address, int]
+        self._checkpoints = []  # type: List[Tuple[Any, Tuple[Dict, Dict, Dict]]]
+
+    #
+    # Recording
+    #
+    def _read(self, *keys: Tuple) -> None:
+        self.reads.update(keys)
+
+    def _write(self, key: Tuple, value: Any) -> None:
+        address = key[0]
+        if key[1] == BALANCE:
+            self.deltas.pop(address, None)
+        self.writes[key] = value
+
+    def _wipe(self, address: Address, wipe_kind: str) -> None:
+        for key in tuple(self.writes):
+            if key[0] != address:
+                continue
+            elif wipe_kind == DELETE_ACCOUNT or key[1] == STORAGE:
+                del self.writes[key]
+        if wipe_kind == DELETE_ACCOUNT:
+            self.deltas.pop(address, None)
+            self.wiped[address] = DELETE_ACCOUNT
+        else:
+            self.wiped.setdefault(address, DELETE_STORAGE)
+
+    #
+    # Storage
+    #
+    def get_storage(self, address, slot):
+        self._read((address, STORAGE, slot))
+        return self.wrapped_db.get_storage(address, slot)
+
+    def set_storage(self, address, slot, value):
+        self.wrapped_db.set_storage(address, slot, value)
+        self._write((address, STORAGE, slot), value)
+
+    def delete_storage(self, address):
+        self.wrapped_db.delete_storage(address)
+        self._wipe(address, DELETE_STORAGE)
+
+    #
+    # Balance
+    #
+    def get_balance(self, address):
+        self._read((address, BALANCE))
+        return self.wrapped_db.get_balance(address)
+
+    def set_balance(self, address, balance):
+        self.wrapped_db.set_balance(address, balance)
+        self._write((address, BALANCE), balance)
+
+    def delta_balance(self, address, delta):
+        is_commutative = (
+            address in self.commutative_addresses and
+            (address, BALANCE) not in self.reads and
+            (address, BALANCE) not in self.writes
+        )
+        if is_commutative:
+            self.wrapped_db.delta_balance(address, delta)
+            self.deltas[address] = self.deltas.get(address, 0) + delta
+        else:
+            super().delta_balance(address, delta)
+
+    #
+    # Nonce
+    #
+    def get_nonce(self, address):
+        self._read((address, NONCE))
+        return self.wrapped_db.get_nonce(address)
+
+    def set_nonce(self, address, nonce):
+        self.wrapped_db.set_nonce(address, nonce)
+        self._write((address, NONCE), nonce)
+
+    def increment_nonce(self, address):
+        self.set_nonce(address, self.get_nonce(address) + 1)
+
+    #
+    # Code
+    #
+    def get_code(self, address):
+        self._read((address, CODE))
+        return self.wrapped_db.get_code(address)
+
+    def set_code(self, address, code):
+        self.wrapped_db.set_code(address, code)
+        self._write((address, CODE), code)
+
+    def get_code_hash(self, address):
+        self._read((address, CODE))
+        return self.wrapped_db.get_code_hash(address)
+
+    def delete_code(self, address):
+        self.wrapped_db.delete_code(address)
+        self._write((address, CODE), None)
+
+    #
+    # Account Methods
+    #
+    def account_has_code_or_nonce(self, address):
+        self._read((address, NONCE), (address, CODE))
+        return self.wrapped_db.account_has_code_or_nonce(address)
+
+    def delete_account(self, address):
+        self.wrapped_db.delete_account(address)
+        self._wipe(address, DELETE_ACCOUNT)
+
+    def account_exists(self, address):
+        self._read((address, EXISTS))
+        return self.wrapped_db.account_exists(address)
+
+    def touch_account(self, address):
+        self.wrapped_db.touch_account(address)
+        self._write((address, TOUCH), True)
+
+    def account_is_empty(self, address):
+        self._read((address, NONCE), (address, CODE), (address, BALANCE))
+        return self.wrapped_db.account_is_empty(address)
+
+    #
+    # Record and discard API
+    #
+    def record(self):
+        changeset = self.wrapped_db.record()
+        recorded = (dict(self.writes), dict(self.wiped), dict(self.deltas))
+        self._checkpoints.append((changeset, recorded))
+        return changeset
+
+    def discard(self, changeset):
+        self.wrapped_db.discard(changeset)
+        self.writes, self.wiped, self.deltas = self._pop_checkpoint(changeset)
+
+    def commit(self, changeset):
+        self.wrapped_db.commit(changeset)
+        self._pop_checkpoint(changeset)
+
+    def _pop_checkpoint(self, changeset):
+        while self._checkpoints:
+            checkpoint, recorded = self._checkpoints.pop()
+            if checkpoint == changeset:
+                return recorded
+        raise ValueError("No checkpoint {0} was recorded".format(changeset))
+
+    #
+    # Unrecorded
+    #
+    @property
+    def state_root(self):
+        return self.wrapped_db.state_root
+
+    @state_root.setter
+    def state_root(self, value):
+        self.wrapped_db.state_root = value
+
+    def has_root(self, state_root: bytes) -> bool:
+        return self.wrapped_db.has_root(state_root)
+
+    def make_state_root(self) -> Hash32:
+        return self.wrapped_db.make_state_root()
+
+    def persist(self) -> None:
+        self.wrapped_db.persist()
+
+
+def apply_account_changes(account_db, wiped, writes, deltas):
+    """
+    Apply changes recorded by a :class:`RecordingAccountDB` to the given account database.
+    """
+    for address, wipe_kind in wiped.items():
+        if wipe_kind == DELETE_ACCOUNT:
+            account_db.delete_account(address)
+        else:
+            account_db.delete_storage(address)
+
+    for key, value in writes.items():
+        address, account_part = key[0], key[1]
+        if account_part == BALANCE:
+            account_db.set_balance(address, value)
+        elif account_part == NONCE:
+            account_db.set_nonce(address, value)
+        elif account_part == CODE and value is None:
+            account_db.delete_code(address)
+        elif account_part == CODE:
+            account_db.set_code(address, value)
+        elif account_part == STORAGE:
+            account_db.set_storage(address, key[2], value)
+        elif account_part == TOUCH:
+            account_db.touch_account(address)
+        else:
+            raise ValueError("Unknown account part: {0}".format(account_part))
+
+    for address, delta in deltas.items():
+        account_db.delta_balance(address, delta)
+
+
+class ComputationResult:
+    """
+    The parts of a finished computation needed to make the receipt of its transaction,
+    which unlike the computation itself can be sent between processes.
+    """
+    def __init__(self, computation: 'BaseComputation') -> None:
+        self.is_error = computation.is_error
+        self._log_entries = computation.get_log_entries()
+        self._gas_remaining = computation.get_gas_remaining()
+        self._gas_refund = computation.get_gas_refund()
+
+    def get_log_entries(self) -> Tuple[Tuple[bytes, List[int], bytes], ...]:
+        return self._log_entries
+
+    def get_gas_remaining(self) -> int:
+        return self._gas_remaining
+
+    def get_gas_refund(self) -> int:
+        return self._gas_refund
+
+
+class SpeculationResult:
+    """
+    The outcome of executing a transaction against the state at the start of its block.
+    """
+    def __init__(self, recording_db: RecordingAccountDB, computation: 'BaseComputation') -> None:
+        self.reads = recording_db.reads
+        self.writes = recording_db.writes
+        self.wiped = recording_db.wiped
+        self.deltas = recording_db.deltas
+        self.computation = ComputationResult(computation)
+
+
+def speculate_transactions(state_class: Type['BaseState'],
+                           db: BaseDB,
+                           execution_context: ExecutionContext,
+                           state_root: Hash32,
+                           transactions: Iterable[BaseTransaction],
+                           ) -> Tuple[Optional[SpeculationResult], ...]:
+    """
+    Execute each of the given transactions on its own against the state with
+    the given root, recording what they read and write.  The result for a
+    transaction which couldn't be executed this way is ``None``.
+    """
+    logger = logging.getLogger('evm.vm.speculative.speculate_transactions')
+    results = []  # type: List[Optional[SpeculationResult]]
+    for transaction in transactions:
+        state = state_class(db, execution_context, state_root)
+        recording_db = RecordingAccountDB(
+            state.account_db,
+            commutative_addresses=(execution_context.coinbase,),
+        )
+        state.account_db = recording_db
+        try:
+            computation = state.execute_transaction(transaction)
+        except Exception as err:
+            logger.debug("Speculative execution of transaction failed: %r", err)
+            results.append(None)
+        else:
+            results.append(SpeculationResult(recording_db, computation))
+    return tuple(results)
+
+
+class BlockWrites:
+    """
+    The parts of the state written by the transactions of a block which were applied so far.
+    """
+    def __init__(self) -> None:
+        self.keys = set()  # type: Set[Tuple]
+        self.addresses = set()  # type: Set[Address]
+        self.wiped_addresses = set()  # type: Set[Address]
+
+    def add(self,
+            writes: Dict[Tuple, Any],
+            wiped: Dict[Address, str],
+            deltas: Dict[Address, int]) -> None:
+        self.keys.update(writes)
+        self.keys.update((address, BALANCE) for address in deltas)
+        self.addresses.update(key[0] for key in writes)
+        self.addresses.update(wiped, deltas)
+        self.wiped_addresses.update(wiped)
+
+    def conflicts_with(self, reads: Iterable[Tuple]) -> bool:
+        """
+        Return whether any of the given reads may have seen a different value
+        than after the writes.
+        """
+        for key in reads:
+            address, account_part = key[0], key[1]
+            if account_part == EXISTS:
+                if address in self.addresses:
+                    return True
+            elif address in self.wiped_addresses or key in self.keys:
+                return True
+        return False
+
+
+class SpeculativeExecutor:
+    """
+    Applies the transactions of a block by first executing all of them concurrently,
+    each against the state at the start of the block, using the given ``executor``.
+
+    The results are then applied in block order, as long as a transaction didn't
+    read any part of the state which was written by an earlier transaction of the
+    block.  Otherwise the transaction is executed again, on top of the earlier ones.
+    The resulting blocks, receipts and state are the same as when executing the
+    transactions one after another.
+
+    To speculate in worker processes, the database of the chain must be picklable
+    and readable from other processes, like :class:`~evm.db.backends.sqlite.SQLiteDB`.
+    Transactions which can't be speculated on, for example because the workers
+    can't read the state of the parent block yet, are simply executed again.
+
+    :attr:`success_rate` tells how many of the transactions didn't have to be
+    executed again.
+    """
+    logger = logging.getLogger('evm.vm.speculative.SpeculativeExecutor')
+
+    def __init__(self,
+                 executor: Executor = None,
+                 transactions_per_task: int = 8) -> None:
+        if executor is None:
+            executor = ProcessPoolExecutor()
+        self.executor = executor
+        self.transactions_per_task = transactions_per_task
+        self.transaction_count = 0
+        self.speculated_count = 0
+
+    @property
+    def success_rate(self) -> float:
+        """
+        Return the share of transactions which didn't have to be executed again.
+        """
+        if self.transaction_count:
+            return self.speculated_count / self.transaction_count
+        else:
+            return 0.0
+
+    def apply_all_transactions(self, vm, transactions, base_header):
+        """
+        Apply the given transactions to the state of the given VM, like
+        :meth:`~evm.vm.base.VM._apply_all_transactions`.
+        """
+        state = vm.state
+        batches = tuple(partition_all(self.transactions_per_task, transactions))
+        futures = [
+            self.executor.submit(
+                speculate_transactions,
+                type(state),
+                vm.chaindb.db,
+                state.execution_context,
+                base_header.state_root,
+                batch,
+            )
+            for batch
+            in batches
+        ]
+
+        receipts = []
+        header = base_header
+        block_writes = BlockWrites()
+        speculated_count = 0
+
+        for future, batch in zip(futures, batches):
+            try:
+                results = future.result()
+            except Exception as err:
+                self.logger.debug("Speculative execution of transactions failed: %r", err)
+                results = (None,) * len(batch)
+
+            for transaction, result in zip(batch, results):
+                if result is not None and not block_writes.conflicts_with(result.reads):
+                    header, receipt = self._apply_speculation(vm, header, transaction, result)
+                    block_writes.add(result.writes, result.wiped, result.deltas)
+                    speculated_count += 1
+                else:
+                    recording_db = RecordingAccountDB(state.account_db)
+                    state.account_db = recording_db
+                    try:
+                        header, receipt, _ = vm.apply_transaction(header, transaction)
+                    finally:
+                        state.account_db = recording_db.wrapped_db
+                    block_writes.add(recording_db.writes, recording_db.wiped, recording_db.deltas)
+                receipts.append(receipt)
+
+        self.transaction_count += len(transactions)
+        self.speculated_count += speculated_count
+        self.logger.debug(
+            "Speculated on %d of %d transactions of block #%d",
+            speculated_count,
+            len(transactions),
+            base_header.block_number,
+        )
+        return header, receipts
+
+    @staticmethod
+    def _apply_speculation(vm, header, transaction, result):
+        vm.validate_transaction_against_header(header, transaction)
+        state = vm.state
+        apply_account_changes(state.account_db, result.wiped, result.writes, result.deltas)
+        state_root = state.account_db.make_state_root()
+        receipt = vm.make_receipt(header, transaction, result.computation, state)
+
+        new_header = header.copy(
+            bloom=int(BloomFilter(header.bloom) | receipt.bloom),
+            gas_used=receipt.gas_used,
+            state_root=state_root,
+        )
+        return new_header, receipt
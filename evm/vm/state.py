@@ -224,7 +224,7 @@ class BaseState(Configurable, metaclass=ABCMeta):
         return self.transaction_executor(self)
 
     @abstractmethod
-    def execute_transaction(self):
+    def execute_transaction(self, transaction):
         raise NotImplementedError()
 
 
@@ -1,4 +1,6 @@
+from abc import ABC, abstractmethod
 import asyncio
+from collections import Counter, deque
 from concurrent.futures import ProcessPoolExecutor
 import logging
 import math
@@ -8,9 +10,11 @@ import time
 from typing import (
     Any,
     Callable,
+    Deque,
     Dict,
     List,
     NamedTuple,
+    Sequence,
     Tuple,
     Union,
     cast,
@@ -28,9 +32,16 @@ from eth_utils import (
 
 from evm.constants import BLANK_ROOT_HASH, EMPTY_UNCLE_HASH, GENESIS_PARENT_HASH
 from evm.chains import AsyncChain
+from evm.chains.pipeline import recover_senders
 from evm.db.chain import AsyncChainDB
 from evm.db.trie import make_trie_root_and_nodes
-from evm.exceptions import HeaderNotFound
+from evm.consensus.pow import (
+    FULL_SEAL_CHECKS,
+    SealCheckPolicy,
+    coro_check_pow_of_headers,
+)
+from evm.exceptions import HeaderNotFound, ValidationError
+from evm.rlp.blocks import BaseBlock
 from evm.rlp.headers import BlockHeader
 from evm.rlp.receipts import Receipt
 from evm.rlp.transactions import BaseTransaction
@@ -62,10 +73,14 @@ class FastChainSyncer(BaseService, PeerPoolSubscriber):
     def __init__(self,
                  chaindb: AsyncChainDB,
                  peer_pool: PeerPool,
-                 token: CancelToken = None) -> None:
+                 token: CancelToken = None,
+                 seal_check_policy: SealCheckPolicy = FULL_SEAL_CHECKS) -> None:
         super().__init__(token)
         self.chaindb = chaindb
         self.peer_pool = peer_pool
+        self.seal_check_policy = seal_check_policy
+        # Number of headers whose seal was checked or skipped by the seal check policy.
+        self.seal_check_counts: Counter[str] = Counter()
         self._syncing = False
         self._sync_complete = asyncio.Event()
         self._sync_requests: asyncio.Queue[ETHPeer] = asyncio.Queue()
@@ -164,7 +179,7 @@ class FastChainSyncer(BaseService, PeerPoolSubscriber):
                 peer.head_td, peer, head_td)
             return
 
-        self.logger.info("Starting sync with %s", peer)
+        self.logger.info("Starting sync with %s, seal checks: %s", peer, self.seal_check_policy)
         # FIXME: Fetch a batch of headers, in reverse order, starting from our current head, and
         # find the common ancestor between our chain and the peer's.
         start_at = max(0, head.block_number - eth.MAX_HEADERS_FETCH)
@@ -194,6 +209,10 @@ class FastChainSyncer(BaseService, PeerPoolSubscriber):
             except NoEligiblePeers:
                 self.logger.info("No peers have the blocks we want, aborting sync")
                 break
+            except ValidationError as err:
+                self.logger.warn("Invalid headers from %s, aborting sync: %s", peer, err)
+                await peer.cancel()
+                break
             start_at = head_number + 1
 
     async def _calculate_td(self, headers: List[BlockHeader]) -> int:
@@ -212,8 +231,20 @@ class FastChainSyncer(BaseService, PeerPoolSubscriber):
             td += header.difficulty
         return td
 
+    async def _validate_seals(self, headers: List[BlockHeader]) -> None:
+        """Check the seals of the given headers selected by our seal check policy, on all our
+        executor's processes.
+
+        Raises ValidationError for the first header whose seal is invalid.
+        """
+        checked_headers = self.seal_check_policy.select_headers(headers)
+        await self.wait_first(coro_check_pow_of_headers(checked_headers, self._executor))
+        self.seal_check_counts['checked'] += len(checked_headers)
+        self.seal_check_counts['skipped'] += len(headers) - len(checked_headers)
+
     async def _process_headers(self, peer: ETHPeer, headers: List[BlockHeader]) -> int:
         start = time.time()
+        await self._validate_seals(headers)
         target_td = await self._calculate_td(headers)
         await self._download_block_parts(
             target_td,
@@ -240,16 +271,18 @@ class FastChainSyncer(BaseService, PeerPoolSubscriber):
 
         # FIXME: Get the bodies returned by self._download_block_parts above and use persit_block
         # here.
-        for header in headers:
-            await self.chaindb.coro_persist_header(header)
+        await self.chaindb.coro_persist_header_chain(headers)
 
         head = await self.chaindb.coro_get_canonical_head()
         self.logger.info(
-            "Imported %d headers in %0.2f seconds, new head: #%d (%s)",
+            "Imported %d headers in %0.2f seconds, new head: #%d (%s), seals checked: %d, "
+            "skipped: %d",
             len(headers),
             time.time() - start,
             head.block_number,
             encode_hex(head.hash)[2:8],
+            self.seal_check_counts['checked'],
+            self.seal_check_counts['skipped'],
         )
         # Quite often the header batch we receive here includes headers past the peer's reported
         # head (via the NewBlock msg), so we can't compare our head's hash to the peer's in
@@ -412,6 +445,7 @@ class FastChainSyncer(BaseService, PeerPoolSubscriber):
         downloaded: List[DownloadedBlockPart] = []
         for (receipts, (receipt_root, trie_dict_data)) in zip(receipts_by_block, receipts_tries):
             await self.chaindb.coro_persist_trie_data_dict(trie_dict_data)
+            await self.chaindb.coro_persist_block_receipts(receipt_root, receipts)
             downloaded.append(DownloadedBlockPart(receipts, receipt_root))
         self._downloaded_receipts.put_nowait((peer, downloaded))
 
@@ -428,6 +462,7 @@ class FastChainSyncer(BaseService, PeerPoolSubscriber):
         downloaded: List[DownloadedBlockPart] = []
         for (body, (tx_root, trie_dict_data)) in zip(bodies, transactions_tries):
             await self.chaindb.coro_persist_trie_data_dict(trie_dict_data)
+            await self.chaindb.coro_persist_block_transactions(tx_root, body.transactions)
             uncles_hash = await self.chaindb.coro_persist_uncles(body.uncles)
             downloaded.append(DownloadedBlockPart(body, (tx_root, uncles_hash)))
         self._downloaded_bodies.put_nowait((peer, downloaded))
@@ -441,20 +476,35 @@ class FastChainSyncer(BaseService, PeerPoolSubscriber):
         peer.sub_proto.send_block_headers([])
 
 
+class BlockImportSubscriber(ABC):
+
+    @abstractmethod
+    def notify_block_imported(self, header: BlockHeader) -> None:
+        """
+        Called with the header of each block once it's imported, from the thread which
+        imported it.
+        """
+        raise NotImplementedError("Must be implemented by subclasses")
+
+
 class RegularChainSyncer(FastChainSyncer):
     """
     Sync with the Ethereum network by fetching block headers/bodies and importing them.
 
     Here, the run() method will execute the sync loop forever, until our CancelToken is triggered.
     """
+    # The number of blocks whose transaction senders are recovered ahead of their import.
+    max_prepared_blocks = 16
 
     def __init__(self,
                  chain: AsyncChain,
                  chaindb: AsyncChainDB,
                  peer_pool: PeerPool,
-                 token: CancelToken = None) -> None:
+                 token: CancelToken = None,
+                 import_subscribers: Sequence[BlockImportSubscriber] = ()) -> None:
         super().__init__(chaindb, peer_pool, token)
         self.chain = chain
+        self.import_subscribers = import_subscribers
 
     async def _handle_msg(self, peer: ETHPeer, cmd: protocol.Command,
                           msg: protocol._DecodedMsgType) -> None:
@@ -549,33 +599,55 @@ class RegularChainSyncer(FastChainSyncer):
         self.logger.info("Got block bodies for chain segment")
 
         parts_by_key = dict((part.unique_key, part.part) for part in downloaded_parts)
-        for header in headers:
-            vm_class = self.chain.get_vm_class_for_block_number(header.block_number)
-            block_class = vm_class.get_block_class()
-
-            if _is_body_empty(header):
-                transactions: List[BaseTransaction] = []
-                uncles: List[BlockHeader] = []
-            else:
-                body = cast(eth.BlockBody, parts_by_key[_body_key(header)])
-                tx_class = block_class.get_transaction_class()
-                transactions = [tx_class.from_base_transaction(tx)
-                                for tx in body.transactions]
-                uncles = body.uncles
-
-            block = block_class(header, transactions, uncles)
-            t = time.time()
-            # FIXME: Instead of using self.wait_first() here we should pass our cancel_token to
-            # coro_import_block() so that it can cancel the actual import-block task. See
-            # https://github.com/ethereum/py-evm/issues/665 for details.
-            await self.wait_first(self.chain.coro_import_block(block, perform_validation=True))
-            self.logger.info("Imported block %d (%d txs) in %f seconds",
-                             block.number, len(transactions), time.time() - t)
+        # The transaction senders of the next blocks are recovered in our process pool while the
+        # current block is imported, so that it's not on the critical path of block execution.
+        loop = asyncio.get_event_loop()
+        preparing: Deque['asyncio.Future[BaseBlock]'] = deque()
+        try:
+            for header in headers:
+                block = self._make_block(header, parts_by_key)
+                preparing.append(loop.run_in_executor(self._executor, recover_senders, block))
+                if len(preparing) >= self.max_prepared_blocks:
+                    await self._import_block(await self.wait_first(preparing.popleft()))
+            while preparing:
+                await self._import_block(await self.wait_first(preparing.popleft()))
+        finally:
+            for future in preparing:
+                future.cancel()
 
         head = await self.chaindb.coro_get_canonical_head()
         self.logger.info("Imported chain segment, new head: #%d", head.block_number)
         return head.block_number
 
+    def _make_block(self,
+                    header: BlockHeader,
+                    parts_by_key: Dict[Union[bytes, Tuple[bytes, bytes]], Any]) -> BaseBlock:
+        vm_class = self.chain.get_vm_class_for_block_number(header.block_number)
+        block_class = vm_class.get_block_class()
+
+        if _is_body_empty(header):
+            transactions: List[BaseTransaction] = []
+            uncles: List[BlockHeader] = []
+        else:
+            body = cast(eth.BlockBody, parts_by_key[_body_key(header)])
+            tx_class = block_class.get_transaction_class()
+            transactions = [tx_class.from_base_transaction(tx)
+                            for tx in body.transactions]
+            uncles = body.uncles
+
+        return block_class(header, transactions, uncles)
+
+    async def _import_block(self, block: BaseBlock) -> None:
+        t = time.time()
+        # FIXME: Instead of using self.wait_first() here we should pass our cancel_token to
+        # coro_import_block() so that it can cancel the actual import-block task. See
+        # https://github.com/ethereum/py-evm/issues/665 for details.
+        await self.wait_first(self.chain.coro_import_block(block, perform_validation=True))
+        self.logger.info("Imported block %d (%d txs) in %f seconds",
+                         block.number, len(block.transactions), time.time() - t)
+        for subscriber in self.import_subscribers:
+            subscriber.notify_block_imported(block.header)
+
 
 class DownloadedBlockPart(NamedTuple):
     part: Union[eth.BlockBody, List[Receipt]]
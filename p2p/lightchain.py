@@ -1,7 +1,10 @@
 import asyncio
+from concurrent.futures import ProcessPoolExecutor
 import logging
+import os
 from typing import (
     Any,
+    Counter,
     Callable,
     cast,
     Dict,
@@ -27,8 +30,13 @@ from eth_utils import (
 
 from trie import HexaryTrie
 
+from evm.consensus.pow import (
+    FULL_SEAL_CHECKS,
+    SealCheckPolicy,
+    coro_check_pow_of_headers,
+)
 from evm.constants import GENESIS_BLOCK_NUMBER
-from evm.exceptions import BlockNotFound, HeaderNotFound
+from evm.exceptions import BlockNotFound, HeaderNotFound, ValidationError
 from evm.rlp.accounts import Account
 from evm.rlp.headers import BlockHeader
 from evm.rlp.receipts import Receipt
@@ -65,13 +73,28 @@ class LightPeerChain(PeerPoolSubscriber, BaseService):
     reply_timeout = REPLY_TIMEOUT
     headerdb: 'BaseAsyncHeaderDB' = None
 
-    def __init__(self, headerdb: 'BaseAsyncHeaderDB', peer_pool: PeerPool) -> None:
+    def __init__(self,
+                 headerdb: 'BaseAsyncHeaderDB',
+                 peer_pool: PeerPool,
+                 seal_check_policy: SealCheckPolicy = FULL_SEAL_CHECKS) -> None:
         super().__init__()
         self.headerdb = headerdb
         self.peer_pool = peer_pool
+        self.seal_check_policy = seal_check_policy
+        # Number of headers whose seal was checked or skipped by the seal check policy.
+        self.seal_check_counts: Counter[str] = Counter()
         self._announcement_queue: asyncio.Queue[Tuple[LESPeer, les.HeadInfo]] = asyncio.Queue()
         self._last_processed_announcements: Dict[LESPeer, les.HeadInfo] = {}
         self._pending_replies: Dict[int, Callable[[protocol._DecodedMsgType], None]] = {}
+        # Use CPU_COUNT - 1 processes to make sure we always leave one CPU idle so that it can run
+        # asyncio's event loop.
+        if os.cpu_count() is None:
+            # Need this because os.cpu_count() returns None when the # of CPUs is indeterminable.
+            cpu_count = 1
+        else:
+            # Light nodes often run on a single CPU, which still needs one process.
+            cpu_count = max(1, os.cpu_count() - 1)
+        self._executor = ProcessPoolExecutor(cpu_count)
 
     def register_peer(self, peer: BasePeer) -> None:
         peer = cast(LESPeer, peer)
@@ -117,7 +140,7 @@ class LightPeerChain(PeerPoolSubscriber, BaseService):
 
         If .stop() is called, we'll disconnect from all peers and return.
         """
-        self.logger.info("Running LightPeerChain...")
+        self.logger.info("Running LightPeerChain, seal checks: %s", self.seal_check_policy)
         with self.subscribe(self.peer_pool):
             asyncio.ensure_future(self._process_announcements())
             while True:
@@ -196,8 +219,7 @@ class LightPeerChain(PeerPoolSubscriber, BaseService):
             except TooManyTimeouts:
                 raise LESAnnouncementProcessingError(
                     "Too many timeouts when fetching headers from {}".format(peer))
-            for header in headers:
-                await self.headerdb.coro_persist_header(header)
+            await self._persist_header_chain(peer, headers)
             start_block = chain_head.block_number
         else:
             start_block = last_peer_announcement.block_number - head_info.reorg_depth
@@ -221,13 +243,37 @@ class LightPeerChain(PeerPoolSubscriber, BaseService):
             except TooManyTimeouts:
                 raise LESAnnouncementProcessingError(
                     "Too many timeouts when fetching headers from {}".format(peer))
-            for header in batch:
-                await self.headerdb.coro_persist_header(header)
-                start_block = header.block_number
-            self.logger.info("synced headers up to #%s", start_block)
+            await self._persist_header_chain(peer, batch)
+            start_block = batch[-1].block_number
+            self.logger.info(
+                "synced headers up to #%s, seals checked: %d, skipped: %d",
+                start_block,
+                self.seal_check_counts['checked'],
+                self.seal_check_counts['skipped'],
+            )
+
+    async def _validate_seals(self, headers: List[BlockHeader]) -> None:
+        """Check the seals of the given headers selected by our seal check policy, on all our
+        executor's processes.
+
+        Raises ValidationError for the first header whose seal is invalid.
+        """
+        checked_headers = self.seal_check_policy.select_headers(headers)
+        await self.wait_first(coro_check_pow_of_headers(checked_headers, self._executor))
+        self.seal_check_counts['checked'] += len(checked_headers)
+        self.seal_check_counts['skipped'] += len(headers) - len(checked_headers)
+
+    async def _persist_header_chain(self, peer: LESPeer, headers: List[BlockHeader]) -> None:
+        try:
+            await self._validate_seals(headers)
+        except ValidationError as err:
+            raise LESAnnouncementProcessingError(
+                "Invalid headers from {}: {}".format(peer, err))
+        await self.headerdb.coro_persist_header_chain(headers)
 
     async def _cleanup(self):
         self.logger.info("Stopping LightPeerChain...")
+        self._executor.shutdown(wait=False)
 
     async def _wait_for_reply(self, request_id: int) -> Dict[str, Any]:
         reply = None
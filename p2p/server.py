@@ -5,6 +5,7 @@ import secrets
 import socket
 from typing import (
     cast,
+    Sequence,
     Tuple,
     Type,
     TYPE_CHECKING,
@@ -19,6 +20,10 @@ from eth_keys import datatypes
 from eth_utils import big_endian_to_int
 
 from evm.chains import AsyncChain
+from evm.consensus.pow import (
+    FULL_SEAL_CHECKS,
+    SealCheckPolicy,
+)
 from evm.db.backends.base import BaseDB
 from evm.db.chain import AsyncChainDB
 
@@ -29,6 +34,7 @@ from p2p.auth import (
 from p2p.cancel_token import (
     CancelToken,
 )
+from p2p.chain import BlockImportSubscriber
 from p2p.constants import (
     ENCRYPTED_AUTH_MSG_LEN,
     DEFAULT_MAX_PEERS,
@@ -80,6 +86,8 @@ class Server(BaseService):
                  peer_pool_class: Type[PeerPool] = PreferredNodePeerPool,
                  bootstrap_nodes: Tuple[Node, ...] = None,
                  token: CancelToken = None,
+                 seal_check_policy: SealCheckPolicy = FULL_SEAL_CHECKS,
+                 import_subscribers: Sequence[BlockImportSubscriber] = (),
                  ) -> None:
         super().__init__(token)
         self.headerdb = headerdb
@@ -93,6 +101,8 @@ class Server(BaseService):
         self.peer_pool_class = peer_pool_class
         self.max_peers = max_peers
         self.bootstrap_nodes = bootstrap_nodes
+        self.seal_check_policy = seal_check_policy
+        self.import_subscribers = import_subscribers
 
         if not bootstrap_nodes:
             self.logger.warn("Running with no bootstrap nodes")
@@ -223,7 +233,14 @@ class Server(BaseService):
     def _make_syncer(self, peer_pool: PeerPool) -> BaseService:
         # This method exists only so that ShardSyncer can provide a different implementation.
         return FullNodeSyncer(
-            self.chain, self.chaindb, self.base_db, peer_pool, self.cancel_token)
+            self.chain,
+            self.chaindb,
+            self.base_db,
+            peer_pool,
+            self.cancel_token,
+            seal_check_policy=self.seal_check_policy,
+            import_subscribers=self.import_subscribers,
+        )
 
     def _make_peer_pool(self, discovery: DiscoveryProtocol) -> PeerPool:
         # This method exists only so that ShardSyncer can provide a different implementation.
@@ -1,14 +1,19 @@
 import logging
 import time
+from typing import Sequence
 
 from evm.chains import AsyncChain
+from evm.consensus.pow import (
+    FULL_SEAL_CHECKS,
+    SealCheckPolicy,
+)
 from evm.constants import BLANK_ROOT_HASH
 from evm.db.backends.base import BaseDB
 from evm.db.chain import AsyncChainDB
 
 from p2p.cancel_token import CancelToken
 from p2p.peer import PeerPool
-from p2p.chain import FastChainSyncer, RegularChainSyncer
+from p2p.chain import BlockImportSubscriber, FastChainSyncer, RegularChainSyncer
 from p2p.service import BaseService
 from p2p.state import StateDownloader
 from p2p.utils import unclean_close_exceptions
@@ -32,12 +37,16 @@ class FullNodeSyncer(BaseService):
                  chaindb: AsyncChainDB,
                  base_db: BaseDB,
                  peer_pool: PeerPool,
-                 token: CancelToken = None) -> None:
+                 token: CancelToken = None,
+                 seal_check_policy: SealCheckPolicy = FULL_SEAL_CHECKS,
+                 import_subscribers: Sequence[BlockImportSubscriber] = ()) -> None:
         super().__init__(token)
         self.chain = chain
         self.chaindb = chaindb
         self.base_db = base_db
         self.peer_pool = peer_pool
+        self.seal_check_policy = seal_check_policy
+        self.import_subscribers = import_subscribers
 
     async def _run(self) -> None:
         try:
@@ -53,7 +62,12 @@ class FullNodeSyncer(BaseService):
         if head.timestamp < time.time() - FAST_SYNC_CUTOFF:
             # Fast-sync chain data.
             self.logger.info("Starting fast-sync; current head: #%d", head.block_number)
-            chain_syncer = FastChainSyncer(self.chaindb, self.peer_pool, self.cancel_token)
+            chain_syncer = FastChainSyncer(
+                self.chaindb,
+                self.peer_pool,
+                self.cancel_token,
+                seal_check_policy=self.seal_check_policy,
+            )
             await chain_syncer.run()
 
         # Ensure we have the state for our current head.
@@ -72,7 +86,12 @@ class FullNodeSyncer(BaseService):
         # latest head so that we can start importing blocks.
         new_chain = type(self.chain)(self.base_db)
         chain_syncer = RegularChainSyncer(
-            new_chain, self.chaindb, self.peer_pool, self.cancel_token)
+            new_chain,
+            self.chaindb,
+            self.peer_pool,
+            self.cancel_token,
+            import_subscribers=self.import_subscribers,
+        )
         await chain_syncer.run()
 
     async def _cleanup(self):
@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+"""
+Measures the block import speed of every fork VM on synthetic chains of several
+workloads, and writes the results as JSON, to track them over time::
+
+    python scripts/benchmark/block_import.py --num-blocks 10 --num-transactions 20 \\
+        --output results.json
+
+For each fork and workload, a chain is built once with the tester chain, and then
+imported into a fresh in-memory database.  The import is timed without tracing,
+and imported once more with :mod:`tracemalloc` to measure the peak memory use.
+"""
+import argparse
+import json
+import logging
+import platform
+import sys
+import time
+import tracemalloc
+from typing import (  # noqa: F401
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Tuple,
+)
+
+import evm
+from evm.chains.tester import MAINNET_VMS
+from evm.db.backends.base import BaseDB
+from evm.db.backends.memory import MemoryDB
+from evm.rlp.blocks import BaseBlock
+
+from chain_generator import (
+    WORKLOADS,
+    generate_chain,
+    new_chain,
+)
+
+
+logger = logging.getLogger('benchmark.block_import')
+
+
+class CountingDB(BaseDB):
+    """
+    Counts the reads and writes made to the wrapped database.
+    """
+    def __init__(self, wrapped_db: BaseDB) -> None:
+        self.wrapped_db = wrapped_db
+        self.reads = 0
+        self.writes = 0
+
+    def __getitem__(self, key: bytes) -> bytes:
+        self.reads += 1
+        return self.wrapped_db[key]
+
+    def _exists(self, key: bytes) -> bool:
+        self.reads += 1
+        return key in self.wrapped_db
+
+    def __setitem__(self, key: bytes, value: bytes) -> None:
+        self.writes += 1
+        self.wrapped_db[key] = value
+
+    def __delitem__(self, key: bytes) -> None:
+        self.writes += 1
+        del self.wrapped_db[key]
+
+
+def import_blocks(fork: str, blocks: Tuple[BaseBlock, ...]) -> Tuple[float, CountingDB]:
+    db = CountingDB(MemoryDB())
+    chain = new_chain(fork, db)
+    # Leave the reads and writes of the genesis state out.
+    db.reads = db.writes = 0
+    start = time.perf_counter()
+    for block in blocks:
+        chain.import_block(block)
+    return time.perf_counter() - start, db
+
+
+def measure_peak_memory(fork: str, blocks: Tuple[BaseBlock, ...]) -> int:
+    tracemalloc.start()
+    try:
+        import_blocks(fork, blocks)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def benchmark(fork: str, workload: str, num_blocks: int, num_transactions: int) -> Dict[str, Any]:
+    blocks = generate_chain(fork, workload, num_blocks, num_transactions)
+    duration, db = import_blocks(fork, blocks)
+    peak_memory = measure_peak_memory(fork, blocks)
+
+    total_transactions = sum(len(block.transactions) for block in blocks)
+    total_gas = sum(block.header.gas_used for block in blocks)
+    return {
+        'fork': fork,
+        'workload': workload,
+        'blocks': len(blocks),
+        'transactions': total_transactions,
+        'gas_used': total_gas,
+        'duration': duration,
+        'transactions_per_second': total_transactions / duration,
+        'gas_per_second': total_gas / duration,
+        'db_reads_per_block': db.reads / len(blocks),
+        'db_writes_per_block': db.writes / len(blocks),
+        'peak_memory_bytes': peak_memory,
+    }
+
+
+def run(forks: Iterable[str],
+        workloads: Iterable[str],
+        num_blocks: int,
+        num_transactions: int) -> Dict[str, Any]:
+    results = []  # type: List[Dict[str, Any]]
+    for fork in forks:
+        for workload in workloads:
+            result = benchmark(fork, workload, num_blocks, num_transactions)
+            logger.info(
+                "%s %s: %.1f tx/s, %.2f Mgas/s, %.0f reads and %.0f writes per block, "
+                "%.1f MB peak memory",
+                fork,
+                workload,
+                result['transactions_per_second'],
+                result['gas_per_second'] / 1e6,
+                result['db_reads_per_block'],
+                result['db_writes_per_block'],
+                result['peak_memory_bytes'] / 1e6,
+            )
+            results.append(result)
+
+    return {
+        'evm_version': evm.__version__,
+        'python_version': platform.python_version(),
+        'python_implementation': platform.python_implementation(),
+        'timestamp': int(time.time()),
+        'num_blocks': num_blocks,
+        'num_transactions': num_transactions,
+        'results': results,
+    }
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stderr)
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--fork', action='append', choices=list(MAINNET_VMS), dest='forks')
+    parser.add_argument(
+        '--workload',
+        action='append',
+        choices=sorted(WORKLOADS),
+        dest='workloads',
+    )
+    parser.add_argument('--num-blocks', type=int, default=10)
+    parser.add_argument('--num-transactions', type=int, default=20)
+    parser.add_argument('--output', type=argparse.FileType('w'), default=sys.stdout)
+    args = parser.parse_args()
+
+    report = run(
+        args.forks or list(MAINNET_VMS),
+        args.workloads or sorted(WORKLOADS),
+        args.num_blocks,
+        args.num_transactions,
+    )
+    json.dump(report, args.output, indent=2, sort_keys=True)
+    args.output.write('\n')
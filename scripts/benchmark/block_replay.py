@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+"""
+Captures the database reads made while importing a range of blocks from a synced
+database, and replays the import of those blocks in memory from the capture alone::
+
+    python scripts/benchmark/block_replay.py capture \\
+        --db-path ~/.local/share/trinity/mainnet/chain \\
+        --from-block 4000000 --to-block 4000010 blocks.capture
+    python scripts/benchmark/block_replay.py replay blocks.capture --rounds 5
+
+The replay doesn't depend on the disk or on the state of the synced database, so
+it gives the same workload every time, e.g. to compare changes to the VM.
+"""
+import argparse
+import logging
+import statistics
+import time
+from pathlib import Path
+from typing import Type  # noqa: F401
+
+from evm import (
+    MainnetChain,
+    RopstenChain,
+)
+from evm.chains.base import BaseChain  # noqa: F401
+from evm.tools.block_capture import (
+    BlockCapture,
+    capture_blocks,
+    replay_blocks,
+)
+
+
+logger = logging.getLogger('benchmark.block_replay')
+
+CHAIN_CLASSES = {
+    'mainnet': MainnetChain,
+    'ropsten': RopstenChain,
+}
+
+
+def capture(chain_class: Type[BaseChain],
+            db_path: Path,
+            from_block: int,
+            to_block: int,
+            output_path: Path) -> None:
+    from evm.db.backends.level import LevelDB
+    db = LevelDB(db_path=db_path)
+    chain = chain_class(db)
+    blocks = tuple(
+        chain.get_canonical_block_by_number(block_number)
+        for block_number
+        in range(from_block, to_block + 1)
+    )
+
+    block_capture = capture_blocks(chain_class, db, blocks)
+    block_capture.save(output_path)
+    logger.info(
+        "Captured %d values read while importing blocks #%d to #%d into %s",
+        len(block_capture.data),
+        from_block,
+        to_block,
+        output_path,
+    )
+
+
+def replay(chain_class: Type[BaseChain], capture_path: Path, rounds: int) -> None:
+    block_capture = BlockCapture.load(capture_path)
+    durations = []
+    for round_number in range(1, rounds + 1):
+        # Decode the blocks every round, so that every round recovers the transaction senders.
+        blocks = block_capture.get_blocks(chain_class)
+        start = time.perf_counter()
+        replay_blocks(chain_class, block_capture, blocks)
+        duration = time.perf_counter() - start
+        durations.append(duration)
+
+        total_gas = sum(block.header.gas_used for block in blocks)
+        logger.info(
+            "Round %d: imported %d blocks in %.2fs (%.1f blocks/s, %.2f Mgas/s)",
+            round_number,
+            len(blocks),
+            duration,
+            len(blocks) / duration,
+            total_gas / duration / 1e6,
+        )
+
+    logger.info(
+        "Fastest round: %.2fs, median round: %.2fs",
+        min(durations),
+        statistics.median(durations),
+    )
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--chain', choices=sorted(CHAIN_CLASSES), default='mainnet')
+    subparsers = parser.add_subparsers(dest='command')
+
+    capture_parser = subparsers.add_parser('capture')
+    capture_parser.add_argument('--db-path', type=Path, required=True)
+    capture_parser.add_argument('--from-block', type=int, required=True)
+    capture_parser.add_argument('--to-block', type=int, required=True)
+    capture_parser.add_argument('output', type=Path)
+
+    replay_parser = subparsers.add_parser('replay')
+    replay_parser.add_argument('capture', type=Path)
+    replay_parser.add_argument('--rounds', type=int, default=3)
+
+    args = parser.parse_args()
+    chain_class = CHAIN_CLASSES[args.chain]
+    if args.command == 'capture':
+        capture(chain_class, args.db_path, args.from_block, args.to_block, args.output)
+    elif args.command == 'replay':
+        replay(chain_class, args.capture, args.rounds)
+    else:
+        parser.error("Please choose a command")
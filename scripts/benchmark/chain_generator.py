@@ -0,0 +1,190 @@
+"""
+Builds synthetic chains on the tester chain, with blocks full of transactions of
+one kind of workload, for the block import benchmarks.
+
+Every chain starts from the same genesis state, which funds a sender account and
+contains the contracts which the workloads call.
+"""
+from typing import (  # noqa: F401
+    Callable,
+    Dict,
+    Tuple,
+    Type,
+)
+
+from eth_keys import keys
+from eth_utils import (
+    big_endian_to_int,
+    decode_hex,
+    to_wei,
+)
+
+from evm import constants
+from evm.chains.base import BaseChain
+from evm.chains.tester import (
+    MAINNET_VMS,
+    MainnetTesterChain,
+)
+from evm.db.backends.base import BaseDB
+from evm.db.backends.memory import MemoryDB
+from evm.rlp.blocks import BaseBlock
+from evm.vm.base import BaseVM  # noqa: F401
+
+
+FUNDED_PRIVATE_KEY = keys.PrivateKey(
+    decode_hex('0x45a915e4d060149eb4365960e6a7a45f334393093061116b197e3240065ff2d8')
+)
+FUNDED_ADDRESS = FUNDED_PRIVATE_KEY.public_key.to_canonical_address()
+
+# Transfers `amount` tokens from the caller to `to`, with the calldata `to | amount`.
+# The balance of each address is stored in the storage slot of that address.
+TOKEN_CODE = decode_hex(
+    '0x33546020358181116024579081900333556000358054820190556000523360206000a1005bfe'
+)
+TOKEN_ADDRESS = decode_hex('0x' + '10' * 20)
+
+# Writes `i` into the storage slot `offset + i` for each `i` from `n` down to 1, with
+# the calldata `n | offset`.
+STORAGE_LOOP_CODE = decode_hex(
+    '0x6000355b80156018578060203501819055600190036003565b00'
+)
+STORAGE_LOOP_ADDRESS = decode_hex('0x' + '20' * 20)
+
+# Calls itself with `depth - 1` until `depth` is zero, with the calldata `depth`.
+DEEP_CALL_CODE = decode_hex(
+    '0x60003580156022576001900360005260006000602060006000306110005a03f150005b00'
+)
+DEEP_CALL_ADDRESS = decode_hex('0x' + '30' * 20)
+
+GENESIS_PARAMS = {
+    'block_number': constants.GENESIS_BLOCK_NUMBER,
+    'difficulty': constants.GENESIS_DIFFICULTY,
+    # The tester chain keeps the gas limit of the genesis block, leave room for
+    # plenty of transactions in every block.
+    'gas_limit': 100000000,
+    'parent_hash': constants.GENESIS_PARENT_HASH,
+    'coinbase': constants.GENESIS_COINBASE,
+    'nonce': constants.GENESIS_NONCE,
+    'mix_hash': constants.GENESIS_MIX_HASH,
+    'extra_data': constants.GENESIS_EXTRA_DATA,
+    'timestamp': 1501851927,
+}
+GENESIS_STATE = {
+    FUNDED_ADDRESS: {
+        'balance': to_wei(1000000, 'ether'),
+        'nonce': 0,
+        'code': b'',
+        'storage': {},
+    },
+    TOKEN_ADDRESS: {
+        'balance': 0,
+        'nonce': 0,
+        'code': TOKEN_CODE,
+        'storage': {big_endian_to_int(FUNDED_ADDRESS): 10 ** 30},
+    },
+    STORAGE_LOOP_ADDRESS: {
+        'balance': 0,
+        'nonce': 0,
+        'code': STORAGE_LOOP_CODE,
+        'storage': {},
+    },
+    DEEP_CALL_ADDRESS: {
+        'balance': 0,
+        'nonce': 0,
+        'code': DEEP_CALL_CODE,
+        'storage': {},
+    },
+}
+
+# Number of storage slots written by each transaction of the storage loop workload.
+STORAGE_LOOP_SLOTS = 50
+# Depth of the nested calls made by each transaction of the deep call workload.
+CALL_DEPTH = 64
+
+
+def _word(value: int) -> bytes:
+    return value.to_bytes(32, 'big')
+
+
+def _recipient(index: int) -> bytes:
+    return (0x1000 + index).to_bytes(20, 'big')
+
+
+def value_transfer(index: int) -> Tuple[bytes, int, int, bytes]:
+    return _recipient(index), 1, 21000, b''
+
+
+def token_transfer(index: int) -> Tuple[bytes, int, int, bytes]:
+    return TOKEN_ADDRESS, 0, 100000, _word(big_endian_to_int(_recipient(index))) + _word(1)
+
+
+def contract_deployment(index: int) -> Tuple[bytes, int, int, bytes]:
+    init_code = decode_hex('0x60{0:02x}600c60003960{0:02x}6000f3'.format(len(TOKEN_CODE)))
+    return constants.CREATE_CONTRACT_ADDRESS, 0, 200000, init_code + TOKEN_CODE
+
+
+def storage_loop(index: int) -> Tuple[bytes, int, int, bytes]:
+    data = _word(STORAGE_LOOP_SLOTS) + _word(index * STORAGE_LOOP_SLOTS)
+    return STORAGE_LOOP_ADDRESS, 0, 30000 + STORAGE_LOOP_SLOTS * 25000, data
+
+
+def deep_call(index: int) -> Tuple[bytes, int, int, bytes]:
+    return DEEP_CALL_ADDRESS, 0, 1000000, _word(CALL_DEPTH)
+
+
+# Each workload gives the recipient, value, gas and data of the transaction with
+# the given index in the chain.
+WORKLOADS = {
+    'value-transfer': value_transfer,
+    'token-transfer': token_transfer,
+    'contract-deployment': contract_deployment,
+    'storage-loop': storage_loop,
+    'deep-call': deep_call,
+}  # type: Dict[str, Callable[[int], Tuple[bytes, int, int, bytes]]]
+
+
+def get_chain_class(fork: str) -> Type[BaseChain]:
+    """
+    Return a tester chain class which uses the VM of the given fork from the genesis block on.
+    """
+    vm_class = MAINNET_VMS[fork]  # type: Type[BaseVM]
+    return MainnetTesterChain.configure(
+        __name__='{0}BenchmarkChain'.format(vm_class.__name__),
+        vm_configuration=((constants.GENESIS_BLOCK_NUMBER, vm_class),),
+    )
+
+
+def new_chain(fork: str, db: BaseDB) -> BaseChain:
+    """
+    Initialize a chain with the benchmark genesis state in the given database.
+    """
+    return get_chain_class(fork).from_genesis(db, GENESIS_PARAMS, GENESIS_STATE)
+
+
+def generate_chain(fork: str,
+                   workload: str,
+                   num_blocks: int,
+                   num_transactions: int) -> Tuple[BaseBlock, ...]:
+    """
+    Build ``num_blocks`` blocks of ``num_transactions`` transactions of the given
+    workload each, on top of the benchmark genesis block.
+    """
+    make_transaction = WORKLOADS[workload]
+    chain = new_chain(fork, MemoryDB())
+    blocks = []
+    nonce = 0
+    for _ in range(num_blocks):
+        for _ in range(num_transactions):
+            to, value, gas, data = make_transaction(nonce)
+            transaction = chain.get_vm().create_unsigned_transaction(
+                nonce=nonce,
+                gas_price=1,
+                gas=gas,
+                to=to,
+                value=value,
+                data=data,
+            ).as_signed_transaction(FUNDED_PRIVATE_KEY)
+            chain.apply_transaction(transaction)
+            nonce += 1
+        blocks.append(chain.mine_block())
+    return tuple(blocks)
@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+"""
+Compares the block import speed of the persistent database backends.
+
+A chain of blocks full of value transfers is built in memory once, and then
+imported into a fresh database of every backend which is available::
+
+    python scripts/benchmark/db_backends.py --num-blocks 100 --num-transactions 20
+"""
+import argparse
+import contextlib
+import logging
+import tempfile
+import time
+from pathlib import Path
+from typing import (
+    Callable,
+    ContextManager,
+    Iterator,
+    Tuple,
+)
+
+from eth_keys import keys
+from eth_utils import (
+    decode_hex,
+    to_wei,
+)
+
+from evm import Chain
+from evm import constants
+from evm.db.backends.base import BaseDB
+from evm.db.backends.memory import MemoryDB
+from evm.db.backends.sqlite import SQLiteDB
+from evm.rlp.blocks import BaseBlock
+from evm.vm.forks.byzantium import ByzantiumVM
+
+
+logger = logging.getLogger('benchmark.db_backends')
+
+FUNDED_PRIVATE_KEY = keys.PrivateKey(
+    decode_hex('0x45a915e4d060149eb4365960e6a7a45f334393093061116b197e3240065ff2d8')
+)
+FUNDED_ADDRESS = FUNDED_PRIVATE_KEY.public_key.to_canonical_address()
+
+GENESIS_PARAMS = {
+    'block_number': constants.GENESIS_BLOCK_NUMBER,
+    'difficulty': constants.GENESIS_DIFFICULTY,
+    'gas_limit': constants.GENESIS_GAS_LIMIT,
+    'parent_hash': constants.GENESIS_PARENT_HASH,
+    'coinbase': constants.GENESIS_COINBASE,
+    'nonce': constants.GENESIS_NONCE,
+    'mix_hash': constants.GENESIS_MIX_HASH,
+    'extra_data': constants.GENESIS_EXTRA_DATA,
+    'timestamp': 1501851927,
+}
+GENESIS_STATE = {
+    FUNDED_ADDRESS: {
+        'balance': to_wei(1000000, 'ether'),
+        'nonce': 0,
+        'code': b'',
+        'storage': {},
+    },
+}
+
+# The blocks are not actually mined, so the proof of work seal can't be checked.
+BenchmarkChain = Chain.configure(
+    __name__='BenchmarkChain',
+    vm_configuration=(
+        (constants.GENESIS_BLOCK_NUMBER, ByzantiumVM.configure(
+            validate_seal=lambda self, header: None,
+        )),
+    ),
+    network_id=1337,
+)
+
+
+def build_blocks(num_blocks: int, num_transactions: int) -> Tuple[BaseBlock, ...]:
+    chain = BenchmarkChain.from_genesis(MemoryDB(), GENESIS_PARAMS, GENESIS_STATE)
+    blocks = []
+    for block_number in range(1, num_blocks + 1):
+        for tx_index in range(num_transactions):
+            vm = chain.get_vm()
+            recipient = (block_number * num_transactions + tx_index).to_bytes(20, 'big')
+            transaction = vm.create_unsigned_transaction(
+                nonce=vm.state.account_db.get_nonce(FUNDED_ADDRESS),
+                gas_price=1,
+                gas=21000,
+                to=recipient,
+                value=1,
+                data=b'',
+            ).as_signed_transaction(FUNDED_PRIVATE_KEY)
+            chain.apply_transaction(transaction)
+        blocks.append(chain.mine_block())
+    return tuple(blocks)
+
+
+@contextlib.contextmanager
+def no_batch(db: BaseDB) -> Iterator[None]:
+    yield
+
+
+def import_blocks(db: BaseDB,
+                  blocks: Tuple[BaseBlock, ...],
+                  batch: Callable[[BaseDB], ContextManager]) -> float:
+    chain = BenchmarkChain.from_genesis(db, GENESIS_PARAMS, GENESIS_STATE)
+    start = time.perf_counter()
+    for block in blocks:
+        with batch(db):
+            chain.import_block(block)
+    return time.perf_counter() - start
+
+
+@contextlib.contextmanager
+def leveldb(db_dir: Path) -> Iterator[BaseDB]:
+    from evm.db.backends.level import LevelDB
+    db = LevelDB(db_path=db_dir / 'leveldb')
+    try:
+        yield db
+    finally:
+        db.db.close()
+
+
+@contextlib.contextmanager
+def sqlite(db_dir: Path) -> Iterator[SQLiteDB]:
+    db = SQLiteDB(db_path=db_dir / 'db.sqlite')
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def run(num_blocks: int, num_transactions: int) -> None:
+    logger.info("Building %d blocks with %d transactions each", num_blocks, num_transactions)
+    blocks = build_blocks(num_blocks, num_transactions)
+
+    configurations = (
+        ('LevelDB', leveldb, no_batch),
+        ('SQLiteDB', sqlite, no_batch),
+        ('SQLiteDB (one transaction per block)', sqlite, SQLiteDB.write_batch),
+    )
+    for name, open_db, batch in configurations:
+        with tempfile.TemporaryDirectory() as db_dir:
+            try:
+                with open_db(Path(db_dir)) as db:
+                    duration = import_blocks(db, blocks, batch)
+            except ImportError as err:
+                logger.info("%s: skipped (%s)", name, err)
+                continue
+
+        logger.info(
+            "%s: imported %d blocks in %.2fs (%.1f blocks/s, %.1f tx/s)",
+            name,
+            len(blocks),
+            duration,
+            len(blocks) / duration,
+            len(blocks) * num_transactions / duration,
+        )
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num-blocks', type=int, default=50)
+    parser.add_argument('--num-transactions', type=int, default=20)
+    args = parser.parse_args()
+
+    run(args.num_blocks, args.num_transactions)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""
+Compares the speed of checking seals in the light mode, which computes the
+dataset items of each hash from the cache with pyethash, and in the full dataset
+mode, which reads them from the dataset, and estimates how long generating the
+dataset of an epoch takes::
+
+    python scripts/benchmark/ethash_modes.py --block-number 0 --num-hashes 500
+
+The speed of hashimoto doesn't depend on the content of the dataset, so without
+``--dataset``, the full dataset mode reads a sparse file of the right size.
+"""
+import argparse
+import contextlib
+import logging
+import mmap
+import tempfile
+import time
+from typing import (
+    Callable,
+    Iterator,
+)
+
+from pyethash import (
+    hashimoto_light,
+    mkcache_bytes,
+)
+
+from evm.consensus import ethash
+
+
+logger = logging.getLogger('benchmark.ethash_modes')
+
+MINING_HASH = b'\x11' * 32
+
+
+def time_hashes(num_hashes: int, compute_hash: Callable[[int], object]) -> float:
+    """
+    Return the average number of seconds taken by ``compute_hash`` for one nonce.
+    """
+    start = time.perf_counter()
+    for nonce in range(num_hashes):
+        compute_hash(nonce)
+    return (time.perf_counter() - start) / num_hashes
+
+
+@contextlib.contextmanager
+def open_dataset(path: str, full_size: int) -> Iterator[mmap.mmap]:
+    with contextlib.ExitStack() as stack:
+        if path is None:
+            dataset_file = stack.enter_context(tempfile.TemporaryFile())
+            dataset_file.truncate(full_size)
+        else:
+            dataset_file = stack.enter_context(open(path, 'rb'))
+        dataset = mmap.mmap(dataset_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield dataset
+        finally:
+            dataset.close()
+
+
+def run(block_number: int, num_hashes: int, num_items: int, dataset_path: str) -> None:
+    full_size = ethash.get_full_size(block_number)
+    logger.info("Generating the cache of epoch %d", block_number // ethash.EPOCH_LENGTH)
+    cache = mkcache_bytes(block_number)
+
+    light_seconds = time_hashes(
+        num_hashes,
+        lambda nonce: hashimoto_light(block_number, cache, MINING_HASH, nonce),
+    )
+    logger.info("Light mode: %.2fms per hash", light_seconds * 1000)
+
+    with open_dataset(dataset_path, full_size) as dataset:
+        full_seconds = time_hashes(
+            num_hashes,
+            lambda nonce: ethash.hashimoto_full(dataset, MINING_HASH, nonce),
+        )
+    logger.info(
+        "Full dataset mode: %.2fms per hash, %.1fx the speed of the light mode",
+        full_seconds * 1000,
+        light_seconds / full_seconds,
+    )
+
+    cache_items = ethash.get_cache_items(cache)
+    start = time.perf_counter()
+    for index in range(num_items):
+        ethash.calc_dataset_item(cache_items, index)
+    item_seconds = (time.perf_counter() - start) / num_items
+    logger.info(
+        "Dataset generation: %.2fms per item, about %.1f hours for the %d items of the epoch",
+        item_seconds * 1000,
+        item_seconds * (full_size // ethash.HASH_BYTES) / 3600,
+        full_size // ethash.HASH_BYTES,
+    )
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--block-number', type=int, default=0)
+    parser.add_argument('--num-hashes', type=int, default=500)
+    parser.add_argument('--num-items', type=int, default=1000)
+    parser.add_argument(
+        '--dataset',
+        help="The dataset file of the epoch, as generated in the full dataset mode",
+    )
+    args = parser.parse_args()
+
+    run(args.block_number, args.num_hashes, args.num_items, args.dataset)
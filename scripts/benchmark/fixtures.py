@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+"""
+Times the execution of the JSON state test fixtures, flags the fixtures which are
+much slower per unit of gas than the others of their fork, and compares the
+timings with the ones of an earlier run::
+
+    python scripts/benchmark/fixtures.py --fork Byzantium --output baseline.json
+    python scripts/benchmark/fixtures.py --fork Byzantium --baseline baseline.json
+
+The exit status is 1 if any fixture became slower than in the baseline.
+"""
+import argparse
+import fnmatch
+import logging
+import os
+import platform
+import sys
+import time
+
+import evm
+from evm.tools.fixture_timing import (
+    STATE_TEST_VMS,
+    compare_timings,
+    find_outliers,
+    find_state_fixtures,
+    load_timings,
+    save_timings,
+    time_state_fixtures,
+)
+
+
+logger = logging.getLogger('benchmark.fixtures')
+
+ROOT_PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_FIXTURES_DIR = os.path.join(ROOT_PROJECT_DIR, 'fixtures', 'GeneralStateTests')
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--fixtures-dir', default=DEFAULT_FIXTURES_DIR)
+    parser.add_argument('--fork', action='append', choices=sorted(STATE_TEST_VMS), dest='forks')
+    parser.add_argument(
+        '--pattern',
+        default='*',
+        help="Only time the fixture files whose path, relative to the fixtures "
+             "directory, matches this pattern",
+    )
+    parser.add_argument('--rounds', type=int, default=1)
+    parser.add_argument('--outlier-factor', type=float, default=10.0)
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--min-duration', type=float, default=0.01)
+    parser.add_argument('--baseline')
+    parser.add_argument('--output')
+    args = parser.parse_args()
+
+    fixtures = tuple(
+        fixture
+        for fixture
+        in find_state_fixtures(args.fixtures_dir, args.forks)
+        if fnmatch.fnmatch(os.path.relpath(fixture[0], args.fixtures_dir), args.pattern)
+    )
+    logger.info("Timing %d fixtures", len(fixtures))
+    timings = tuple(time_state_fixtures(args.fixtures_dir, fixtures, args.rounds))
+
+    for fork in sorted(set(timing.fork for timing in timings)):
+        fork_timings = tuple(timing for timing in timings if timing.fork == fork)
+        total_duration = sum(timing.duration for timing in fork_timings)
+        total_gas = sum(timing.gas_used for timing in fork_timings)
+        logger.info(
+            "%s: %d fixtures in %.2fs, %.2f Mgas/s",
+            fork,
+            len(fork_timings),
+            total_duration,
+            total_gas / total_duration / 1e6 if total_duration else 0,
+        )
+
+    for timing in find_outliers(timings, args.outlier_factor, args.min_duration):
+        logger.info(
+            "Outlier: %s took %.3fs, %.2f Mgas/s",
+            timing.fixture_id,
+            timing.duration,
+            timing.gas_per_second / 1e6,
+        )
+
+    if args.output:
+        save_timings(
+            args.output,
+            timings,
+            evm_version=evm.__version__,
+            python_version=platform.python_version(),
+            python_implementation=platform.python_implementation(),
+            timestamp=int(time.time()),
+        )
+
+    if args.baseline:
+        regressions = compare_timings(
+            timings,
+            load_timings(args.baseline),
+            args.tolerance,
+            args.min_duration,
+        )
+        for change in regressions:
+            logger.info(
+                "Slower: %s took %.3fs, %.3fs in the baseline (%.2fx)",
+                change.fixture_id,
+                change.duration,
+                change.baseline_duration,
+                change.ratio,
+            )
+        if regressions:
+            sys.exit(1)
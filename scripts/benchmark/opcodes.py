@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+"""
+Measures the speed of the interpreter on tight loops of each opcode family and of
+each precompile, with every fork VM, and writes the results as JSON::
+
+    python scripts/benchmark/opcodes.py --fork byzantium --rounds 5 --output results.json
+
+Each benchmark runs its loop body many times with ``VM.execute_bytecode``.  The
+time of a loop with an empty body is subtracted, so ``ns_per_op`` is the time
+taken by one execution of the body alone, including pushing its arguments.
+"""
+import argparse
+import json
+import logging
+import platform
+import sys
+import time
+from typing import (  # noqa: F401
+    Any,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Tuple,
+)
+
+from eth_utils import (
+    decode_hex,
+    keccak,
+)
+from py_ecc import bn128
+
+import evm
+from evm.chains.tester import MAINNET_VMS
+from evm.db.backends.memory import MemoryDB
+
+from chain_generator import (
+    FUNDED_ADDRESS,
+    FUNDED_PRIVATE_KEY,
+    new_chain,
+)
+
+
+logger = logging.getLogger('benchmark.opcodes')
+
+CONTRACT_ADDRESS = decode_hex('0x' + '40' * 20)
+
+# Copies the call data to memory, for the bodies which use it as input.
+CALLDATA_TO_MEMORY = decode_hex('0x366000600037')
+
+
+class Benchmark(NamedTuple):
+    name: str
+    family: str
+    body: bytes
+    iterations: int
+    prologue: bytes = b''
+    data: bytes = b''
+    forks: Tuple[str, ...] = tuple(MAINNET_VMS)
+
+
+def loop(body: bytes, iterations: int, prologue: bytes = b'') -> bytes:
+    """
+    Return code which runs ``prologue`` once and then the stack neutral ``body``
+    ``iterations`` times.
+    """
+    loop_start = len(prologue) + 5
+    return b''.join((
+        prologue,
+        b'\x63' + iterations.to_bytes(4, 'big'),  # PUSH4 iterations
+        b'\x5b',  # JUMPDEST
+        body,
+        decode_hex('0x60019003'),  # PUSH1 1 SWAP1 SUB
+        b'\x80\x61' + loop_start.to_bytes(2, 'big') + b'\x57',  # DUP1 PUSH2 loop_start JUMPI
+        decode_hex('0x5000'),  # POP STOP
+    ))
+
+
+def call_body(address: int) -> bytes:
+    """
+    Return a body which calls the given address with the whole call data as input.
+    """
+    # PUSH1 0 PUSH1 0 CALLDATASIZE PUSH1 0 PUSH1 0 PUSH1 address PUSH3 0x100000 CALL POP
+    return decode_hex('0x60006000366000600060{0:02x}62100000f150'.format(address))
+
+
+def _ecrecover_input() -> bytes:
+    message_hash = keccak(b'benchmark')
+    signature = FUNDED_PRIVATE_KEY.sign_msg_hash(message_hash)
+    return b''.join((
+        message_hash,
+        (signature.v + 27).to_bytes(32, 'big'),
+        signature.r.to_bytes(32, 'big'),
+        signature.s.to_bytes(32, 'big'),
+    ))
+
+
+def _g1_generator() -> bytes:
+    return b''.join(coordinate.n.to_bytes(32, 'big') for coordinate in bn128.G1)
+
+
+def _g2_generator() -> bytes:
+    # The imaginary part of each coordinate comes first.
+    return b''.join(
+        coefficient.n.to_bytes(32, 'big')
+        for coordinate in bn128.G2
+        for coefficient in reversed(coordinate.coeffs)
+    )
+
+
+_MODEXP_INPUT = b''.join((
+    (32).to_bytes(32, 'big'),
+    (32).to_bytes(32, 'big'),
+    (32).to_bytes(32, 'big'),
+    keccak(b'base'),
+    keccak(b'exponent'),
+    keccak(b'modulus'),
+))
+BYZANTIUM_FORKS = ('byzantium',)
+
+BENCHMARKS = (
+    # PUSH1 3 PUSH1 5 <op> POP
+    Benchmark('ADD', 'arithmetic', decode_hex('0x600360050150'), 20000),
+    Benchmark('MUL', 'arithmetic', decode_hex('0x600360050250'), 20000),
+    Benchmark('DIV', 'arithmetic', decode_hex('0x600360050450'), 20000),
+    Benchmark('EXP', 'arithmetic', decode_hex('0x60ff60050a50'), 20000),
+    # PUSH1 7 PUSH1 3 PUSH1 5 ADDMOD POP
+    Benchmark('ADDMOD', 'arithmetic', decode_hex('0x6007600360050850'), 20000),
+    Benchmark('LT', 'comparison', decode_hex('0x600360051050'), 20000),
+    Benchmark('EQ', 'comparison', decode_hex('0x600360051450'), 20000),
+    Benchmark('AND', 'comparison', decode_hex('0x600360051650'), 20000),
+    # PUSH1 3 ISZERO POP
+    Benchmark('ISZERO', 'comparison', decode_hex('0x60031550'), 20000),
+    # PUSH1 1 PUSH1 0 MSTORE
+    Benchmark('MSTORE', 'memory', decode_hex('0x6001600052'), 20000),
+    # PUSH1 0 MLOAD POP
+    Benchmark('MLOAD', 'memory', decode_hex('0x60005150'), 20000),
+    # PUSH1 1 PUSH1 0 SSTORE
+    Benchmark('SSTORE', 'storage', decode_hex('0x6001600055'), 10000),
+    # PUSH1 0 SLOAD POP
+    Benchmark('SLOAD', 'storage', decode_hex('0x60005450'), 10000),
+    # PUSH1 32 PUSH1 0 SHA3 POP
+    Benchmark('SHA3', 'sha3', decode_hex('0x602060002050'), 10000),
+    # Calls an empty account.
+    Benchmark('CALL', 'call', call_body(0xff), 2000),
+    # PUSH1 0 PUSH1 0 PUSH1 0 CREATE POP
+    Benchmark('CREATE', 'call', decode_hex('0x600060006000f050'), 1000),
+    # PUSH1 32 PUSH1 0 LOG0
+    Benchmark('LOG0', 'log', decode_hex('0x60206000a0'), 10000),
+    # PUSH1 1 PUSH1 32 PUSH1 0 LOG1
+    Benchmark('LOG1', 'log', decode_hex('0x600160206000a1'), 10000),
+    Benchmark(
+        'ecrecover', 'precompile', call_body(1), 200, CALLDATA_TO_MEMORY, _ecrecover_input()
+    ),
+    Benchmark('sha256', 'precompile', call_body(2), 2000, CALLDATA_TO_MEMORY, b'\x01' * 128),
+    Benchmark('ripemd160', 'precompile', call_body(3), 2000, CALLDATA_TO_MEMORY, b'\x01' * 128),
+    Benchmark('identity', 'precompile', call_body(4), 2000, CALLDATA_TO_MEMORY, b'\x01' * 128),
+    Benchmark(
+        'modexp', 'precompile', call_body(5), 200, CALLDATA_TO_MEMORY, _MODEXP_INPUT,
+        BYZANTIUM_FORKS,
+    ),
+    Benchmark(
+        'ecadd', 'precompile', call_body(6), 200, CALLDATA_TO_MEMORY,
+        _g1_generator() * 2, BYZANTIUM_FORKS,
+    ),
+    Benchmark(
+        'ecmul', 'precompile', call_body(7), 20, CALLDATA_TO_MEMORY,
+        _g1_generator() + keccak(b'scalar'), BYZANTIUM_FORKS,
+    ),
+    Benchmark(
+        'ecpairing', 'precompile', call_body(8), 2, CALLDATA_TO_MEMORY,
+        _g1_generator() + _g2_generator(), BYZANTIUM_FORKS,
+    ),
+)  # type: Tuple[Benchmark, ...]
+
+
+def execute(fork: str, code: bytes, data: bytes) -> Tuple[float, int]:
+    """
+    Execute the given code with a fresh VM of the fork, and return the time it
+    took and the gas it used.
+    """
+    vm = new_chain(fork, MemoryDB()).get_vm()
+    gas = 10 ** 10
+    start = time.perf_counter()
+    computation = vm.execute_bytecode(
+        origin=FUNDED_ADDRESS,
+        gas_price=1,
+        gas=gas,
+        to=CONTRACT_ADDRESS,
+        sender=FUNDED_ADDRESS,
+        value=0,
+        data=data,
+        code=code,
+    )
+    duration = time.perf_counter() - start
+    if computation.is_error:
+        raise computation._error
+    return duration, gas - computation.get_gas_remaining()
+
+
+def measure(fork: str, benchmark: Benchmark, rounds: int) -> Dict[str, Any]:
+    code = loop(benchmark.body, benchmark.iterations, benchmark.prologue)
+    empty_code = loop(b'', benchmark.iterations, benchmark.prologue)
+    # The fastest round is the least disturbed by the rest of the machine.
+    duration, gas_used = min(execute(fork, code, benchmark.data) for _ in range(rounds))
+    empty_duration, empty_gas_used = min(
+        execute(fork, empty_code, benchmark.data) for _ in range(rounds)
+    )
+    return {
+        'fork': fork,
+        'name': benchmark.name,
+        'family': benchmark.family,
+        'iterations': benchmark.iterations,
+        'duration': duration,
+        'gas_used': gas_used,
+        'ns_per_op': max(duration - empty_duration, 0) / benchmark.iterations * 1e9,
+        'gas_per_second': (gas_used - empty_gas_used) / max(duration - empty_duration, 1e-9),
+    }
+
+
+def run(forks: Iterable[str], names: Iterable[str], rounds: int) -> Dict[str, Any]:
+    selected_names = set(names)
+    results = []  # type: List[Dict[str, Any]]
+    for fork in forks:
+        for benchmark in BENCHMARKS:
+            if fork not in benchmark.forks:
+                continue
+            elif selected_names and benchmark.name not in selected_names:
+                continue
+            result = measure(fork, benchmark, rounds)
+            logger.info(
+                "%s %s: %.0f ns/op, %.2f Mgas/s",
+                fork,
+                benchmark.name,
+                result['ns_per_op'],
+                result['gas_per_second'] / 1e6,
+            )
+            results.append(result)
+
+    return {
+        'evm_version': evm.__version__,
+        'python_version': platform.python_version(),
+        'python_implementation': platform.python_implementation(),
+        'timestamp': int(time.time()),
+        'rounds': rounds,
+        'results': results,
+    }
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stderr)
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--fork', action='append', choices=list(MAINNET_VMS), dest='forks')
+    parser.add_argument(
+        '--benchmark',
+        action='append',
+        choices=[benchmark.name for benchmark in BENCHMARKS],
+        dest='names',
+    )
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--output', type=argparse.FileType('w'), default=sys.stdout)
+    args = parser.parse_args()
+
+    report = run(args.forks or list(MAINNET_VMS), args.names or (), args.rounds)
+    json.dump(report, args.output, indent=2, sort_keys=True)
+    args.output.write('\n')
@@ -26,6 +26,8 @@ deps = {
         "coincurve>=7.0.0,<8.0.0",
         "plyvel==1.0.4",
         "eth-hash[pycryptodome]",
+        # Required by the full ethash dataset mode.
+        "pysha3>=1.0.0,<2.0.0",
     ],
     'p2p': [
         "aiohttp>=2.3.1,<3.0.0",
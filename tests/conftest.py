@@ -1,5 +1,6 @@
 import logging
 import sys
+import time
 
 # from evm.utils.logging import TRACE_LEVEL_NUM
 
@@ -15,11 +16,51 @@ from eth_keys import keys
 from evm import Chain
 from evm import constants
 from evm.db.backends.memory import MemoryDB
+from evm.tools.fixture_tests import (
+    NormalizedFixtureCache,
+    idfn,
+    update_fixture_durations,
+)
 # TODO: tests should not be locked into one set of VM rules.  Look at expanding
 # to all mainnet vms.
 from evm.vm.forks.spurious_dragon import SpuriousDragonVM
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        '--fixture-shard',
+        default=None,
+        help="Only run the JSON fixture tests of one shard, given as <index>/<count>.  "
+             "The shards are balanced by the durations of earlier runs.",
+    )
+
+
+_fixture_durations = {}
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    start = time.perf_counter()
+    yield
+    duration = time.perf_counter() - start
+
+    callspec = getattr(item, 'callspec', None)
+    if callspec is not None and 'fixture_data' in callspec.params:
+        _fixture_durations[idfn(callspec.params['fixture_data'])] = duration
+
+
+def pytest_sessionfinish(session):
+    if _fixture_durations:
+        update_fixture_durations(session.config.cache, _fixture_durations)
+
+
+@pytest.fixture(scope="session")
+def normalized_fixture_cache(request):
+    cache = NormalizedFixtureCache(str(request.config.cache.makedir('pyevm-normalized-fixtures')))
+    yield cache
+    cache.flush()
+
+
 @pytest.fixture(autouse=True, scope="session")
 def vm_logger():
     logger = logging.getLogger('evm')
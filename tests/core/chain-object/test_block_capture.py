@@ -0,0 +1,105 @@
+import pytest
+
+from eth_utils import decode_hex
+
+from evm import Chain
+from evm import constants
+from evm.db.backends.memory import MemoryDB
+from evm.exceptions import StateRootNotFound
+from evm.tools.block_capture import (
+    BlockCapture,
+    capture_blocks,
+    replay_blocks,
+)
+from evm.vm.forks.byzantium import ByzantiumVM
+
+from tests.core.helpers import (
+    new_transaction,
+)
+
+
+RECIPIENT = decode_hex('0xa94f5374fce5edbc8e2a8697c15331677e6ebf0c')
+
+GENESIS_PARAMS = {
+    'block_number': constants.GENESIS_BLOCK_NUMBER,
+    'difficulty': constants.GENESIS_DIFFICULTY,
+    'gas_limit': constants.GENESIS_GAS_LIMIT,
+    'parent_hash': constants.GENESIS_PARENT_HASH,
+    'coinbase': constants.GENESIS_COINBASE,
+    'nonce': constants.GENESIS_NONCE,
+    'mix_hash': constants.GENESIS_MIX_HASH,
+    'extra_data': constants.GENESIS_EXTRA_DATA,
+    'timestamp': 1501851927,
+}
+
+# The blocks are not actually mined, so the proof of work seal can't be checked.
+CaptureTestChain = Chain.configure(
+    __name__='CaptureTestChain',
+    vm_configuration=(
+        (
+            constants.GENESIS_BLOCK_NUMBER,
+            ByzantiumVM.configure(validate_seal=lambda self, header: None),
+        ),
+    ),
+    network_id=1337,
+)
+
+
+@pytest.fixture
+def chain(funded_address, funded_address_initial_balance, funded_address_private_key):
+    genesis_state = {
+        funded_address: {
+            'balance': funded_address_initial_balance,
+            'nonce': 0,
+            'code': b'',
+            'storage': {},
+        }
+    }
+    chain = CaptureTestChain.from_genesis(MemoryDB(), GENESIS_PARAMS, genesis_state)
+    for _ in range(6):
+        vm = chain.get_vm()
+        tx = new_transaction(vm, funded_address, RECIPIENT, 10, funded_address_private_key)
+        chain.apply_transaction(tx)
+        chain.mine_block()
+    return chain
+
+
+@pytest.fixture
+def blocks(chain):
+    return tuple(chain.get_canonical_block_by_number(number) for number in range(3, 6))
+
+
+def test_capture_does_not_change_database(chain, blocks):
+    db_contents = dict(chain.chaindb.db.kv_store)
+
+    capture_blocks(CaptureTestChain, chain.chaindb.db, blocks)
+
+    assert chain.chaindb.db.kv_store == db_contents
+
+
+def test_replay_captured_blocks(chain, blocks):
+    capture = capture_blocks(CaptureTestChain, chain.chaindb.db, blocks)
+
+    assert capture.get_blocks(CaptureTestChain) == blocks
+    assert len(capture.data) < len(chain.chaindb.db.kv_store)
+    assert replay_blocks(CaptureTestChain, capture) == blocks
+    # Every replay starts from the captured data again.
+    assert replay_blocks(CaptureTestChain, capture) == blocks
+
+
+def test_replay_only_uses_captured_data(chain, blocks):
+    capture = capture_blocks(CaptureTestChain, chain.chaindb.db, blocks)
+    parent_header = chain.get_block_header_by_hash(blocks[0].header.parent_hash)
+    del capture.data[parent_header.state_root]
+
+    with pytest.raises(StateRootNotFound):
+        replay_blocks(CaptureTestChain, capture)
+
+
+def test_save_and_load_capture(tmpdir, chain, blocks):
+    capture_path = tmpdir.join('blocks.capture')
+    capture_blocks(CaptureTestChain, chain.chaindb.db, blocks).save(capture_path)
+
+    capture = BlockCapture.load(capture_path)
+
+    assert replay_blocks(CaptureTestChain, capture) == blocks
@@ -69,3 +69,31 @@ def test_building_block_incrementally_with_multiple_transactions(
 
     for expected, actual in zip(txns, mined_block.transactions):
         assert expected == actual
+
+
+def test_building_block_incrementally_only_stores_final_item_lists(
+        chain,
+        funded_address,
+        funded_address_private_key):
+    schema = chain.chaindb.schema
+    pending_roots = []
+    for _ in range(2):
+        tx = new_transaction(
+            chain.get_vm(),
+            from_=funded_address,
+            to=ADDRESS_1010,
+            private_key=funded_address_private_key,
+        )
+        new_block, _, _ = chain.apply_transaction(tx)
+        pending_roots.append((new_block.header.transaction_root, new_block.header.receipt_root))
+
+    mined_block = chain.mine_block()
+    transaction_root, receipt_root = pending_roots.pop()
+    assert mined_block.header.transaction_root == transaction_root
+    assert chain.chaindb.exists(schema.make_block_transactions_lookup_key(transaction_root))
+    assert chain.chaindb.exists(schema.make_block_receipts_lookup_key(receipt_root))
+
+    # the lists of the block before its last transaction were never stored
+    for transaction_root, receipt_root in pending_roots:
+        assert not chain.chaindb.exists(schema.make_block_transactions_lookup_key(transaction_root))
+        assert not chain.chaindb.exists(schema.make_block_receipts_lookup_key(receipt_root))
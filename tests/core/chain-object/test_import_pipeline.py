@@ -0,0 +1,156 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import rlp
+
+from eth_utils import decode_hex
+
+from evm import Chain
+from evm import constants
+from evm.chains.pipeline import (
+    BlockImportPipeline,
+    decode_block,
+)
+from evm.db.backends.memory import MemoryDB
+from evm.exceptions import ValidationError
+from evm.vm.forks.spurious_dragon import SpuriousDragonVM
+
+from tests.core.helpers import (
+    new_transaction,
+)
+
+
+RECIPIENT = decode_hex('0xa94f5374fce5edbc8e2a8697c15331677e6ebf0c')
+
+GENESIS_PARAMS = {
+    'block_number': constants.GENESIS_BLOCK_NUMBER,
+    'difficulty': constants.GENESIS_DIFFICULTY,
+    'gas_limit': constants.GENESIS_GAS_LIMIT,
+    'parent_hash': constants.GENESIS_PARENT_HASH,
+    'coinbase': constants.GENESIS_COINBASE,
+    'nonce': constants.GENESIS_NONCE,
+    'mix_hash': constants.GENESIS_MIX_HASH,
+    'extra_data': constants.GENESIS_EXTRA_DATA,
+    'timestamp': 1501851927,
+}
+
+# The blocks are not actually mined, so the proof of work seal can't be checked.
+PipelineTestChain = Chain.configure(
+    __name__='PipelineTestChain',
+    vm_configuration=(
+        (
+            constants.GENESIS_BLOCK_NUMBER,
+            SpuriousDragonVM.configure(validate_seal=lambda self, header: None),
+        ),
+    ),
+    network_id=1337,
+)
+
+
+@pytest.fixture
+def genesis_state(funded_address, funded_address_initial_balance):
+    return {
+        funded_address: {
+            'balance': funded_address_initial_balance,
+            'nonce': 0,
+            'code': b'',
+            'storage': {},
+        }
+    }
+
+
+@pytest.fixture
+def blocks(genesis_state, funded_address, funded_address_private_key):
+    chain = PipelineTestChain.from_genesis(MemoryDB(), GENESIS_PARAMS, genesis_state)
+    mined_blocks = []
+    for _ in range(5):
+        for _ in range(2):
+            vm = chain.get_vm()
+            tx = new_transaction(vm, funded_address, RECIPIENT, 10, funded_address_private_key)
+            chain.apply_transaction(tx)
+        mined_blocks.append(chain.mine_block())
+    return tuple(mined_blocks)
+
+
+@pytest.fixture
+def base_db(genesis_state):
+    db = MemoryDB()
+    PipelineTestChain.from_genesis(db, GENESIS_PARAMS, genesis_state)
+    return db
+
+
+@pytest.fixture
+def pipeline(base_db):
+    return BlockImportPipeline(
+        PipelineTestChain,
+        base_db,
+        executor=ThreadPoolExecutor(max_workers=2),
+        max_prepared_blocks=2,
+        max_unpersisted_blocks=1,
+    )
+
+
+def assert_chain_imported(base_db, blocks, funded_address):
+    chain = PipelineTestChain(base_db)
+    assert chain.get_canonical_head() == blocks[-1].header
+    for block in blocks:
+        assert chain.get_canonical_block_by_number(block.number) == block
+        for transaction in block.transactions:
+            assert chain.get_canonical_transaction(transaction.hash) == transaction
+    state = chain.get_vm().state
+    assert state.account_db.get_balance(RECIPIENT) == 10 * 2 * len(blocks)
+    assert state.account_db.get_nonce(funded_address) == 2 * len(blocks)
+
+
+def test_import_blocks(pipeline, base_db, blocks, funded_address):
+    imported_blocks = tuple(pipeline.import_blocks(blocks))
+
+    assert imported_blocks == blocks
+    assert_chain_imported(base_db, blocks, funded_address)
+
+
+def test_import_skips_canonical_blocks(pipeline, base_db, blocks, funded_address):
+    assert tuple(pipeline.import_blocks(blocks[:2])) == blocks[:2]
+    assert tuple(pipeline.import_blocks(blocks)) == blocks[2:]
+
+    assert_chain_imported(base_db, blocks, funded_address)
+
+
+def test_import_encoded_blocks(pipeline, base_db, blocks, funded_address):
+    imported_blocks = tuple(pipeline.import_encoded_blocks(rlp.encode(block) for block in blocks))
+
+    assert imported_blocks == blocks
+    assert_chain_imported(base_db, blocks, funded_address)
+
+
+def test_decode_block_recovers_senders(blocks, funded_address):
+    block = decode_block(PipelineTestChain, rlp.encode(blocks[0]))
+
+    assert block == blocks[0]
+    # The senders are cached on the transactions, so execution doesn't recover them again.
+    assert all(transaction._sender == funded_address for transaction in block.transactions)
+
+
+def test_import_stops_at_invalid_block(pipeline, base_db, blocks, funded_address):
+    invalid_block = blocks[3].copy(header=blocks[3].header.copy(gas_used=1))
+
+    with pytest.raises(ValidationError):
+        tuple(pipeline.import_blocks(blocks[:3] + (invalid_block,) + blocks[4:]))
+
+    # The blocks before the invalid one are still written to the database.
+    assert_chain_imported(base_db, blocks[:3], funded_address)
+
+
+def test_close_shuts_down_own_executor(base_db, blocks, funded_address):
+    with BlockImportPipeline(PipelineTestChain, base_db) as pipeline:
+        assert tuple(pipeline.import_blocks(blocks)) == blocks
+    assert_chain_imported(base_db, blocks, funded_address)
+
+    with pytest.raises(RuntimeError):
+        pipeline.executor.submit(len, ())
+
+
+def test_close_leaves_given_executor(base_db):
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        BlockImportPipeline(PipelineTestChain, base_db, executor=executor).close()
+        assert executor.submit(len, ()).result() == 0
@@ -0,0 +1,108 @@
+import pytest
+
+from eth_utils import decode_hex
+
+from evm import constants
+from evm.chains.tester import (
+    MAINNET_VMS,
+    MainnetTesterChain,
+)
+from evm.db import trie
+from evm.db.backends.memory import MemoryDB
+from evm.vm.base import VM
+
+from tests.core.helpers import (
+    new_transaction,
+)
+
+
+GENESIS_PARAMS = {
+    'block_number': constants.GENESIS_BLOCK_NUMBER,
+    'difficulty': constants.GENESIS_DIFFICULTY,
+    'gas_limit': constants.GENESIS_GAS_LIMIT,
+    'parent_hash': constants.GENESIS_PARENT_HASH,
+    'coinbase': constants.GENESIS_COINBASE,
+    'nonce': constants.GENESIS_NONCE,
+    'mix_hash': constants.GENESIS_MIX_HASH,
+    'extra_data': constants.GENESIS_EXTRA_DATA,
+    'timestamp': 1501851927,
+}
+RECIPIENT = decode_hex('0xa94f5374fce5edbc8e2a8697c15331677e6ebf0c')
+
+
+@pytest.fixture
+def chain_class():
+    return MainnetTesterChain.configure(
+        vm_configuration=((constants.GENESIS_BLOCK_NUMBER, MAINNET_VMS['byzantium']),),
+    )
+
+
+@pytest.fixture
+def genesis_state(funded_address, funded_address_initial_balance):
+    return {
+        funded_address: {
+            'balance': funded_address_initial_balance,
+            'nonce': 0,
+            'code': b'',
+            'storage': {},
+        },
+    }
+
+
+@pytest.fixture
+def blocks(chain_class, genesis_state, funded_address, funded_address_private_key):
+    chain = chain_class.from_genesis(MemoryDB(), GENESIS_PARAMS, genesis_state)
+    mined_blocks = []
+    for _ in range(3):
+        for _ in range(2):
+            tx = new_transaction(
+                chain.get_vm(),
+                funded_address,
+                RECIPIENT,
+                amount=1,
+                private_key=funded_address_private_key,
+            )
+            chain.apply_transaction(tx)
+        mined_blocks.append(chain.mine_block())
+    return mined_blocks
+
+
+def test_import_builds_each_trie_and_validates_each_header_once(
+        monkeypatch,
+        chain_class,
+        genesis_state,
+        blocks):
+    chain = chain_class.from_genesis(MemoryDB(), GENESIS_PARAMS, genesis_state)
+
+    built_tries = []
+    make_trie_root_and_nodes = trie._make_trie_root_and_nodes
+
+    def counting_make_trie_root_and_nodes(items):
+        built_tries.append(items)
+        return make_trie_root_and_nodes(items)
+
+    validated_headers = []
+    validate_header = VM.validate_header.__func__
+
+    def counting_validate_header(cls, header, parent_header):
+        validated_headers.append(header)
+        validate_header(cls, header, parent_header)
+
+    monkeypatch.setattr(trie, '_make_trie_root_and_nodes', counting_make_trie_root_and_nodes)
+    monkeypatch.setattr(VM, 'validate_header', classmethod(counting_validate_header))
+
+    for block in blocks:
+        del built_tries[:]
+        del validated_headers[:]
+
+        imported_block = chain.import_block(block)
+
+        assert imported_block == block
+        # One trie for the transactions and one for the receipts.
+        assert len(built_tries) == 2
+        assert validated_headers == [block.header]
+
+    for block in blocks:
+        for index, tx in enumerate(block.transactions):
+            assert chain.get_canonical_transaction(tx.hash) == tx
+            assert chain.chaindb.get_transaction_index(tx.hash) == (block.number, index)
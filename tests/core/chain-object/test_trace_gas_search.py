@@ -0,0 +1,204 @@
+import pytest
+
+from eth_utils import decode_hex
+
+from evm import constants
+from evm.chains.tester import (
+    MAINNET_VMS,
+    MainnetTesterChain,
+)
+from evm.db.backends.memory import MemoryDB
+from evm.estimators import gas
+from evm.estimators.gas import (
+    binary_gas_search_exact,
+    trace_gas_search,
+)
+from evm.exceptions import VMError
+from evm.utils.spoof import SpoofTransaction
+
+
+GENESIS_PARAMS = {
+    'block_number': constants.GENESIS_BLOCK_NUMBER,
+    'difficulty': constants.GENESIS_DIFFICULTY,
+    'gas_limit': constants.GENESIS_GAS_LIMIT,
+    'parent_hash': constants.GENESIS_PARENT_HASH,
+    'coinbase': constants.GENESIS_COINBASE,
+    'nonce': constants.GENESIS_NONCE,
+    'mix_hash': constants.GENESIS_MIX_HASH,
+    'extra_data': constants.GENESIS_EXTRA_DATA,
+    'timestamp': 1501851927,
+}
+
+SENDER = decode_hex('0x' + '01' * 20)
+
+
+def address(number):
+    return number.to_bytes(20, 'big')
+
+
+def fail_unless_success(code):
+    """
+    Code which runs the given code and fails if it leaves zero on the stack, the way
+    contracts check the result of their calls.
+    """
+    jumpdest = len(code) + 5
+    # ISZERO PUSH1 jumpdest JUMPI STOP JUMPDEST INVALID
+    return code + b'\x15\x60' + bytes([jumpdest]) + decode_hex('0x57005bfe')
+
+
+def call(to, gas=None, value=0, check_success=True):
+    """
+    Code which calls the given address, with all the gas available if ``gas`` is None.
+    """
+    code = b''.join((
+        decode_hex('0x6000600060006000'),  # no input or output
+        b'\x60' + bytes([value]),  # PUSH1 value
+        b'\x73' + to,  # PUSH20 to
+        b'\x5a' if gas is None else b'\x62' + gas.to_bytes(3, 'big'),  # GAS or PUSH3 gas
+        b'\xf1',  # CALL
+    ))
+    if check_success:
+        return fail_unless_success(code)
+    else:
+        return code + decode_hex('0x5000')  # POP STOP
+
+
+STORE = address(0x10)
+CLEAR = address(0x11)
+RECEIVER = address(0x12)
+REVERTER = address(0x13)
+BURNER = address(0x14)
+CALL_STORE = address(0x20)
+CALL_STORE_IGNORING_RESULT = address(0x26)
+CALL_STORE_WITH_ALL_GAS = address(0x21)
+CALL_NESTED = address(0x22)
+CALL_WITH_VALUE = address(0x23)
+CALL_REVERTER = address(0x24)
+CALL_BURNER = address(0x25)
+CREATOR = address(0x30)
+GAS_CHECK = address(0x40)
+
+# Stores 1 in slot 0 of the new contract.
+INIT_CODE = decode_hex('0x600160005500')
+
+CODES = {
+    # PUSH1 1 PUSH1 0 SSTORE STOP
+    STORE: decode_hex('0x600160005500'),
+    # PUSH1 0 PUSH1 0 SSTORE STOP, with the slot set in the genesis state for a refund.
+    CLEAR: decode_hex('0x600060005500'),
+    # PUSH1 1 PUSH1 0 MSTORE STOP
+    RECEIVER: decode_hex('0x600160005200'),
+    # PUSH1 0 PUSH1 0 REVERT
+    REVERTER: decode_hex('0x60006000fd'),
+    # INVALID
+    BURNER: decode_hex('0xfe'),
+    CALL_STORE: call(STORE, gas=100000),
+    CALL_STORE_IGNORING_RESULT: call(STORE, gas=100000, check_success=False),
+    CALL_STORE_WITH_ALL_GAS: call(STORE),
+    CALL_NESTED: call(CALL_STORE_WITH_ALL_GAS),
+    CALL_WITH_VALUE: call(RECEIVER, gas=0, value=1),
+    CALL_REVERTER: call(REVERTER, check_success=False),
+    CALL_BURNER: call(BURNER, gas=100000, check_success=False),
+    # PUSH6 INIT_CODE PUSH1 0 MSTORE PUSH1 6 PUSH1 26 PUSH1 0 CREATE
+    CREATOR: fail_unless_success(
+        decode_hex('0x65') + INIT_CODE + decode_hex('0x6000526006601a6000f0')
+    ),
+    # INVALID unless GAS is at least 1000000
+    GAS_CHECK: decode_hex('0x620f42405a10600a57005bfe'),
+}
+
+GENESIS_STATE = {
+    account: {
+        'balance': 10 ** 18 if account == SENDER else 1000,
+        'nonce': 0,
+        'code': CODES.get(account, b''),
+        'storage': {0: 1} if account == CLEAR else {},
+    }
+    for account in (SENDER,) + tuple(CODES)
+}
+
+
+@pytest.fixture(params=tuple(MAINNET_VMS))
+def vm(request):
+    chain_class = MainnetTesterChain.configure(
+        vm_configuration=((constants.GENESIS_BLOCK_NUMBER, MAINNET_VMS[request.param]),),
+    )
+    chain = chain_class.from_genesis(MemoryDB(), GENESIS_PARAMS, GENESIS_STATE)
+    return chain.get_vm()
+
+
+def make_transaction(vm, to, data=b''):
+    transaction = vm.create_unsigned_transaction(
+        nonce=0,
+        gas_price=1,
+        gas=100000,
+        to=to,
+        value=0,
+        data=data,
+    )
+    return SpoofTransaction(transaction, from_=SENDER)
+
+
+def estimate(estimator, state, transaction):
+    try:
+        return estimator(state, transaction)
+    except VMError as error:
+        return type(error)
+
+
+@pytest.fixture
+def executions(monkeypatch):
+    counts = {'executions': 0}
+    get_computation_error = gas._get_computation_error
+    get_traced_computation = gas._get_traced_computation
+
+    def count(execute):
+        def counted(*args):
+            counts['executions'] += 1
+            return execute(*args)
+        return counted
+
+    monkeypatch.setattr(gas, '_get_computation_error', count(get_computation_error))
+    monkeypatch.setattr(gas, '_get_traced_computation', count(get_traced_computation))
+    return counts
+
+
+@pytest.mark.parametrize(
+    'to, data',
+    (
+        (address(0x1234), b''),
+        (address(0x1234), b'\xff' * 100),
+        (constants.CREATE_CONTRACT_ADDRESS, INIT_CODE),
+        (address(2), b'\xff' * 320),
+        (STORE, b''),
+        (CLEAR, b''),
+        (CALL_STORE, b''),
+        (CALL_STORE_IGNORING_RESULT, b''),
+        (CALL_STORE_WITH_ALL_GAS, b''),
+        (CALL_NESTED, b''),
+        (CALL_WITH_VALUE, b''),
+        (CALL_REVERTER, b''),
+        (CALL_BURNER, b''),
+        (CREATOR, b''),
+        (GAS_CHECK, b''),
+        (BURNER, b''),
+    ),
+)
+def test_trace_gas_search_matches_exact_binary_search(vm, to, data):
+    state = vm.state
+    transaction = make_transaction(vm, to, data)
+    state_root = state.state_root
+
+    expected = estimate(binary_gas_search_exact, state, transaction)
+    assert estimate(trace_gas_search, state, transaction) == expected
+    assert state.state_root == state_root
+
+
+@pytest.mark.parametrize(
+    'to',
+    (STORE, CLEAR, CALL_STORE, CALL_NESTED, CALL_WITH_VALUE, CREATOR),
+)
+def test_trace_gas_search_confirms_the_traced_gas(vm, executions, to):
+    transaction = make_transaction(vm, to)
+    estimate(trace_gas_search, vm.state, transaction)
+    assert executions['executions'] <= 3
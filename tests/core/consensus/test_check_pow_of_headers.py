@@ -0,0 +1,59 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from evm.consensus import pow
+from evm.exceptions import ValidationError
+from evm.rlp.headers import BlockHeader
+
+
+HEADERS = tuple(
+    BlockHeader(difficulty=1, block_number=number, gas_limit=0)
+    for number in range(50)
+)
+
+
+@pytest.fixture
+def invalid_seals(monkeypatch):
+    invalid_block_numbers = set()
+
+    def check_pow(block_number, mining_hash, mix_hash, nonce, difficulty):
+        if block_number in invalid_block_numbers:
+            raise ValidationError("mix hash mismatch")
+
+    monkeypatch.setattr(pow, 'check_pow', check_pow)
+    return invalid_block_numbers
+
+
+@pytest.fixture(params=[False, True], ids=['sequential', 'executor'])
+def executor(request):
+    if request.param:
+        with ThreadPoolExecutor(4) as executor:
+            yield executor
+    else:
+        yield None
+
+
+def test_check_pow_of_valid_headers(invalid_seals, executor):
+    pow.check_pow_of_headers(HEADERS, executor)
+
+
+def test_check_pow_of_headers_raises_first_failure(invalid_seals, executor):
+    invalid_seals.update({pow.POW_CHECK_BATCH_SIZE + 3, 40})
+
+    with pytest.raises(ValidationError, match=r'#{0} '.format(pow.POW_CHECK_BATCH_SIZE + 3)):
+        pow.check_pow_of_headers(HEADERS, executor)
+
+
+def test_coro_check_pow_of_headers_raises_first_failure(invalid_seals):
+    invalid_seals.update({3, 40})
+
+    with ThreadPoolExecutor(4) as executor:
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(pow.coro_check_pow_of_headers(HEADERS[4:40], executor))
+            with pytest.raises(ValidationError, match=r'#3 '):
+                loop.run_until_complete(pow.coro_check_pow_of_headers(HEADERS, executor))
+        finally:
+            loop.close()
@@ -0,0 +1,154 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+import mmap
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from evm.consensus import pow
+from evm.rlp.headers import BlockHeader
+
+
+def fake_mkcache_bytes(block_number):
+    return b'cache of epoch %d' % (block_number // pow.EPOCH_LENGTH)
+
+
+class SynchronousProcess:
+    def __init__(self, target, args, daemon):
+        self.target = target
+        self.args = args
+
+    def start(self):
+        self.target(*self.args)
+
+    def join(self):
+        pass
+
+
+class SynchronousContext:
+    Process = SynchronousProcess
+
+
+@pytest.fixture
+def generated_caches(monkeypatch):
+    generated = []
+
+    def mkcache_bytes(block_number):
+        generated.append(block_number // pow.EPOCH_LENGTH)
+        return fake_mkcache_bytes(block_number)
+
+    monkeypatch.setattr(pow, 'mkcache_bytes', mkcache_bytes)
+    monkeypatch.setattr(pow, 'cache_by_seed', pow.OrderedDict())
+    monkeypatch.setattr(pow, '_cache_generation_context', SynchronousContext)
+    monkeypatch.setattr(pow, '_cache_generations', {})
+    monkeypatch.setattr(pow, 'cache_dir', None)
+    monkeypatch.setattr(pow, '_pregenerating_pid', None)
+    monkeypatch.delenv(pow.CACHE_DIR_ENV_VAR, raising=False)
+    return generated
+
+
+def test_caches_in_memory_only_by_default(generated_caches):
+    assert pow.get_cache(10) == fake_mkcache_bytes(10)
+    assert pow.get_cache(20) == fake_mkcache_bytes(20)
+    assert generated_caches == [0]
+
+
+def test_cache_files_are_generated_once(tmpdir, monkeypatch, generated_caches):
+    cache_dir = str(tmpdir.join('ethash'))
+    pow.set_cache_dir(cache_dir)
+    assert os.environ[pow.CACHE_DIR_ENV_VAR] == cache_dir
+
+    cache = pow.get_cache(10)
+    assert isinstance(cache, mmap.mmap)
+    assert cache[:] == fake_mkcache_bytes(10)
+    assert os.listdir(cache_dir) == [os.path.basename(pow.get_cache_path(pow.get_cache_seed(10)))]
+
+    # Another process loads the cache from its file.
+    monkeypatch.setattr(pow, 'cache_by_seed', pow.OrderedDict())
+    assert pow.get_cache(20)[:] == fake_mkcache_bytes(20)
+    assert generated_caches == [0]
+
+
+def test_next_epoch_cache_is_pregenerated(tmpdir, generated_caches):
+    pow.set_cache_dir(str(tmpdir), pregenerate=True)
+
+    pow.get_cache(10)
+    assert generated_caches == [0, 1]
+    assert os.path.exists(pow.get_cache_path(pow.get_cache_seed(pow.EPOCH_LENGTH)))
+
+    assert pow.get_cache(pow.EPOCH_LENGTH + 10)[:] == fake_mkcache_bytes(pow.EPOCH_LENGTH)
+    assert generated_caches == [0, 1, 2]
+
+
+def test_cache_generated_by_another_process_is_waited_for(tmpdir, generated_caches):
+    pow.set_cache_dir(str(tmpdir))
+    path = pow.get_cache_path(pow.get_cache_seed(10))
+    with open(path + '.lock', 'w') as lock_file:
+        lock_file.write(str(os.getpid()))
+
+    def finish_generation():
+        pow._write_file(path, (fake_mkcache_bytes(10),))
+        os.unlink(path + '.lock')
+
+    timer = threading.Timer(pow.FILE_GENERATION_POLL_INTERVAL * 3, finish_generation)
+    timer.start()
+    try:
+        assert pow.get_cache(10)[:] == fake_mkcache_bytes(10)
+    finally:
+        timer.join()
+    assert generated_caches == []
+
+
+def test_stale_cache_lock_is_removed(tmpdir, generated_caches):
+    pow.set_cache_dir(str(tmpdir))
+    path = pow.get_cache_path(pow.get_cache_seed(10))
+    dead_process = subprocess.Popen([sys.executable, '-c', ''])
+    dead_process.wait()
+    with open(path + '.lock', 'w') as lock_file:
+        lock_file.write(str(dead_process.pid))
+
+    assert pow.get_cache(10)[:] == fake_mkcache_bytes(10)
+    assert generated_caches == [0]
+    assert not os.path.exists(path + '.lock')
+
+
+def test_caches_are_generated_for_the_executor(tmpdir, monkeypatch, generated_caches):
+    pow.set_cache_dir(str(tmpdir.join('ethash')), pregenerate=True)
+    # The worker processes have their own list of generated caches, so they log them too.
+    generations_log = str(tmpdir.join('generations'))
+
+    def mkcache_bytes(block_number):
+        with open(generations_log, 'a') as log_file:
+            log_file.write('{0} {1}\n'.format(os.getpid(), block_number // pow.EPOCH_LENGTH))
+        return fake_mkcache_bytes(block_number)
+
+    def check_pow(block_number, mining_hash, mix_hash, nonce, difficulty):
+        pow.get_cache(block_number)
+
+    monkeypatch.setattr(pow, 'mkcache_bytes', mkcache_bytes)
+    monkeypatch.setattr(pow, 'check_pow', check_pow)
+    headers = tuple(
+        BlockHeader(difficulty=1, block_number=number, gas_limit=0)
+        for number in range(pow.EPOCH_LENGTH - 40, pow.EPOCH_LENGTH + 40)
+    )
+    next_epoch_headers = tuple(
+        BlockHeader(difficulty=1, block_number=number, gas_limit=0)
+        for number in range(2 * pow.EPOCH_LENGTH, 2 * pow.EPOCH_LENGTH + 40)
+    )
+
+    with ProcessPoolExecutor(4) as executor:
+        pow.check_pow_of_headers(headers, executor)
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(pow.coro_check_pow_of_headers(next_epoch_headers, executor))
+        finally:
+            loop.close()
+
+    # Each cache is generated once, by this process, before the workers need it.
+    with open(generations_log) as log_file:
+        assert log_file.read().splitlines() == [
+            '{0} {1}'.format(os.getpid(), epoch) for epoch in range(4)
+        ]
@@ -0,0 +1,164 @@
+from concurrent.futures import ProcessPoolExecutor
+import mmap
+import os
+
+from eth_hash.auto import keccak
+import pytest
+
+from evm.consensus import (
+    ethash,
+    pow,
+)
+from evm.rlp.headers import BlockHeader
+
+
+# A dataset of 32 pages computed from a cache of 16 items, small enough to generate in tests.
+FULL_SIZE = 32 * ethash.MIX_BYTES
+CACHE = b''.join(ethash.keccak_512(bytes([index])) for index in range(16))
+MINING_HASH = keccak(b'header')
+
+
+def hashimoto_light(block_number, cache, mining_hash, nonce):
+    cache_items = ethash.get_cache_items(cache)
+    return ethash.hashimoto(
+        mining_hash,
+        nonce,
+        FULL_SIZE,
+        lambda page: b''.join(
+            ethash.calc_dataset_item(cache_items, page * ethash.MIX_HASHES + index)
+            for index in range(ethash.MIX_HASHES)
+        ),
+    )
+
+
+class Value:
+    def __init__(self, typecode, value):
+        self.value = value
+
+
+class DeferredProcess:
+    def __init__(self, target, args, daemon):
+        self.target = target
+        self.args = args
+        self.started = False
+
+    def start(self):
+        self.started = True
+
+    def run(self):
+        self.target(*self.args)
+
+    def join(self):
+        pass
+
+
+class DeferredContext:
+    Process = DeferredProcess
+    Value = Value
+
+
+@pytest.fixture
+def small_dataset(monkeypatch):
+    monkeypatch.setattr(pow, 'mkcache_bytes', lambda block_number: CACHE)
+    monkeypatch.setattr(pow, 'hashimoto_light', hashimoto_light)
+    monkeypatch.setattr(ethash, 'get_full_size', lambda block_number: FULL_SIZE)
+    monkeypatch.setattr(pow, 'cache_by_seed', pow.OrderedDict())
+    monkeypatch.setattr(pow, 'cache_dir', None)
+    monkeypatch.setattr(pow, 'dataset_by_seed', pow.OrderedDict())
+    monkeypatch.setattr(pow, 'dataset_dir', None)
+    monkeypatch.setattr(pow, '_invalid_dataset_seeds', set())
+    monkeypatch.setattr(pow, '_generating_dataset_pid', None)
+    monkeypatch.setattr(pow, '_dataset_generations', {})
+    monkeypatch.setattr(pow, '_cache_generation_context', DeferredContext)
+    monkeypatch.setattr(pow, 'DATASET_PROGRESS_INTERVAL', 8)
+    monkeypatch.delenv(pow.DATASET_DIR_ENV_VAR, raising=False)
+
+
+def test_full_sizes():
+    assert ethash.get_full_size(0) == 1073739904
+    assert ethash.get_full_size(ethash.EPOCH_LENGTH) == 1082130304
+
+
+def test_hashimoto_full_matches_light():
+    dataset = b''.join(ethash.iter_dataset_items(CACHE, FULL_SIZE))
+    assert len(dataset) == FULL_SIZE
+    for nonce in (0, 1, 2**64 - 1):
+        assert ethash.hashimoto_full(dataset, MINING_HASH, nonce) == hashimoto_light(
+            0, CACHE, MINING_HASH, nonce)
+
+
+def test_light_mode_by_default(small_dataset):
+    assert pow.get_dataset(0) is None
+    assert pow.hashimoto(0, MINING_HASH, 7) == hashimoto_light(0, CACHE, MINING_HASH, 7)
+    assert pow._dataset_generations == {}
+
+
+def test_dataset_is_generated_in_the_background(tmpdir, small_dataset):
+    dataset_dir = str(tmpdir.join('ethash'))
+    pow.set_dataset_dir(dataset_dir, generate=True)
+    assert os.environ[pow.DATASET_DIR_ENV_VAR] == dataset_dir
+
+    # The hashes are computed from the cache until the dataset is generated, once.
+    assert pow.hashimoto(0, MINING_HASH, 7) == hashimoto_light(0, CACHE, MINING_HASH, 7)
+    assert pow.get_dataset(1) is None
+    generation, progress = pow._dataset_generations[pow.get_cache_seed(0)]
+    assert generation.started
+    assert len(pow._dataset_generations) == 1
+    assert pow.get_dataset_progress(0) == 0.0
+
+    generation.run()
+    assert progress.value == 56
+    assert pow.get_dataset_progress(0) == 1.0
+
+    dataset = pow.get_dataset(0)
+    assert isinstance(dataset, mmap.mmap)
+    assert dataset[:] == b''.join(ethash.iter_dataset_items(CACHE, FULL_SIZE))
+    assert pow._dataset_generations == {}
+    assert pow.hashimoto(0, MINING_HASH, 7) == hashimoto_light(0, CACHE, MINING_HASH, 7)
+
+
+def test_dataset_is_only_generated_on_request(tmpdir, small_dataset):
+    pow.set_dataset_dir(str(tmpdir))
+
+    assert pow.get_dataset(0) is None
+    assert pow._dataset_generations == {}
+
+    pow.make_dataset_file(0, pow.get_dataset_path(pow.get_cache_seed(0)))
+    assert isinstance(pow.get_dataset(0), mmap.mmap)
+
+
+def test_invalid_dataset_is_not_used(tmpdir, small_dataset):
+    pow.set_dataset_dir(str(tmpdir))
+    seed = pow.get_cache_seed(0)
+    with open(pow.get_dataset_path(seed), 'wb') as dataset_file:
+        dataset_file.write(b'\x01' * FULL_SIZE)
+
+    assert pow.get_dataset(0) is None
+    assert seed in pow._invalid_dataset_seeds
+    assert pow.hashimoto(0, MINING_HASH, 7) == hashimoto_light(0, CACHE, MINING_HASH, 7)
+
+
+def test_dataset_is_generated_for_the_executor(tmpdir, monkeypatch, small_dataset):
+    pow.set_dataset_dir(str(tmpdir), generate=True)
+
+    def check_pow(block_number, mining_hash, mix_hash, nonce, difficulty):
+        pow.hashimoto(block_number, mining_hash, 0)
+
+    monkeypatch.setattr(pow, 'check_pow', check_pow)
+    headers = tuple(
+        BlockHeader(difficulty=1, block_number=number, gas_limit=0)
+        for number in range(40)
+    )
+
+    # The worker processes don't generate the dataset, this process does before
+    # giving them the headers.
+    with ProcessPoolExecutor(4) as executor:
+        pow.check_pow_of_headers(headers, executor)
+    generation, _ = pow._dataset_generations[pow.get_cache_seed(0)]
+    assert generation.started
+    assert len(pow._dataset_generations) == 1
+
+    generation.run()
+    with ProcessPoolExecutor(4) as executor:
+        pow.check_pow_of_headers(headers, executor)
+    assert len(pow._dataset_generations) == 1
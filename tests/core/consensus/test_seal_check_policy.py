@@ -0,0 +1,60 @@
+import pytest
+
+from evm.consensus.pow import (
+    FULL_SEAL_CHECKS,
+    SealCheckPolicy,
+)
+from evm.rlp.headers import BlockHeader
+
+
+HEADERS = tuple(
+    BlockHeader(difficulty=1, block_number=number, gas_limit=0)
+    for number in range(1, 101)
+)
+
+
+def test_full_seal_checks_select_every_header():
+    assert FULL_SEAL_CHECKS.select_headers(HEADERS) == HEADERS
+    assert str(FULL_SEAL_CHECKS) == 'full'
+
+
+def test_headers_up_to_the_checkpoint_are_not_selected():
+    policy = SealCheckPolicy(checkpoint=60)
+    assert policy.select_headers(HEADERS) == HEADERS[60:]
+    assert policy.select_headers(HEADERS[:60]) == ()
+    assert str(policy) == 'full, none up to #60'
+
+
+@pytest.mark.parametrize(
+    'sample_ratio, expected_count',
+    (
+        (0, 1),
+        (0.01, 1),
+        (0.1, 10),
+        (0.25, 25),
+        (0.999, 100),
+    ),
+)
+def test_sampled_headers_include_the_last_one(sample_ratio, expected_count):
+    selected = SealCheckPolicy(sample_ratio).select_headers(HEADERS)
+
+    assert len(selected) == expected_count
+    assert selected[-1] == HEADERS[-1]
+    assert list(selected) == sorted(selected, key=lambda header: header.block_number)
+    assert len(set(selected)) == expected_count
+
+
+def test_sampled_headers_after_the_checkpoint():
+    policy = SealCheckPolicy(0.5, checkpoint=90)
+    selected = policy.select_headers(HEADERS)
+
+    assert len(selected) == 5
+    assert all(header.block_number > 90 for header in selected)
+    assert selected[-1] == HEADERS[-1]
+    assert str(policy) == '50% sampled, none up to #90'
+
+
+@pytest.mark.parametrize('sample_ratio', (-0.1, 1.5))
+def test_invalid_sample_ratio(sample_ratio):
+    with pytest.raises(ValueError):
+        SealCheckPolicy(sample_ratio)
@@ -0,0 +1,35 @@
+import io
+
+import pytest
+import rlp
+
+from evm.utils.rlp import iterate_rlp_items
+
+
+ITEMS = tuple(
+    rlp.encode(item)
+    for item in (
+        b'\x01',
+        b'',
+        [],
+        [b'a' * 55],
+        [b'a' * 56, [b'b' * 300]],
+        b'c' * 70000,
+    )
+)
+
+
+@pytest.mark.parametrize('chunk_size', (1, 7, 100, 1024 * 1024))
+def test_iterate_rlp_items(chunk_size):
+    stream = io.BytesIO(b''.join(ITEMS))
+    assert tuple(iterate_rlp_items(stream, chunk_size)) == ITEMS
+
+
+def test_iterate_rlp_items_empty_stream():
+    assert tuple(iterate_rlp_items(io.BytesIO(b''))) == ()
+
+
+def test_iterate_rlp_items_truncated_stream():
+    stream = io.BytesIO(b''.join(ITEMS)[:-1])
+    with pytest.raises(rlp.DecodingError):
+        tuple(iterate_rlp_items(stream, chunk_size=100))
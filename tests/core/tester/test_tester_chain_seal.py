@@ -0,0 +1,35 @@
+import pytest
+
+from evm import constants
+from evm.chains.tester import (
+    MAINNET_VMS,
+    MainnetTesterChain,
+)
+from evm.db.backends.memory import MemoryDB
+
+
+GENESIS_PARAMS = {
+    'block_number': constants.GENESIS_BLOCK_NUMBER,
+    'difficulty': constants.GENESIS_DIFFICULTY,
+    'gas_limit': constants.GENESIS_GAS_LIMIT,
+    'parent_hash': constants.GENESIS_PARENT_HASH,
+    'coinbase': constants.GENESIS_COINBASE,
+    'nonce': constants.GENESIS_NONCE,
+    'mix_hash': constants.GENESIS_MIX_HASH,
+    'extra_data': constants.GENESIS_EXTRA_DATA,
+    'timestamp': 1501851927,
+}
+
+
+@pytest.mark.parametrize('fork', tuple(MAINNET_VMS))
+def test_tester_chain_imports_unsealed_blocks(fork):
+    chain_class = MainnetTesterChain.configure(
+        vm_configuration=((constants.GENESIS_BLOCK_NUMBER, MAINNET_VMS[fork]),),
+    )
+    chain = chain_class.from_genesis(MemoryDB(), GENESIS_PARAMS)
+    block = chain.mine_block()
+
+    importing_chain = chain_class.from_genesis(MemoryDB(), GENESIS_PARAMS)
+    importing_chain.import_block(block)
+
+    assert importing_chain.get_canonical_head() == block.header
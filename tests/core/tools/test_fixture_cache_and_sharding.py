@@ -0,0 +1,137 @@
+import json
+
+import pytest
+
+from evm.tools import fixture_tests
+from evm.tools.fixture_tests import (
+    NormalizedFixtureCache,
+    get_normalizer_key,
+    normalize_statetest_fixture,
+    normalize_vmtest_fixture,
+    parse_fixture_shard,
+    shard_fixtures,
+)
+
+
+def normalize_value(fixture):
+    return {'value': int(fixture['value'], 16)}
+
+
+@pytest.fixture
+def fixture_path(tmpdir):
+    path = tmpdir.join('fixtures.json')
+    path.write(json.dumps({'first': {'value': '0x01'}, 'second': {'value': '0x02'}}))
+    return str(path)
+
+
+@pytest.fixture
+def counted_loads(monkeypatch):
+    loads = []
+    original_load_fixture = fixture_tests.load_fixture
+
+    def load_fixture(fixture_path, fixture_key, normalize_fn):
+        loads.append((fixture_path, fixture_key))
+        return original_load_fixture(fixture_path, fixture_key, normalize_fn)
+
+    monkeypatch.setattr(fixture_tests, 'load_fixture', load_fixture)
+    return loads
+
+
+def test_normalizer_key_includes_curried_arguments():
+    assert get_normalizer_key(normalize_vmtest_fixture) == (
+        'evm.tools.fixture_tests',
+        'normalize_vmtest_fixture',
+    )
+    byzantium_key = get_normalizer_key(
+        normalize_statetest_fixture(fork='Byzantium', post_state_index=0)
+    )
+    frontier_key = get_normalizer_key(
+        normalize_statetest_fixture(post_state_index=0, fork='Frontier')
+    )
+    assert byzantium_key != frontier_key
+    assert byzantium_key == get_normalizer_key(
+        normalize_statetest_fixture(post_state_index=0, fork='Byzantium')
+    )
+
+
+def test_normalized_fixture_cache(tmpdir, fixture_path, counted_loads):
+    cache_dir = str(tmpdir.join('cache'))
+    cache = NormalizedFixtureCache(cache_dir)
+
+    assert cache.load_fixture(fixture_path, 'first', normalize_value) == {'value': 1}
+    assert cache.load_fixture(fixture_path, 'first', normalize_value) == {'value': 1}
+    assert len(counted_loads) == 1
+    cache.flush()
+
+    other_cache = NormalizedFixtureCache(cache_dir)
+    assert other_cache.load_fixture(fixture_path, 'first', normalize_value) == {'value': 1}
+    assert len(counted_loads) == 1
+
+    assert other_cache.load_fixture(fixture_path, 'second', normalize_value) == {'value': 2}
+    assert len(counted_loads) == 2
+
+
+def test_normalized_fixture_cache_merges_entries_of_other_processes(
+        tmpdir, fixture_path, counted_loads):
+    cache_dir = str(tmpdir.join('cache'))
+    first_cache = NormalizedFixtureCache(cache_dir)
+    second_cache = NormalizedFixtureCache(cache_dir)
+
+    first_cache.load_fixture(fixture_path, 'first', normalize_value)
+    second_cache.load_fixture(fixture_path, 'second', normalize_value)
+    first_cache.flush()
+    second_cache.flush()
+
+    cache = NormalizedFixtureCache(cache_dir)
+    cache.load_fixture(fixture_path, 'first', normalize_value)
+    cache.load_fixture(fixture_path, 'second', normalize_value)
+    assert len(counted_loads) == 2
+
+
+def test_normalized_fixture_cache_is_invalidated_by_changes(tmpdir, fixture_path):
+    cache_dir = str(tmpdir.join('cache'))
+    cache = NormalizedFixtureCache(cache_dir)
+    cache.load_fixture(fixture_path, 'first', normalize_value)
+    cache.flush()
+
+    with open(fixture_path, 'w') as fixture_file:
+        json.dump({'first': {'value': '0x03'}}, fixture_file)
+    fixture_tests.load_json_fixture.cache_clear()
+
+    other_cache = NormalizedFixtureCache(cache_dir)
+    assert other_cache.load_fixture(fixture_path, 'first', normalize_value) == {'value': 3}
+
+
+def test_shard_fixtures_balances_recorded_durations():
+    fixtures = tuple(('a.json', key) for key in 'abcdef')
+    durations = {'a.json:a': 6, 'a.json:b': 1, 'a.json:c': 2, 'a.json:d': 3, 'a.json:e': 4}
+
+    shards = shard_fixtures(fixtures, 2, durations)
+
+    # The fixture without a recorded duration is assumed to take the median, 3.
+    assert shards == (
+        (('a.json', 'a'), ('a.json', 'b'), ('a.json', 'f')),
+        (('a.json', 'c'), ('a.json', 'd'), ('a.json', 'e')),
+    )
+    assert sorted(sum(shards, ())) == sorted(fixtures)
+    assert shard_fixtures(fixtures, 2, durations) == shards
+
+
+def test_shard_fixtures_without_durations():
+    fixtures = tuple(('a.json', key) for key in 'abcde')
+
+    shards = shard_fixtures(fixtures, 3)
+
+    assert tuple(len(shard) for shard in shards) == (2, 2, 1)
+    assert sorted(sum(shards, ())) == sorted(fixtures)
+
+
+@pytest.mark.parametrize('shard,expected', (('0/1', (0, 1)), ('3/4', (3, 4))))
+def test_parse_fixture_shard(shard, expected):
+    assert parse_fixture_shard(shard) == expected
+
+
+@pytest.mark.parametrize('shard', ('1', '1/1', '-1/2', 'a/b', '1/2/3'))
+def test_parse_invalid_fixture_shard(shard):
+    with pytest.raises(ValueError):
+        parse_fixture_shard(shard)
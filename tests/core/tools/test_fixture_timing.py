@@ -0,0 +1,142 @@
+import json
+
+import pytest
+
+from eth_utils import encode_hex
+
+from evm.tools.fixture_timing import (
+    FixtureTiming,
+    compare_timings,
+    find_outliers,
+    find_state_fixtures,
+    load_timings,
+    save_timings,
+    time_state_fixtures,
+)
+
+
+SECRET_KEY = '0x45a915e4d060149eb4365960e6a7a45f334393093061116b197e3240065ff2d8'
+SENDER = '0xa94f5374fce5edbc8e2a8697c15331677e6ebf0b'
+CONTRACT = '0x1000000000000000000000000000000000000000'
+# Writes 1 into storage slot 0.
+CONTRACT_CODE = '0x6001600055'
+
+POST_STATE = {'hash': encode_hex(b'\0' * 32), 'indexes': {'data': 0, 'gas': 0, 'value': 0}}
+
+
+def make_state_fixture(gas_limit):
+    return {
+        'env': {
+            'currentCoinbase': '0x2adc25665018aa1fe0e6bc666dac8fc2697ff9ba',
+            'currentDifficulty': '0x020000',
+            'currentGasLimit': '0x0f4240',
+            'currentNumber': '0x01',
+            'currentTimestamp': '0x03e8',
+            'previousHash': '0x' + '5e' * 32,
+        },
+        'pre': {
+            SENDER: {'balance': '0x0de0b6b3a7640000', 'code': '0x', 'nonce': '0x00', 'storage': {}},
+            CONTRACT: {'balance': '0x00', 'code': CONTRACT_CODE, 'nonce': '0x00', 'storage': {}},
+        },
+        'transaction': {
+            'data': ['0x'],
+            'gasLimit': [gas_limit],
+            'gasPrice': '0x01',
+            'nonce': '0x00',
+            'secretKey': SECRET_KEY,
+            'to': CONTRACT,
+            'value': ['0x00'],
+        },
+        'post': {
+            'Byzantium': [POST_STATE],
+            'Frontier': [POST_STATE, POST_STATE],
+            'Constantinople': [POST_STATE],
+        },
+    }
+
+
+@pytest.fixture
+def fixtures_dir(tmpdir):
+    fixtures = {
+        'storeOne': make_state_fixture('0x0186a0'),
+        # Not enough gas for the intrinsic gas of the transaction.
+        'intrinsicGasTooLow': make_state_fixture('0x5207'),
+    }
+    tmpdir.mkdir('stExample').join('storeOne.json').write(json.dumps(fixtures))
+    return str(tmpdir)
+
+
+def test_find_state_fixtures_for_supported_forks(fixtures_dir):
+    fixtures = find_state_fixtures(fixtures_dir)
+
+    assert len(fixtures) == 6
+    assert set(fork for _, _, fork, _ in fixtures) == {'Byzantium', 'Frontier'}
+
+    assert len(find_state_fixtures(fixtures_dir, ['Byzantium'])) == 2
+
+
+def test_time_state_fixtures(fixtures_dir):
+    fixtures = find_state_fixtures(fixtures_dir, ['Byzantium'])
+    timings = {
+        timing.fixture_id: timing
+        for timing
+        in time_state_fixtures(fixtures_dir, fixtures, rounds=2)
+    }
+
+    store_one = timings['stExample/storeOne.json:storeOne:Byzantium:0']
+    assert store_one.is_valid
+    assert store_one.gas_used == 21000 + 3 + 3 + 20000
+    assert store_one.duration > 0
+    assert store_one.gas_per_second > 0
+
+    too_low = timings['stExample/storeOne.json:intrinsicGasTooLow:Byzantium:0']
+    assert not too_low.is_valid
+    assert too_low.gas_used == 0
+
+
+def test_find_outliers():
+    timings = (
+        FixtureTiming('fast-1', 'Byzantium', 1.0, 10000000, True),
+        FixtureTiming('fast-2', 'Byzantium', 1.0, 12000000, True),
+        FixtureTiming('slow', 'Byzantium', 1.0, 100000, True),
+        FixtureTiming('slow-but-short', 'Byzantium', 0.001, 100, True),
+        FixtureTiming('invalid', 'Byzantium', 1.0, 0, False),
+        FixtureTiming('other-fork', 'Frontier', 1.0, 100000, True),
+    )
+
+    assert find_outliers(timings) == (timings[2],)
+
+
+def test_compare_timings():
+    baseline = (
+        FixtureTiming('same', 'Byzantium', 1.0, 1000, True),
+        FixtureTiming('slower', 'Byzantium', 1.0, 1000, True),
+        FixtureTiming('much-slower', 'Byzantium', 1.0, 1000, True),
+        FixtureTiming('faster', 'Byzantium', 1.0, 1000, True),
+        FixtureTiming('short', 'Byzantium', 0.001, 1000, True),
+    )
+    timings = (
+        FixtureTiming('same', 'Byzantium', 1.1, 1000, True),
+        FixtureTiming('slower', 'Byzantium', 1.5, 1000, True),
+        FixtureTiming('much-slower', 'Byzantium', 3.0, 1000, True),
+        FixtureTiming('faster', 'Byzantium', 0.5, 1000, True),
+        FixtureTiming('short', 'Byzantium', 0.005, 1000, True),
+        FixtureTiming('new', 'Byzantium', 5.0, 1000, True),
+    )
+
+    changes = compare_timings(timings, baseline)
+
+    assert [change.fixture_id for change in changes] == ['much-slower', 'slower']
+    assert changes[0].ratio == 3.0
+
+
+def test_save_and_load_timings(tmpdir):
+    timings = (
+        FixtureTiming('stExample/a.json:a:Byzantium:0', 'Byzantium', 0.5, 21000, True),
+        FixtureTiming('stExample/a.json:a:Frontier:0', 'Frontier', 0.25, 0, False),
+    )
+    path = str(tmpdir.join('timings.json'))
+
+    save_timings(path, timings, evm_version='0.0.0')
+
+    assert load_timings(path) == timings
@@ -243,6 +243,14 @@ def test_get_log_entries_order_with_children(computation, child_message):
     assert logs[2] == parent_log2
 
 
+def test_raise_if_error(computation):
+    computation.raise_if_error()
+    with computation:
+        raise VMError('Triggered VMError for tests')
+    with pytest.raises(VMError, match='Triggered VMError for tests'):
+        computation.raise_if_error()
+
+
 def test_get_log_entries_with_vmerror(computation):
     # Trigger an out of gas error causing get log entries to be ()
     computation.add_log_entry(CANONICAL_ADDRESS_A, [1, 2, 3], b'')
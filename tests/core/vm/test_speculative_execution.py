@@ -0,0 +1,238 @@
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+
+import pytest
+
+from eth_keys import keys
+from eth_utils import decode_hex
+
+from evm import Chain
+from evm import constants
+from evm.db.account import AccountDB
+from evm.db.backends.memory import MemoryDB
+from evm.db.write_behind import WriteBehindDB
+from evm.rlp.receipts import Receipt
+from evm.vm.forks.byzantium import ByzantiumVM
+from evm.vm.forks.spurious_dragon import SpuriousDragonVM
+from evm.vm.speculative import (
+    BALANCE,
+    NONCE,
+    STORAGE,
+    RecordingAccountDB,
+    SpeculativeExecutor,
+)
+
+from tests.core.helpers import (
+    new_transaction,
+)
+
+
+PRIVATE_KEYS = tuple(keys.PrivateKey(bytes([index]) * 32) for index in range(1, 5))
+SENDERS = tuple(private_key.public_key.to_canonical_address() for private_key in PRIVATE_KEYS)
+
+RECIPIENT_A = decode_hex('0xa94f5374fce5edbc8e2a8697c15331677e6ebf0c')
+RECIPIENT_B = decode_hex('0xbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbb')
+BENEFICIARY = decode_hex('0xcccccccccccccccccccccccccccccccccccccccc')
+COUNTER_ADDRESS = decode_hex('0x1000000000000000000000000000000000000001')
+SELFDESTRUCT_ADDRESS = decode_hex('0x1000000000000000000000000000000000000002')
+
+# Increments the value in storage slot 0: PUSH1 0 SLOAD PUSH1 1 ADD PUSH1 0 SSTORE
+COUNTER_CODE = decode_hex('0x600054600101600055')
+# PUSH20 <beneficiary> SELFDESTRUCT
+SELFDESTRUCT_CODE = b'\x73' + BENEFICIARY + b'\xff'
+
+GENESIS_PARAMS = {
+    'block_number': constants.GENESIS_BLOCK_NUMBER,
+    'difficulty': constants.GENESIS_DIFFICULTY,
+    'gas_limit': constants.GENESIS_GAS_LIMIT,
+    'parent_hash': constants.GENESIS_PARENT_HASH,
+    'coinbase': constants.GENESIS_COINBASE,
+    'nonce': constants.GENESIS_NONCE,
+    'mix_hash': constants.GENESIS_MIX_HASH,
+    'extra_data': constants.GENESIS_EXTRA_DATA,
+    'timestamp': 1501851927,
+}
+
+GENESIS_STATE = {
+    COUNTER_ADDRESS: {'balance': 0, 'nonce': 0, 'code': COUNTER_CODE, 'storage': {}},
+    SELFDESTRUCT_ADDRESS: {'balance': 1, 'nonce': 0, 'code': SELFDESTRUCT_CODE, 'storage': {}},
+}
+GENESIS_STATE.update(
+    (sender, {'balance': 10 ** 20, 'nonce': 0, 'code': b'', 'storage': {}})
+    for sender in SENDERS
+)
+
+
+def make_chain_class(vm_class, speculative_executor=None):
+    # The blocks are not actually mined, so the proof of work seal can't be checked.
+    return Chain.configure(
+        __name__='SpeculativeTestChain',
+        vm_configuration=(
+            (
+                constants.GENESIS_BLOCK_NUMBER,
+                vm_class.configure(
+                    validate_seal=lambda self, header: None,
+                    speculative_executor=speculative_executor,
+                ),
+            ),
+        ),
+        network_id=1337,
+    )
+
+
+def make_blocks(chain_class):
+    chain = chain_class.from_genesis(MemoryDB(), GENESIS_PARAMS, GENESIS_STATE)
+
+    def send(sender_index, to, amount=0):
+        vm = chain.get_vm()
+        sender, private_key = SENDERS[sender_index], PRIVATE_KEYS[sender_index]
+        chain.apply_transaction(new_transaction(vm, sender, to, amount, private_key))
+
+    # Transactions with disjoint senders and recipients can be speculated on,
+    # the others read the nonce of an earlier sender or the counter storage.
+    send(0, RECIPIENT_A, 10)
+    send(1, RECIPIENT_B, 10)
+    send(2, COUNTER_ADDRESS)
+    send(3, COUNTER_ADDRESS)
+    send(0, RECIPIENT_B, 10)
+    first_block = chain.mine_block()
+
+    # The second call of the self destructing contract reads the deleted account.
+    send(0, SELFDESTRUCT_ADDRESS)
+    send(1, COUNTER_ADDRESS)
+    send(2, SELFDESTRUCT_ADDRESS)
+    second_block = chain.mine_block()
+
+    return first_block, second_block
+
+
+@pytest.fixture(params=[SpuriousDragonVM, ByzantiumVM])
+def vm_class(request):
+    return request.param
+
+
+@pytest.fixture
+def blocks(vm_class):
+    return make_blocks(make_chain_class(vm_class))
+
+
+def import_blocks(chain_class, blocks, base_db=None):
+    if base_db is None:
+        base_db = MemoryDB()
+    chain = chain_class.from_genesis(base_db, GENESIS_PARAMS, GENESIS_STATE)
+    imported_blocks = tuple(chain.import_block(block) for block in blocks)
+    return chain, imported_blocks
+
+
+@pytest.mark.parametrize('transactions_per_task', (1, 2, 8))
+def test_speculative_import_matches_serial_import(vm_class, blocks, transactions_per_task):
+    speculative_executor = SpeculativeExecutor(
+        ThreadPoolExecutor(max_workers=2),
+        transactions_per_task=transactions_per_task,
+    )
+    chain_class = make_chain_class(vm_class, speculative_executor)
+
+    chain, imported_blocks = import_blocks(chain_class, blocks)
+    serial_chain, serial_blocks = import_blocks(make_chain_class(vm_class), blocks)
+
+    assert imported_blocks == blocks == serial_blocks
+    for block in blocks:
+        receipts = chain.chaindb.get_receipts(block.header, Receipt)
+        assert receipts == serial_chain.chaindb.get_receipts(block.header, Receipt)
+
+    account_db = chain.get_vm().state.account_db
+    assert account_db.get_storage(COUNTER_ADDRESS, 0) == 3
+    assert not account_db.account_exists(SELFDESTRUCT_ADDRESS)
+    assert account_db.get_balance(BENEFICIARY) == 1
+
+    assert speculative_executor.transaction_count == 8
+    # The second transactions from the first sender, to the counter and to the
+    # self destructing contract had to be executed again.
+    assert speculative_executor.speculated_count == 5
+    assert speculative_executor.success_rate == 5 / 8
+
+
+def test_speculative_import_in_worker_processes(vm_class, blocks):
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        speculative_executor = SpeculativeExecutor(executor, transactions_per_task=2)
+        chain_class = make_chain_class(vm_class, speculative_executor)
+
+        _, imported_blocks = import_blocks(chain_class, blocks)
+
+    assert imported_blocks == blocks
+    assert speculative_executor.success_rate == 5 / 8
+
+
+def test_speculative_import_falls_back_to_serial_execution(vm_class, blocks):
+    # The database can't be sent to the worker processes.
+    base_db = WriteBehindDB(MemoryDB())
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        speculative_executor = SpeculativeExecutor(executor)
+        chain_class = make_chain_class(vm_class, speculative_executor)
+
+        _, imported_blocks = import_blocks(chain_class, blocks, base_db)
+    base_db.close()
+
+    assert imported_blocks == blocks
+    assert speculative_executor.transaction_count == 8
+    assert speculative_executor.success_rate == 0
+
+
+@pytest.fixture
+def account_db():
+    account_db = AccountDB(MemoryDB())
+    account_db.set_balance(RECIPIENT_A, 100)
+    account_db.set_storage(COUNTER_ADDRESS, 0, 1)
+    return account_db
+
+
+def test_recording_account_db_records_reads_and_writes(account_db):
+    recording_db = RecordingAccountDB(account_db)
+
+    assert recording_db.get_balance(RECIPIENT_A) == 100
+    recording_db.increment_nonce(RECIPIENT_B)
+    recording_db.set_storage(COUNTER_ADDRESS, 0, 2)
+
+    assert recording_db.reads == {(RECIPIENT_A, BALANCE), (RECIPIENT_B, NONCE)}
+    assert recording_db.writes == {(RECIPIENT_B, NONCE): 1, (COUNTER_ADDRESS, STORAGE, 0): 2}
+    assert account_db.get_nonce(RECIPIENT_B) == 1
+    assert account_db.get_storage(COUNTER_ADDRESS, 0) == 2
+
+
+def test_recording_account_db_discards_reverted_writes(account_db):
+    recording_db = RecordingAccountDB(account_db)
+    recording_db.set_balance(RECIPIENT_B, 1)
+
+    changeset = recording_db.record()
+    recording_db.get_storage(COUNTER_ADDRESS, 0)
+    recording_db.set_storage(COUNTER_ADDRESS, 0, 2)
+    recording_db.delete_account(RECIPIENT_B)
+    recording_db.discard(changeset)
+
+    # The read may still have affected the execution.
+    assert recording_db.reads == {(COUNTER_ADDRESS, STORAGE, 0)}
+    assert recording_db.writes == {(RECIPIENT_B, BALANCE): 1}
+    assert recording_db.wiped == {}
+    assert account_db.get_storage(COUNTER_ADDRESS, 0) == 1
+
+
+def test_recording_account_db_records_commutative_balance_deltas(account_db):
+    recording_db = RecordingAccountDB(account_db, commutative_addresses=(RECIPIENT_A,))
+
+    recording_db.delta_balance(RECIPIENT_A, 10)
+    recording_db.delta_balance(RECIPIENT_A, 5)
+    recording_db.delta_balance(RECIPIENT_B, 5)
+
+    assert recording_db.deltas == {RECIPIENT_A: 15}
+    assert recording_db.reads == {(RECIPIENT_B, BALANCE)}
+    assert recording_db.writes == {(RECIPIENT_B, BALANCE): 5}
+    assert account_db.get_balance(RECIPIENT_A) == 115
+
+    # Once the balance is read, it depends on the earlier balance.
+    assert recording_db.get_balance(RECIPIENT_A) == 115
+    recording_db.delta_balance(RECIPIENT_A, 5)
+
+    assert recording_db.deltas == {}
+    assert recording_db.writes[(RECIPIENT_A, BALANCE)] == 120
@@ -0,0 +1,147 @@
+from concurrent.futures import (
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+)
+
+import pytest
+
+from eth_utils import decode_hex
+
+from evm import Chain
+from evm import constants
+from evm.db.backends.memory import MemoryDB
+from evm.vm.forks.byzantium import ByzantiumVM
+from evm.vm.prefetch import StatePrefetcher
+
+from tests.core.helpers import (
+    new_transaction,
+)
+
+
+RECIPIENT = decode_hex('0xa94f5374fce5edbc8e2a8697c15331677e6ebf0c')
+COUNTER_ADDRESS = decode_hex('0x1000000000000000000000000000000000000001')
+# Increments the value in storage slot 0: PUSH1 0 SLOAD PUSH1 1 ADD PUSH1 0 SSTORE
+COUNTER_CODE = decode_hex('0x600054600101600055')
+
+GENESIS_PARAMS = {
+    'block_number': constants.GENESIS_BLOCK_NUMBER,
+    'difficulty': constants.GENESIS_DIFFICULTY,
+    'gas_limit': constants.GENESIS_GAS_LIMIT,
+    'parent_hash': constants.GENESIS_PARENT_HASH,
+    'coinbase': constants.GENESIS_COINBASE,
+    'nonce': constants.GENESIS_NONCE,
+    'mix_hash': constants.GENESIS_MIX_HASH,
+    'extra_data': constants.GENESIS_EXTRA_DATA,
+    'timestamp': 1501851927,
+}
+
+
+class ImmediateExecutor(Executor):
+    """
+    Runs the submitted calls right away, so that all state is loaded before execution.
+    """
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as err:
+            future.set_exception(err)
+        return future
+
+
+def make_chain_class(state_prefetcher=None):
+    # The blocks are not actually mined, so the proof of work seal can't be checked.
+    return Chain.configure(
+        __name__='PrefetchTestChain',
+        vm_configuration=(
+            (
+                constants.GENESIS_BLOCK_NUMBER,
+                ByzantiumVM.configure(
+                    validate_seal=lambda self, header: None,
+                    state_prefetcher=state_prefetcher,
+                ),
+            ),
+        ),
+        network_id=1337,
+    )
+
+
+@pytest.fixture
+def genesis_state(funded_address, funded_address_initial_balance):
+    return {
+        funded_address: {
+            'balance': funded_address_initial_balance,
+            'nonce': 0,
+            'code': b'',
+            'storage': {},
+        },
+        COUNTER_ADDRESS: {'balance': 0, 'nonce': 0, 'code': COUNTER_CODE, 'storage': {0: 1}},
+    }
+
+
+@pytest.fixture
+def blocks(genesis_state, funded_address, funded_address_private_key):
+    chain = make_chain_class().from_genesis(MemoryDB(), GENESIS_PARAMS, genesis_state)
+    mined_blocks = []
+    for _ in range(3):
+        for recipient in (RECIPIENT, COUNTER_ADDRESS):
+            vm = chain.get_vm()
+            tx = new_transaction(vm, funded_address, recipient, 10, funded_address_private_key)
+            chain.apply_transaction(tx)
+        mined_blocks.append(chain.mine_block())
+    return tuple(mined_blocks)
+
+
+def import_blocks(state_prefetcher, genesis_state, blocks):
+    chain_class = make_chain_class(state_prefetcher)
+    chain = chain_class.from_genesis(MemoryDB(), GENESIS_PARAMS, genesis_state)
+    return tuple(chain.import_block(block) for block in blocks)
+
+
+def test_import_with_state_prefetcher(genesis_state, blocks):
+    state_prefetcher = StatePrefetcher(ThreadPoolExecutor(max_workers=2), pre_execute=True)
+
+    assert import_blocks(state_prefetcher, genesis_state, blocks) == blocks
+    assert state_prefetcher.hits + state_prefetcher.misses > 0
+
+
+@pytest.mark.parametrize('pre_execute', (False, True))
+def test_prefetched_state_is_read_from_cache(genesis_state, blocks, pre_execute):
+    state_prefetcher = StatePrefetcher(ImmediateExecutor(), pre_execute=pre_execute)
+
+    assert import_blocks(state_prefetcher, genesis_state, blocks) == blocks
+    assert state_prefetcher.hits > 0
+    if pre_execute:
+        assert state_prefetcher.misses == 0
+    else:
+        # The storage of the counter contract is not known without executing the transactions.
+        assert state_prefetcher.misses > 0
+
+
+def test_prefetch_errors_do_not_affect_import(genesis_state, blocks):
+    class FailingExecutor(ImmediateExecutor):
+        def submit(self, fn, *args, **kwargs):
+            return super().submit(lambda *args: 1 / 0)
+
+    state_prefetcher = StatePrefetcher(FailingExecutor(), pre_execute=True)
+
+    assert import_blocks(state_prefetcher, genesis_state, blocks) == blocks
+    # Nothing was loaded ahead of time, so the first read of everything misses the cache.
+    assert state_prefetcher.misses > 0
+
+
+def test_state_is_on_database_after_prefetching(genesis_state, blocks):
+    state_prefetcher = StatePrefetcher(ImmediateExecutor(), pre_execute=True)
+    chain = make_chain_class(state_prefetcher).from_genesis(
+        MemoryDB(),
+        GENESIS_PARAMS,
+        genesis_state,
+    )
+
+    vm = chain.get_chain_at_block_parent(blocks[0]).get_vm()
+    imported_block, _ = vm.import_block_with_receipts(blocks[0])
+
+    assert imported_block == blocks[0]
+    assert vm.state._db is chain.chaindb.db
+    assert vm.state.state_root == blocks[0].header.state_root
@@ -1,11 +1,13 @@
 import pytest
 from evm.db.backends.memory import MemoryDB
+from evm.db.backends.sqlite import SQLiteDB
 from evm.db.journal import JournalDB
 from evm.db.batch import BatchDB
+from evm.db.write_behind import WriteBehindDB
 
 
-@pytest.fixture(params=[JournalDB, BatchDB, MemoryDB])
-def db(request):
+@pytest.fixture(params=[JournalDB, BatchDB, MemoryDB, SQLiteDB, WriteBehindDB])
+def db(request, tmpdir):
     base_db = MemoryDB()
     if request.param is JournalDB:
         return JournalDB(base_db)
@@ -13,6 +15,10 @@ def db(request):
         return BatchDB(base_db)
     elif request.param is MemoryDB:
         return base_db
+    elif request.param is SQLiteDB:
+        return SQLiteDB(db_path=str(tmpdir.join('db.sqlite')))
+    elif request.param is WriteBehindDB:
+        return WriteBehindDB(base_db)
     else:
         raise Exception("Invariant")
 
@@ -76,3 +82,54 @@ def test_database_api_missing_key_for_deletion(db):
 
     with pytest.raises(KeyError):
         del db[b'does-not-exist']
+
+
+@pytest.fixture
+def populated_db(db):
+    for key in (b'\x02', b'\x00', b'\x01\x00', b'\x01', b'\x01\xff', b'\x03'):
+        db[key] = key + b'-value'
+    return db
+
+
+def test_database_api_iterate(populated_db):
+    assert list(populated_db.iterate(start=b'\x01', stop=b'\x02')) == [
+        (b'\x01', b'\x01-value'),
+        (b'\x01\x00', b'\x01\x00-value'),
+        (b'\x01\xff', b'\x01\xff-value'),
+    ]
+    assert list(populated_db.iterate_keys()) == [
+        b'\x00', b'\x01', b'\x01\x00', b'\x01\xff', b'\x02', b'\x03',
+    ]
+    assert list(populated_db.iterate_keys(start=b'\x02')) == [b'\x02', b'\x03']
+    assert list(populated_db.iterate_keys(stop=b'\x01')) == [b'\x00']
+
+
+def test_database_api_iterate_prefix(populated_db):
+    assert list(populated_db.iterate_keys(prefix=b'\x01')) == [b'\x01', b'\x01\x00', b'\x01\xff']
+    assert list(populated_db.iterate_keys(prefix=b'\x01', start=b'\x01\x01')) == [b'\x01\xff']
+    assert list(populated_db.iterate_keys(prefix=b'\x01', stop=b'\x01\x01')) == [
+        b'\x01',
+        b'\x01\x00',
+    ]
+    assert list(populated_db.iterate_keys(prefix=b'\x04')) == []
+
+
+def test_database_api_iterate_reverse(populated_db):
+    assert list(populated_db.iterate_keys(reverse=True)) == [
+        b'\x03', b'\x02', b'\x01\xff', b'\x01\x00', b'\x01', b'\x00',
+    ]
+    assert list(populated_db.iterate(prefix=b'\x01', reverse=True)) == [
+        (b'\x01\xff', b'\x01\xff-value'),
+        (b'\x01\x00', b'\x01\x00-value'),
+        (b'\x01', b'\x01-value'),
+    ]
+
+
+def test_database_api_iterate_skips_deleted_keys(populated_db):
+    populated_db.delete(b'\x01\x00')
+    populated_db[b'\x01'] = b'updated'
+
+    assert list(populated_db.iterate(prefix=b'\x01')) == [
+        (b'\x01', b'updated'),
+        (b'\x01\xff', b'\x01\xff-value'),
+    ]
@@ -104,3 +104,27 @@ def test_batch_db_with_exception_across_contexts(base_db, batch_db):
     assert batch_db[b'key-1'] == b'origin-1'
     assert base_db[b'key-2'] == b'value-2'
     assert batch_db[b'key-2'] == b'value-2'
+
+
+def test_batch_db_iterate_overlays_pending_changes(base_db, batch_db):
+    base_db.set(b'key-1', b'value-1')
+    base_db.set(b'key-2', b'value-2')
+    base_db.set(b'key-4', b'value-4')
+
+    batch_db.set(b'key-0', b'value-0')
+    batch_db.set(b'key-2', b'value-2b')
+    batch_db.set(b'key-3', b'value-3')
+    batch_db.delete(b'key-4')
+    batch_db.set(b'other', b'other')
+
+    assert list(batch_db.iterate(prefix=b'key-')) == [
+        (b'key-0', b'value-0'),
+        (b'key-1', b'value-1'),
+        (b'key-2', b'value-2b'),
+        (b'key-3', b'value-3'),
+    ]
+    assert list(batch_db.iterate_keys(prefix=b'key-', reverse=True)) == [
+        b'key-3', b'key-2', b'key-1', b'key-0',
+    ]
+    # The wrapped database is unchanged until the batch is committed
+    assert list(base_db.iterate_keys()) == [b'key-1', b'key-2', b'key-4']
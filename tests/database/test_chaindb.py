@@ -16,20 +16,33 @@ from evm.db.backends.memory import MemoryDB
 from evm.db.chain import (
     ChainDB,
 )
-from evm.db.schema import SchemaV1
+from evm.db.migrations import migrate_block_bodies_to_v2
+from evm.db.schema import (
+    SchemaV1,
+    SchemaV2,
+)
+from evm.db.trie import make_trie_root_and_nodes
 from evm.exceptions import (
     HeaderNotFound,
     ParentNotFound,
+    TransactionNotFound,
+    ValidationError,
 )
 from evm.rlp.headers import (
     BlockHeader,
 )
+from evm.rlp.receipts import (
+    Receipt,
+)
 from evm.tools.fixture_tests import (
     assert_rlp_equal,
 )
 from evm.vm.forks.frontier.blocks import (
     FrontierBlock,
 )
+from evm.vm.forks.frontier.transactions import (
+    FrontierTransaction,
+)
 from evm.vm.forks.homestead.blocks import (
     HomesteadBlock,
 )
@@ -70,10 +83,36 @@ def block(request, header):
     return request.param(header)
 
 
+@pytest.fixture
+def transactions():
+    return tuple(
+        FrontierTransaction(
+            nonce=nonce,
+            gas_price=1,
+            gas=21000,
+            to=B_ADDRESS,
+            value=nonce,
+            data=b'',
+            v=27,
+            r=1,
+            s=1,
+        )
+        for nonce in range(5)
+    )
+
+
+@pytest.fixture
+def receipts():
+    return tuple(
+        Receipt(state_root=b'\x01' * 32, gas_used=21000 * (idx + 1), logs=[])
+        for idx in range(5)
+    )
+
+
 def test_chaindb_add_block_number_to_hash_lookup(chaindb, block):
     block_number_to_hash_key = SchemaV1.make_block_number_to_hash_lookup_key(block.number)
     assert not chaindb.exists(block_number_to_hash_key)
-    chaindb._add_block_number_to_hash_lookup(block.header)
+    chaindb._add_block_number_to_hash_lookup(chaindb.db, block.header)
     assert chaindb.exists(block_number_to_hash_key)
 
 
@@ -96,6 +135,44 @@ def test_chaindb_persist_header_unknown_parent(chaindb, header, seed):
         chaindb.persist_header(n_header)
 
 
+def test_chaindb_persist_header_chain(chaindb):
+    genesis = BlockHeader(difficulty=1, block_number=0, gas_limit=0)
+    chaindb.persist_header(genesis)
+
+    headers = []
+    parent = genesis
+    for _ in range(5):
+        parent = BlockHeader(
+            difficulty=10,
+            block_number=parent.block_number + 1,
+            gas_limit=0,
+            parent_hash=parent.hash,
+        )
+        headers.append(parent)
+
+    new_canonical_headers = chaindb.persist_header_chain(headers)
+
+    assert new_canonical_headers == tuple(headers)
+    assert chaindb.get_canonical_head() == headers[-1]
+    for idx, header in enumerate(headers, 1):
+        assert chaindb.get_canonical_block_hash(header.block_number) == header.hash
+        assert chaindb.get_score(header.hash) == 1 + 10 * idx
+
+
+def test_chaindb_persist_header_chain_non_contiguous(chaindb):
+    genesis = BlockHeader(difficulty=1, block_number=0, gas_limit=0)
+    chaindb.persist_header(genesis)
+
+    block1 = BlockHeader(difficulty=1, block_number=1, gas_limit=0, parent_hash=genesis.hash)
+    orphan = BlockHeader(difficulty=1, block_number=2, gas_limit=0, parent_hash=b'\x0f' * 32)
+
+    with pytest.raises(ValidationError):
+        chaindb.persist_header_chain((block1, orphan))
+
+    assert not chaindb.header_exists(block1.hash)
+    assert chaindb.get_canonical_head() == genesis
+
+
 def test_chaindb_persist_block(chaindb, block):
     block = block.copy(header=set_empty_root(chaindb, block.header))
     block_to_hash_key = SchemaV1.make_block_hash_to_score_lookup_key(block.hash)
@@ -132,6 +209,96 @@ def test_chaindb_get_block_header_by_hash(chaindb, block, header):
 
 def test_chaindb_get_canonical_block_hash(chaindb, block):
     block = block.copy(header=set_empty_root(chaindb, block.header))
-    chaindb._add_block_number_to_hash_lookup(block.header)
+    chaindb._add_block_number_to_hash_lookup(chaindb.db, block.header)
     block_hash = chaindb.get_canonical_block_hash(block.number)
     assert block_hash == block.hash
+
+
+def test_chaindb_block_transactions_and_receipts_stored_as_single_value(
+        chaindb,
+        transactions,
+        receipts):
+    transaction_root, _ = make_trie_root_and_nodes(transactions)
+    receipt_root, _ = make_trie_root_and_nodes(receipts)
+    header = BlockHeader(
+        difficulty=1,
+        block_number=0,
+        gas_limit=0,
+        transaction_root=transaction_root,
+        receipt_root=receipt_root,
+    )
+
+    # Only the single-value lists are stored, none of the trie nodes.
+    chaindb.persist_block_transactions(transaction_root, transactions)
+    chaindb.persist_block_receipts(receipt_root, receipts)
+    chaindb.persist_header(header)
+
+    assert chaindb.get_block_transactions(header, FrontierTransaction) == list(transactions)
+    assert chaindb.get_block_transaction_hashes(header) == [tx.hash for tx in transactions]
+    assert chaindb.get_receipts(header, Receipt) == receipts
+    assert chaindb.get_transaction_by_index(0, 3, FrontierTransaction) == transactions[3]
+    with pytest.raises(TransactionNotFound):
+        chaindb.get_transaction_by_index(0, len(transactions), FrontierTransaction)
+
+
+def test_chaindb_block_transactions_and_receipts_fall_back_to_tries(
+        chaindb,
+        transactions,
+        receipts):
+    transaction_root, transaction_nodes = make_trie_root_and_nodes(transactions)
+    receipt_root, receipt_nodes = make_trie_root_and_nodes(receipts)
+    header = BlockHeader(
+        difficulty=1,
+        block_number=0,
+        gas_limit=0,
+        transaction_root=transaction_root,
+        receipt_root=receipt_root,
+    )
+
+    # Only the trie nodes are stored, as done by databases created before SchemaV2.
+    chaindb.persist_trie_data_dict(transaction_nodes)
+    chaindb.persist_trie_data_dict(receipt_nodes)
+    chaindb.persist_header(header)
+
+    assert chaindb.get_block_transactions(header, FrontierTransaction) == list(transactions)
+    assert chaindb.get_receipts(header, Receipt) == receipts
+    assert chaindb.get_transaction_by_index(0, 3, FrontierTransaction) == transactions[3]
+
+
+def test_migrate_block_bodies_to_v2(chaindb, transactions, receipts):
+    genesis = BlockHeader(difficulty=1, block_number=0, gas_limit=0)
+    chaindb.persist_header(genesis)
+
+    parent = genesis
+    headers = []
+    for idx in range(1, len(transactions) + 1):
+        transaction_root, transaction_nodes = make_trie_root_and_nodes(transactions[:idx])
+        receipt_root, receipt_nodes = make_trie_root_and_nodes(receipts[:idx])
+        chaindb.persist_trie_data_dict(transaction_nodes)
+        chaindb.persist_trie_data_dict(receipt_nodes)
+        parent = BlockHeader(
+            difficulty=1,
+            block_number=idx,
+            gas_limit=0,
+            parent_hash=parent.hash,
+            transaction_root=transaction_root,
+            receipt_root=receipt_root,
+        )
+        headers.append(parent)
+    chaindb.persist_header_chain(headers)
+
+    assert migrate_block_bodies_to_v2(chaindb.db, batch_size=2) == len(headers)
+    # running it again is a no-op
+    assert migrate_block_bodies_to_v2(chaindb.db) == 0
+
+    for idx, header in enumerate(headers, 1):
+        assert chaindb.exists(SchemaV2.make_block_transactions_lookup_key(header.transaction_root))
+        assert chaindb.exists(SchemaV2.make_block_receipts_lookup_key(header.receipt_root))
+        assert chaindb.get_block_transactions(header, FrontierTransaction) == list(
+            transactions[:idx]
+        )
+        assert chaindb.get_receipts(header, Receipt) == receipts[:idx]
+
+
+def test_migrate_block_bodies_to_v2_without_canonical_head():
+    assert migrate_block_bodies_to_v2(MemoryDB()) == 0
@@ -18,6 +18,7 @@ from evm.constants import (
 from evm.exceptions import (
     CanonicalHeadNotFound,
     ParentNotFound,
+    ValidationError,
 )
 from evm.db.backends.memory import MemoryDB
 from evm.db.header import HeaderDB
@@ -134,6 +135,63 @@ def test_headerdb_persist_header_returns_new_canonical_chain(headerdb, genesis_h
             assert res == (header,)
 
 
+def test_headerdb_persist_header_chain_matches_individual_persists(genesis_header):
+    chain_a = mk_header_chain(genesis_header, 7)
+    chain_b = mk_header_chain(genesis_header, 9)
+
+    individual_db = HeaderDB(MemoryDB())
+    individual_db.persist_header(genesis_header)
+    for header in chain_a + chain_b:
+        individual_db.persist_header(header)
+
+    batch_db = HeaderDB(MemoryDB())
+    batch_db.persist_header_chain((genesis_header,))
+    assert batch_db.persist_header_chain(chain_a) == chain_a
+    # `chain_b` overtakes `chain_a` so all of its headers become canonical at once.
+    assert batch_db.persist_header_chain(chain_b) == chain_b
+
+    assert batch_db.db.kv_store == individual_db.db.kv_store
+    assert_is_canonical_chain(batch_db, chain_b)
+
+
+def test_headerdb_persist_header_chain_not_canonical(headerdb, genesis_header):
+    headerdb.persist_header(genesis_header)
+
+    chain_a = mk_header_chain(genesis_header, 5)
+    chain_b = mk_header_chain(genesis_header, 3)
+
+    assert headerdb.persist_header_chain(chain_a) == chain_a
+    assert headerdb.persist_header_chain(chain_b) == tuple()
+    assert_is_canonical_chain(headerdb, chain_a)
+
+    for header in chain_b:
+        assert headerdb.header_exists(header.hash)
+
+
+def test_headerdb_persist_header_chain_empty(headerdb):
+    assert headerdb.persist_header_chain(()) == tuple()
+
+
+def test_headerdb_persist_header_chain_disallows_unknown_parent(headerdb, genesis_header):
+    headers = mk_header_chain(genesis_header, 3)
+    with pytest.raises(ParentNotFound, match="unknown parent"):
+        headerdb.persist_header_chain(headers)
+
+
+def test_headerdb_persist_header_chain_disallows_non_contiguous_chain(headerdb, genesis_header):
+    headerdb.persist_header(genesis_header)
+
+    headers = mk_header_chain(genesis_header, 5)
+    non_contiguous = headers[:2] + headers[3:]
+
+    with pytest.raises(ValidationError, match="Non-contiguous"):
+        headerdb.persist_header_chain(non_contiguous)
+
+    # nothing from the failed batch should have been written
+    assert not any(headerdb.header_exists(h.hash) for h in headers)
+    assert_headers_eq(headerdb.get_canonical_head(), genesis_header)
+
+
 def test_headerdb_get_score_for_genesis_header(headerdb, genesis_header):
     headerdb.persist_header(genesis_header)
     score = headerdb.get_score(genesis_header.hash)
@@ -194,3 +194,25 @@ def test_returns_key_from_underlying_db_if_missing(journal_db, memory_db):
     assert memory_db.exists(b'1')
 
     assert journal_db.get(b'1') == b'test-a'
+
+
+def test_iterate_overlays_journaled_changes(journal_db, memory_db):
+    memory_db.set(b'1', b'test-a')
+    memory_db.set(b'2', b'test-b')
+    memory_db.set(b'3', b'test-c')
+
+    journal_db.set(b'0', b'test-0')
+    changeset = journal_db.record()
+    journal_db.delete(b'2')
+    journal_db.set(b'3', b'test-d')
+
+    assert list(journal_db.iterate()) == [
+        (b'0', b'test-0'),
+        (b'1', b'test-a'),
+        (b'3', b'test-d'),
+    ]
+
+    journal_db.discard(changeset)
+
+    assert list(journal_db.iterate_keys(reverse=True)) == [b'3', b'2', b'1', b'0']
+    assert journal_db.get(b'3') == b'test-c'
@@ -57,3 +57,20 @@ def test_delete(level_db, memory_db):
     level_db.delete(b'1')
     memory_db.delete(b'1')
     assert level_db.exists(b'1') == memory_db.exists(b'1')
+
+
+def test_iterate(level_db, memory_db):
+    for key in (b'3', b'1', b'20', b'2'):
+        level_db.set(key, key)
+        memory_db.set(key, key)
+    assert list(level_db.iterate()) == list(memory_db.iterate())
+    assert list(level_db.iterate(b'2', b'3')) == list(memory_db.iterate(b'2', b'3'))
+
+
+def test_iterate_prefix_and_reverse(level_db, memory_db):
+    for key in (b'a1', b'a2', b'a\xff', b'b1', b'a'):
+        level_db.set(key, key)
+        memory_db.set(key, key)
+    for kwargs in ({'prefix': b'a'}, {'prefix': b'a', 'reverse': True}, {'reverse': True}):
+        assert list(level_db.iterate(**kwargs)) == list(memory_db.iterate(**kwargs))
+        assert list(level_db.iterate_keys(**kwargs)) == list(memory_db.iterate_keys(**kwargs))
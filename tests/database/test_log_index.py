@@ -0,0 +1,216 @@
+import pytest
+
+from eth_bloom import BloomFilter
+
+from evm.db.backends.memory import MemoryDB
+from evm.db.bloombits import (
+    BLOOM_BITS_SECTION_SIZE,
+    get_bloom_bit_indices,
+    get_section_range_mask,
+    get_set_bits,
+)
+from evm.db.chain import ChainDB
+from evm.db.migrations import (
+    backfill_bloom_bits,
+    migrate_block_bodies_to_v2,
+    migrate_keys_to_v3,
+)
+from evm.db.schema import (
+    SchemaV3,
+    set_schema,
+)
+from evm.db.trie import make_trie_root_and_nodes
+from evm.rlp.headers import BlockHeader
+from evm.rlp.logs import Log
+from evm.rlp.receipts import Receipt
+from evm.vm.forks.frontier.blocks import FrontierBlock
+
+
+ADDRESS_A = b'\xaa' * 20
+ADDRESS_B = b'\xbb' * 20
+TOPIC_X = 1
+TOPIC_Y = 2
+TOPIC_X_BYTES = TOPIC_X.to_bytes(32, 'big')
+TOPIC_Y_BYTES = TOPIC_Y.to_bytes(32, 'big')
+
+# The logs of each block after genesis, by block number
+BLOCK_LOGS = {
+    1: [Log(ADDRESS_A, [TOPIC_X], b'')],
+    2: [],
+    3: [Log(ADDRESS_B, [TOPIC_Y], b'')],
+    4: [Log(ADDRESS_A, [TOPIC_Y], b''), Log(ADDRESS_B, [TOPIC_X], b'')],
+    5: [],
+}
+
+
+@pytest.fixture(params=[None, SchemaV3], ids=['default-schema', 'schema-v3'])
+def chaindb(request):
+    db = MemoryDB()
+    if request.param is not None:
+        set_schema(db, request.param)
+    return ChainDB(db)
+
+
+def make_block(chaindb, parent, logs, extra_data=b''):
+    receipts = [Receipt(state_root=b'\x01' * 32, gas_used=21000, logs=logs)] if logs else []
+    receipt_root, _ = make_trie_root_and_nodes(receipts)
+    chaindb.persist_block_receipts(receipt_root, receipts)
+
+    bloom = BloomFilter()
+    for receipt in receipts:
+        bloom |= receipt.bloom_filter
+
+    header = BlockHeader(
+        difficulty=1,
+        block_number=parent.block_number + 1,
+        gas_limit=0,
+        parent_hash=parent.hash,
+        receipt_root=receipt_root,
+        bloom=int(bloom),
+        extra_data=extra_data,
+    )
+    return FrontierBlock(header)
+
+
+def import_chain(chaindb, block_logs, parent=None, extra_data=b''):
+    if parent is None:
+        parent = BlockHeader(difficulty=1, block_number=0, gas_limit=0)
+        chaindb.persist_header(parent)
+
+    headers = [parent]
+    for block_number in sorted(block_logs):
+        block = make_block(chaindb, headers[-1], block_logs[block_number], extra_data)
+        chaindb.persist_block(block)
+        headers.append(block.header)
+    return headers
+
+
+@pytest.mark.parametrize('value', (ADDRESS_A, TOPIC_X_BYTES, b'', b'\x01' * 100))
+def test_get_bloom_bit_indices(value):
+    bloom = int(BloomFilter.from_iterable([value]))
+    assert set(get_bloom_bit_indices(value)) == set(get_set_bits(bloom))
+
+
+def test_get_set_bits():
+    assert tuple(get_set_bits(0)) == ()
+    assert tuple(get_set_bits(0b101001)) == (0, 3, 5)
+
+
+@pytest.mark.parametrize(
+    'section, from_block, to_block, expected',
+    (
+        (0, 0, 3, 0b1111),
+        (0, 2, 3, 0b1100),
+        (0, 5, 3, 0),
+        (1, 0, 3, 0),
+        (0, 1, BLOOM_BITS_SECTION_SIZE * 2, (1 << BLOOM_BITS_SECTION_SIZE) - 2),
+        (1, 0, BLOOM_BITS_SECTION_SIZE + 1, 0b11),
+    ),
+)
+def test_get_section_range_mask(section, from_block, to_block, expected):
+    assert get_section_range_mask(section, from_block, to_block) == expected
+
+
+@pytest.mark.parametrize(
+    'criteria, from_block, to_block, expected',
+    (
+        ((), 0, 5, (0, 1, 2, 3, 4, 5)),
+        (((ADDRESS_A,),), 0, 5, (1, 4)),
+        (((ADDRESS_A,),), 2, 5, (4,)),
+        (((ADDRESS_A, ADDRESS_B),), 0, 5, (1, 3, 4)),
+        (((ADDRESS_A,), (TOPIC_Y_BYTES,)), 0, 5, (4,)),
+        (((), (TOPIC_X_BYTES,)), 0, 5, (1, 4)),
+        (((b'\xcc' * 20,),), 0, 5, ()),
+    ),
+)
+def test_get_log_candidate_block_numbers(chaindb, criteria, from_block, to_block, expected):
+    import_chain(chaindb, BLOCK_LOGS)
+    candidates = chaindb.get_log_candidate_block_numbers(criteria, from_block, to_block)
+    assert tuple(candidates) == expected
+
+
+def test_log_index_follows_reorg(chaindb):
+    headers = import_chain(chaindb, BLOCK_LOGS)
+
+    # A longer fork from block 2, with logs of ADDRESS_B only
+    fork_logs = {
+        number: [Log(ADDRESS_B, [TOPIC_Y], b'')]
+        for number in range(3, 7)
+    }
+    import_chain(chaindb, fork_logs, parent=headers[2], extra_data=b'fork')
+
+    assert tuple(chaindb.get_log_candidate_block_numbers(((ADDRESS_A,),), 0, 6)) == (1,)
+    assert tuple(chaindb.get_log_candidate_block_numbers(((ADDRESS_B,),), 0, 6)) == (3, 4, 5, 6)
+    assert tuple(chaindb.get_log_candidate_block_numbers(((TOPIC_X_BYTES,),), 0, 6)) == (1,)
+
+
+def test_bloom_bits_of_header_chain(chaindb, monkeypatch):
+    genesis = BlockHeader(difficulty=1, block_number=0, gas_limit=0)
+    chaindb.persist_header(genesis)
+    headers = []
+    for block_number in sorted(BLOCK_LOGS):
+        parent = headers[-1] if headers else genesis
+        headers.append(make_block(chaindb, parent, BLOCK_LOGS[block_number]).header)
+
+    # every vector is only updated once for the whole chain
+    updated_vectors = []
+    get_bloom_bits = chaindb._get_bloom_bits
+
+    def get_bloom_bits_counting(db, bit, section):
+        updated_vectors.append((bit, section))
+        return get_bloom_bits(db, bit, section)
+
+    monkeypatch.setattr(chaindb, '_get_bloom_bits', get_bloom_bits_counting)
+    chaindb.persist_header_chain(headers)
+    monkeypatch.undo()
+
+    assert updated_vectors
+    assert len(updated_vectors) == len(set(updated_vectors))
+
+    assert tuple(chaindb.get_log_candidate_block_numbers(((ADDRESS_A,),), 0, 5)) == (1, 4)
+    assert tuple(chaindb.get_log_candidate_block_numbers(((ADDRESS_B,),), 0, 5)) == (3, 4)
+
+
+def test_migrate_log_index_to_v3():
+    db = MemoryDB()
+    import_chain(ChainDB(db), BLOCK_LOGS)
+    migrate_keys_to_v3(db)
+
+    chaindb = ChainDB(db)
+    assert chaindb.schema is SchemaV3
+    assert tuple(chaindb.get_log_candidate_block_numbers(((ADDRESS_A,),), 0, 5)) == (1, 4)
+    assert tuple(chaindb.get_log_candidate_block_numbers(((TOPIC_Y_BYTES,),), 0, 5)) == (3, 4)
+
+
+def make_db_without_bloom_bits():
+    # The chain as written before the bloom bits were introduced
+    db = MemoryDB()
+    import_chain(ChainDB(db), BLOCK_LOGS)
+    for key in tuple(db.iterate_keys(prefix=b'bloom-bits:')):
+        db.delete(key)
+    return db
+
+
+def test_backfill_bloom_bits():
+    db = make_db_without_bloom_bits()
+    assert tuple(ChainDB(db).get_log_candidate_block_numbers(((ADDRESS_A,),), 0, 5)) == ()
+
+    migrate_block_bodies_to_v2(db)
+    migrate_keys_to_v3(db)
+    assert backfill_bloom_bits(db) == 3
+    assert backfill_bloom_bits(db) == 0
+
+    chaindb = ChainDB(db)
+    assert tuple(chaindb.get_log_candidate_block_numbers(((ADDRESS_A,),), 0, 5)) == (1, 4)
+    assert tuple(chaindb.get_log_candidate_block_numbers(((TOPIC_Y_BYTES,),), 0, 5)) == (3, 4)
+
+
+def test_backfill_bloom_bits_from_start_block():
+    db = make_db_without_bloom_bits()
+
+    assert backfill_bloom_bits(db, start_block=2) == 2
+    assert tuple(ChainDB(db).get_log_candidate_block_numbers(((ADDRESS_A,),), 0, 5)) == (4,)
+
+
+def test_backfill_bloom_bits_without_canonical_head():
+    assert backfill_bloom_bits(MemoryDB()) == 0
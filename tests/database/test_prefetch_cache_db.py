@@ -0,0 +1,54 @@
+import pytest
+
+from evm.db.backends.memory import MemoryDB
+from evm.db.prefetch import PrefetchCacheDB
+
+
+@pytest.fixture
+def base_db():
+    return MemoryDB({b'key-1': b'value-1', b'key-2': b'value-2'})
+
+
+@pytest.fixture
+def cache_db(base_db):
+    return PrefetchCacheDB(base_db)
+
+
+def test_prefetch_cache_db_counts_hits_and_misses(base_db, cache_db):
+    assert cache_db[b'key-1'] == b'value-1'
+    assert cache_db[b'key-1'] == b'value-1'
+    with pytest.raises(KeyError):
+        cache_db[b'missing']
+
+    assert cache_db.hits == 1
+    assert cache_db.misses == 2
+
+
+def test_prefetch_cache_db_warming(base_db, cache_db):
+    warming_db = cache_db.get_warming_db()
+    assert warming_db[b'key-1'] == b'value-1'
+    assert b'missing' not in warming_db
+
+    # Reads are served from the cache even if the underlying value goes away.
+    del base_db[b'key-1']
+    assert cache_db[b'key-1'] == b'value-1'
+    assert cache_db.hits == 1
+    assert cache_db.misses == 0
+
+
+def test_prefetch_cache_db_writes_through(base_db, cache_db):
+    cache_db[b'key-3'] = b'value-3'
+    del cache_db[b'key-2']
+
+    assert base_db.kv_store == {b'key-1': b'value-1', b'key-3': b'value-3'}
+    assert cache_db[b'key-3'] == b'value-3'
+    assert b'key-2' not in cache_db
+
+
+def test_prefetch_cache_db_warming_db_is_read_only(cache_db):
+    warming_db = cache_db.get_warming_db()
+
+    with pytest.raises(TypeError):
+        warming_db[b'key-3'] = b'value-3'
+    with pytest.raises(TypeError):
+        del warming_db[b'key-1']
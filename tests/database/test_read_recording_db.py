@@ -0,0 +1,34 @@
+import pytest
+
+from evm.db.backends.memory import MemoryDB
+from evm.db.batch import BatchDB
+from evm.db.recording import ReadRecordingDB
+
+
+@pytest.fixture
+def recording_db():
+    return ReadRecordingDB(MemoryDB({b'key-1': b'value-1', b'key-2': b'value-2'}))
+
+
+def test_read_recording_db_records_reads(recording_db):
+    assert recording_db[b'key-1'] == b'value-1'
+    assert b'key-2' in recording_db
+    assert b'missing' not in recording_db
+
+    assert recording_db.read_values == {b'key-1': b'value-1', b'key-2': b'value-2'}
+
+
+def test_read_recording_db_is_read_only(recording_db):
+    with pytest.raises(TypeError):
+        recording_db[b'key-3'] = b'value-3'
+    with pytest.raises(TypeError):
+        del recording_db[b'key-1']
+
+
+def test_read_recording_db_with_batch_db_records_only_wrapped_values(recording_db):
+    batch_db = BatchDB(recording_db)
+    batch_db[b'key-1'] = b'changed'
+
+    assert batch_db[b'key-1'] == b'changed'
+    assert batch_db[b'key-2'] == b'value-2'
+    assert recording_db.read_values == {b'key-2': b'value-2'}
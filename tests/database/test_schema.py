@@ -0,0 +1,146 @@
+import pytest
+
+import rlp
+
+from evm.db.backends.memory import MemoryDB
+from evm.db.chain import ChainDB
+from evm.db.header import HeaderDB
+from evm.db.migrations import migrate_keys_to_v3
+from evm.db.schema import (
+    SCHEMA_VERSION_KEY,
+    SchemaV2,
+    SchemaV3,
+    get_schema,
+    set_schema,
+)
+from evm.db.trie import make_trie_root_and_nodes
+from evm.rlp.headers import BlockHeader
+from evm.rlp.receipts import Receipt
+from evm.vm.forks.frontier.transactions import FrontierTransaction
+
+
+@pytest.fixture
+def base_db():
+    return MemoryDB()
+
+
+@pytest.fixture
+def v3_db(base_db):
+    set_schema(base_db, SchemaV3)
+    return base_db
+
+
+def mk_header_chain(length):
+    parent = BlockHeader(difficulty=1, block_number=0, gas_limit=0)
+    headers = [parent]
+    for _ in range(length - 1):
+        parent = BlockHeader(
+            difficulty=1,
+            block_number=parent.block_number + 1,
+            gas_limit=0,
+            parent_hash=parent.hash,
+        )
+        headers.append(parent)
+    return headers
+
+
+def test_get_schema_defaults_to_v2(base_db):
+    assert get_schema(base_db) is SchemaV2
+    assert ChainDB(base_db).schema is SchemaV2
+    assert HeaderDB(base_db).schema is SchemaV2
+
+
+def test_set_schema(v3_db):
+    assert get_schema(v3_db) is SchemaV3
+    assert ChainDB(v3_db).schema is SchemaV3
+    assert HeaderDB(v3_db).schema is SchemaV3
+
+
+def test_get_schema_unknown_version(base_db):
+    base_db[SCHEMA_VERSION_KEY] = b'99'
+    with pytest.raises(ValueError):
+        get_schema(base_db)
+
+
+def test_schema_v3_block_number_keys_sort_numerically():
+    block_numbers = [0, 1, 2, 9, 10, 11, 99, 100, 255, 256, 2 ** 32, 2 ** 63]
+    keys = [SchemaV3.make_block_number_to_hash_lookup_key(n) for n in block_numbers]
+
+    assert sorted(keys) == keys
+    assert len(set(len(key) for key in keys)) == 1
+    assert [SchemaV3.get_block_number_from_lookup_key(key) for key in keys] == block_numbers
+
+
+def test_schema_v3_canonical_range_scan(v3_db):
+    headers = mk_header_chain(20)
+    HeaderDB(v3_db).persist_header_chain(headers)
+
+    start = SchemaV3.make_block_number_to_hash_lookup_key(5)
+    stop = SchemaV3.make_block_number_to_hash_lookup_key(12)
+    canonical_numbers = [
+        SchemaV3.get_block_number_from_lookup_key(key)
+        for key, _ in v3_db.iterate(start, stop)
+    ]
+    assert canonical_numbers == list(range(5, 12))
+
+
+def test_chaindb_with_schema_v3(v3_db):
+    headers = mk_header_chain(5)
+    chaindb = ChainDB(v3_db)
+    chaindb.persist_header_chain(headers)
+
+    assert chaindb.get_canonical_head() == headers[-1]
+    assert chaindb.get_score(headers[-1].hash) == len(headers)
+    assert chaindb.get_canonical_block_hash(3) == headers[3].hash
+    assert v3_db.exists(SchemaV3.make_block_number_to_hash_lookup_key(3))
+    assert not v3_db.exists(SchemaV2.make_block_number_to_hash_lookup_key(3))
+
+
+def test_migrate_keys_to_v3(base_db):
+    transactions = tuple(
+        FrontierTransaction(
+            nonce=nonce,
+            gas_price=1,
+            gas=21000,
+            to=b'\xbb' * 20,
+            value=nonce,
+            data=b'',
+            v=27,
+            r=1,
+            s=1,
+        )
+        for nonce in range(3)
+    )
+    receipts = tuple(
+        Receipt(state_root=b'\x01' * 32, gas_used=21000 * (idx + 1), logs=[])
+        for idx in range(3)
+    )
+    transaction_root, _ = make_trie_root_and_nodes(transactions)
+    receipt_root, _ = make_trie_root_and_nodes(receipts)
+
+    headers = mk_header_chain(10)
+    chaindb = ChainDB(base_db)
+    chaindb.persist_header_chain(headers)
+    chaindb.persist_block_transactions(transaction_root, transactions)
+    chaindb.persist_block_receipts(receipt_root, receipts)
+    chaindb._add_transaction_to_canonical_chain(transactions[1].hash, headers[4], 1)
+
+    # 10 canonical numbers, 10 scores, the canonical head, one transaction lookup and
+    # the transaction and receipt lists.
+    assert migrate_keys_to_v3(base_db, batch_size=3) == 24
+    assert migrate_keys_to_v3(base_db) == 0
+
+    assert get_schema(base_db) is SchemaV3
+    assert not any(key.startswith(b'block-') for key in base_db.kv_store)
+    assert not base_db.exists(SchemaV2.make_canonical_head_hash_lookup_key())
+
+    chaindb = ChainDB(base_db)
+    assert chaindb.get_canonical_head() == headers[-1]
+    for header in headers:
+        assert chaindb.get_canonical_block_hash(header.block_number) == header.hash
+        assert chaindb.get_score(header.hash) == header.block_number + 1
+    assert chaindb.get_transaction_index(transactions[1].hash) == (4, 1)
+    assert chaindb._get_encoded_item_list(
+        base_db,
+        SchemaV3.make_block_transactions_lookup_key(transaction_root),
+    ) == tuple(rlp.encode(transaction) for transaction in transactions)
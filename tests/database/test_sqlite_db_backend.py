@@ -0,0 +1,114 @@
+import pickle
+
+import pytest
+
+from evm.db.backends import sqlite
+from evm.db.backends.sqlite import SQLiteDB
+
+
+@pytest.fixture
+def db_path(tmpdir):
+    return str(tmpdir.join('db.sqlite'))
+
+
+@pytest.fixture
+def sqlite_db(db_path):
+    return SQLiteDB(db_path=db_path)
+
+
+def test_raises_if_db_path_is_not_specified():
+    with pytest.raises(TypeError):
+        SQLiteDB()
+
+
+def test_uses_wal_journal_mode(sqlite_db):
+    journal_mode, = sqlite_db._connection.execute('PRAGMA journal_mode').fetchone()
+    assert journal_mode == 'wal'
+
+
+def test_data_persists_after_reopening(sqlite_db, db_path):
+    sqlite_db.set(b'1', b'1')
+    sqlite_db.close()
+
+    assert SQLiteDB(db_path=db_path).get(b'1') == b'1'
+
+
+def test_concurrent_connections(sqlite_db, db_path):
+    reader = SQLiteDB(db_path=db_path)
+
+    with sqlite_db.write_batch():
+        sqlite_db.set(b'1', b'1')
+        # uncommitted writes are not visible to other connections
+        assert reader.get(b'1') is None
+
+    assert reader.get(b'1') == b'1'
+
+
+def test_pickled_db_reopens_the_same_file(sqlite_db, db_path):
+    sqlite_db.set(b'1', b'1')
+
+    unpickled_db = pickle.loads(pickle.dumps(sqlite_db))
+
+    assert unpickled_db.db_path == db_path
+    assert unpickled_db.get(b'1') == b'1'
+
+
+def test_multi_get(sqlite_db):
+    for i in range(1200):
+        sqlite_db.set(b'%d' % i, b'value-%d' % i)
+
+    keys = [b'%d' % i for i in range(0, 2000, 3)]
+    values = sqlite_db.multi_get(keys)
+
+    assert values == {b'%d' % i: b'value-%d' % i for i in range(0, 1200, 3)}
+    assert sqlite_db.multi_get([]) == {}
+
+
+def test_write_batch_commits(sqlite_db):
+    with sqlite_db.write_batch():
+        sqlite_db.set(b'1', b'1')
+        with sqlite_db.write_batch():
+            sqlite_db.set(b'2', b'2')
+        sqlite_db.delete(b'3')
+
+    assert sqlite_db.get(b'1') == b'1'
+    assert sqlite_db.get(b'2') == b'2'
+
+
+def test_write_batch_rolls_back_on_error(sqlite_db):
+    sqlite_db.set(b'1', b'1')
+
+    with pytest.raises(ZeroDivisionError):
+        with sqlite_db.write_batch():
+            sqlite_db.set(b'1', b'2')
+            sqlite_db.set(b'2', b'2')
+            1 / 0
+
+    assert sqlite_db.get(b'1') == b'1'
+    assert not sqlite_db.exists(b'2')
+
+
+@pytest.mark.parametrize('reverse', (False, True))
+def test_iterate_in_pages(sqlite_db, monkeypatch, reverse):
+    monkeypatch.setattr(sqlite, 'ITERATE_PAGE_SIZE', 3)
+    keys = [b'%02d' % i for i in range(10)]
+    for key in keys:
+        sqlite_db.set(key, key)
+
+    expected = [(key, key) for key in sorted(keys, reverse=reverse)]
+    assert list(sqlite_db.iterate(reverse=reverse)) == expected
+
+
+def test_iterate_while_writing(sqlite_db, monkeypatch):
+    monkeypatch.setattr(sqlite, 'ITERATE_PAGE_SIZE', 2)
+    for i in range(6):
+        sqlite_db.set(b'%d' % i, b'old')
+
+    iterated = []
+    for key, value in sqlite_db.iterate():
+        iterated.append((key, value))
+        # writes made while iterating don't disturb the iteration
+        sqlite_db.set(key, b'new')
+
+    assert iterated == [(b'%d' % i, b'old') for i in range(6)]
+    assert all(value == b'new' for _, value in sqlite_db.iterate())
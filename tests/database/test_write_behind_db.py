@@ -0,0 +1,102 @@
+import threading
+
+import pytest
+
+from evm.db.backends.memory import MemoryDB
+from evm.db.write_behind import WriteBehindDB
+
+
+class BlockingMemoryDB(MemoryDB):
+    """
+    A MemoryDB whose writes wait until they are released, and which can be made to fail.
+    """
+    def __init__(self):
+        super().__init__()
+        self.release_writes = threading.Event()
+        self.fail_writes = False
+
+    def __setitem__(self, key, value):
+        self.release_writes.wait()
+        if self.fail_writes:
+            raise ValueError("Write failed")
+        super().__setitem__(key, value)
+
+
+@pytest.fixture
+def base_db():
+    return BlockingMemoryDB()
+
+
+@pytest.fixture
+def write_behind_db(base_db):
+    db = WriteBehindDB(base_db, max_pending=2)
+    yield db
+    base_db.release_writes.set()
+    db.close()
+
+
+def test_write_behind_db_reads_unwritten_changes(base_db, write_behind_db):
+    base_db.kv_store[b'key-1'] = b'origin'
+    base_db.kv_store[b'key-2'] = b'origin'
+
+    write_behind_db[b'key-1'] = b'value-1'
+    write_behind_db.commit()
+    del write_behind_db[b'key-2']
+    write_behind_db.commit()
+    write_behind_db[b'key-3'] = b'value-3'
+
+    assert base_db.kv_store == {b'key-1': b'origin', b'key-2': b'origin'}
+    assert write_behind_db[b'key-1'] == b'value-1'
+    assert b'key-2' not in write_behind_db
+    assert write_behind_db[b'key-3'] == b'value-3'
+    assert list(write_behind_db.iterate()) == [(b'key-1', b'value-1'), (b'key-3', b'value-3')]
+
+    base_db.release_writes.set()
+    write_behind_db.flush()
+
+    assert base_db.kv_store == {b'key-1': b'value-1', b'key-3': b'value-3'}
+    assert write_behind_db[b'key-1'] == b'value-1'
+    assert b'key-2' not in write_behind_db
+
+
+def test_write_behind_db_commit_blocks_when_too_many_pending(base_db, write_behind_db):
+    # One commit is being written and two are queued.
+    for index in range(3):
+        write_behind_db[b'key-%d' % index] = b'value'
+        write_behind_db.commit()
+
+    write_behind_db[b'key-3'] = b'value'
+    committer = threading.Thread(target=write_behind_db.commit)
+    committer.start()
+    committer.join(timeout=0.1)
+    assert committer.is_alive()
+
+    base_db.release_writes.set()
+    committer.join(timeout=5)
+    assert not committer.is_alive()
+
+    write_behind_db.flush()
+    assert len(base_db.kv_store) == 4
+
+
+def test_write_behind_db_clear_discards_uncommitted_changes(base_db, write_behind_db):
+    base_db.release_writes.set()
+    write_behind_db[b'key-1'] = b'value-1'
+    write_behind_db.commit()
+    write_behind_db[b'key-2'] = b'value-2'
+    write_behind_db.clear()
+    write_behind_db.flush()
+
+    assert base_db.kv_store == {b'key-1': b'value-1'}
+
+
+def test_write_behind_db_raises_write_errors(base_db, write_behind_db):
+    base_db.fail_writes = True
+    base_db.release_writes.set()
+    write_behind_db[b'key-1'] = b'value-1'
+    write_behind_db.commit()
+
+    with pytest.raises(ValueError):
+        write_behind_db.flush()
+    with pytest.raises(ValueError):
+        write_behind_db.commit()
@@ -14,7 +14,6 @@ from evm.tools.fixture_tests import (
     apply_fixture_block_to_chain,
     new_chain_from_fixture,
     genesis_params_from_fixture,
-    load_fixture,
     generate_fixture_tests,
     filter_fixtures,
     normalize_blockchain_fixtures,
@@ -56,9 +55,9 @@ def pytest_generate_tests(metafunc):
 
 
 @pytest.fixture
-def fixture(fixture_data):
+def fixture(fixture_data, normalized_fixture_cache):
     fixture_path, fixture_key = fixture_data
-    fixture = load_fixture(
+    fixture = normalized_fixture_cache.load_fixture(
         fixture_path,
         fixture_key,
         normalize_blockchain_fixtures,
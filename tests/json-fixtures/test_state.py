@@ -9,12 +9,9 @@ from evm.db import (
 )
 
 from eth_utils import (
-    to_bytes,
     to_tuple,
 )
 
-from eth_hash.auto import keccak
-
 from evm.db.chain import ChainDB
 from evm.exceptions import (
     ValidationError,
@@ -38,6 +35,8 @@ from evm.rlp.headers import (
 from evm.tools.fixture_tests import (
     filter_fixtures,
     generate_fixture_tests,
+    get_block_hash_for_testing,
+    get_prev_hashes_for_testing,
     hash_log_entries,
     load_fixture,
     normalize_statetest_fixture,
@@ -160,9 +159,9 @@ def pytest_generate_tests(metafunc):
 
 
 @pytest.fixture
-def fixture(fixture_data):
+def fixture(fixture_data, normalized_fixture_cache):
     fixture_path, fixture_key, fixture_fork, post_state_index = fixture_data
-    fixture = load_fixture(
+    fixture = normalized_fixture_cache.load_fixture(
         fixture_path,
         fixture_key,
         normalize_statetest_fixture(fork=fixture_fork, post_state_index=post_state_index),
@@ -173,22 +172,6 @@ def fixture(fixture_data):
 #
 # Test Chain Setup
 #
-def get_block_hash_for_testing(self, block_number):
-    if block_number >= self.block_number:
-        return b''
-    elif block_number < 0:
-        return b''
-    elif block_number < self.block_number - 256:
-        return b''
-    else:
-        return keccak(to_bytes(text="{0}".format(block_number)))
-
-
-def get_prev_hashes_testing(self, last_block_hash, db):
-    prev_hashes = []
-    return prev_hashes
-
-
 FrontierStateForTesting = FrontierState.configure(
     __name__='FrontierStateForTesting',
     get_ancestor_hash=get_block_hash_for_testing,
@@ -213,27 +196,27 @@ ByzantiumStateForTesting = ByzantiumState.configure(
 FrontierVMForTesting = FrontierVM.configure(
     __name__='FrontierVMForTesting',
     _state_class=FrontierStateForTesting,
-    get_prev_hashes=get_prev_hashes_testing,
+    get_prev_hashes=get_prev_hashes_for_testing,
 )
 HomesteadVMForTesting = HomesteadVM.configure(
     __name__='HomesteadVMForTesting',
     _state_class=HomesteadStateForTesting,
-    get_prev_hashes=get_prev_hashes_testing,
+    get_prev_hashes=get_prev_hashes_for_testing,
 )
 TangerineWhistleVMForTesting = TangerineWhistleVM.configure(
     __name__='TangerineWhistleVMForTesting',
     _state_class=TangerineWhistleStateForTesting,
-    get_prev_hashes=get_prev_hashes_testing,
+    get_prev_hashes=get_prev_hashes_for_testing,
 )
 SpuriousDragonVMForTesting = SpuriousDragonVM.configure(
     __name__='SpuriousDragonVMForTesting',
     _state_class=SpuriousDragonStateForTesting,
-    get_prev_hashes=get_prev_hashes_testing,
+    get_prev_hashes=get_prev_hashes_for_testing,
 )
 ByzantiumVMForTesting = ByzantiumVM.configure(
     __name__='ByzantiumVMForTesting',
     _state_class=ByzantiumStateForTesting,
-    get_prev_hashes=get_prev_hashes_testing,
+    get_prev_hashes=get_prev_hashes_for_testing,
 )
 
 
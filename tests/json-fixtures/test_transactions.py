@@ -68,9 +68,9 @@ def pytest_generate_tests(metafunc):
 
 
 @pytest.fixture
-def fixture(fixture_data):
+def fixture(fixture_data, normalized_fixture_cache):
     fixture_path, fixture_key, fixture_fork = fixture_data
-    fixture = load_fixture(
+    fixture = normalized_fixture_cache.load_fixture(
         fixture_path,
         fixture_key,
         normalize_transactiontest_fixture(fork=fixture_fork),
@@ -22,7 +22,6 @@ from evm.rlp.headers import (
 from evm.tools.fixture_tests import (
     normalize_vmtest_fixture,
     generate_fixture_tests,
-    load_fixture,
     filter_fixtures,
     setup_account_db,
     verify_account_db,
@@ -70,9 +69,9 @@ def pytest_generate_tests(metafunc):
 
 
 @pytest.fixture
-def fixture(fixture_data):
+def fixture(fixture_data, normalized_fixture_cache):
     fixture_path, fixture_key = fixture_data
-    fixture = load_fixture(
+    fixture = normalized_fixture_cache.load_fixture(
         fixture_path,
         fixture_key,
         normalize_vmtest_fixture,
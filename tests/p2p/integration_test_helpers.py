@@ -51,8 +51,11 @@ class FakeAsyncChainDB(AsyncChainDB):
     coro_header_exists = async_passthrough('header_exists')
     coro_get_canonical_block_hash = async_passthrough('get_canonical_block_hash')
     coro_persist_header = async_passthrough('persist_header')
+    coro_persist_header_chain = async_passthrough('persist_header_chain')
     coro_persist_uncles = async_passthrough('persist_uncles')
     coro_persist_trie_data_dict = async_passthrough('persist_trie_data_dict')
+    coro_persist_block_transactions = async_passthrough('persist_block_transactions')
+    coro_persist_block_receipts = async_passthrough('persist_block_receipts')
 
 
 async def coro_import_block(chain, block, perform_validation=True):
@@ -84,3 +87,4 @@ class FakeAsyncHeaderDB(AsyncHeaderDB):
     coro_get_score = async_passthrough('get_score')
     coro_header_exists = async_passthrough('header_exists')
     coro_persist_header = async_passthrough('persist_header')
+    coro_persist_header_chain = async_passthrough('persist_header_chain')
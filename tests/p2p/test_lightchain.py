@@ -70,7 +70,7 @@ async def test_incremental_header_sync(request, event_loop, headerdb_mainnet_100
 
 
 @pytest.mark.asyncio
-async def test_full_header_sync_and_reorg(request, event_loop, headerdb_mainnet_100):
+async def test_full_header_sync_and_reorg(request, event_loop, monkeypatch, headerdb_mainnet_100):
     # Here we create our server with a populated headerdb, so upon startup it will announce its
     # chain head and the client will fetch all headers
     light_chain, _, server = await get_lightchain_with_peers(
@@ -81,6 +81,11 @@ async def test_full_header_sync_and_reorg(request, event_loop, headerdb_mainnet_
     await wait_for_head(light_chain.headerdb, head)
     assert_canonical_chains_are_equal(light_chain.headerdb, server.headerdb, head.block_number)
 
+    # The new head below isn't sealed, so from now on the client must accept it as is.
+    async def skip_seal_validation(self, headers):
+        pass
+    monkeypatch.setattr(MainnetLightPeerChain, '_validate_seals', skip_seal_validation)
+
     head_parent = server.headerdb.get_block_header_by_hash(head.parent_hash)
     difficulty = head.difficulty + 1
     new_head = BlockHeader.from_parent(
@@ -0,0 +1,79 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from trinity.rpc.dispatch import (
+    RPCDispatcher,
+)
+
+
+class RecordingRPC:
+    '''
+    Sleeps for the seconds given as the parameter of each request, and records when
+    the requests start and end.
+    '''
+    def __init__(self):
+        self.events = []
+
+    def execute(self, request):
+        self.events.append(('start', request['id']))
+        time.sleep(request['params'][0])
+        self.events.append(('end', request['id']))
+        return json.dumps({'id': request['id'], 'result': request['params'][0]})
+
+
+def build_request(request_id, method, seconds):
+    return {'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': [seconds]}
+
+
+@pytest.mark.asyncio
+async def test_mutating_request_runs_alone(event_loop):
+    rpc = RecordingRPC()
+    dispatcher = RPCDispatcher(rpc, max_workers=4, timeout=1)
+    requests = (
+        build_request(1, 'eth_blockNumber', 0.2),
+        build_request(2, 'evm_resetToGenesisFixture', 0.1),
+        build_request(3, 'eth_blockNumber', 0),
+    )
+
+    try:
+        await asyncio.gather(*(dispatcher.execute(request) for request in requests))
+    finally:
+        dispatcher.shutdown()
+
+    assert rpc.events == [
+        ('start', 1),
+        ('end', 1),
+        ('start', 2),
+        ('end', 2),
+        ('start', 3),
+        ('end', 3),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_request_which_timed_out_waiting_for_a_change(event_loop):
+    rpc = RecordingRPC()
+    dispatcher = RPCDispatcher(rpc, max_workers=4, timeout=0.2)
+
+    try:
+        responses = await asyncio.gather(
+            dispatcher.execute(build_request(1, 'evm_applyBlockFixture', 0.3)),
+            dispatcher.execute(build_request(2, 'eth_blockNumber', 0)),
+        )
+        assert json.loads(responses[1]) == {
+            'id': 2,
+            'jsonrpc': '2.0',
+            'error': "Request timed out after 0.2s",
+        }
+
+        # The chain is available again once the change completes.
+        await asyncio.sleep(0.2)
+        response = await dispatcher.execute(build_request(3, 'evm_applyBlockFixture', 0))
+        assert json.loads(response) == {'id': 3, 'result': 0}
+    finally:
+        dispatcher.shutdown()
+
+    assert ('start', 2) not in rpc.events
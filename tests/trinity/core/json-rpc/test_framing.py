@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from trinity.rpc.framing import (
+    Frame,
+    JSONFramer,
+)
+
+
+MESSAGES = (
+    b'{}',
+    b'[]',
+    json.dumps({'jsonrpc': '2.0', 'id': 1, 'method': 'web3_sha3', 'params': ['0x01']}).encode(),
+    json.dumps({'brackets': '{[}]', 'quote': '"}', 'backslash': '\\', 'nested': [[{}]]}).encode(),
+    json.dumps([{'id': 1}, {'id': 2, 'params': ['\\"]']}]).encode(),
+)
+
+
+def feed_in_chunks(framer, data, chunk_size):
+    frames = []
+    for start in range(0, len(data), chunk_size):
+        frames.extend(framer.feed(data[start:start + chunk_size]))
+    return frames
+
+
+@pytest.mark.parametrize('chunk_size', (1, 2, 3, 7, 1000))
+def test_messages_split_in_chunks(chunk_size):
+    data = b'\n'.join(MESSAGES) + b' '.join(MESSAGES)
+    frames = feed_in_chunks(JSONFramer(1000), data, chunk_size)
+    assert frames == [Frame(message) for message in MESSAGES * 2]
+
+
+@pytest.mark.parametrize('chunk_size', (1, 3, 1000))
+def test_data_which_is_not_json(chunk_size):
+    data = b'abc {"id": 1} } def\n[1]ghi'
+    frames = feed_in_chunks(JSONFramer(1000), data, chunk_size)
+    assert frames == [
+        Frame(b'abc', 'Cannot parse json: abc'),
+        Frame(b'{"id": 1}'),
+        Frame(b'} def', 'Cannot parse json: } def'),
+        Frame(b'[1]'),
+    ]
+
+
+@pytest.mark.parametrize('chunk_size', (1, 10, 1000))
+def test_large_message(chunk_size):
+    message = json.dumps({'params': ['0x' + 'ff' * 10000]}).encode()
+    framer = JSONFramer(len(message))
+    assert feed_in_chunks(framer, message + MESSAGES[2], chunk_size) == [
+        Frame(message),
+        Frame(MESSAGES[2]),
+    ]
+
+
+@pytest.mark.parametrize('chunk_size', (1, 10, 1000))
+def test_message_which_is_too_long(chunk_size):
+    message = json.dumps({'params': ['0x' + 'ff' * 100, {'"{': '}'}]}).encode()
+    framer = JSONFramer(100)
+    frames = feed_in_chunks(framer, message + MESSAGES[2], chunk_size)
+
+    assert frames == [
+        Frame(message[:20], "reached limit: 100 bytes, starting with '{\"params\": [\"0xfffff'"),
+        Frame(MESSAGES[2]),
+    ]
+    # A message being skipped isn't kept.
+    feed_in_chunks(framer, message[:-1], chunk_size)
+    assert len(framer._buffer) <= max(chunk_size, 100)
@@ -0,0 +1,228 @@
+import asyncio
+import gzip
+import json
+import time
+
+import pytest
+
+from trinity.rpc.dispatch import (
+    RPCDispatcher,
+)
+from trinity.rpc.http import (
+    HTTPServer,
+)
+from trinity.rpc.main import (
+    RPCServer,
+)
+from trinity.utils.version import construct_trinity_client_identifier
+
+
+class SleepingRPC:
+    '''
+    Sleeps for the number of seconds in the params of each request, and returns them.
+    '''
+    def execute(self, request):
+        time.sleep(request['params'][0])
+        return json.dumps({'id': request['id'], 'result': request['params'][0]})
+
+
+async def start_http_server(event_loop, rpc, **kwargs):
+    http_server = HTTPServer(rpc, '127.0.0.1', 0, **kwargs)
+    asyncio.ensure_future(http_server.run(loop=event_loop), loop=event_loop)
+    while http_server.server is None:
+        await asyncio.sleep(0.01, loop=event_loop)
+    return http_server
+
+
+@pytest.fixture
+def http_server(event_loop, chain_with_block_validation):
+    http_server = event_loop.run_until_complete(
+        start_http_server(event_loop, RPCServer(chain_with_block_validation), max_connections=2)
+    )
+    try:
+        yield http_server
+    finally:
+        event_loop.run_until_complete(http_server.stop())
+
+
+@pytest.fixture
+def sleeping_http_server(event_loop):
+    dispatcher = RPCDispatcher(SleepingRPC(), max_workers=4)
+    http_server = event_loop.run_until_complete(
+        start_http_server(event_loop, None, dispatcher=dispatcher)
+    )
+    try:
+        yield http_server
+    finally:
+        event_loop.run_until_complete(http_server.stop())
+        dispatcher.shutdown()
+
+
+def build_request(method, params=[], request_id=3):
+    return json.dumps({
+        'jsonrpc': '2.0',
+        'id': request_id,
+        'method': method,
+        'params': params,
+    }).encode()
+
+
+def build_http_request(body, headers=()):
+    head_lines = ['POST / HTTP/1.1', 'Host: localhost', 'Content-Length: %d' % len(body)]
+    head_lines.extend(headers)
+    return ('\r\n'.join(head_lines) + '\r\n\r\n').encode() + body
+
+
+async def read_response(reader, event_loop):
+    head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), 1, loop=event_loop)
+    status_line, *header_lines = head.decode().strip().split('\r\n')
+    headers = dict(line.lower().split(': ', 1) for line in header_lines)
+    body = await reader.readexactly(int(headers['content-length']))
+    if headers.get('content-encoding') == 'gzip':
+        body = gzip.decompress(body)
+    return int(status_line.split(' ')[1]), headers, json.loads(body.decode())
+
+
+@pytest.mark.asyncio
+async def test_http_requests_on_one_connection(http_server, event_loop):
+    reader, writer = await asyncio.open_connection(*http_server.address, loop=event_loop)
+
+    writer.write(build_http_request(build_request('web3_clientVersion')))
+    status, headers, result = await read_response(reader, event_loop)
+    assert status == 200
+    assert headers['connection'] == 'keep-alive'
+    assert result == {'result': construct_trinity_client_identifier(), 'id': 3, 'jsonrpc': '2.0'}
+
+    writer.write(build_http_request(build_request('net_version')))
+    status, _, result = await read_response(reader, event_loop)
+    assert status == 200
+    assert result == {'result': '1337', 'id': 3, 'jsonrpc': '2.0'}
+
+    writer.write(build_http_request(
+        build_request('eth_mining'),
+        headers=['Connection: close'],
+    ))
+    status, headers, result = await read_response(reader, event_loop)
+    assert headers['connection'] == 'close'
+    assert result == {'result': False, 'id': 3, 'jsonrpc': '2.0'}
+    assert await reader.read() == b''
+    writer.close()
+
+
+@pytest.mark.asyncio
+async def test_http_gzip_response(http_server, event_loop):
+    reader, writer = await asyncio.open_connection(*http_server.address, loop=event_loop)
+
+    # The responses add up to more than the size from which they are compressed.
+    batch_size = 100
+    body = b'[' + b','.join([build_request('web3_sha3', ['0x' + 'ff' * 32])] * batch_size) + b']'
+    writer.write(build_http_request(body, headers=['Accept-Encoding: gzip, deflate']))
+
+    status, headers, result = await read_response(reader, event_loop)
+    assert status == 200
+    assert headers['content-encoding'] == 'gzip'
+    assert len(result) == batch_size
+    writer.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    'body, expected_status, expected',
+    (
+        (b'{}', 400, {'error': "Invalid Request: empty"}),
+        (
+            b'[]',
+            200,
+            {'error': "batch must include at least one request", 'id': -1, 'jsonrpc': '2.0'},
+        ),
+    ),
+    ids=['empty_request', 'empty_batch'],
+)
+async def test_http_empty_requests(http_server, event_loop, body, expected_status, expected):
+    reader, writer = await asyncio.open_connection(*http_server.address, loop=event_loop)
+
+    writer.write(build_http_request(body))
+    status, _, result = await read_response(reader, event_loop)
+    assert status == expected_status
+    assert result == expected
+    writer.close()
+
+
+@pytest.mark.asyncio
+async def test_http_server_leaves_given_dispatcher_running(event_loop):
+    # The dispatcher may be shared with the IPC server, which still needs it.
+    dispatcher = RPCDispatcher(SleepingRPC())
+    http_server = await start_http_server(event_loop, None, dispatcher=dispatcher)
+    await http_server.stop()
+    try:
+        response = await dispatcher.execute({'jsonrpc': '2.0', 'id': 1, 'params': [0]})
+        assert json.loads(response) == {'id': 1, 'result': 0}
+    finally:
+        dispatcher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_http_pipelined_requests(sleeping_http_server, event_loop):
+    reader, writer = await asyncio.open_connection(
+        *sleeping_http_server.address,
+        loop=event_loop,
+    )
+
+    writer.write(b''.join(
+        build_http_request(build_request('sleep', [seconds], request_id))
+        for request_id, seconds in ((1, 0.3), (2, 0.3), (3, 0))
+    ))
+
+    start = event_loop.time()
+    results = [(await read_response(reader, event_loop))[2] for _ in range(3)]
+    assert results == [
+        {'id': 1, 'result': 0.3},
+        {'id': 2, 'result': 0.3},
+        {'id': 3, 'result': 0},
+    ]
+    # The requests were executed concurrently.
+    assert event_loop.time() - start < 0.6
+    writer.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    'request_msg, expected_status',
+    (
+        (b'GET / HTTP/1.1\r\n\r\n', 405),
+        (b'POST / HTTP/1.1\r\n\r\n', 411),
+        (b'POST / HTTP/1.1\r\nContent-Length: 100000000000\r\n\r\n', 413),
+        (b'POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n', 501),
+        (b'POST / HTTP/2\r\n\r\n', 505),
+        (b'POST / HTTP/1.1\r\nContent-Length: 1\r\n\r\n{', 400),
+    ),
+)
+async def test_http_invalid_requests(http_server, event_loop, request_msg, expected_status):
+    reader, writer = await asyncio.open_connection(*http_server.address, loop=event_loop)
+
+    writer.write(request_msg)
+    status, headers, result = await read_response(reader, event_loop)
+    assert status == expected_status
+    assert 'error' in result
+    writer.close()
+
+
+@pytest.mark.asyncio
+async def test_http_connection_limit(http_server, event_loop):
+    connections = [
+        await asyncio.open_connection(*http_server.address, loop=event_loop)
+        for _ in range(3)
+    ]
+
+    reader, writer = connections[-1]
+    status, headers, result = await read_response(reader, event_loop)
+    assert status == 503
+    assert await reader.read() == b''
+
+    reader, writer = connections[0]
+    writer.write(build_http_request(build_request('net_version')))
+    status, _, result = await read_response(reader, event_loop)
+    assert status == 200
+
+    for _, writer in connections:
+        writer.close()
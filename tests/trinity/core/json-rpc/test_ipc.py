@@ -4,6 +4,24 @@ import os
 import pytest
 import time
 
+from eth_hash.auto import keccak
+from eth_utils import encode_hex
+
+from trinity.rpc.dispatch import (
+    RPCDispatcher,
+)
+from trinity.rpc.format import (
+    header_to_dict,
+)
+from trinity.rpc.ipc import (
+    IPCServer,
+)
+from trinity.rpc.main import (
+    RPCServer,
+)
+from trinity.rpc.subscriptions import (
+    SubscriptionManager,
+)
 from trinity.utils.version import construct_trinity_client_identifier
 
 
@@ -65,10 +83,14 @@ def build_request(method, params=[]):
             build_request('net_version'),
             {'result': '1337', 'id': 3, 'jsonrpc': '2.0'},
         ),
+        (
+            build_request('eth_getLogs', [{'fromBlock': '0x0', 'address': '0x' + 'aa' * 20}]),
+            {'result': [], 'id': 3, 'jsonrpc': '2.0'},
+        ),
     ),
     ids=[
         'empty', 'notamethod', 'eth_mining', 'web3_clientVersion',
-        'web3_sha3_1', 'web3_sha3_2', 'net_version',
+        'web3_sha3_1', 'web3_sha3_2', 'net_version', 'eth_getLogs',
     ],
 )
 async def test_ipc_requests(jsonrpc_ipc_pipe_path,
@@ -87,3 +109,292 @@ async def test_ipc_requests(jsonrpc_ipc_pipe_path,
     result = json.loads(result_bytes.decode())
     assert result == expected
     writer.close()
+
+
+class SleepingRPC:
+    '''
+    Sleeps for the number of seconds in the params of each request, and returns them.
+    '''
+    max_batch_size = 10
+
+    def execute_request(self, request):
+        time.sleep(request['params'][0])
+        return json.dumps({'id': request['id'], 'result': request['params'][0]})
+
+    execute = execute_request
+
+
+@pytest.fixture
+def sleeping_ipc_server(tmpdir, event_loop):
+    ipc_path = str(tmpdir.join('sleeping.ipc'))
+    dispatcher = RPCDispatcher(SleepingRPC(), max_workers=4, timeout=1)
+    ipc_server = IPCServer(None, ipc_path, dispatcher)
+
+    asyncio.ensure_future(ipc_server.run(loop=event_loop), loop=event_loop)
+    assert wait_for(ipc_path), "IPC server did not successfully start with IPC file"
+
+    try:
+        yield ipc_path
+    finally:
+        event_loop.run_until_complete(ipc_server.stop())
+        dispatcher.shutdown()
+
+
+def build_sleep_request(request_id, seconds):
+    return json.dumps({'jsonrpc': '2.0', 'id': request_id, 'params': [seconds]}).encode()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    'request_msg, expected',
+    (
+        (
+            b'[' + build_request('eth_mining') + b',' + build_request('net_version') + b']',
+            [
+                {'result': False, 'id': 3, 'jsonrpc': '2.0'},
+                {'result': '1337', 'id': 3, 'jsonrpc': '2.0'},
+            ],
+        ),
+        (
+            b'[' + build_request('web3_sha3', ['0x']) + b', 3]',
+            [
+                {
+                    'result': '0xc5d2460186f7233c927e7db2dcc703c0e500b653ca82273b7bfad8045d85a470',
+                    'id': 3,
+                    'jsonrpc': '2.0',
+                },
+                {'error': "request must be a JSON object", 'id': -1, 'jsonrpc': '2.0'},
+            ],
+        ),
+        (
+            b'[' + b','.join([build_request('eth_mining')] * 101) + b']',
+            {
+                'error': "batch must include at most 100 requests, not 101",
+                'id': -1,
+                'jsonrpc': '2.0',
+            },
+        ),
+        (
+            b'[]',
+            {'error': "batch must include at least one request", 'id': -1, 'jsonrpc': '2.0'},
+        ),
+    ),
+    ids=['batch', 'batch_with_invalid_request', 'batch_too_large', 'empty_batch'],
+)
+async def test_ipc_batch_requests(jsonrpc_ipc_pipe_path,
+                                  request_msg,
+                                  expected,
+                                  event_loop,
+                                  ipc_server):
+    assert wait_for(jsonrpc_ipc_pipe_path), "IPC server did not successfully start with IPC file"
+
+    reader, writer = await asyncio.open_unix_connection(jsonrpc_ipc_pipe_path, loop=event_loop)
+
+    writer.write(request_msg)
+    await writer.drain()
+    separator = b']' if isinstance(expected, list) else b'}'
+    result_bytes = await asyncio.tasks.wait_for(reader.readuntil(separator), 0.25, loop=event_loop)
+
+    result = json.loads(result_bytes.decode())
+    assert result == expected
+    writer.close()
+
+
+@pytest.mark.asyncio
+async def test_ipc_slow_request_does_not_block_other_connections(sleeping_ipc_server, event_loop):
+    slow_reader, slow_writer = await asyncio.open_unix_connection(
+        sleeping_ipc_server,
+        loop=event_loop,
+    )
+    reader, writer = await asyncio.open_unix_connection(sleeping_ipc_server, loop=event_loop)
+
+    slow_writer.write(build_sleep_request(1, 0.5))
+    await slow_writer.drain()
+    writer.write(build_sleep_request(2, 0))
+    await writer.drain()
+
+    result_bytes = await asyncio.tasks.wait_for(reader.readuntil(b'}'), 0.25, loop=event_loop)
+    assert json.loads(result_bytes.decode()) == {'id': 2, 'result': 0}
+
+    result_bytes = await asyncio.tasks.wait_for(slow_reader.readuntil(b'}'), 1, loop=event_loop)
+    assert json.loads(result_bytes.decode()) == {'id': 1, 'result': 0.5}
+    slow_writer.close()
+    writer.close()
+
+
+@pytest.mark.asyncio
+async def test_ipc_responses_are_in_request_order(sleeping_ipc_server, event_loop):
+    reader, writer = await asyncio.open_unix_connection(sleeping_ipc_server, loop=event_loop)
+
+    writer.write(build_sleep_request(1, 0.3) + build_sleep_request(2, 0) + b'{}')
+    await writer.drain()
+
+    responses = []
+    for _ in range(3):
+        result_bytes = await asyncio.tasks.wait_for(reader.readuntil(b'}'), 1, loop=event_loop)
+        responses.append(json.loads(result_bytes.decode()))
+    assert responses == [
+        {'id': 1, 'result': 0.3},
+        {'id': 2, 'result': 0},
+        {'error': "Invalid Request: empty"},
+    ]
+    writer.close()
+
+
+@pytest.mark.asyncio
+async def test_ipc_request_timeout(sleeping_ipc_server, event_loop):
+    reader, writer = await asyncio.open_unix_connection(sleeping_ipc_server, loop=event_loop)
+
+    writer.write(build_sleep_request(1, 1.5))
+    await writer.drain()
+
+    result_bytes = await asyncio.tasks.wait_for(reader.readuntil(b'}'), 1.25, loop=event_loop)
+    assert json.loads(result_bytes.decode()) == {
+        'id': 1,
+        'jsonrpc': '2.0',
+        'error': "Request timed out after 1s",
+    }
+    writer.close()
+
+
+@pytest.mark.asyncio
+async def test_ipc_batch_requests_are_concurrent(sleeping_ipc_server, event_loop):
+    reader, writer = await asyncio.open_unix_connection(sleeping_ipc_server, loop=event_loop)
+
+    batch = [json.loads(build_sleep_request(request_id, 0.3)) for request_id in range(3)]
+    writer.write(json.dumps(batch).encode())
+    await writer.drain()
+
+    # Run one after the other, the requests would take 0.9 seconds.
+    result_bytes = await asyncio.tasks.wait_for(reader.readuntil(b']'), 0.6, loop=event_loop)
+    assert json.loads(result_bytes.decode()) == [
+        {'id': request_id, 'result': 0.3}
+        for request_id in range(3)
+    ]
+    writer.close()
+
+
+@pytest.mark.asyncio
+async def test_ipc_large_request(jsonrpc_ipc_pipe_path, event_loop, ipc_server):
+    assert wait_for(jsonrpc_ipc_pipe_path), "IPC server did not successfully start with IPC file"
+
+    reader, writer = await asyncio.open_unix_connection(jsonrpc_ipc_pipe_path, loop=event_loop)
+
+    data = b'\xff' * 100000
+    writer.write(build_request('web3_sha3', [encode_hex(data)]))
+    await writer.drain()
+    result_bytes = await asyncio.tasks.wait_for(reader.readuntil(b'}'), 0.25, loop=event_loop)
+
+    result = json.loads(result_bytes.decode())
+    assert result == {'result': encode_hex(keccak(data)), 'id': 3, 'jsonrpc': '2.0'}
+    writer.close()
+
+
+@pytest.fixture
+def subscription_ipc_server(jsonrpc_ipc_pipe_path, event_loop, chain_with_block_validation):
+    rpc = RPCServer(chain_with_block_validation)
+    ipc_server = IPCServer(
+        rpc,
+        jsonrpc_ipc_pipe_path,
+        subscriptions=SubscriptionManager(rpc, max_notifications=2),
+    )
+
+    asyncio.ensure_future(ipc_server.run(loop=event_loop), loop=event_loop)
+    assert wait_for(jsonrpc_ipc_pipe_path), "IPC server did not successfully start with IPC file"
+
+    try:
+        yield ipc_server
+    finally:
+        event_loop.run_until_complete(ipc_server.stop())
+
+
+async def read_message(reader, event_loop):
+    result_bytes = await asyncio.tasks.wait_for(reader.readuntil(b'}'), 0.25, loop=event_loop)
+    while True:
+        try:
+            return json.loads(result_bytes.decode())
+        except ValueError:
+            result_bytes += await asyncio.tasks.wait_for(
+                reader.readuntil(b'}'),
+                0.25,
+                loop=event_loop,
+            )
+
+
+@pytest.mark.asyncio
+async def test_ipc_subscribe_new_heads(jsonrpc_ipc_pipe_path,
+                                       event_loop,
+                                       chain_with_block_validation,
+                                       subscription_ipc_server):
+    reader, writer = await asyncio.open_unix_connection(jsonrpc_ipc_pipe_path, loop=event_loop)
+
+    writer.write(build_request('eth_subscribe', ['newHeads']))
+    await writer.drain()
+    response = await read_message(reader, event_loop)
+    subscription_id = response['result']
+
+    header = chain_with_block_validation.get_canonical_head()
+    subscription_ipc_server.subscriptions.notify_block_imported(header)
+    assert await read_message(reader, event_loop) == {
+        'jsonrpc': '2.0',
+        'method': 'eth_subscription',
+        'params': {'subscription': subscription_id, 'result': header_to_dict(header)},
+    }
+
+    writer.write(build_request('eth_unsubscribe', [subscription_id]))
+    await writer.drain()
+    assert await read_message(reader, event_loop) == {'result': True, 'id': 3, 'jsonrpc': '2.0'}
+    assert subscription_ipc_server.subscriptions.subscriptions == {}
+
+    writer.write(build_request('eth_unsubscribe', [subscription_id]))
+    await writer.drain()
+    assert await read_message(reader, event_loop) == {'result': False, 'id': 3, 'jsonrpc': '2.0'}
+    writer.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    'params, expected_error',
+    (
+        ([], "eth_subscribe takes the kind of subscription, and its filter"),
+        (['pendingTransactions'], "Unsupported subscription: 'pendingTransactions'"),
+        (['logs', 3], "logs filter must be a JSON object"),
+    ),
+)
+async def test_ipc_subscribe_invalid(jsonrpc_ipc_pipe_path,
+                                     event_loop,
+                                     subscription_ipc_server,
+                                     params,
+                                     expected_error):
+    reader, writer = await asyncio.open_unix_connection(jsonrpc_ipc_pipe_path, loop=event_loop)
+
+    writer.write(build_request('eth_subscribe', params))
+    await writer.drain()
+    assert await read_message(reader, event_loop) == {
+        'error': expected_error,
+        'id': 3,
+        'jsonrpc': '2.0',
+    }
+    writer.close()
+
+
+@pytest.mark.asyncio
+async def test_ipc_subscription_slow_consumer_is_disconnected(jsonrpc_ipc_pipe_path,
+                                                              event_loop,
+                                                              chain_with_block_validation,
+                                                              subscription_ipc_server):
+    reader, writer = await asyncio.open_unix_connection(jsonrpc_ipc_pipe_path, loop=event_loop)
+
+    writer.write(build_request('eth_subscribe', ['newHeads']))
+    await writer.drain()
+    await read_message(reader, event_loop)
+
+    # Enough notifications to fill the buffers of the socket, which the client doesn't read.
+    header = chain_with_block_validation.get_canonical_head()
+    for _ in range(5000):
+        subscription_ipc_server.subscriptions.notify_block_imported(header)
+    await asyncio.sleep(0.5, loop=event_loop)
+
+    while await asyncio.tasks.wait_for(reader.read(2 ** 20), 1, loop=event_loop):
+        pass
+    assert subscription_ipc_server.subscriptions.subscriptions == {}
@@ -5,8 +5,9 @@ from multiprocessing.managers import (  # type: ignore
     BaseProxy,
 )
 import os
+from typing import Type
 
-from evm import MainnetChain, RopstenChain
+from evm import Chain, MainnetChain, RopstenChain
 from evm.chains.mainnet import (
     MAINNET_GENESIS_HEADER,
     MAINNET_NETWORK_ID,
@@ -17,6 +18,10 @@ from evm.chains.ropsten import (
 )
 from evm.db.backends.base import BaseDB
 from evm.db.chain import AsyncChainDB
+from evm.db.schema import (
+    SchemaV3,
+    set_schema,
+)
 from evm.exceptions import CanonicalHeadNotFound
 
 from p2p import ecies
@@ -138,19 +143,33 @@ def initialize_database(chain_config: ChainConfig, chaindb: AsyncChainDB) -> Non
             )
 
 
-def serve_chaindb(chain_config: ChainConfig, base_db: BaseDB) -> None:
-    chaindb = AsyncChainDB(base_db)
-
-    if not is_database_initialized(chaindb):
-        initialize_database(chain_config, chaindb)
+def get_chain_class(chain_config: ChainConfig) -> Type[Chain]:
     if chain_config.network_id == MAINNET_NETWORK_ID:
-        chain_class = MainnetChain  # type: ignore
+        return MainnetChain
     elif chain_config.network_id == ROPSTEN_NETWORK_ID:
-        chain_class = RopstenChain  # type: ignore
+        return RopstenChain
     else:
         raise NotImplementedError(
             "Only the mainnet and ropsten chains are currently supported"
         )
+
+
+def initialize_chaindb(chain_config: ChainConfig, base_db: BaseDB) -> AsyncChainDB:
+    chaindb = AsyncChainDB(base_db)
+
+    if not is_database_initialized(chaindb):
+        # New databases use the compact binary keys; existing ones can be
+        # upgraded with `trinity migrate-db`.
+        set_schema(base_db, SchemaV3)
+        chaindb = AsyncChainDB(base_db)
+        initialize_database(chain_config, chaindb)
+
+    return chaindb
+
+
+def serve_chaindb(chain_config: ChainConfig, base_db: BaseDB) -> None:
+    chaindb = initialize_chaindb(chain_config, base_db)
+    chain_class = get_chain_class(chain_config)
     chain = chain_class(base_db)  # type: ignore
 
     headerdb = AsyncHeaderDB(base_db)
@@ -190,9 +190,6 @@ class LightDispatchChain(BaseChain):
     def validate_block(self, block: BaseBlock) -> None:
         raise NotImplementedError("Chain classes must implement " + inspect.stack()[0][3])
 
-    def validate_gaslimit(self, header: BlockHeader) -> None:
-        raise NotImplementedError("Chain classes must implement " + inspect.stack()[0][3])
-
     def validate_seal(self, header: BlockHeader) -> None:
         raise NotImplementedError("Chain classes must implement " + inspect.stack()[0][3])
 
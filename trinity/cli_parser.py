@@ -29,6 +29,13 @@ class ValidateAndStoreEnodes(argparse.Action):
         enode_list.append(enode)
 
 
+def parse_address(value):
+    host, colon, port = value.rpartition(':')
+    if not colon or not host or not port.isdigit():
+        raise argparse.ArgumentTypeError("Expected an address like 127.0.0.1:8545, not %r" % value)
+    return host, int(port)
+
+
 DEFAULT_LOG_LEVEL = 'info'
 LOG_LEVEL_CHOICES = (
     'debug',
@@ -51,6 +58,7 @@ logging_parser = parser.add_argument_group('logging')
 network_parser = parser.add_argument_group('network')
 syncing_parser = parser.add_argument_group('sync mode')
 chain_parser = parser.add_argument_group('chain')
+jsonrpc_parser = parser.add_argument_group('json-rpc')
 debug_parser = parser.add_argument_group('debug')
 
 
@@ -143,6 +151,32 @@ mode_parser.add_argument(
     dest='sync_mode',
     help="Shortcut for `--sync-mode=light`",
 )
+syncing_parser.add_argument(
+    '--seal-check-ratio',
+    type=float,
+    help=(
+        "Fraction, between 0 and 1, of the synced headers whose proof-of-work seal is "
+        "checked.  The last header of each batch is always checked.  Default: 1"
+    ),
+)
+syncing_parser.add_argument(
+    '--seal-check-checkpoint',
+    type=int,
+    help=(
+        "Trusted block number up to which the proof-of-work seals of synced headers "
+        "aren't checked.  Default: 0"
+    ),
+)
+syncing_parser.add_argument(
+    '--ethash-full-dataset',
+    action='store_true',
+    help=(
+        "Generate the full ethash dataset of each epoch in the background, and check "
+        "proof-of-work seals with it once ready, about twice as fast as from the cache.  "
+        "Generating the dataset of an epoch takes several hours of one CPU core, and "
+        "requires several GB of disk space"
+    ),
+)
 
 
 #
@@ -168,6 +202,27 @@ chain_parser.add_argument(
 )
 
 
+#
+# JSON-RPC configuration
+#
+jsonrpc_parser.add_argument(
+    '--http-rpc-address',
+    type=parse_address,
+    metavar='HOST:PORT',
+    help=(
+        "Serve JSON-RPC over HTTP at this address, like 127.0.0.1:8545.  It's only "
+        "served over the IPC socket by default"
+    ),
+)
+jsonrpc_parser.add_argument(
+    '--http-rpc-max-connections',
+    type=int,
+    help=(
+        "Maximum number of open HTTP JSON-RPC connections.  Default: 100"
+    ),
+)
+
+
 #
 # Debug configuration
 #
@@ -206,3 +261,25 @@ attach_parser.add_argument(
     default=False,
     help='start a native Python shell'
 )
+
+
+#
+# Add `migrate-db` sub-command to trinity CLI.
+#
+migrate_db_parser = subparser.add_parser(
+    'migrate-db',
+    help='upgrade the chain database to the latest storage layout (trinity must not be running)',
+)
+
+
+#
+# Add `import` sub-command to trinity CLI.
+#
+import_parser = subparser.add_parser(
+    'import',
+    help='import blocks from a file of RLP encoded blocks (trinity must not be running)',
+)
+import_parser.add_argument(
+    'blocks_file',
+    help='the file to import, e.g. created with the export command of another client',
+)
@@ -14,6 +14,10 @@ from evm.chains.mainnet import (
 from evm.chains.ropsten import (
     ROPSTEN_NETWORK_ID,
 )
+from evm.consensus.pow import (
+    FULL_SEAL_CHECKS,
+    SealCheckPolicy,
+)
 from p2p.kademlia import Node as KademliaNode
 from p2p.constants import (
     DEFAULT_MAX_PEERS,
@@ -25,10 +29,14 @@ from trinity.constants import (
     SYNC_FULL,
     SYNC_LIGHT,
 )
+from trinity.rpc.http import (
+    DEFAULT_MAX_CONNECTIONS,
+)
 from trinity.utils.chains import (
     construct_chain_config_params,
     get_data_dir_for_network_id,
     get_database_socket_path,
+    get_ethash_cache_dir,
     get_jsonrpc_socket_path,
     get_logfile_path,
     get_nodekey_path,
@@ -64,12 +72,20 @@ class ChainConfig:
                  sync_mode: str=SYNC_FULL,
                  port: int=30303,
                  preferred_nodes: Tuple[KademliaNode, ...]=None,
-                 bootstrap_nodes: Tuple[KademliaNode, ...]=None) -> None:
+                 bootstrap_nodes: Tuple[KademliaNode, ...]=None,
+                 seal_check_policy: SealCheckPolicy=FULL_SEAL_CHECKS,
+                 ethash_full_dataset: bool=False,
+                 jsonrpc_http_address: Tuple[str, int]=None,
+                 jsonrpc_http_max_connections: int=DEFAULT_MAX_CONNECTIONS) -> None:
         self.network_id = network_id
         self.max_peers = max_peers
         self.sync_mode = sync_mode
         self.port = port
         self.preferred_nodes = preferred_nodes
+        self.seal_check_policy = seal_check_policy
+        self.ethash_full_dataset = ethash_full_dataset
+        self.jsonrpc_http_address = jsonrpc_http_address
+        self.jsonrpc_http_max_connections = jsonrpc_http_max_connections
 
         if bootstrap_nodes is None:
             if self.network_id == MAINNET_NETWORK_ID:
@@ -136,6 +152,10 @@ class ChainConfig:
         else:
             raise ValueError("Unknown sync mode: {}}".format(self.sync_mode))
 
+    @property
+    def ethash_cache_dir(self) -> Path:
+        return get_ethash_cache_dir(self.data_dir)
+
     @property
     def database_ipc_path(self) -> Path:
         return get_database_socket_path(self.data_dir)
@@ -17,8 +17,11 @@ class ChainDBProxy(BaseProxy):
     coro_header_exists = async_method('header_exists')
     coro_get_canonical_block_hash = async_method('get_canonical_block_hash')
     coro_persist_header = async_method('persist_header')
+    coro_persist_header_chain = async_method('persist_header_chain')
     coro_persist_uncles = async_method('persist_uncles')
     coro_persist_trie_data_dict = async_method('persist_trie_data_dict')
+    coro_persist_block_transactions = async_method('persist_block_transactions')
+    coro_persist_block_receipts = async_method('persist_block_receipts')
 
     get_block_header_by_hash = sync_method('get_block_header_by_hash')
     get_canonical_head = sync_method('get_canonical_head')
@@ -26,5 +29,8 @@ class ChainDBProxy(BaseProxy):
     header_exists = sync_method('header_exists')
     get_canonical_block_hash = sync_method('get_canonical_block_hash')
     persist_header = sync_method('persist_header')
+    persist_header_chain = sync_method('persist_header_chain')
     persist_uncles = sync_method('persist_uncles')
     persist_trie_data_dict = sync_method('persist_trie_data_dict')
+    persist_block_transactions = sync_method('persist_block_transactions')
+    persist_block_receipts = sync_method('persist_block_receipts')
@@ -1,7 +1,9 @@
 import asyncio
+from concurrent.futures import ProcessPoolExecutor
 import logging
 import signal
 import sys
+import time
 from typing import Type
 
 from evm.chains.mainnet import (
@@ -10,8 +12,16 @@ from evm.chains.mainnet import (
 from evm.chains.ropsten import (
     ROPSTEN_NETWORK_ID,
 )
+from evm.chains.pipeline import BlockImportPipeline
+from evm.consensus import pow
 from evm.db.backends.base import BaseDB
 from evm.db.backends.level import LevelDB
+from evm.db.migrations import (
+    backfill_bloom_bits,
+    migrate_block_bodies_to_v2,
+    migrate_keys_to_v3,
+)
+from evm.utils.rlp import iterate_rlp_items
 
 from p2p.service import BaseService
 
@@ -20,6 +30,8 @@ from trinity.exceptions import (
     MissingPath,
 )
 from trinity.chains import (
+    get_chain_class,
+    initialize_chaindb,
     initialize_data_dir,
     is_data_dir_initialized,
     serve_chaindb,
@@ -130,6 +142,14 @@ def main() -> None:
         console(chain_config.jsonrpc_ipc_path, use_ipython=not args.vanilla_shell)
         sys.exit(0)
 
+    if args.subcommand == 'migrate-db':
+        run_database_migrations(chain_config)
+        sys.exit(0)
+
+    if args.subcommand == 'import':
+        run_block_import(chain_config, args.blocks_file, logger)
+        sys.exit(0)
+
     # start the listener thread to handle logs produced by other processes in
     # the local logger.
     listener.start()
@@ -183,6 +203,39 @@ def run_database_process(chain_config: ChainConfig, db_class: Type[BaseDB]) -> N
     serve_chaindb(chain_config, base_db)
 
 
+def run_database_migrations(chain_config: ChainConfig) -> None:
+    base_db = LevelDB(db_path=chain_config.database_dir)
+    migrate_block_bodies_to_v2(base_db)
+    migrate_keys_to_v3(base_db)
+    backfill_bloom_bits(base_db)
+
+
+def run_block_import(chain_config: ChainConfig, blocks_path: str, logger: logging.Logger) -> None:
+    pow.set_cache_dir(str(chain_config.ethash_cache_dir), pregenerate=True)
+    if chain_config.ethash_full_dataset:
+        pow.set_dataset_dir(str(chain_config.ethash_cache_dir), generate=True)
+    base_db = LevelDB(db_path=chain_config.database_dir)
+    initialize_chaindb(chain_config, base_db)
+    start = time.perf_counter()
+    num_blocks = num_transactions = 0
+    with ProcessPoolExecutor() as executor, open(blocks_path, 'rb') as blocks_file:
+        pipeline = BlockImportPipeline(get_chain_class(chain_config), base_db, executor=executor)
+        encoded_blocks = iterate_rlp_items(blocks_file)
+        for block in pipeline.import_encoded_blocks(encoded_blocks):
+            num_blocks += 1
+            num_transactions += len(block.transactions)
+            if num_blocks % 1000 == 0:
+                logger.info("Imported block #%d", block.number)
+
+    duration = time.perf_counter() - start
+    logger.info(
+        "Imported %d blocks (%d txs) in %.2f seconds",
+        num_blocks,
+        num_transactions,
+        duration,
+    )
+
+
 def exit_because_ambigious_filesystem(logger: logging.Logger) -> None:
     logger.error(TRINITY_AMBIGIOUS_FILESYSTEM_INFO)
     sys.exit(1)
@@ -206,6 +259,11 @@ async def exit_on_signal(service_to_exit: BaseService) -> None:
 @with_queued_logging
 def launch_node(chain_config: ChainConfig) -> None:
     display_launch_logs(chain_config)
+    # This process generates the caches of the headers it gives to the worker processes
+    # which check seals, and the one of the next epoch before the sync crosses its boundary.
+    pow.set_cache_dir(str(chain_config.ethash_cache_dir), pregenerate=True)
+    if chain_config.ethash_full_dataset:
+        pow.set_dataset_dir(str(chain_config.ethash_cache_dir), generate=True)
 
     NodeClass = chain_config.node_class
     node = NodeClass(chain_config)
@@ -6,12 +6,15 @@ from multiprocessing.managers import (
 )
 from threading import Thread
 from typing import (
+    List,
+    Optional,
     Type,
     Union
 )
 
 from evm.chains.base import BaseChain
 
+from p2p.chain import BlockImportSubscriber
 from p2p.service import (
     BaseService,
     EmptyService,
@@ -29,9 +32,15 @@ from trinity.db.header import (
     BaseAsyncHeaderDB,
     AsyncHeaderDBProxy
 )
+from trinity.rpc.dispatch import (
+    RPCDispatcher,
+)
 from trinity.rpc.main import (
     RPCServer,
 )
+from trinity.rpc.http import (
+    HTTPServer,
+)
 from trinity.rpc.ipc import (
     IPCServer,
 )
@@ -55,7 +64,12 @@ class Node(BaseService):
         self._headerdb = self._db_manager.get_headerdb()  # type: ignore
 
         self._jsonrpc_ipc_path: Path = chain_config.jsonrpc_ipc_path
+        self._jsonrpc_http_address = chain_config.jsonrpc_http_address
+        self._jsonrpc_http_max_connections = chain_config.jsonrpc_http_max_connections
         self._auxiliary_services = ServiceContext()
+        # Notified of the blocks imported by the syncer of the node, if it imports any.
+        self._import_subscribers: List[BlockImportSubscriber] = []
+        self._rpc_dispatcher: RPCDispatcher = None
 
     @abstractmethod
     def get_chain(self) -> BaseChain:
@@ -83,13 +97,39 @@ class Node(BaseService):
         else:
             self._auxiliary_services.append(service)
 
+    def get_rpc_dispatcher(self) -> RPCDispatcher:
+        """
+        Return the dispatcher shared by the IPC and HTTP servers, so that the requests
+        which change the chain run alone whichever server they come from, and change
+        the chain of both.
+        """
+        if self._rpc_dispatcher is None:
+            self._rpc_dispatcher = RPCDispatcher(RPCServer(self.get_chain()))
+        return self._rpc_dispatcher
+
     def make_ipc_server(self) -> Union[IPCServer, BaseService]:
         if self._jsonrpc_ipc_path:
-            rpc = RPCServer(self.get_chain())
-            return IPCServer(rpc, self._jsonrpc_ipc_path)
+            dispatcher = self.get_rpc_dispatcher()
+            ipc_server = IPCServer(dispatcher.rpc, self._jsonrpc_ipc_path, dispatcher=dispatcher)
+            self._import_subscribers.append(ipc_server.subscriptions)
+            return ipc_server
         else:
             return EmptyService()
 
+    def make_http_server(self) -> Optional[HTTPServer]:
+        if self._jsonrpc_http_address is None:
+            return None
+        else:
+            host, port = self._jsonrpc_http_address
+            dispatcher = self.get_rpc_dispatcher()
+            return HTTPServer(
+                dispatcher.rpc,
+                host,
+                port,
+                dispatcher=dispatcher,
+                max_connections=self._jsonrpc_http_max_connections,
+            )
+
     async def _run(self):
         self._ipc_server = self.make_ipc_server()
 
@@ -103,11 +143,23 @@ class Node(BaseService):
 
         asyncio.run_coroutine_threadsafe(self._ipc_server.run(loop=ipc_loop), loop=ipc_loop)
 
+        # The HTTP server shares the thread and loop of the IPC server, for the same reason.
+        self._http_server = self.make_http_server()
+        if self._http_server is not None:
+            asyncio.run_coroutine_threadsafe(
+                self._http_server.run(loop=ipc_loop),
+                loop=ipc_loop,
+            )
+
         async with self._auxiliary_services:
             await self.get_p2p_server().run()
 
     async def _cleanup(self):
         await self._ipc_server.stop()
+        if self._http_server is not None:
+            await self._http_server.stop()
+        if self._rpc_dispatcher is not None:
+            self._rpc_dispatcher.shutdown()
 
     def _make_new_loop_thread(self):
         new_loop = asyncio.new_event_loop()
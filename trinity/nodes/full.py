@@ -23,6 +23,7 @@ class FullNode(Node):
         self._node_key = chain_config.nodekey
         self._node_port = chain_config.port
         self._max_peers = chain_config.max_peers
+        self._seal_check_policy = chain_config.seal_check_policy
 
     def get_chain(self):
         if self._chain is None:
@@ -45,5 +46,7 @@ class FullNode(Node):
                 peer_pool_class=PreferredNodePeerPool,
                 bootstrap_nodes=self._bootstrap_nodes,
                 token=self.cancel_token,
+                seal_check_policy=self._seal_check_policy,
+                import_subscribers=self._import_subscribers,
             )
         return self._p2p_server
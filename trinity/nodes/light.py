@@ -37,6 +37,7 @@ class LightNode(Node):
         self.nodekey = chain_config.nodekey
 
         self._port = chain_config.port
+        self._seal_check_policy = chain_config.seal_check_policy
         self._discovery = DiscoveryProtocol(
             chain_config.nodekey,
             Address('0.0.0.0', chain_config.port, chain_config.port),
@@ -74,7 +75,11 @@ class LightNode(Node):
 
     def get_p2p_server(self) -> LightPeerChain:
         if self._p2p_server is None:
-            self._p2p_server = LightPeerChain(self.headerdb, self._peer_pool)
+            self._p2p_server = LightPeerChain(
+                self.headerdb,
+                self._peer_pool,
+                seal_check_policy=self._seal_check_policy,
+            )
         return self._p2p_server
 
     def _create_peer_pool(self, chain_config: ChainConfig) -> PeerPool:
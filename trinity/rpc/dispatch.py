@@ -0,0 +1,228 @@
+import asyncio
+import collections
+from concurrent.futures import (
+    Future,
+    ThreadPoolExecutor,
+)
+import logging
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from trinity.rpc.main import (
+    RPCServer,
+    generate_batch_response,
+    generate_response,
+    is_read_only_request,
+    validate_batch,
+)
+
+
+DEFAULT_MAX_WORKERS = 4
+
+# Seconds after which the response to a request is an error, if it hasn't completed.
+DEFAULT_REQUEST_TIMEOUT = 30
+
+# The most requests of each of these methods which may run at once. They replay
+# blocks or search through many of them, so they could otherwise take all the workers.
+DEFAULT_METHOD_LIMITS = {
+    'eth_getLogs': 2,
+    'evm_applyBlockFixture': 1,
+    'evm_resetToGenesisFixture': 1,
+}
+
+
+class ChainAccessLock:
+    '''
+    Lets any number of read-only requests run at once, or a single request which changes
+    the chain, alone.  The requests get the lock in the order they asked for it, so a
+    change waits for the reads before it, and the reads after it wait for the change.
+    '''
+    def __init__(self) -> None:
+        self._readers = 0
+        self._changing = False
+        self._waiters: Deque[Tuple[bool, asyncio.Future]] = collections.deque()
+
+    async def acquire(self, exclusive: bool) -> None:
+        if not self._waiters and self._is_available(exclusive):
+            self._take(exclusive)
+            return
+
+        waiter = asyncio.get_event_loop().create_future()
+        self._waiters.append((exclusive, waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The lock was given just before the cancellation.
+                self.release(exclusive)
+            else:
+                self._waiters.remove((exclusive, waiter))
+                self._wake_waiters()
+            raise
+
+    def release(self, exclusive: bool) -> None:
+        if exclusive:
+            self._changing = False
+        else:
+            self._readers -= 1
+        self._wake_waiters()
+
+    def _is_available(self, exclusive: bool) -> bool:
+        if exclusive:
+            return not self._changing and self._readers == 0
+        else:
+            return not self._changing
+
+    def _take(self, exclusive: bool) -> None:
+        if exclusive:
+            self._changing = True
+        else:
+            self._readers += 1
+
+    def _wake_waiters(self) -> None:
+        while self._waiters:
+            exclusive, waiter = self._waiters[0]
+            if waiter.done():
+                # Cancelled, it removes itself once its task resumes.
+                self._waiters.popleft()
+            elif self._is_available(exclusive):
+                self._waiters.popleft()
+                self._take(exclusive)
+                waiter.set_result(None)
+            else:
+                break
+
+
+class RPCDispatcher:
+    '''
+    Executes the requests of an :class:`~trinity.rpc.main.RPCServer` on a bounded pool
+    of worker threads, so that a slow request doesn't block the event loop which reads
+    the others.
+
+    A request which doesn't complete within ``timeout`` seconds gets an error response.
+    Its worker can't be interrupted though, so it stays busy until the request completes.
+
+    The requests which change the chain run alone, so that the read-only ones never see
+    it while it's being changed.
+    '''
+    logger = logging.getLogger('trinity.rpc.dispatch.RPCDispatcher')
+
+    def __init__(self,
+                 rpc: RPCServer,
+                 max_workers: int = DEFAULT_MAX_WORKERS,
+                 timeout: float = DEFAULT_REQUEST_TIMEOUT,
+                 method_limits: Dict[str, int] = None) -> None:
+        self.rpc = rpc
+        self.max_workers = max_workers
+        self.timeout = timeout
+        if method_limits is None:
+            self.method_limits = DEFAULT_METHOD_LIMITS
+        else:
+            self.method_limits = method_limits
+        self._executor = ThreadPoolExecutor(max_workers)
+        self._method_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._chain_lock = ChainAccessLock()
+        # The number of requests submitted to the workers which haven't completed yet,
+        # including the ones which timed out, and the highest it has been.
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+
+    async def execute(self, request: Union[Dict[str, Any], List[Any]]) -> str:
+        '''
+        Execute the request, or batch of requests, on the workers and return the response.
+        '''
+        if isinstance(request, list):
+            return await self.execute_batch(request)
+        else:
+            return await self.execute_request(request)
+
+    async def execute_batch(self, requests: List[Any]) -> str:
+        '''
+        Execute the requests of a batch concurrently, except the ones which change the
+        chain: they run after the requests before them, and before the ones after them.
+        '''
+        try:
+            validate_batch(requests, self.rpc.max_batch_size)
+        except ValueError as exc:
+            return generate_response({}, None, exc)
+
+        responses: List[asyncio.Future] = []
+        for request in requests:
+            if is_read_only_request(request):
+                responses.append(asyncio.ensure_future(self.execute_request(request)))
+            else:
+                await asyncio.gather(*responses)
+                responses.append(asyncio.ensure_future(self.execute_request(request)))
+                await responses[-1]
+        return generate_batch_response(await asyncio.gather(*responses))
+
+    async def execute_request(self, request: Dict[str, Any]) -> str:
+        '''
+        Execute the request on a worker and return its response.
+        '''
+        if not isinstance(request, dict):
+            # Not worth a worker: the response is an error.
+            return self.rpc.execute_request(request)
+
+        try:
+            return await asyncio.wait_for(self._execute(request), self.timeout)
+        except asyncio.TimeoutError:
+            self.logger.info(
+                "RPC request timed out after %ss: %s",
+                self.timeout,
+                request.get('method'),
+            )
+            return generate_response(
+                request,
+                None,
+                "Request timed out after %ss" % self.timeout,
+            )
+
+    async def _execute(self, request: Dict[str, Any]) -> str:
+        loop = asyncio.get_event_loop()
+        semaphore = self._get_method_semaphore(request)
+        if semaphore is not None:
+            await semaphore.acquire()
+        exclusive = not is_read_only_request(request)
+        try:
+            await self._chain_lock.acquire(exclusive)
+        except asyncio.CancelledError:
+            if semaphore is not None:
+                semaphore.release()
+            raise
+
+        future = self._executor.submit(self.rpc.execute, request)
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        if self.queue_depth > self.max_workers:
+            self.logger.debug("RPC requests waiting for a worker: %d",
+                              self.queue_depth - self.max_workers)
+
+        def finish(future: Future) -> None:
+            # Only release the chain and the method's slot once its worker is actually
+            # done, even if the request timed out.
+            self.queue_depth -= 1
+            self._chain_lock.release(exclusive)
+            if semaphore is not None:
+                semaphore.release()
+
+        future.add_done_callback(lambda future: loop.call_soon_threadsafe(finish, future))
+        return await asyncio.wrap_future(future, loop=loop)
+
+    def _get_method_semaphore(self, request: Dict[str, Any]) -> Optional[asyncio.Semaphore]:
+        method = request.get('method')
+        if method not in self.method_limits:
+            return None
+        elif method not in self._method_semaphores:
+            self._method_semaphores[method] = asyncio.Semaphore(self.method_limits[method])
+        return self._method_semaphores[method]
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
@@ -13,6 +13,8 @@ from eth_utils import (
 
 import rlp
 
+from evm.rlp.sedes import int32
+
 
 def transaction_to_dict(transaction):
     return dict(
@@ -29,6 +31,20 @@ def transaction_to_dict(transaction):
     )
 
 
+def log_to_dict(log, log_index, transaction_index, transaction_hash, header):
+    return dict(
+        logIndex=hex(log_index),
+        transactionIndex=hex(transaction_index),
+        transactionHash=encode_hex(transaction_hash),
+        blockHash=encode_hex(header.hash),
+        blockNumber=hex(header.block_number),
+        address=encode_hex(log.address),
+        data=encode_hex(log.data),
+        topics=[encode_hex(int32.serialize(topic)) for topic in log.topics],
+        removed=False,
+    )
+
+
 def header_to_dict(header):
     logs_bloom = encode_hex(int_to_big_endian(header.bloom))[2:]
     logs_bloom = '0x' + logs_bloom.rjust(512, '0')
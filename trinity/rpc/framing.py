@@ -0,0 +1,138 @@
+import re
+from typing import (
+    List,
+    NamedTuple,
+)
+
+
+# Characters which change the state of the framer, inside and outside of strings.
+STRING_SPECIAL_CHARS = re.compile(rb'["\\]')
+STRUCTURAL_CHARS = re.compile(rb'[{}\[\]"]')
+MESSAGE_START_CHARS = re.compile(rb'[{\[]')
+
+
+class Frame(NamedTuple):
+    '''
+    A complete JSON message, or the reason why some data isn't one.
+    '''
+    data: bytes
+    error: str = None
+
+
+class JSONFramer:
+    '''
+    Splits a stream of bytes into the JSON objects and arrays which it contains.
+
+    The framer tracks the depth of the brackets and whether it's inside a string, so
+    each byte is only scanned once however the messages are split up, and the
+    messages are only decoded once they are complete.
+
+    A message longer than ``max_message_bytes`` is skipped, to bound the memory held
+    for a connection.
+    '''
+    def __init__(self, max_message_bytes: int) -> None:
+        self.max_message_bytes = max_message_bytes
+        self._buffer = bytearray()
+        # The position in the buffer up to which it was scanned.
+        self._position = 0
+        # The depth of the brackets at that position, and whether it's inside a string.
+        self._depth = 0
+        self._in_string = False
+        # Whether the message being scanned is too long, and not kept in the buffer.
+        self._skipping = False
+
+    def feed(self, data: bytes) -> List[Frame]:
+        '''
+        Add the data to the stream, and return the frames which it completes.
+        '''
+        frames: List[Frame] = []
+        self._buffer.extend(data)
+
+        while True:
+            if self._depth == 0:
+                match = MESSAGE_START_CHARS.search(self._buffer, self._position)
+                if match is None:
+                    # Keep any data which isn't JSON, to report it all at once when a
+                    # message starts.
+                    self._position = len(self._buffer)
+                    if not self._buffer.strip():
+                        self._clear()
+                    elif self._position > self.max_message_bytes:
+                        frames.append(self._make_non_json_frame(self._position))
+                        self._clear()
+                    break
+                if self._buffer[:match.start()].strip():
+                    frames.append(self._make_non_json_frame(match.start()))
+                del self._buffer[:match.start()]
+                self._depth = 1
+                self._position = 1
+            elif self._in_string:
+                match = STRING_SPECIAL_CHARS.search(self._buffer, self._position)
+                if match is None:
+                    self._position = len(self._buffer)
+                elif match.group() == b'"':
+                    self._in_string = False
+                    self._position = match.end()
+                elif match.end() < len(self._buffer):
+                    # Skip the escaped character.
+                    self._position = match.end() + 1
+                else:
+                    # The escaped character hasn't been received yet.
+                    self._position = match.start()
+                    match = None
+            else:
+                match = STRUCTURAL_CHARS.search(self._buffer, self._position)
+                if match is None:
+                    self._position = len(self._buffer)
+                else:
+                    self._position = match.end()
+                    char = match.group()
+                    if char == b'"':
+                        self._in_string = True
+                    elif char in b'{[':
+                        self._depth += 1
+                    else:
+                        self._depth -= 1
+
+            if self._depth == 0:
+                self._end_message(frames)
+            elif match is None:
+                self._check_length(frames)
+                break
+
+        return frames
+
+    def _end_message(self, frames: List[Frame]) -> None:
+        if self._skipping:
+            self._skipping = False
+        elif self._position > self.max_message_bytes:
+            frames.append(self._make_too_long_frame())
+        else:
+            frames.append(Frame(bytes(self._buffer[:self._position])))
+        self._clear()
+
+    def _check_length(self, frames: List[Frame]) -> None:
+        if not self._skipping and self._position > self.max_message_bytes:
+            frames.append(self._make_too_long_frame())
+            self._skipping = True
+        if self._skipping:
+            # Only the state of the framer is needed to find the end of the message.
+            self._clear()
+
+    def _clear(self) -> None:
+        del self._buffer[:self._position]
+        self._position = 0
+
+    def _make_non_json_frame(self, end: int) -> Frame:
+        non_json_data = bytes(self._buffer[:end]).strip()
+        return Frame(
+            non_json_data,
+            'Cannot parse json: ' + non_json_data.decode(errors='replace'),
+        )
+
+    def _make_too_long_frame(self) -> Frame:
+        start = bytes(self._buffer[:20])
+        return Frame(start, "reached limit: %d bytes, starting with '%s'" % (
+            self.max_message_bytes,
+            start.decode(errors='replace'),
+        ))
@@ -0,0 +1,303 @@
+import asyncio
+import gzip
+from http import HTTPStatus
+import json
+import logging
+
+from cytoolz import curry
+
+from p2p.cancel_token import (
+    CancelToken,
+)
+from p2p.exceptions import (
+    OperationCancelled,
+)
+
+from trinity.rpc.dispatch import (
+    RPCDispatcher,
+)
+from trinity.rpc.ipc import (
+    MAXIMUM_PENDING_RESPONSES,
+    MAXIMUM_REQUEST_BYTES,
+    completed,
+    run_until_closed,
+)
+
+
+DEFAULT_MAX_CONNECTIONS = 100
+
+# Seconds for which a connection is kept open, waiting for its next request.
+KEEP_ALIVE_TIMEOUT = 60
+
+# The most bytes of the request line and headers of a request.
+MAXIMUM_HEAD_BYTES = 64 * 1024
+
+# Responses are only compressed above this size, which block payloads easily reach.
+GZIP_MINIMUM_BYTES = 4096
+
+
+class HTTPRequestError(Exception):
+    '''
+    The request can't be executed, and the response is the given HTTP error. The
+    connection is closed after it, because the rest of the request can't be found.
+    '''
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def parse_request_head(head):
+    '''
+    :returns: (method, version, headers) - the names of the headers are lower case.
+    '''
+    request_line, *header_lines = head.decode('latin-1').split('\r\n')
+    try:
+        method, _, version = request_line.split(' ')
+    except ValueError:
+        raise HTTPRequestError(HTTPStatus.BAD_REQUEST, "Invalid request line")
+    if version not in ('HTTP/1.0', 'HTTP/1.1'):
+        raise HTTPRequestError(HTTPStatus.HTTP_VERSION_NOT_SUPPORTED, "Unsupported version")
+
+    headers = {}
+    for line in header_lines:
+        name, colon, value = line.partition(':')
+        if not colon:
+            raise HTTPRequestError(HTTPStatus.BAD_REQUEST, "Invalid header line")
+        headers[name.strip().lower()] = value.strip()
+    return method, version, headers
+
+
+def is_keep_alive(version, headers):
+    connection = headers.get('connection', '').lower()
+    if version == 'HTTP/1.0':
+        return connection == 'keep-alive'
+    else:
+        return connection != 'close'
+
+
+def accepts_gzip(headers):
+    encodings = headers.get('accept-encoding', '').split(',')
+    return any(encoding.split(';')[0].strip() == 'gzip' for encoding in encodings)
+
+
+def format_response(status, body, keep_alive, content_encoding=None):
+    head_lines = [
+        'HTTP/1.1 %d %s' % (status, status.phrase),
+        'Content-Type: application/json',
+        'Content-Length: %d' % len(body),
+    ]
+    if content_encoding is not None:
+        head_lines.append('Content-Encoding: %s' % content_encoding)
+    head_lines.append('Connection: %s' % ('keep-alive' if keep_alive else 'close'))
+    return ('\r\n'.join(head_lines) + '\r\n\r\n').encode('latin-1') + body
+
+
+def format_error_response(status, message):
+    return format_response(status, json.dumps({'error': message}).encode(), keep_alive=False)
+
+
+async def execute_request(execute_rpc, body, keep_alive, compress):
+    try:
+        request = json.loads(body)
+    except ValueError as e:
+        return format_response(
+            HTTPStatus.BAD_REQUEST,
+            json.dumps({'error': 'Cannot parse json: ' + str(e)}).encode(),
+            keep_alive,
+        )
+    if not isinstance(request, list) and not request:
+        return format_response(
+            HTTPStatus.BAD_REQUEST,
+            json.dumps({'error': 'Invalid Request: empty'}).encode(),
+            keep_alive,
+        )
+
+    response_body = (await execute_rpc(request)).encode()
+    if compress and len(response_body) >= GZIP_MINIMUM_BYTES:
+        loop = asyncio.get_event_loop()
+        response_body = await loop.run_in_executor(None, gzip.compress, response_body)
+        return format_response(HTTPStatus.OK, response_body, keep_alive, 'gzip')
+    else:
+        return format_response(HTTPStatus.OK, response_body, keep_alive)
+
+
+@curry
+async def connection_handler(execute_rpc, cancel_token, reader, writer):
+    '''
+    Catch fatal errors, log them, and close the connection
+    '''
+    logger = logging.getLogger('trinity.rpc.http')
+
+    try:
+        await connection_loop(execute_rpc, reader, writer, logger, cancel_token)
+    except ConnectionResetError:
+        logger.debug("Client closed connection")
+    except OperationCancelled:
+        logger.debug("CancelToken triggered")
+    except Exception:
+        logger.exception("Unrecognized exception while handling requests")
+    finally:
+        writer.close()
+
+
+async def connection_loop(execute_rpc, reader, writer, logger, cancel_token):
+    '''
+    Read the requests of the connection and execute them concurrently, while writing
+    their responses in the order of the requests, until either side closes it.
+    '''
+    responses = asyncio.Queue(MAXIMUM_PENDING_RESPONSES)
+    await run_until_closed(
+        read_requests(execute_rpc, reader, responses, logger),
+        write_responses(writer, responses, logger),
+        responses,
+        cancel_token,
+    )
+
+
+async def read_requests(execute_rpc, reader, responses, logger):
+    try:
+        while await read_request(execute_rpc, reader, responses, logger):
+            pass
+    except HTTPRequestError as e:
+        logger.info("Invalid HTTP request: %s", e)
+        await responses.put(completed(format_error_response(e.status, str(e))))
+    except asyncio.TimeoutError:
+        logger.debug("Closing idle connection")
+    except asyncio.IncompleteReadError:
+        logger.debug("Client closed connection")
+    # Let the responses to the requests already read be written before closing.
+    await responses.put(None)
+
+
+async def read_request(execute_rpc, reader, responses, logger):
+    '''
+    Read the next request of the connection, and queue its response.
+
+    :returns: whether the connection stays open for another request
+    '''
+    try:
+        head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), KEEP_ALIVE_TIMEOUT)
+    except asyncio.LimitOverrunError:
+        raise HTTPRequestError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Headers too large")
+    # Clients may send empty lines between requests.
+    method, version, headers = parse_request_head(head.lstrip(b'\r\n')[:-4])
+
+    if method != 'POST':
+        raise HTTPRequestError(HTTPStatus.METHOD_NOT_ALLOWED, "Only POST is supported")
+    elif 'transfer-encoding' in headers:
+        raise HTTPRequestError(HTTPStatus.NOT_IMPLEMENTED, "Transfer encodings aren't supported")
+
+    try:
+        content_length = int(headers['content-length'])
+    except KeyError:
+        raise HTTPRequestError(HTTPStatus.LENGTH_REQUIRED, "Content-Length is required")
+    except ValueError:
+        raise HTTPRequestError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+    if content_length < 0:
+        raise HTTPRequestError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+    elif content_length > MAXIMUM_REQUEST_BYTES:
+        raise HTTPRequestError(
+            HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+            "reached limit: %d bytes" % MAXIMUM_REQUEST_BYTES,
+        )
+
+    if headers.get('expect', '').lower() == '100-continue':
+        await responses.put(completed(b'HTTP/1.1 100 Continue\r\n\r\n'))
+    body = await reader.readexactly(content_length)
+
+    keep_alive = is_keep_alive(version, headers)
+    # Waits for a response to be written when too many are pending, so that a client
+    # which doesn't read them can't make the server buffer them all.
+    await responses.put(asyncio.ensure_future(
+        execute_request(execute_rpc, body, keep_alive, accepts_gzip(headers))
+    ))
+    return keep_alive
+
+
+async def write_responses(writer, responses, logger):
+    while True:
+        response = await responses.get()
+        if response is None:
+            return
+        try:
+            response_bytes = await response
+        except Exception as e:
+            logger.exception("Unrecognized exception while executing RPC")
+            response_bytes = format_error_response(
+                HTTPStatus.INTERNAL_SERVER_ERROR,
+                "unknown failure: " + str(e),
+            )
+        writer.write(response_bytes)
+        await writer.drain()
+
+
+class HTTPServer:
+    '''
+    Serves JSON-RPC over HTTP/1.1 on a TCP address. Connections are kept open between
+    requests, and a client may send its next requests without waiting for the
+    responses to the previous ones.
+    '''
+    logger = logging.getLogger('trinity.rpc.http.HTTPServer')
+
+    cancel_token = None
+    dispatcher = None
+    rpc = None
+    server = None
+
+    def __init__(self, rpc, host, port, dispatcher=None, max_connections=DEFAULT_MAX_CONNECTIONS):
+        self.rpc = rpc
+        self.host = host
+        self.port = port
+        self.max_connections = max_connections
+        self.connections = 0
+        # A dispatcher given by the caller may be shared with other servers, so
+        # it's left to the caller to shut it down.
+        self._owns_dispatcher = dispatcher is None
+        if dispatcher is None:
+            self.dispatcher = RPCDispatcher(rpc)
+        else:
+            self.dispatcher = dispatcher
+
+    async def run(self, loop=None):
+        self.cancel_token = CancelToken('HTTPServer', loop=loop)
+        self.server = await asyncio.start_server(
+            self.handle_connection,
+            self.host,
+            self.port,
+            loop=loop,
+            limit=MAXIMUM_HEAD_BYTES,
+        )
+        self.logger.info('HTTP JSON-RPC started at: http://%s:%d', *self.address)
+        await self.cancel_token.wait()
+
+    @property
+    def address(self):
+        '''
+        The address which the server listens on, with the port chosen by the system if
+        it was given as 0.
+        '''
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def handle_connection(self, reader, writer):
+        if self.connections >= self.max_connections:
+            self.logger.debug("Refusing connection: %d are open already", self.connections)
+            writer.write(format_error_response(
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                "Too many connections",
+            ))
+            writer.close()
+            return
+
+        self.connections += 1
+        try:
+            await connection_handler(self.dispatcher.execute, self.cancel_token, reader, writer)
+        finally:
+            self.connections -= 1
+
+    async def stop(self):
+        if self.cancel_token is not None:
+            self.cancel_token.trigger()
+        self.server.close()
+        await self.server.wait_closed()
+        if self._owns_dispatcher:
+            self.dispatcher.shutdown()
@@ -13,124 +13,241 @@ from p2p.exceptions import (
     OperationCancelled,
 )
 
+from trinity.rpc.dispatch import (
+    RPCDispatcher,
+)
+from trinity.rpc.framing import (
+    JSONFramer,
+)
+from trinity.rpc.subscriptions import (
+    SlowConsumer,
+    SubscriptionManager,
+)
+
 
-MAXIMUM_REQUEST_BYTES = 10000
+# Requests are large when they include a lot of data, like raw transactions with
+# large calldata.
+MAXIMUM_REQUEST_BYTES = 32 * 1024 * 1024
+
+READ_CHUNK_BYTES = 64 * 1024
+
+# The most requests of a connection which may be executing, or waiting for the responses
+# to the earlier ones to be written, before the server stops reading the connection.
+MAXIMUM_PENDING_RESPONSES = 64
 
 
 @curry
-async def connection_handler(execute_rpc, cancel_token, reader, writer):
+async def connection_handler(execute_rpc, subscriptions, cancel_token, reader, writer):
     '''
     Catch fatal errors, log them, and close the connection
     '''
     logger = logging.getLogger('trinity.rpc.ipc')
 
     try:
-        await connection_loop(execute_rpc, reader, writer, logger, cancel_token),
+        await connection_loop(execute_rpc, subscriptions, reader, writer, logger, cancel_token),
     except (ConnectionResetError, asyncio.IncompleteReadError):
         logger.debug("Client closed connection")
     except OperationCancelled:
         logger.debug("CancelToken triggered")
+    except SlowConsumer as e:
+        logger.info("Closing connection which doesn't read its notifications: %s", e)
     except Exception:
         logger.exception("Unrecognized exception while handling requests")
     finally:
         writer.close()
 
 
-async def connection_loop(execute_rpc, reader, writer, logger, cancel_token):
-    # TODO: we should look into using an io.StrinIO here for more efficient
-    # writing to the end of the string.
-    raw_request = ''
+async def connection_loop(execute_rpc, subscriptions, reader, writer, logger, cancel_token):
+    '''
+    Read the requests of the connection and execute them concurrently, while writing
+    their responses in the order of the requests, and the notifications of its
+    subscriptions as they are published.
+    '''
+    responses = asyncio.Queue(MAXIMUM_PENDING_RESPONSES)
+    subscriber = subscriptions.make_subscriber()
+
+    def execute(request):
+        if subscriptions.is_subscription_request(request):
+            return subscriptions.execute(subscriber, request)
+        else:
+            return execute_rpc(request)
+
+    try:
+        await run_until_closed(
+            read_requests(execute, reader, responses, logger),
+            write_messages(writer, responses, subscriber, logger),
+            responses,
+            cancel_token,
+        )
+    finally:
+        subscriptions.remove_subscriber(subscriber)
+
+
+async def run_until_closed(reading, writing, responses, cancel_token):
+    '''
+    Run the coroutines reading the requests of a connection and writing their responses
+    until either fails, or the writing one returns after the last response.
+    '''
+    tasks = (asyncio.ensure_future(reading), asyncio.ensure_future(writing))
+    try:
+        done, _ = await wait_with_token(
+            asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION),
+            token=cancel_token,
+        )
+    finally:
+        for task in tasks:
+            task.cancel()
+        while not responses.empty():
+            response = responses.get_nowait()
+            if response is not None:
+                response.cancel()
+
+    for task in done:
+        task.result()
+
+
+async def read_requests(execute_rpc, reader, responses, logger):
+    framer = JSONFramer(MAXIMUM_REQUEST_BYTES)
     while True:
-        request_bytes = b''
-        try:
-            request_bytes = await wait_with_token(reader.readuntil(b'}'), token=cancel_token)
-        except asyncio.LimitOverrunError as e:
-            logger.info("Client request was too long. Erasing buffer and restarting...")
-            request_bytes = await wait_with_token(reader.read(e.consumed), token=cancel_token)
-            await wait_with_token(write_error(
-                writer,
-                "reached limit: %d bytes, starting with '%s'" % (
-                    e.consumed,
-                    request_bytes[:20],
-                ),
-            ), token=cancel_token)
-            continue
-
-        raw_request += request_bytes.decode()
-
-        bad_prefix, raw_request = strip_non_json_prefix(raw_request)
-        if bad_prefix:
-            logger.info("Client started request with non json data: %r", bad_prefix)
-            await wait_with_token(
-                write_error(writer, 'Cannot parse json: ' + bad_prefix),
-                token=cancel_token,
-            )
+        data = await reader.read(READ_CHUNK_BYTES)
+        if not data:
+            logger.debug("Client closed connection")
+            # Let the responses to the requests already read be written.
+            await responses.put(None)
+            return
 
-        try:
-            request = json.loads(raw_request)
-        except json.JSONDecodeError:
-            # invalid json request, keep reading data until a valid json is formed
-            logger.debug("Invalid JSON, waiting for rest of message: %r", raw_request)
-            continue
-
-        # reset the buffer for the next message
-        raw_request = ''
-
-        if not request:
-            logger.debug("Client sent empty request")
-            await wait_with_token(
-                write_error(writer, 'Invalid Request: empty'),
-                token=cancel_token,
-            )
-            continue
-
-        try:
-            result = execute_rpc(request)
-        except Exception as e:
-            logger.exception("Unrecognized exception while executing RPC")
-            await wait_with_token(
-                write_error(writer, "unknown failure: " + str(e)),
-                token=cancel_token,
+        for frame in framer.feed(data):
+            if frame.error is not None:
+                logger.info("Client sent data which isn't a JSON message: %s", frame.error)
+                await responses.put(error_response(frame.error))
+                continue
+
+            try:
+                request = json.loads(frame.data)
+            except ValueError as e:
+                logger.info("Client sent invalid JSON: %r", frame.data[:100])
+                await responses.put(error_response('Cannot parse json: ' + str(e)))
+                continue
+
+            if not isinstance(request, list) and not request:
+                logger.debug("Client sent empty request")
+                await responses.put(error_response('Invalid Request: empty'))
+                continue
+
+            # Waits for a response to be written when too many are pending, so that a
+            # client which doesn't read them can't make the server buffer them all.
+            await responses.put(asyncio.ensure_future(execute_rpc(request)))
+
+
+async def write_messages(writer, responses, subscriber, logger):
+    '''
+    Write the responses in the order of the requests, and the notifications in between
+    them, until the last response is written.
+
+    :raise SlowConsumer: if the subscriber buffers too many notifications, because the
+        client doesn't read them
+    '''
+    next_response = asyncio.ensure_future(get_next_response(responses, logger))
+    next_notification = asyncio.ensure_future(subscriber.notifications.get())
+    overflowed = asyncio.ensure_future(subscriber.overflowed.wait())
+    try:
+        while True:
+            await asyncio.wait(
+                (next_response, next_notification, overflowed),
+                return_when=asyncio.FIRST_COMPLETED,
             )
-        else:
-            writer.write(result.encode())
+            if overflowed.done():
+                break
 
-        await wait_with_token(writer.drain(), token=cancel_token)
+            if next_notification.done():
+                writer.write(next_notification.result().encode())
+                next_notification = asyncio.ensure_future(subscriber.notifications.get())
 
+            if next_response.done():
+                response, result = next_response.result()
+                if response is None:
+                    return
+                writer.write(result.encode())
+                subscriber.response_written(response)
+                next_response = asyncio.ensure_future(get_next_response(responses, logger))
 
-def strip_non_json_prefix(raw_request):
-    if raw_request and raw_request[0] != '{':
-        prefix, bracket, rest = raw_request.partition('{')
-        return prefix.strip(), bracket + rest
-    else:
-        return '', raw_request
+            drain = asyncio.ensure_future(writer.drain())
+            await asyncio.wait((drain, overflowed), return_when=asyncio.FIRST_COMPLETED)
+            if overflowed.done():
+                break
+            drain.result()
+    finally:
+        for task in (next_response, next_notification, overflowed):
+            task.cancel()
 
+    raise SlowConsumer("more than %d notifications are waiting to be written" % (
+        subscriber.max_notifications,
+    ))
 
-async def write_error(writer, message):
-    json_error = json.dumps({'error': message}) + '\n'
-    writer.write(json_error.encode())
-    await writer.drain()
+
+async def get_next_response(responses, logger):
+    '''
+    :returns: (response, result) - the next response, and its result once completed,
+        or None for both after the last response
+    '''
+    response = await responses.get()
+    if response is None:
+        return None, None
+    try:
+        result = await response
+    except Exception as e:
+        logger.exception("Unrecognized exception while executing RPC")
+        result = format_error("unknown failure: " + str(e))
+    return response, result
+
+
+def format_error(message):
+    return json.dumps({'error': message}) + '\n'
+
+
+def completed(result):
+    future = asyncio.Future()
+    future.set_result(result)
+    return future
+
+
+def error_response(message):
+    return completed(format_error(message))
 
 
 class IPCServer:
     logger = logging.getLogger('trinity.rpc.ipc.IPCServer')
 
     cancel_token = None
+    dispatcher = None
     ipc_path = None
+    publishing = None
     rpc = None
     server = None
+    subscriptions = None
 
-    def __init__(self, rpc, ipc_path):
+    def __init__(self, rpc, ipc_path, dispatcher=None, subscriptions=None):
         self.rpc = rpc
         self.ipc_path = ipc_path
+        # A dispatcher given by the caller may be shared with other servers, so
+        # it's left to the caller to shut it down.
+        self._owns_dispatcher = dispatcher is None
+        if dispatcher is None:
+            self.dispatcher = RPCDispatcher(rpc)
+        else:
+            self.dispatcher = dispatcher
+        if subscriptions is None:
+            self.subscriptions = SubscriptionManager(rpc)
+        else:
+            self.subscriptions = subscriptions
 
     async def run(self, loop=None):
         self.cancel_token = CancelToken('IPCServer', loop=loop)
+        self.publishing = asyncio.ensure_future(self.subscriptions.run(loop), loop=loop)
         self.server = await asyncio.start_unix_server(
-            connection_handler(self.rpc.execute, self.cancel_token),
+            connection_handler(self.dispatcher.execute, self.subscriptions, self.cancel_token),
             self.ipc_path,
             loop=loop,
-            limit=MAXIMUM_REQUEST_BYTES,
         )
         self.logger.info('IPC started at: %s', os.path.abspath(self.ipc_path))
         await self.cancel_token.wait()
@@ -138,5 +255,13 @@ class IPCServer:
     async def stop(self):
         if self.cancel_token is not None:
             self.cancel_token.trigger()
+        if self.publishing is not None:
+            self.publishing.cancel()
         self.server.close()
         await self.server.wait_closed()
+        if self._owns_dispatcher:
+            self.dispatcher.shutdown()
+        self.logger.debug(
+            "Most RPC requests submitted to the workers at once: %d",
+            self.dispatcher.max_queue_depth,
+        )
@@ -20,14 +20,40 @@ REQUIRED_REQUEST_KEYS = {
     'method',
 }
 
+DEFAULT_MAX_BATCH_SIZE = 100
+
+# Methods which change the chain, so the requests of a batch can't be reordered around them.
+MUTATING_METHODS = {
+    'evm_applyBlockFixture',
+    'evm_resetToGenesisFixture',
+}
+
 
 def validate_request(request):
+    if not isinstance(request, dict):
+        raise ValueError("request must be a JSON object")
     missing_keys = REQUIRED_REQUEST_KEYS - set(request.keys())
     if missing_keys:
         raise ValueError("request must include the keys: %r" % missing_keys)
 
 
+def validate_batch(requests, max_batch_size):
+    if not requests:
+        raise ValueError("batch must include at least one request")
+    elif len(requests) > max_batch_size:
+        raise ValueError("batch must include at most %d requests, not %d" % (
+            max_batch_size,
+            len(requests),
+        ))
+
+
+def is_read_only_request(request):
+    return not isinstance(request, dict) or request.get('method') not in MUTATING_METHODS
+
+
 def generate_response(request, result, error):
+    if not isinstance(request, dict):
+        request = {}
     response = {
         'id': request.get('id', -1),
         'jsonrpc': request.get('jsonrpc', "2.0"),
@@ -44,6 +70,10 @@ def generate_response(request, result, error):
     return json.dumps(response)
 
 
+def generate_batch_response(responses):
+    return '[' + ','.join(responses) + ']'
+
+
 class RPCServer:
     '''
     This "server" accepts json strings requests and returns the appropriate json string response,
@@ -61,9 +91,10 @@ class RPCServer:
         Web3,
     )
 
-    def __init__(self, chain):
+    def __init__(self, chain, max_batch_size=DEFAULT_MAX_BATCH_SIZE):
         self.modules: Dict[str, RPCModule] = {}
         self.chain = chain
+        self.max_batch_size = max_batch_size
         for M in self.module_classes:
             self.modules[M.__name__.lower()] = M(chain)
         if len(self.modules) != len(self.module_classes):
@@ -122,11 +153,27 @@ class RPCServer:
 
     def execute(self, request):
         '''
-        The key entry point for all incoming requests
+        The key entry point for all incoming requests, and batches of them
         '''
+        if isinstance(request, list):
+            return self.execute_batch(request)
+        else:
+            return self.execute_request(request)
+
+    def execute_request(self, request):
         result, error = self._get_result(request)
         return generate_response(request, result, error)
 
+    def execute_batch(self, requests):
+        '''
+        Execute the requests of a batch in order, and return their responses in an array
+        '''
+        try:
+            validate_batch(requests, self.max_batch_size)
+        except ValueError as exc:
+            return generate_response({}, None, exc)
+        return generate_batch_response(self.execute_request(request) for request in requests)
+
     @property
     def chain(self):
         return self.__chain
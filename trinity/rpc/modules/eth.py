@@ -9,10 +9,14 @@ from eth_utils import (
     is_integer,
 )
 
+from evm.rlp.receipts import Receipt
+from evm.rlp.sedes import int32
+
 from trinity.rpc.format import (
     block_to_dict,
     header_to_dict,
     format_params,
+    log_to_dict,
     to_int_if_hex,
     transaction_to_dict,
 )
@@ -53,6 +57,69 @@ def get_block_at_number(chain, at_block):
         return chain.get_block_by_header(at_header)
 
 
+def normalize_filter_values(values):
+    """
+    Normalizes the address, or one of the topic positions, of a log filter to
+    a tuple of the accepted values.  An empty tuple matches anything.
+    """
+    if values is None:
+        return ()
+    elif isinstance(values, str):
+        return (decode_hex(values),)
+    else:
+        return tuple(decode_hex(value) for value in values)
+
+
+def get_filter_block_number(at_block, head_number):
+    at_block = to_int_if_hex(at_block)
+    if at_block == 'pending' or at_block == 'latest':
+        return head_number
+    elif at_block == 'earliest':
+        return 0
+    elif is_integer(at_block) and at_block >= 0:
+        return min(at_block, head_number)
+    else:
+        raise TypeError("Unrecognized block reference: %r" % at_block)
+
+
+def is_log_match(address, log_topics, addresses, topics):
+    """
+    Whether a log of the given address and topics matches the filter.
+    """
+    return (
+        (not addresses or address in addresses) and
+        len(log_topics) >= len(topics) and
+        all(
+            not accepted or log_topic in accepted
+            for accepted, log_topic in zip(topics, log_topics)
+        )
+    )
+
+
+def get_matching_logs(chaindb, header, addresses, topics):
+    """
+    Decodes the receipts of the given block, returning its logs which match the filter.
+    """
+    receipts = chaindb.get_receipts(header, Receipt)
+    transaction_hashes = tuple(chaindb.get_block_transaction_hashes(header))
+
+    logs = []
+    log_index = 0
+    for transaction_index, receipt in enumerate(receipts):
+        for log in receipt.logs:
+            log_topics = tuple(int32.serialize(topic) for topic in log.topics)
+            if is_log_match(log.address, log_topics, addresses, topics):
+                logs.append(log_to_dict(
+                    log,
+                    log_index,
+                    transaction_index,
+                    transaction_hashes[transaction_index],
+                    header,
+                ))
+            log_index += 1
+    return logs
+
+
 class Eth(RPCModule):
     '''
     All the methods defined by JSON-RPC API, starting with "eth_"...
@@ -106,6 +173,41 @@ class Eth(RPCModule):
         code = account_db.get_code(address)
         return encode_hex(code)
 
+    @format_params(identity)
+    def getLogs(self, filter_params):
+        chaindb = self._chain.chaindb
+        addresses = normalize_filter_values(filter_params.get('address'))
+        topics = tuple(
+            normalize_filter_values(position)
+            for position in filter_params.get('topics') or ()
+        )
+
+        if filter_params.get('blockHash'):
+            block_hash = decode_hex(filter_params['blockHash'])
+            headers = (chaindb.get_block_header_by_hash(block_hash),)
+        else:
+            head_number = chaindb.get_canonical_head().block_number
+            from_block, to_block = (
+                get_filter_block_number(filter_params.get(param, 'latest'), head_number)
+                for param in ('fromBlock', 'toBlock')
+            )
+            # Only the blocks whose bloom may match the filter are loaded.
+            candidates = chaindb.get_log_candidate_block_numbers(
+                (addresses,) + topics,
+                from_block,
+                to_block,
+            )
+            headers = (
+                chaindb.get_canonical_block_header_by_number(block_number)
+                for block_number in candidates
+            )
+
+        return [
+            log
+            for header in headers
+            for log in get_matching_logs(chaindb, header, addresses, topics)
+        ]
+
     @format_params(decode_hex, to_int_if_hex, to_int_if_hex)
     def getStorageAt(self, address, position, at_block):
         if not is_integer(position) or position < 0:
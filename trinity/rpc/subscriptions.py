@@ -0,0 +1,260 @@
+import asyncio
+import json
+import logging
+import os
+from typing import (
+    Any,
+    Dict,
+    List,
+    NamedTuple,
+    Set,
+    Tuple,
+)
+
+from eth_utils import (
+    decode_hex,
+    encode_hex,
+)
+
+from evm.rlp.headers import BlockHeader
+
+from p2p.chain import BlockImportSubscriber
+
+from trinity.rpc.format import (
+    header_to_dict,
+)
+from trinity.rpc.main import (
+    generate_response,
+    validate_request,
+)
+from trinity.rpc.modules.eth import (
+    get_matching_logs,
+    is_log_match,
+    normalize_filter_values,
+)
+
+
+SUBSCRIPTION_METHODS = {
+    'eth_subscribe',
+    'eth_unsubscribe',
+}
+
+# The most notifications of a connection which may wait to be written before it's
+# closed, so that a client which doesn't read them can't make the server buffer them all.
+MAXIMUM_BUFFERED_NOTIFICATIONS = 256
+
+
+class SlowConsumer(Exception):
+    '''
+    A connection didn't read the notifications of its subscriptions as fast as they
+    were published.
+    '''
+    pass
+
+
+class Subscription(NamedTuple):
+    subscriber: 'Subscriber'
+    kind: str
+    addresses: Tuple[bytes, ...] = ()
+    topics: Tuple[Tuple[bytes, ...], ...] = ()
+
+
+class Subscriber:
+    '''
+    The subscriptions of a connection, and their notifications which haven't been
+    written yet.
+
+    A subscription only publishes its notifications once the response with its id was
+    written, so that the client knows the id of the first notification it reads.
+    '''
+    def __init__(self, max_notifications: int = MAXIMUM_BUFFERED_NOTIFICATIONS) -> None:
+        self.max_notifications = max_notifications
+        self.notifications: asyncio.Queue = asyncio.Queue(max_notifications)
+        # Set once more notifications were published than could be buffered.
+        self.overflowed = asyncio.Event()
+        self.subscription_ids: Set[str] = set()
+        # The subscriptions whose response wasn't written yet, by the response, and
+        # the notifications which they published meanwhile.
+        self._pending: Dict[asyncio.Future, str] = {}
+        self._held: Dict[str, List[str]] = {}
+
+    def add(self, subscription_id: str, response: asyncio.Future) -> None:
+        self.subscription_ids.add(subscription_id)
+        self._pending[response] = subscription_id
+        self._held[subscription_id] = []
+
+    def remove(self, subscription_id: str) -> None:
+        self.subscription_ids.discard(subscription_id)
+        self._held.pop(subscription_id, None)
+
+    def response_written(self, response: asyncio.Future) -> None:
+        subscription_id = self._pending.pop(response, None)
+        if subscription_id in self._held:
+            for message in self._held.pop(subscription_id):
+                self._put(message)
+
+    def notify(self, subscription_id: str, result: Any) -> None:
+        message = json.dumps({
+            'jsonrpc': '2.0',
+            'method': 'eth_subscription',
+            'params': {
+                'subscription': subscription_id,
+                'result': result,
+            },
+        })
+        if subscription_id not in self._held:
+            self._put(message)
+        elif len(self._held[subscription_id]) < self.max_notifications:
+            self._held[subscription_id].append(message)
+        else:
+            self.overflowed.set()
+
+    def _put(self, message: str) -> None:
+        try:
+            self.notifications.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed.set()
+
+
+class SubscriptionManager(BlockImportSubscriber):
+    '''
+    Publishes the headers of the imported blocks, and the logs which they include, to
+    the subscriptions made with ``eth_subscribe`` by the connections of a server.
+    '''
+    logger = logging.getLogger('trinity.rpc.subscriptions.SubscriptionManager')
+
+    _headers: asyncio.Queue = None
+    _loop: asyncio.AbstractEventLoop = None
+
+    def __init__(self,
+                 rpc: Any,
+                 max_notifications: int = MAXIMUM_BUFFERED_NOTIFICATIONS) -> None:
+        self.rpc = rpc
+        self.max_notifications = max_notifications
+        self.subscriptions: Dict[str, Subscription] = {}
+
+    def is_subscription_request(self, request: Any) -> bool:
+        return isinstance(request, dict) and request.get('method') in SUBSCRIPTION_METHODS
+
+    def make_subscriber(self) -> Subscriber:
+        return Subscriber(self.max_notifications)
+
+    def execute(self, subscriber: Subscriber, request: Dict[str, Any]) -> asyncio.Future:
+        '''
+        Execute an ``eth_subscribe`` or ``eth_unsubscribe`` request of the subscriber,
+        and return the future of its response.
+        '''
+        response = asyncio.Future()
+        try:
+            validate_request(request)
+            params = request.get('params', [])
+            if not isinstance(params, list):
+                raise ValueError("params must be an array")
+
+            if request['method'] == 'eth_subscribe':
+                if not 1 <= len(params) <= 2:
+                    raise ValueError("eth_subscribe takes the kind of subscription, and its filter")
+                result = self._subscribe(subscriber, response, *params)
+            else:
+                if len(params) != 1:
+                    raise ValueError("eth_unsubscribe takes the id of the subscription")
+                result = self._unsubscribe(subscriber, *params)
+        except (TypeError, ValueError) as exc:
+            response.set_result(generate_response(request, None, exc))
+        else:
+            response.set_result(generate_response(request, result, None))
+        return response
+
+    def _subscribe(self,
+                   subscriber: Subscriber,
+                   response: asyncio.Future,
+                   kind: str,
+                   filter_params: Dict[str, Any] = None) -> str:
+        if kind == 'newHeads' and filter_params is None:
+            subscription = Subscription(subscriber, kind)
+        elif kind == 'logs':
+            if filter_params is None:
+                filter_params = {}
+            elif not isinstance(filter_params, dict):
+                raise ValueError("logs filter must be a JSON object")
+            subscription = Subscription(
+                subscriber,
+                kind,
+                normalize_filter_values(filter_params.get('address')),
+                tuple(
+                    normalize_filter_values(position)
+                    for position in filter_params.get('topics') or ()
+                ),
+            )
+        else:
+            raise ValueError("Unsupported subscription: %r" % kind)
+
+        subscription_id = encode_hex(os.urandom(16))
+        self.subscriptions[subscription_id] = subscription
+        subscriber.add(subscription_id, response)
+        return subscription_id
+
+    def _unsubscribe(self, subscriber: Subscriber, subscription_id: str) -> bool:
+        if subscription_id not in subscriber.subscription_ids:
+            return False
+        del self.subscriptions[subscription_id]
+        subscriber.remove(subscription_id)
+        return True
+
+    def remove_subscriber(self, subscriber: Subscriber) -> None:
+        for subscription_id in subscriber.subscription_ids:
+            self.subscriptions.pop(subscription_id, None)
+        subscriber.subscription_ids.clear()
+
+    def notify_block_imported(self, header: BlockHeader) -> None:
+        # Blocks are imported on another thread than the one of the server.
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._headers.put_nowait, header)
+
+    async def run(self, loop: asyncio.AbstractEventLoop = None) -> None:
+        '''
+        Publish the imported blocks, in the order of their import, until cancelled.
+        '''
+        self._headers = asyncio.Queue()
+        if loop is None:
+            self._loop = asyncio.get_event_loop()
+        else:
+            self._loop = loop
+        try:
+            while True:
+                header = await self._headers.get()
+                await self._publish(header)
+                # Let the notifications be written between the blocks of a burst of imports.
+                await asyncio.sleep(0)
+        finally:
+            self._loop = None
+
+    async def _publish(self, header: BlockHeader) -> None:
+        log_subscriptions = []
+        for subscription_id, subscription in tuple(self.subscriptions.items()):
+            if subscription.kind == 'newHeads':
+                subscription.subscriber.notify(subscription_id, header_to_dict(header))
+            else:
+                log_subscriptions.append((subscription_id, subscription))
+
+        if not log_subscriptions:
+            return
+
+        # Decoding the receipts reads the database, so it mustn't block the connections.
+        logs = await self._loop.run_in_executor(
+            None,
+            get_matching_logs,
+            self.rpc.chain.chaindb,
+            header,
+            (),
+            (),
+        )
+        for log in logs:
+            address = decode_hex(log['address'])
+            log_topics = tuple(decode_hex(topic) for topic in log['topics'])
+            for subscription_id, subscription in log_subscriptions:
+                if subscription_id not in self.subscriptions:
+                    # Unsubscribed while the logs were read.
+                    continue
+                elif is_log_match(address, log_topics, subscription.addresses, subscription.topics):
+                    subscription.subscriber.notify(subscription_id, log)
@@ -15,6 +15,9 @@ from evm.chains.mainnet import (
 from evm.chains.ropsten import (
     ROPSTEN_NETWORK_ID,
 )
+from evm.consensus.pow import (
+    SealCheckPolicy,
+)
 
 from .xdg import (
     get_xdg_trinity_root,
@@ -75,6 +78,16 @@ def get_nodekey_path(data_dir: Path) -> Path:
     ))
 
 
+ETHASH_DIRNAME = 'ethash'
+
+
+def get_ethash_cache_dir(data_dir: Path) -> Path:
+    """
+    Returns the path to the directory of the ethash cache files.
+    """
+    return data_dir / ETHASH_DIRNAME
+
+
 DATABASE_SOCKET_FILENAME = 'db.ipc'
 
 
@@ -143,6 +156,21 @@ def construct_chain_config_params(args):
     if args.port is not None:
         yield 'port', args.port
 
+    if args.seal_check_ratio is not None or args.seal_check_checkpoint is not None:
+        yield 'seal_check_policy', SealCheckPolicy(
+            sample_ratio=1.0 if args.seal_check_ratio is None else args.seal_check_ratio,
+            checkpoint=args.seal_check_checkpoint or 0,
+        )
+
+    if args.ethash_full_dataset:
+        yield 'ethash_full_dataset', args.ethash_full_dataset
+
+    if args.http_rpc_address is not None:
+        yield 'jsonrpc_http_address', args.http_rpc_address
+
+    if args.http_rpc_max_connections is not None:
+        yield 'jsonrpc_http_max_connections', args.http_rpc_max_connections
+
     if args.preferred_nodes is None:
         yield 'preferred_nodes', args.preferred_nodes
     else: